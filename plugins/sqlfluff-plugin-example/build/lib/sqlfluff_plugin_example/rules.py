@@ -0,0 +1,62 @@
+"""An example of a custom rule implemented through the plugin system.
+
+This uses the rules API supported from 0.4.0 onwards.
+"""
+
+from sqlfluff.core.rules import (
+    BaseRule,
+    LintResult,
+    RuleContext,
+)
+from sqlfluff.core.rules.crawlers import SegmentSeekerCrawler
+
+
+# These two decorators allow plugins
+# to be displayed in the sqlfluff docs
+class Rule_Example_L001(BaseRule):
+    """ORDER BY on these columns is forbidden!
+
+    **Anti-pattern**
+
+    Using ``ORDER BY`` one some forbidden columns.
+
+    .. code-block:: sql
+
+        SELECT *
+        FROM foo
+        ORDER BY
+            bar,
+            baz
+
+    **Best practice**
+
+    Do not order by these columns.
+
+    .. code-block:: sql
+
+        SELECT *
+        FROM foo
+        ORDER BY bar
+    """
+
+    groups = ("all",)
+    config_keywords = ["forbidden_columns"]
+    crawl_behaviour = SegmentSeekerCrawler({"orderby_clause"})
+    is_fix_compatible = True
+
+    def __init__(self, *args, **kwargs):
+        """Overwrite __init__ to set config."""
+        super().__init__(*args, **kwargs)
+        self.forbidden_columns = [
+            col.strip() for col in self.forbidden_columns.split(",")
+        ]
+
+    def _eval(self, context: RuleContext):
+        """We should not ORDER BY forbidden_columns."""
+        for seg in context.segment.segments:
+            col_name = seg.raw.lower()
+            if col_name in self.forbidden_columns:
+                return LintResult(
+                    anchor=seg,
+                    description=f"Column `{col_name}` not allowed in ORDER BY.",
+                )
@@ -191,6 +191,10 @@ class DbtTemplater(JinjaTemplater):
         """Returns info about the given templater for output by the cli."""
         return [("templater", self.name), ("dbt", self.dbt_version)]
 
+    def get_cache_dependencies(self, config):
+        """Results depend on the whole dbt project, so are never cached."""
+        return None
+
     @cached_property
     def _dbt_version(self) -> "VersionSpecifier":
         """Fetches the installed dbt version.
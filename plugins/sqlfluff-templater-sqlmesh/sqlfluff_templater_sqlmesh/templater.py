@@ -160,6 +160,10 @@ class SQLMeshTemplater(JinjaTemplater):
         """Returns info about the given templater for output by the cli."""
         return [("templater", self.name), ("sqlmesh", self.sqlmesh_version)]
 
+    def get_cache_dependencies(self, config: "FluffConfig") -> Optional[list[str]]:
+        """Results depend on the whole SQLMesh project, so are never cached."""
+        return None
+
     def _clear_cached_sqlmesh_context(self) -> None:
         """Clear cached SQLMesh context when runtime configuration changes."""
         self.__dict__.pop("sqlmesh_context", None)
@@ -41,6 +41,7 @@ from sqlfluff.core import (
     dialect_selector,
 )
 from sqlfluff.core.config import progress_bar_configuration
+from sqlfluff.core.config.validate import ALLOWABLE_SCHEDULE_VALUES
 from sqlfluff.core.linter import LintingResult, ParsedString
 from sqlfluff.core.linter.linted_file import TMP_PRS_ERROR_TYPES
 from sqlfluff.core.plugin.host import get_plugin_manager
@@ -486,6 +487,47 @@ def lint_options(f: Callable) -> Callable:
         is_flag=True,
         help="Perform the operation regardless of .sqlfluffignore configurations",
     )(f)
+    f = click.option(
+        "--cache-dir",
+        default=None,
+        help=(
+            "A directory in which to cache lint results between runs. Files "
+            "which haven't changed (along with their config and any templater "
+            "dependencies) are then served from the cache rather than linted "
+            "again. This overrides the ``cache_dir`` config value."
+        ),
+        type=click.Path(file_okay=False),
+    )(f)
+    f = click.option(
+        "--no-cache",
+        is_flag=True,
+        default=False,
+        help="Don't read from or write to the lint result cache for this run.",
+    )(f)
+    f = click.option(
+        "--schedule",
+        default=None,
+        type=click.Choice(ALLOWABLE_SCHEDULE_VALUES, case_sensitive=False),
+        help=(
+            "The order in which to send files to parallel workers. "
+            "``discovery`` sends them in the order they are found, ``size`` "
+            "sends the largest first, and ``history`` sends the slowest first "
+            "based on the timings in ``schedule_history_path`` (as written by "
+            "``--persist-timing``). Small files are sent in batches in the "
+            "latter two modes. This overrides the ``schedule`` config value."
+        ),
+    )(f)
+    f = click.option(
+        "--changed-since",
+        default=None,
+        metavar="REF",
+        help=(
+            "Only process files which have changed since the merge base of this "
+            "git ref and HEAD (including uncommitted changes and untracked "
+            "files), within the paths given. Ignore files still apply. This "
+            "overrides the ``changed_since`` config value."
+        ),
+    )(f)
     return f
 
 
@@ -713,6 +755,16 @@ def dump_file_payload(filename: Optional[str], payload: str) -> None:
     default=None,
     help="Set the Python recursion limit before linting.",
 )
+@click.option(
+    "--changed-lines-only",
+    is_flag=True,
+    default=None,
+    help=(
+        "When used with --changed-since, only report linting violations on "
+        "lines which have changed. This overrides the ``changed_lines_only`` "
+        "config value."
+    ),
+)
 @click.argument("paths", nargs=-1, type=click.Path(allow_dash=True))
 def lint(
     paths: tuple[str],
@@ -722,6 +774,7 @@ def lint(
     nofail: bool,
     recursion_limit: Optional[int],
     disregard_sqlfluffignores: bool,
+    no_cache: bool = False,
     quiet: bool = False,
     logger: Optional[logging.Logger] = None,
     bench: bool = False,
@@ -815,6 +868,7 @@ def lint(
                 # If we're just linting in the CLI, we don't need to retain the
                 # raw file content. This allows us to reduce memory overhead.
                 retain_files=False,
+                use_cache=not no_cache,
             )
 
     # Output the final stats
@@ -1024,7 +1078,10 @@ def lint(
     output_stream.close()
     if bench:
         click.echo("==== overall timings ====")
-        click.echo(formatter.cli_table([("Clock time", result.total_time)]))
+        overall_timings = [("Clock time", result.total_time)]
+        if result.tail_idle_time is not None:
+            overall_timings.append(("Tail idle", result.tail_idle_time))
+        click.echo(formatter.cli_table(overall_timings))
         timing_summary = result.timing_summary()
         for step in timing_summary:
             click.echo(f"=== {step} ===")
@@ -1202,6 +1259,7 @@ def _paths_fix(
     check: bool = False,
     persist_timing: Optional[str] = None,
     ignore_files: bool = True,
+    use_cache: bool = True,
 ) -> None:
     """Handle fixing from paths."""
     # Lint the paths (not with the fix argument at this stage), outputting as we go.
@@ -1225,6 +1283,7 @@ def _paths_fix(
             # NOTE: This should enable us to limit the memory overhead of keeping
             # a large parsed project in memory unless necessary.
             retain_files=check,
+            use_cache=use_cache,
         )
 
     exit_code = _handle_unparsable(fix_even_unparsable, exit_code, result, formatter)
@@ -1287,7 +1346,10 @@ def _paths_fix(
 
     if bench:
         click.echo("==== overall timings ====")
-        click.echo(formatter.cli_table([("Clock time", result.total_time)]))
+        overall_timings = [("Clock time", result.total_time)]
+        if result.tail_idle_time is not None:
+            overall_timings.append(("Tail idle", result.tail_idle_time))
+        click.echo(formatter.cli_table(overall_timings))
         timing_summary = result.timing_summary()
         for step in timing_summary:
             click.echo(f"=== {step} ===")
@@ -1379,6 +1441,7 @@ def fix(
     disregard_sqlfluffignores: bool,
     recursion_limit: Optional[int],
     check: bool = False,
+    no_cache: bool = False,
     bench: bool = False,
     quiet: bool = False,
     fixed_suffix: str = "",
@@ -1469,6 +1532,7 @@ def fix(
                 check=check,
                 persist_timing=persist_timing,
                 ignore_files=not disregard_sqlfluffignores,
+                use_cache=not no_cache,
             )
 
 
@@ -1493,6 +1557,7 @@ def cli_format(
     paths: tuple[str],
     disregard_sqlfluffignores: bool,
     recursion_limit: Optional[int],
+    no_cache: bool = False,
     quiet: bool = False,
     bench: bool = False,
     fixed_suffix: str = "",
@@ -1596,6 +1661,7 @@ def cli_format(
                 show_lint_violations=False,
                 persist_timing=persist_timing,
                 ignore_files=not disregard_sqlfluffignores,
+                use_cache=not no_cache,
             )
 
 
@@ -1867,7 +1933,7 @@ def render(
             fname = path
 
         # Get file specific config
-        file_config.process_raw_file_for_config(raw_sql, fname)
+        file_config = file_config.with_inline_config(raw_sql, fname)
         rendered = lnt.render_string(raw_sql, fname, file_config, "utf8")
 
         if rendered.templater_violations:
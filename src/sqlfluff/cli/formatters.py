@@ -558,6 +558,10 @@ class OutputStreamFormatter(FormatterInterface):
                 "unclean rate",
                 "status",
             ]
+            # Only present if the lint result cache was in use.
+            output_fields += [
+                key for key in ("cache hits", "cache misses") if key in all_stats
+            ]
             special_formats = {"unclean rate": "{0:.0%}"}
         else:
             output_fields = ["violations", "status"]
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+import os
+from collections.abc import Iterable, Iterator
 from copy import copy, deepcopy
 from itertools import chain
 from typing import TYPE_CHECKING, Any, Optional
@@ -20,6 +21,7 @@ from sqlfluff.core.helpers.dict import (
     nested_combine,
     records_to_nested_dict,
 )
+from sqlfluff.core.helpers.source import scan_source
 from sqlfluff.core.helpers.string import (
     split_colon_separated_string,
     split_comma_separated_string,
@@ -33,6 +35,11 @@ if TYPE_CHECKING:  # pragma: no cover
 # Instantiate the config logger
 config_logger = logging.getLogger("sqlfluff.config")
 
+# The maximum number of child configs (one per directory) to cache on each
+# config object. Files are usually linted in directory order, so this only
+# needs to cover the directories currently being processed.
+_CHILD_CONFIG_CACHE_SIZE = 64
+
 
 class FluffConfig:
     """The persistent object for internal methods to access configuration.
@@ -112,6 +119,8 @@ class FluffConfig:
         core_overrides = overrides["core"] if overrides else None
         assert isinstance(core_overrides, dict) or core_overrides is None
         self._overrides = core_overrides
+        # Child configs for each directory, as shared by `get_child_from_path`.
+        self._child_configs: dict[tuple[str, str, bool], FluffConfig] = {}
 
         # Fetch a fresh plugin manager if we weren't provided with one
         self._plugin_manager = plugin_manager or get_plugin_manager()
@@ -227,6 +236,8 @@ class FluffConfig:
         state = self.__dict__.copy()
         # Remove the unpicklable entries.
         del state["_plugin_manager"]
+        # Child configs are cheap to recreate compared to pickling them.
+        state["_child_configs"] = {}
         # The dbt templater doesn't pickle well, but isn't required
         # within threaded operations. If it was, it could easily be
         # rehydrated within the thread. For rules which want to determine
@@ -238,6 +249,15 @@ class FluffConfig:
         state["_configs"] = state["_configs"].copy()
         state["_configs"]["core"] = state["_configs"]["core"].copy()
         state["_configs"]["core"]["templater_obj"] = None
+        # The dialect is large to pickle, and can be fetched from the dialect
+        # cache on the other side, as long as it's the one we'd get anyway.
+        # NB: We import here to avoid a circular references.
+        from sqlfluff.core.dialects import dialect_selector
+
+        dialect = state["_configs"]["core"].get("dialect")
+        dialect_obj = state["_configs"]["core"].get("dialect_obj")
+        if dialect and dialect_obj is dialect_selector(dialect):
+            del state["_configs"]["core"]["dialect_obj"]
         return state
 
     def __setstate__(self, state: dict[str, Any]) -> None:  # pragma: no cover
@@ -246,6 +266,10 @@ class FluffConfig:
         # NOTE: Rather than rehydrating the previous plugin manager, we
         # fetch a fresh one.
         self._plugin_manager = get_plugin_manager()
+        # Fetch the dialect if it was removed when pickling.
+        core = self._configs["core"]
+        if "dialect_obj" not in core:
+            self._initialise_dialect(core.get("dialect"), require_dialect=False)
         # NOTE: Likewise we don't reinstate the "templater_obj" config value
         # which should also only be used in the main thread rather than child
         # processes.
@@ -537,6 +561,40 @@ class FluffConfig:
             require_dialect=require_dialect,
         )
 
+    def get_child_from_path(
+        self, path: str, require_dialect: bool = True
+    ) -> FluffConfig:
+        """Get a child config for a path, shared with others in the same directory.
+
+        This is equivalent to :meth:`make_child_from_path`, but config is
+        only resolved once for each directory (config files apply to whole
+        directories), and the same object is returned for every path in it.
+
+        .. note::
+           The returned config is shared, so must not be modified. Use
+           :meth:`copy` first, or :meth:`with_inline_config` to apply any
+           inline config from a file.
+
+        Args:
+            path (str): The path to load the new config object from, inheriting
+                the content of the calling `FluffConfig` as base values.
+            require_dialect (bool, optional, default is True): When True
+                an error will be raise if the dialect config value is unset.
+
+        Returns:
+            :obj:`FluffConfig`: A config object for the path.
+        """
+        dirname = path if os.path.isdir(path) else os.path.dirname(path)
+        # Config is loaded relative to the working directory, so include that.
+        key = (os.path.abspath(dirname), os.getcwd(), require_dialect)
+        child = self._child_configs.get(key)
+        if child is None:
+            child = self.make_child_from_path(path, require_dialect=require_dialect)
+            if len(self._child_configs) >= _CHILD_CONFIG_CACHE_SIZE:
+                self._child_configs.clear()
+            self._child_configs[key] = child
+        return child
+
     def diff_to(self, other: FluffConfig) -> ConfigMappingType:
         """Compare this config to another.
 
@@ -775,12 +833,41 @@ class FluffConfig:
         'postgres'
         """
         # Scan the raw file for config commands.
-        for raw_line in raw_str.splitlines():
-            # With or without a space.
-            if raw_line.startswith(("-- sqlfluff", "--sqlfluff")):
-                # Found a in-file config command
-                self.process_inline_config(raw_line, fname)
+        for raw_line in self._iter_inline_config_lines(raw_str):
+            # Found a in-file config command
+            self.process_inline_config(raw_line, fname)
         # Deal with potential list-like inputs.
         self._handle_comma_separated_values()
         # Re-validate: inline config may have changed the rust parser/rules keys.
         self._verify_rust_config()
+
+    def with_inline_config(self, raw_str: str, fname: str) -> FluffConfig:
+        """Get a config which includes any inline config in a raw file.
+
+        Unlike :meth:`process_raw_file_for_config`, this doesn't modify
+        this config. If the file has no inline config, then this config
+        is returned as it is (rather than a copy), so it can be shared
+        between files (see :meth:`get_child_from_path`). Otherwise the
+        inline config is applied to a copy.
+
+        Args:
+            raw_str (str): The full SQL script to evaluate for inline configs.
+            fname (str): The name of the current file being processed. This
+                is used purely for logging purposes in the case that an
+                invalid config string is provided so that any error messages
+                can reference the file with the issue.
+        """
+        if not any(self._iter_inline_config_lines(raw_str)):
+            return self
+        config = self.copy()
+        config.process_raw_file_for_config(raw_str, fname)
+        return config
+
+    @staticmethod
+    def _iter_inline_config_lines(raw_str: str) -> Iterator[str]:
+        """Iterate through any inline config commands in a raw file.
+
+        NOTE: The file is scanned for ``noqa`` comments at the same time (see
+        :func:`scan_source`), as those are needed later.
+        """
+        yield from scan_source(raw_str).config_lines
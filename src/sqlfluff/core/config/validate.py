@@ -18,6 +18,8 @@ ALLOWABLE_LAYOUT_CONFIG_KEYS = (
 
 ALLOWABLE_IMPLICIT_INDENTS_VALUES = ("forbid", "allow", "require")
 
+ALLOWABLE_SCHEDULE_VALUES = ("discovery", "size", "history")
+
 
 def _validate_layout_config(config: ConfigMappingType, logging_reference: str) -> None:
     """Validate the layout config section of the config.
@@ -113,6 +115,24 @@ def _validate_indentation_config(
             )
 
 
+def _validate_schedule_config(
+    config: ConfigMappingType, logging_reference: str
+) -> None:
+    """Validate the parallel schedule config value."""
+    core_section = config.get("core", {})
+    if not core_section:
+        return None
+
+    assert isinstance(core_section, dict)
+    schedule = core_section.get("schedule")
+    if schedule is not None and schedule not in ALLOWABLE_SCHEDULE_VALUES:
+        raise SQLFluffUserError(
+            f"Config file {logging_reference!r} set an invalid value for "
+            f"`schedule`: {schedule!r}. "
+            f"Valid options are: {', '.join(ALLOWABLE_SCHEDULE_VALUES)}."
+        )
+
+
 def _validate_max_parse_depth_config(
     config: ConfigMappingType, logging_reference: str
 ) -> None:
@@ -241,6 +261,8 @@ def validate_config_dict(config: ConfigMappingType, logging_reference: str) -> N
     _validate_layout_config(config, logging_reference)
     # Validate indentation section
     _validate_indentation_config(config, logging_reference)
+    # Validate parallel schedule config
+    _validate_schedule_config(config, logging_reference)
     # Validate max parse depth config
     _validate_max_parse_depth_config(config, logging_reference)
     # Validate max parse nodes config
@@ -248,3 +270,4 @@ def validate_config_dict(config: ConfigMappingType, logging_reference: str) -> N
     # Validate other core integer limits which have no disable sentinel.
     _validate_int_config(config, "render_variant_limit", 1, logging_reference)
     _validate_int_config(config, "runaway_limit", 1, logging_reference)
+    _validate_int_config(config, "cache_max_size_mb", 0, logging_reference)
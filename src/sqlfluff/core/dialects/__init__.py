@@ -11,6 +11,7 @@ Within .dialects, each dialect is free to depend on other dialects as
 required. Any dependent dialects will be loaded as needed.
 """
 
+import functools
 from collections.abc import Iterator
 from importlib import import_module
 from typing import NamedTuple
@@ -98,8 +99,15 @@ def dialect_readout() -> Iterator[DialectTuple]:
         )
 
 
+@functools.lru_cache(maxsize=32)
 def dialect_selector(s: str) -> Dialect:
-    """Return a dialect given its name."""
+    """Return a dialect given its name.
+
+    Expanding a dialect is costly relative to linting a small file, and
+    happens every time a config is created, so expanded dialects are cached
+    for the lifetime of the process. The same object is returned for every
+    call with the same name, and so it must not be modified.
+    """
     dialect = load_raw_dialect(s)
     # Expand any callable references at this point.
     # NOTE: The result of .expand() is a new class.
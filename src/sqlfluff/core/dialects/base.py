@@ -9,6 +9,8 @@ from sqlfluff.core.parser import (
     SegmentGenerator,
     StringParser,
 )
+from sqlfluff.core.parser.dispatch import DispatchTable, build_dispatch_tables
+from sqlfluff.core.parser.grammar.anyof import AnyNumberOf
 from sqlfluff.core.parser.grammar.base import BaseGrammar, Nothing
 from sqlfluff.core.parser.lexer import LexerType
 from sqlfluff.core.parser.matchable import Matchable
@@ -43,6 +45,9 @@ class Dialect:
         self._sets = sets or {}
         self.inherits_from = inherits_from
         self.root_segment_name = root_segment_name
+        # Dispatch tables for pruning the options of each compound grammar.
+        # These are built when the dialect is expanded.
+        self._dispatch_tables: dict[int, tuple[AnyNumberOf, DispatchTable]] = {}
         # Attributes for documentation
         self.formatted_name: str = formatted_name or name
         self.docstring = docstring or f"The dialect for {self.formatted_name}."
@@ -91,6 +96,7 @@ class Dialect:
                 if n not in expanded_copy._library:
                     expanded_copy._library[n] = StringParser(kw.lower(), KeywordSegment)
         expanded_copy.expanded = True
+        expanded_copy._dispatch_tables = build_dispatch_tables(expanded_copy)
         return expanded_copy
 
     def sets(self, label: str) -> set[str]:
@@ -181,6 +187,8 @@ class Dialect:
             if n in self._library:  # pragma: no cover
                 raise ValueError(f"{n!r} is already registered in {self!r}")
             self._library[n] = kwargs[n]
+        # Any precomputed hints may no longer be valid.
+        self._dispatch_tables = {}
 
     def replace(self, **kwargs: DialectElementType) -> None:
         """Override a segment on the dialect directly.
@@ -239,6 +247,8 @@ class Dialect:
                         )
 
             self._library[n] = replacement
+            # Any precomputed hints may no longer be valid.
+            self._dispatch_tables = {}
 
     def add_update_segments(self, module_dct: dict[str, Any]) -> None:
         """Scans module dictionary, adding or replacing segment definitions."""
@@ -283,6 +293,17 @@ class Dialect:
                 f"with get_segment - type{type(segment)}"
             )
 
+    def dispatch_table(self, grammar: Matchable) -> Optional[DispatchTable]:
+        """Return the dispatch table for the options of a compound grammar.
+
+        Returns `None` if there isn't one, in which case options should be
+        pruned by evaluating their simple hints.
+        """
+        entry = self._dispatch_tables.get(id(grammar))
+        if entry and entry[0] is grammar:
+            return entry[1]
+        return None
+
     def ref(self, name: str) -> Matchable:
         """Return an object which acts as a late binding reference to the element named.
 
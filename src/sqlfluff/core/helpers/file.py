@@ -1,8 +1,9 @@
 """File Helpers for the parser module."""
 
 import codecs
+import hashlib
 import os.path
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Optional
 
@@ -33,6 +34,31 @@ def get_encoding(fname: str, config_encoding: str = "autodetect") -> str:
     return detected_encoding
 
 
+def snapshot_paths(paths: Iterable[str]) -> str:
+    """Snapshot the size and mtime of every file within the given paths.
+
+    Paths may be files or directories, which are walked recursively. The
+    result is a hash which changes whenever any of the files is added,
+    removed or modified.
+    """
+    records = []
+    for path in sorted(paths):
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            records.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+            continue
+        for dirname, subdirs, filenames in os.walk(path):
+            subdirs.sort()
+            for filename in sorted(filenames):
+                filepath = os.path.join(dirname, filename)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:  # pragma: no cover
+                    continue
+                records.append(f"{filepath}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(records).encode("utf8")).hexdigest()
+
+
 def iter_intermediate_paths(inner_path: Path, outer_path: Path) -> Iterator[Path]:
     """Iterate paths between two given paths.
 
@@ -0,0 +1,59 @@
+"""Source Helpers for the linter.
+
+Both inline config (``-- sqlfluff:...``) and ``noqa`` comments can be found
+in the raw source of a file, before it's templated, so both are found in a
+single pass over its lines.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import regex
+
+
+class SourceScan(NamedTuple):
+    """The lines of a raw file which may hold directives for sqlfluff.
+
+    Line numbers (from 1) are those of the file with its newlines
+    normalised to ``\\n`` (as they are when it's linted).
+    """
+
+    # Any inline config commands.
+    config_lines: tuple[str, ...]
+    # The lines which mention "noqa", with their line numbers.
+    noqa_lines: tuple[tuple[int, str], ...]
+
+
+@lru_cache(maxsize=16)
+def scan_source(raw_str: str) -> SourceScan:
+    """Scan the raw source of a file for lines which may hold directives.
+
+    NOTE: The result is cached, as the same source is usually scanned for
+    inline config as it's loaded, and for ``noqa`` comments later.
+
+    >>> scan = scan_source("SELECT 1 -- noqa\\n-- sqlfluff:dialect:ansi\\n")
+    >>> scan.config_lines
+    ('-- sqlfluff:dialect:ansi',)
+    >>> scan.noqa_lines
+    ((1, 'SELECT 1 -- noqa'),)
+    """
+    # Most files have neither, so check that quickly first.
+    if "sqlfluff" not in raw_str and "noqa" not in raw_str:
+        return SourceScan((), ())
+    if "\r" in raw_str:
+        raw_str = regex.sub(r"\r\n|\r", "\n", raw_str)
+    config_lines: list[str] = []
+    noqa_lines: list[tuple[int, str]] = []
+    for idx, line in enumerate(raw_str.split("\n")):
+        if "sqlfluff" in line:
+            # NOTE: Inline config commands are found on any line break (e.g.
+            # form feeds too), rather than only on newlines.
+            config_lines.extend(
+                part
+                for part in line.splitlines()
+                # With or without a space.
+                if part.startswith(("-- sqlfluff", "--sqlfluff"))
+            )
+        if "noqa" in line:
+            noqa_lines.append((idx + 1, line))
+    return SourceScan(tuple(config_lines), tuple(noqa_lines))
@@ -0,0 +1,356 @@
+"""An on-disk cache of lint results.
+
+Results are stored per file and keyed on a hash of everything which can
+influence the result of linting that file: the raw source, the effective
+config, the selected rules, the sqlfluff version and a snapshot of any
+files outside the source file which the templater depends on. Files whose
+key is found in the cache are served from it without templating, lexing,
+parsing or linting.
+
+The cache is a flat directory of small json files, one per entry. Entries
+are touched when read so that eviction can remove the least recently used
+entries once the total size of the cache exceeds a configured cap.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from importlib import metadata
+from typing import Any, Optional
+
+from sqlfluff.core.config import FluffConfig
+from sqlfluff.core.errors import (
+    SerializedObject,
+    SQLBaseError,
+    SQLLexError,
+    SQLLintError,
+    SQLParseError,
+    SQLTemplaterError,
+)
+from sqlfluff.core.helpers.file import snapshot_paths
+from sqlfluff.core.linter.linted_file import LintedFile
+
+# Instantiate the linter logger
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# Bump this if the layout of cache entries changes in a way which
+# means old entries can no longer be read.
+CACHE_FORMAT_VERSION = 2
+
+# Config values in the core section which affect how results are
+# displayed or gathered, but not the results themselves. These are
+# left out of the key so that (for example) changing verbosity doesn't
+# invalidate the whole cache.
+_NON_RESULT_CONFIG_KEYS = frozenset(
+    (
+        "cache_dir",
+        "cache_max_size_mb",
+        "changed_lines_only",
+        "changed_since",
+        "color",
+        "nocolor",
+        "output_line_length",
+        "parse_processes",
+        "parse_shape_cache",
+        "parse_split_min_segments",
+        "processes",
+        "rust_parser_lazy_tree",
+        "verbose",
+        # Live objects, which are represented by their config names.
+        "dialect_obj",
+        "templater_obj",
+    )
+)
+
+
+class CachedParseError(SQLParseError):
+    """A parsing error reconstructed from the lint result cache.
+
+    Parse errors carry positional information from their segment when
+    serialised, so we keep the serialised form to reproduce it exactly.
+    """
+
+    def __init__(self, record: SerializedObject, ignore: bool = False) -> None:
+        self._record = record
+        super().__init__(
+            description=str(record["description"]),
+            line_no=int(record["start_line_no"]),  # type: ignore[arg-type]
+            line_pos=int(record["start_line_pos"]),  # type: ignore[arg-type]
+            ignore=ignore,
+            warning=bool(record["warning"]),
+        )
+
+    def __reduce__(self) -> tuple[type["CachedParseError"], tuple[Any, ...]]:
+        """Prepare the CachedParseError for pickling."""
+        return type(self), (self._record, self.ignore)
+
+    def to_dict(self) -> SerializedObject:
+        """Return the cached serialised form, with any updated warning state."""
+        return {**self._record, "warning": self.warning}
+
+
+class CachedLintError(SQLLintError):
+    """A linting error reconstructed from the lint result cache.
+
+    There is no segment or rule object available for cached results, so
+    the code, name and fixes are served from the serialised form. The
+    ``fixes`` are kept as their serialised dicts, which is enough to
+    report on them and to discard them (for files with parsing errors),
+    but not to apply them.
+    """
+
+    def __init__(self, record: SerializedObject, ignore: bool = False) -> None:
+        self._record = record
+        self.segment = None  # type: ignore[assignment]
+        self.fixes = list(record.get("fixes", []))  # type: ignore[arg-type]
+        SQLBaseError.__init__(
+            self,
+            description=str(record["description"]),
+            line_no=int(record["start_line_no"]),  # type: ignore[arg-type]
+            line_pos=int(record["start_line_pos"]),  # type: ignore[arg-type]
+            ignore=ignore,
+            warning=bool(record["warning"]),
+        )
+
+    def __reduce__(self) -> tuple[type["CachedLintError"], tuple[Any, ...]]:
+        """Prepare the CachedLintError for pickling."""
+        return type(self), (self._record, self.ignore)
+
+    def rule_code(self) -> str:
+        """Fetch the code of the rule which cause this error."""
+        return str(self._record["code"])
+
+    def rule_name(self) -> str:
+        """Fetch the name of the rule which cause this error."""
+        return str(self._record["name"])
+
+    def to_dict(self) -> SerializedObject:
+        """Return the cached serialised form, with any updated state."""
+        return {**self._record, "warning": self.warning, "fixes": list(self.fixes)}
+
+    def __repr__(self) -> str:
+        return "<CachedLintError: rule {} pos:{!r}, #fixes: {}>".format(
+            self.rule_code(), (self.line_no, self.line_pos), len(self.fixes)
+        )
+
+
+def _violation_from_record(record: SerializedObject, ignore: bool) -> SQLBaseError:
+    """Rehydrate a violation from its serialised form."""
+    code = record["code"]
+    error_class: Optional[type[SQLBaseError]] = {
+        "TMP": SQLTemplaterError,
+        "LXR": SQLLexError,
+    }.get(str(code))
+    if error_class:
+        return error_class(
+            description=str(record["description"]),
+            line_no=int(record["start_line_no"]),  # type: ignore[arg-type]
+            line_pos=int(record["start_line_pos"]),  # type: ignore[arg-type]
+            ignore=ignore,
+            warning=bool(record["warning"]),
+        )
+    elif code == "PRS":
+        return CachedParseError(record, ignore=ignore)
+    return CachedLintError(record, ignore=ignore)
+
+
+def config_fingerprint(config: FluffConfig) -> str:
+    """Generate a stable string representation of the effective config."""
+    configs = dict(config._configs)
+    configs["core"] = {
+        k: v
+        for k, v in configs["core"].items()  # type: ignore[union-attr]
+        if k not in _NON_RESULT_CONFIG_KEYS
+    }
+    return json.dumps(configs, sort_keys=True, default=repr)
+
+
+class LintResultCache:
+    """A content addressed, size capped, on-disk cache of lint results.
+
+    Args:
+        cache_dir (str): The directory to store cache entries in. It will
+            be created if it doesn't already exist.
+        max_size (int): The maximum total size (in bytes) of the entries
+            in the cache. When exceeded, ``prune()`` removes the least
+            recently used entries until the cache is back under the cap.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._version = metadata.version("sqlfluff")
+        # A memo of dependency snapshots, so that files sharing a set
+        # of templater dependencies (e.g. a macro folder) only stat them
+        # once per run.
+        self._dependency_memo: dict[tuple[str, ...], str] = {}
+
+    @classmethod
+    def from_config(cls, config: FluffConfig) -> Optional["LintResultCache"]:
+        """Create a cache from the root config, if caching is enabled."""
+        cache_dir = config.get("cache_dir")
+        if not cache_dir:
+            return None
+        # The result cache can't reproduce warnings about unused noqa
+        # comments because it doesn't retain the ignore mask, so don't
+        # use it at all in that case.
+        if config.get("warn_unused_ignores"):
+            linter_logger.info("Lint result cache disabled by warn_unused_ignores.")
+            return None
+        # Nor can it narrow results to changed lines, because they change
+        # independently of the file content.
+        if config.get("changed_since") and config.get("changed_lines_only"):
+            linter_logger.info("Lint result cache disabled by changed_lines_only.")
+            return None
+        max_size_mb = config.get("cache_max_size_mb", default=100)
+        return cls(str(cache_dir), int(max_size_mb) * 1024 * 1024)
+
+    def _dependency_snapshot(self, paths: Iterable[str]) -> str:
+        """Snapshot the size and mtime of every file within the given paths."""
+        path_key = tuple(sorted(paths))
+        if path_key in self._dependency_memo:
+            return self._dependency_memo[path_key]
+        snapshot = snapshot_paths(path_key)
+        self._dependency_memo[path_key] = snapshot
+        return snapshot
+
+    def make_key(
+        self,
+        raw_str: str,
+        config: FluffConfig,
+        rule_codes: Iterable[str],
+        fix: bool,
+        dependencies: Iterable[str] = (),
+    ) -> str:
+        """Generate the cache key for a file.
+
+        Args:
+            raw_str (str): The raw content of the file.
+            config (FluffConfig): The effective config for the file. Any
+                inline config directives are covered by ``raw_str``.
+            rule_codes (iterable of str): The codes of the selected rules.
+            fix (bool): Whether results are being gathered for fixing.
+            dependencies (iterable of str): Paths outside the file which
+                influence the result (e.g. macro files for the templater).
+        """
+        hasher = hashlib.sha256()
+        for part in (
+            str(CACHE_FORMAT_VERSION),
+            self._version,
+            str(config.get("dialect")),
+            config_fingerprint(config),
+            ",".join(sorted(rule_codes)),
+            str(fix),
+            self._dependency_snapshot(dependencies),
+            raw_str,
+        ):
+            hasher.update(part.encode("utf8", errors="surrogatepass"))
+            # Separate the parts so that content can't bleed between them.
+            hasher.update(b"\x00")
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str, fname: str, encoding: str) -> Optional[LintedFile]:
+        """Fetch a cached result, returning None if not present."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding="utf8") as f:
+                payload = json.load(f)
+            # Touch the entry to mark it as recently used.
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        linter_logger.info("Lint result cache hit for %s", fname)
+        return LintedFile(
+            fname,
+            [
+                _violation_from_record(record, ignore)
+                for record, ignore in payload["violations"]
+            ],
+            None,
+            None,
+            ignore_mask=None,
+            templated_file=None,
+            encoding=encoding,
+            statistics=payload["statistics"],
+        )
+
+    def put(self, key: str, linted_file: LintedFile, fix: bool) -> bool:
+        """Store a result in the cache.
+
+        Files which have fatal errors aren't stored, and neither are files
+        which have fixes to apply when fixing (because we don't retain
+        enough to apply them, and once applied the source will change
+        anyway).
+
+        Returns:
+            bool: Whether the result was stored.
+        """
+        if any(v.fatal for v in linted_file.violations):
+            return False
+        if fix and linted_file.num_violations(fixable=True, filter_warning=False):
+            return False
+        # Violations which are masked by noqa comments are stored as
+        # ignored, because we don't store the mask itself.
+        unmasked = {id(v) for v in linted_file.get_violations(filter_warning=False)}
+        payload = {
+            "violations": [
+                (v.to_dict(), v.ignore or id(v) not in unmasked)
+                for v in linted_file.violations
+            ],
+            # The templated file and tree aren't stored, so keep their sizes.
+            "statistics": linted_file.get_statistics(),
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write atomically, so that concurrent runs sharing a cache never
+        # read a partially written entry.
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:  # pragma: no cover
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        return True
+
+    def prune(self) -> int:
+        """Evict the least recently used entries until under the size cap.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json") and entry.is_file()
+            ]
+        except FileNotFoundError:
+            return 0
+        stats = [(entry.path, entry.stat()) for entry in entries]
+        total_size = sum(stat.st_size for _, stat in stats)
+        removed = 0
+        # Oldest first.
+        for path, stat in sorted(stats, key=lambda s: s[1].st_mtime_ns):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # pragma: no cover
+                continue
+            total_size -= stat.st_size
+            removed += 1
+        if removed:
+            linter_logger.info("Evicted %s entries from lint result cache.", removed)
+        return removed
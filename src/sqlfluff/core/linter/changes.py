@@ -0,0 +1,141 @@
+"""Finding the files and lines which have changed relative to a git ref.
+
+This supports the ``changed_since`` config value (``--changed-since`` on
+the command line), which limits linting to files changed since the merge
+base of a ref and ``HEAD``, e.g. on a pull request. Changes include any
+uncommitted changes and untracked files. Git is run locally, so only the
+local index and objects are read (nothing is fetched).
+"""
+
+import functools
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Iterable, Sequence
+
+from sqlfluff.core.errors import SQLBaseError, SQLFluffUserError, SQLLintError
+
+# Instantiate the linter logger
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# Inclusive ranges of (1-indexed) line numbers.
+LineRanges = tuple[tuple[int, int], ...]
+
+# The range used for files which are entirely new.
+WHOLE_FILE: LineRanges = ((1, sys.maxsize),)
+
+_HUNK_HEADER_REGEX = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _git(args: Sequence[str], cwd: str) -> str:
+    """Run a git command, returning its output."""
+    try:
+        process = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args],
+            cwd=cwd,
+            capture_output=True,
+            check=True,
+            encoding="utf8",
+            errors="surrogateescape",
+        )
+    except FileNotFoundError:
+        raise SQLFluffUserError("Finding changed files requires git to be installed.")
+    except subprocess.CalledProcessError as err:
+        raise SQLFluffUserError(
+            f"Unable to find changed files with `git {' '.join(args)}`: "
+            f"{err.stderr.strip()}"
+        )
+    return process.stdout
+
+
+def _parse_diff(diff: str, root: str) -> dict[str, LineRanges]:
+    """Parse a zero context diff into the changed lines of each file.
+
+    Where lines have only been removed, the lines either side of the
+    removal are treated as changed.
+    """
+    changes: dict[str, list[tuple[int, int]]] = {}
+    ranges: list[tuple[int, int]] = []
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            # Paths with spaces have a trailing tab.
+            path = line[4:].rstrip("\t")
+            if path == "/dev/null":
+                # The file has been deleted.
+                ranges = []
+                continue
+            # Strip the "b/" prefix.
+            ranges = changes.setdefault(
+                os.path.realpath(os.path.join(root, path[2:])), []
+            )
+            continue
+        match = _HUNK_HEADER_REGEX.match(line)
+        if not match:
+            continue
+        start = int(match.group(1))
+        count = int(match.group(2)) if match.group(2) is not None else 1
+        if count:
+            ranges.append((start, start + count - 1))
+        else:
+            ranges.append((max(start, 1), start + 1))
+    return {path: tuple(ranges) for path, ranges in changes.items()}
+
+
+@functools.lru_cache(maxsize=8)
+def get_changed_lines(ref: str, working_path: str) -> dict[str, LineRanges]:
+    """Find the files changed since the merge base of ``ref`` and ``HEAD``.
+
+    The result is cached, so that git is only run once per process.
+
+    Args:
+        ref (str): Any git ref or commit, e.g. ``origin/main``.
+        working_path (str): A path within the git repository.
+
+    Returns:
+        A dict of the real paths of the changed files, mapped to the
+        ranges of lines which have changed. Untracked files are
+        treated as entirely changed.
+    """
+    root = _git(["rev-parse", "--show-toplevel"], working_path).strip()
+    merge_base = _git(["merge-base", ref, "HEAD"], working_path).strip()
+    changes = _parse_diff(
+        _git(
+            [
+                "diff",
+                "--unified=0",
+                "--no-color",
+                "--no-ext-diff",
+                "--no-renames",
+                "--src-prefix=a/",
+                "--dst-prefix=b/",
+                merge_base,
+                "--",
+            ],
+            root,
+        ),
+        root,
+    )
+    for path in _git(["ls-files", "--others", "--exclude-standard", "-z"], root).split(
+        "\0"
+    ):
+        if path:
+            changes[os.path.realpath(os.path.join(root, path))] = WHOLE_FILE
+    linter_logger.info("Found %s files changed since %s.", len(changes), ref)
+    return changes
+
+
+def ignore_unchanged_lines(
+    violations: Iterable[SQLBaseError], line_ranges: LineRanges
+) -> None:
+    """Ignore any linting violations outside the given line ranges.
+
+    Only linting violations are ignored. Any templating or parsing
+    errors affect the whole file, so they're always kept.
+    """
+    for violation in violations:
+        if isinstance(violation, SQLLintError) and not any(
+            start <= violation.line_no <= end for start, end in line_ranges
+        ):
+            violation.ignore = True
@@ -37,6 +37,8 @@ class RenderedFile(NamedTuple):
     fname: str
     encoding: str
     source_str: str
+    # Hits and misses on caches kept by the templater while rendering.
+    cache_stats: dict[str, int] = {}
 
 
 class DeferredRenderTask(NamedTuple):
@@ -44,12 +46,19 @@ class DeferredRenderTask(NamedTuple):
 
     Instead of templating in the main process and shipping the full
     RenderedFile (~200 KB) across the IPC boundary, we ship only the
-    filename and root config and let the worker call render_file itself.
+    filename and root config (plus the raw file, if it's already been
+    loaded) and let the worker call render_file itself.
     """
 
     fname: str
     root_config: FluffConfig
     fix: bool
+    # Identifies the run which the task is part of, so that workers can
+    # tell when a new run starts.
+    run_id: int = 0
+    # The raw file, config and encoding, if already loaded in the main
+    # process (e.g. to check the lint result cache).
+    loaded: Optional[tuple[str, FluffConfig, str]] = None
 
 
 class ParsedVariant(NamedTuple):
@@ -94,6 +103,8 @@ class ParsedString(NamedTuple):
             including any parsed in-file directives.
         fname (str): The name of the file. Used mostly for user feedback.
         source_str (str): The raw content of the source file.
+        cache_stats (:obj:`dict`): Hits and misses on caches kept by the
+            templater while rendering.
     """
 
     parsed_variants: list[ParsedVariant]
@@ -102,6 +113,7 @@ class ParsedString(NamedTuple):
     config: FluffConfig
     fname: str
     source_str: str
+    cache_stats: dict[str, int] = {}
 
     @property
     def violations(self) -> list[SQLBaseError]:
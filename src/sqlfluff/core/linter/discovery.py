@@ -3,14 +3,20 @@
 The main public method here is `paths_from_path` which takes
 potentially ambiguous paths and file input and resolves them
 into specific file references. The method also processes the
-`.sqlfluffignore` functionality in the process.
+`.sqlfluffignore` functionality in the process. The lazy
+equivalent, `iter_paths_from_path`, yields files as they are found.
 """
 
+import json
 import logging
 import os
+import tempfile
+import threading
+import time
 from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional, Protocol
+from typing import TYPE_CHECKING, Callable, Optional, Protocol
 
 import pathspec
 
@@ -18,10 +24,25 @@ from sqlfluff.core.config.file import load_config_file_as_dict
 from sqlfluff.core.errors import SQLFluffUserError
 from sqlfluff.core.helpers.file import iter_intermediate_paths
 
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+
 # Instantiate the linter logger
 linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
 
 WalkableType = Iterable[tuple[str, Optional[list[str]], list[str]]]
+# The filenames and subdirectory names within a directory.
+DirListing = tuple[list[str], list[str]]
+
+# The number of threads used to list directories while walking a path.
+# Listing is IO bound (especially on network filesystems), so this isn't
+# limited by the number of cores.
+_DISCOVERY_THREADS = 8
+# Bump this if the layout of the directory listing snapshot changes.
+_LISTING_CACHE_VERSION = 1
+# Directories modified within this window (in nanoseconds) aren't stored
+# in the directory listing snapshot.
+_LISTING_CACHE_RACY_NS = 2_000_000_000
 
 
 class IgnoreSpec(Protocol):
@@ -174,11 +195,158 @@ def _process_exact_path(
     return []
 
 
+class DirectoryListingCache:
+    """A snapshot of directory listings, reused while directories are unchanged.
+
+    Adding, removing or renaming anything within a directory updates its
+    mtime, so a stored listing is reused for as long as the directory's
+    mtime is unchanged. That means repeat runs only need to ``stat`` each
+    directory rather than list it, which is much cheaper on network
+    filesystems. The snapshot is stored as a json file in the lint result
+    cache directory.
+
+    Args:
+        snapshot_path (str, optional): The file to load the snapshot from
+            and save it to. If not provided, listings are only reused
+            within the lifetime of this object.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None) -> None:
+        self.snapshot_path = snapshot_path
+        self.hits = 0
+        self.misses = 0
+        # Listings (as mtime, filenames, subdirs) keyed by absolute path.
+        self._listings: dict[str, tuple[int, list[str], list[str]]] = {}
+        self._dirty = False
+        # Directories are scanned from several threads at once.
+        self._lock = threading.Lock()
+        if snapshot_path:
+            self._load(snapshot_path)
+
+    @classmethod
+    def from_config(cls, config: "FluffConfig") -> Optional["DirectoryListingCache"]:
+        """Create a listing cache from the root config, if caching is enabled."""
+        cache_dir = config.get("cache_dir")
+        if not cache_dir:
+            return None
+        return cls(os.path.join(str(cache_dir), "discovery", "listings.json"))
+
+    def _load(self, snapshot_path: str) -> None:
+        try:
+            with open(snapshot_path, encoding="utf8") as f:
+                payload = json.load(f)
+            if payload["version"] != _LISTING_CACHE_VERSION:
+                return
+            self._listings = {
+                dirname: (int(mtime_ns), list(filenames), list(subdirs))
+                for dirname, (mtime_ns, filenames, subdirs) in payload[
+                    "listings"
+                ].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            linter_logger.debug("Unable to load directory listings: %r", err)
+
+    def scan(self, dirname: str) -> Optional[DirListing]:
+        """List a directory, reusing the stored listing if it's unchanged."""
+        key = os.path.abspath(dirname)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            with self._lock:
+                if self._listings.pop(key, None):
+                    self._dirty = True
+            return _scandir(dirname)
+        stored = self._listings.get(key)
+        if stored and stored[0] == mtime_ns:
+            with self._lock:
+                self.hits += 1
+            return stored[1], stored[2]
+        listing = _scandir(dirname)
+        with self._lock:
+            self.misses += 1
+            # Directories modified very recently might be modified again
+            # without their (possibly coarse) mtime changing, so don't
+            # store those.
+            if listing and time.time_ns() - mtime_ns > _LISTING_CACHE_RACY_NS:
+                self._listings[key] = (mtime_ns, *listing)
+                self._dirty = True
+        return listing
+
+    def save(self) -> None:
+        """Save the snapshot, if anything has changed since it was loaded."""
+        if not self.snapshot_path or not self._dirty:
+            return
+        snapshot_dir = os.path.dirname(self.snapshot_path)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        # Write atomically, so that concurrent runs sharing a cache never
+        # read a partially written snapshot.
+        fd, tmp_name = tempfile.mkstemp(dir=snapshot_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump(
+                    {"version": _LISTING_CACHE_VERSION, "listings": self._listings}, f
+                )
+            os.replace(tmp_name, self.snapshot_path)
+        except BaseException:  # pragma: no cover
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        self._dirty = False
+
+
+def _scandir(dirname: str) -> Optional[DirListing]:
+    """List the files and subdirectories in a directory.
+
+    Returns:
+        A tuple of filenames and subdirectory names, or None if the
+        directory can't be read.
+    """
+    try:
+        with os.scandir(dirname) as it:
+            entries = list(it)
+    except OSError as err:
+        # Like os.walk, skip any directories we can't read.
+        linter_logger.debug("Unable to read directory %s: %s", dirname, err)
+        return None
+
+    filenames: list[str] = []
+    subdirs: list[str] = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:  # pragma: no cover
+            is_dir = False
+        if not is_dir:
+            filenames.append(entry.name)
+        # Like os.walk, don't follow symlinks to directories.
+        elif not entry.is_symlink():
+            subdirs.append(entry.name)
+    return filenames, subdirs
+
+
+def _compile_ignore_specs(
+    dirname: str, ignore_specs: IgnoreSpecRecords
+) -> list[tuple[str, IgnoreSpec]]:
+    """Prepare ignore specs for matching the contents of a directory.
+
+    Specs match paths relative to the directory they were loaded from, so
+    the relative path from there to this directory is worked out once here
+    rather than for every file.
+    """
+    abs_dirname = os.path.abspath(dirname)
+    compiled = []
+    for spec_dirname, _, spec in ignore_specs:
+        relpath = os.path.relpath(abs_dirname, spec_dirname)
+        compiled.append(("" if relpath == os.curdir else relpath + os.sep, spec))
+    return compiled
+
+
 def _iter_files_in_path(
     path: str,
     ignore_files: bool,
     outer_ignore_specs: IgnoreSpecRecords,
     lower_file_exts: tuple[str, ...],
+    listing_cache: Optional[DirectoryListingCache] = None,
 ) -> Iterator[str]:
     """Handle directory paths being passed to paths_from_path.
 
@@ -187,56 +355,99 @@ def _iter_files_in_path(
     files) only apply within the folder they are found, whereas the
     ignore files from outside the path (the outer ignore files) will
     always apply, so we handle them separately.
+
+    Files are yielded in sorted order, i.e. the same order as sorting the
+    full list of paths, but without having to walk the whole path first.
+    Directories are listed ahead of time on a pool of threads, so that
+    slow filesystems are read concurrently.
     """
-    inner_ignore_specs: IgnoreSpecRecords = []
-    ignore_filename_set = frozenset(ignore_file_loaders.keys())
-
-    for dirname, subdirs, filenames in os.walk(path, topdown=True):
-        # Before adding new ignore specs, remove any which are no longer relevant
-        # as indicated by us no longer being in a subdirectory of them.
-        # NOTE: Slice so we can modify as we go.
-        for inner_dirname, inner_file, inner_spec in inner_ignore_specs[:]:
-            if not (
-                dirname == inner_dirname
-                or dirname.startswith(os.path.abspath(inner_dirname) + os.sep)
-            ):
-                inner_ignore_specs.remove((inner_dirname, inner_file, inner_spec))
-
-        # Then look for any ignore files in the path (if ignoring files), add them
-        # to the inner buffer if found.
-        if ignore_files:
-            for ignore_file in set(filenames) & ignore_filename_set:
-                ignore_spec = ignore_file_loaders[ignore_file](dirname, ignore_file)
-                if ignore_spec:
-                    inner_ignore_specs.append(ignore_spec)
-
-        # Then prune any subdirectories which are ignored (by modifying `subdirs`)
-        # https://docs.python.org/3/library/os.html#os.walk
-        for subdir in subdirs[:]:  # slice it so that we can modify it in the process.
-            # NOTE: The "*" in this next section is a bit of a hack, but pathspec
-            # doesn't like matching _directories_ directly, but if we instead match
-            # `directory/*` we get the same effect.
-            absolute_path = os.path.abspath(os.path.join(dirname, subdir, "*"))
-            if _check_ignore_specs(
-                absolute_path, outer_ignore_specs
-            ) or _check_ignore_specs(absolute_path, inner_ignore_specs):
-                subdirs.remove(subdir)
-                continue
-
-        # Then look for any relevant sql files in the path.
-        for filename in filenames:
-            relative_path = os.path.join(dirname, filename)
-            absolute_path = os.path.abspath(relative_path)
-
-            # Check file extension is relevant
-            if not _match_file_extension(filename, lower_file_exts):
-                continue
-            # Check not ignored by outer & inner ignore specs
-            if _check_ignore_specs(absolute_path, outer_ignore_specs):
-                continue
-            if _check_ignore_specs(absolute_path, inner_ignore_specs):
-                continue
+    scan = listing_cache.scan if listing_cache else _scandir
+    executor = ThreadPoolExecutor(
+        max_workers=_DISCOVERY_THREADS, thread_name_prefix="sqlfluff-discovery"
+    )
+    try:
+        yield from _iter_files_in_dir(
+            path,
+            executor.submit(scan, path),
+            lambda dirname: executor.submit(scan, dirname),
+            ignore_files,
+            outer_ignore_specs,
+            lower_file_exts,
+            frozenset(ignore_file_loaders.keys()),
+        )
+    finally:
+        # Don't wait for (or start) listing any directories we no longer need.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_files_in_dir(
+    dirname: str,
+    listing: "Future[Optional[DirListing]]",
+    submit_scan: Callable[[str], "Future[Optional[DirListing]]"],
+    ignore_files: bool,
+    parent_ignore_specs: IgnoreSpecRecords,
+    lower_file_exts: tuple[str, ...],
+    ignore_filename_set: frozenset[str],
+) -> Iterator[str]:
+    """Yield the sql files within a directory, recursing into subdirectories.
 
+    The ``parent_ignore_specs`` are the outer ignore specs, followed by
+    any inner ones found in the directories above this one.
+    """
+    result = listing.result()
+    if result is None:
+        return
+    filenames, subdirs = result
+
+    # Look for any ignore files in the path (if ignoring files). These apply
+    # to this directory and everything within it.
+    ignore_specs = parent_ignore_specs
+    if ignore_files:
+        for ignore_file in sorted(set(filenames) & ignore_filename_set):
+            ignore_spec = ignore_file_loaders[ignore_file](dirname, ignore_file)
+            if ignore_spec:
+                if ignore_specs is parent_ignore_specs:
+                    ignore_specs = parent_ignore_specs.copy()
+                ignore_specs.append(ignore_spec)
+    compiled_specs = _compile_ignore_specs(dirname, ignore_specs)
+
+    def _is_ignored(name: str) -> bool:
+        return any(spec.match_file(prefix + name) for prefix, spec in compiled_specs)
+
+    # Sort files and subdirectories together. A subdirectory is keyed with a
+    # trailing separator, so that this matches sorting the full paths.
+    to_visit: list[tuple[str, Optional[Future[Optional[DirListing]]]]] = []
+    for subdir in subdirs:
+        # Prune any subdirectories which are ignored.
+        # NOTE: The "*" in this next section is a bit of a hack, but pathspec
+        # doesn't like matching _directories_ directly, but if we instead match
+        # `directory/*` we get the same effect.
+        if _is_ignored(os.path.join(subdir, "*")):
+            continue
+        # Start listing the subdirectory straight away.
+        to_visit.append(
+            (subdir + os.sep, submit_scan(os.path.join(dirname, subdir)))
+        )
+    for filename in filenames:
+        # Check file extension is relevant, and not ignored.
+        if _match_file_extension(filename, lower_file_exts) and not _is_ignored(
+            filename
+        ):
+            to_visit.append((filename, None))
+
+    for name, subdir_listing in sorted(to_visit, key=lambda item: item[0]):
+        relative_path = os.path.join(dirname, name)
+        if subdir_listing:
+            yield from _iter_files_in_dir(
+                relative_path,
+                subdir_listing,
+                submit_scan,
+                ignore_files,
+                ignore_specs,
+                lower_file_exts,
+                ignore_filename_set,
+            )
+        else:
             # If we get here, it's one we want. Yield it.
             yield os.path.normpath(relative_path)
 
@@ -248,9 +459,41 @@ def paths_from_path(
     working_path: str = os.getcwd(),
     target_file_exts: Sequence[str] = (".sql",),
     check_non_existent_file: bool = False,
+    listing_cache: Optional[DirectoryListingCache] = None,
 ) -> list[str]:
     """Return a set of sql file paths from a potentially more ambiguous path string.
 
+    See :func:`iter_paths_from_path` for details.
+    """
+    return list(
+        iter_paths_from_path(
+            path,
+            ignore_non_existent_files=ignore_non_existent_files,
+            ignore_files=ignore_files,
+            working_path=working_path,
+            target_file_exts=target_file_exts,
+            check_non_existent_file=check_non_existent_file,
+            listing_cache=listing_cache,
+        )
+    )
+
+
+def iter_paths_from_path(
+    path: str,
+    ignore_non_existent_files: bool = False,
+    ignore_files: bool = True,
+    working_path: str = os.getcwd(),
+    target_file_exts: Sequence[str] = (".sql",),
+    check_non_existent_file: bool = False,
+    listing_cache: Optional[DirectoryListingCache] = None,
+) -> Iterator[str]:
+    """Lazily yield sql file paths from a potentially ambiguous path string.
+
+    Paths are yielded in sorted order, as they are found. Any errors with
+    the path itself (e.g. it not existing) are raised when this is called
+    rather than when iterating, but errors found while walking the path
+    (e.g. in an ignore file) are raised while iterating.
+
     Here we also deal with the any ignore files file if present, whether as raw
     ignore files (`.sqlfluffignore`) or embedded in more general config files like
     `.sqlfluff` or `pyproject.toml`.
@@ -263,10 +506,13 @@ def paths_from_path(
     working path, the current behaviour is to search for the *lowest common path*
     of the two. This might be counterintuitive, but supports an appropriate solution
     for the dbt templater without having to additionally pass the project root path.
+
+    If a ``listing_cache`` is provided, then directory listings are served
+    from it where the directory is unchanged since it was last listed.
     """
     if not os.path.exists(path) and not check_non_existent_file:
         if ignore_non_existent_files:
-            return []
+            return iter([])
         else:
             raise SQLFluffUserError(
                 f"Specified path does not exist. Check it/they exist(s): {path}."
@@ -292,12 +538,12 @@ def paths_from_path(
 
     # Handle being passed an exact file first.
     if os.path.isfile(path) or check_non_existent_file:
-        return _process_exact_path(
-            path, working_path, lower_file_exts, outer_ignore_specs
+        return iter(
+            _process_exact_path(path, working_path, lower_file_exts, outer_ignore_specs)
         )
 
     # Otherwise, it's not an exact path and we're going to walk the path
     # progressively, processing ignore files as we go.
-    return sorted(
-        _iter_files_in_path(path, ignore_files, outer_ignore_specs, lower_file_exts)
+    return _iter_files_in_path(
+        path, ignore_files, outer_ignore_specs, lower_file_exts, listing_cache
     )
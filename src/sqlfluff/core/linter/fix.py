@@ -2,6 +2,7 @@
 
 import logging
 from collections import defaultdict
+from collections.abc import Hashable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
@@ -14,6 +15,10 @@ if TYPE_CHECKING:  # pragma: no cover
 
 linter_logger = logging.getLogger("sqlfluff.linter")
 
+# The key in the `__dict__` of segments which `apply_fixes` has left for
+# `validate_deferred` to check.
+_UNVALIDATED = "_unvalidated"
+
 
 @dataclass
 class AnchorEditInfo:
@@ -112,6 +117,7 @@ def apply_fixes(
     max_parse_depth: int,
     max_parse_nodes: int = 0,
     fix_even_unparsable: bool = False,
+    defer_validation: bool = False,
 ) -> tuple["BaseSegment", list["BaseSegment"], list["BaseSegment"], bool]:
     """Apply a dictionary of fixes to this segment.
 
@@ -144,6 +150,71 @@ def apply_fixes(
     sections, but will do so *without validation*. That means that the final
     element of the return value will always return `True`, so that we don't interrupt
     the validity checking of any outer (parsable) sections.
+
+    If `defer_validation` is True, then any segments which would be checked are
+    instead marked to be checked later by `validate_deferred` (e.g. once several
+    sets of fixes have been applied), and are assumed to be valid until then.
+
+    Only the segments which contain the anchors of the fixes are rebuilt. Any
+    others are shared with the new segment where their position is unchanged
+    (rather than copied), so the original segment and the new one may have
+    segments in common, and those belong to (i.e. have as their parent) the
+    latter.
+    """
+    return _apply_fixes(
+        segment,
+        dialect,
+        rule_code,
+        fixes,
+        max_parse_depth=max_parse_depth,
+        max_parse_nodes=max_parse_nodes,
+        fix_even_unparsable=fix_even_unparsable,
+        paths=_anchor_paths(segment, fixes),
+        defer_validation=defer_validation,
+    )
+
+
+def _anchor_paths(
+    segment: BaseSegment, fixes: dict[int, AnchorEditInfo]
+) -> Optional[set[int]]:
+    """The uuids of the segments within a segment which contain fix anchors.
+
+    Returns `None` if any of the anchors can't be found within the segment by
+    following references to parents (e.g. if it's a copy of a segment in the
+    tree, rather than the segment itself).
+    """
+    paths: set[int] = set()
+    for info in fixes.values():
+        for fix in info.fixes:
+            seg = fix.anchor
+            while seg is not segment:
+                parent = seg.get_parent()
+                if not parent:
+                    return None
+                seg = parent[0]
+                if seg.uuid in paths:
+                    # We've already been this way.
+                    break
+                paths.add(seg.uuid)
+    return paths
+
+
+def _apply_fixes(
+    segment: BaseSegment,
+    dialect: "Dialect",
+    rule_code: str,
+    fixes: dict[int, AnchorEditInfo],
+    max_parse_depth: int,
+    max_parse_nodes: int,
+    fix_even_unparsable: bool,
+    paths: Optional[set[int]],
+    defer_validation: bool,
+) -> tuple["BaseSegment", list["BaseSegment"], list["BaseSegment"], bool]:
+    """Apply fixes to a segment (see `apply_fixes`).
+
+    If `paths` is provided, only those segments (by uuid) contain anchors, so
+    only those are looked within. Otherwise all of them are, until all the
+    fixes have been applied.
     """
     if not fixes or segment.is_raw():
         return segment, [], [], True
@@ -232,8 +303,15 @@ def apply_fixes(
                 # segment on the end
                 seg_buffer.append(seg)
 
-    # Invalidate any caches
-    segment.invalidate_caches()
+    # NOTE: We don't invalidate the caches of the segment (or those within
+    # it), because it doesn't change. Instead, any of its children which
+    # don't contain fixes (and so don't change either) can be reused as they
+    # are, along with their caches.
+    reusable = {
+        id(seg)
+        for seg in segment.segments
+        if paths is not None and seg.uuid not in paths
+    }
 
     # If any fixes applied, do an intermediate reposition. When applying
     # fixes to children and then trying to reposition them, that recursion
@@ -243,27 +321,46 @@ def apply_fixes(
     if fixes_applied:
         assert segment.pos_marker
         seg_buffer = list(
-            segment._position_segments(tuple(seg_buffer), parent_pos=segment.pos_marker)
+            segment._position_segments(
+                tuple(seg_buffer), parent_pos=segment.pos_marker, reusable=reusable
+            )
         )
 
     # Then recurse (i.e. deal with the children) (Requeueing)
     seg_queue = seg_buffer
     seg_buffer = []
+    # Keep track of whether the content of the segment is unchanged (in which
+    # case, so is its fingerprint), if it has one to keep.
+    unchanged = not fixes_applied and "_fingerprint" in segment.__dict__
     for seg in seg_queue:
-        s, pre, post, validated = apply_fixes(
+        if id(seg) in reusable:
+            # There are no fixes within this segment.
+            seg_buffer.append(seg)
+            continue
+        s, pre, post, validated = _apply_fixes(
             seg,
             dialect,
             rule_code,
             fixes,
             max_parse_depth=max_parse_depth,
             max_parse_nodes=max_parse_nodes,
+            fix_even_unparsable=False,
+            paths=paths,
+            defer_validation=defer_validation,
         )
+        if s is not seg:
+            # This is a new segment, so nothing else has a reference to it.
+            reusable.add(id(s))
         # 'before' and 'after' will usually be empty. Only used when
         # lower-level fixes left 'seg' with non-code (usually
         # whitespace) segments as the first or last children. This is
         # generally not allowed (see the can_start_end_non_code field),
         # and these segments need to be "bubbled up" the tree.
         seg_buffer += pre + [s] + post
+        if unchanged and (
+            pre or post or (s is not seg and s.fingerprint != seg.fingerprint)
+        ):
+            unchanged = False
         # If we fail to validate a child segment, make sure to validate this
         # segment.
         if not validated:
@@ -298,7 +395,7 @@ def apply_fixes(
         new_seg = segment.__class__(
             # Realign the segments within
             segments=segment._position_segments(
-                tuple(seg_buffer), parent_pos=segment.pos_marker
+                tuple(seg_buffer), parent_pos=segment.pos_marker, reusable=reusable
             ),
             pos_marker=segment.pos_marker,
             # Pass through any additional kwargs
@@ -313,6 +410,12 @@ def apply_fixes(
             err.add_note(f" After applying fixes: {fixes_applied}.")
         raise err
 
+    if unchanged and not before and not after:
+        new_seg.__dict__["_fingerprint"] = segment.fingerprint
+    # If the segment was still to be checked, then so is the new one.
+    if _UNVALIDATED in segment.__dict__:
+        new_seg.__dict__[_UNVALIDATED] = True
+
     # Handle any necessary validation.
     if requires_validate:
         # Was it already unparsable?
@@ -326,10 +429,15 @@ def apply_fixes(
             else:
                 # It was already unparsable, but we're being asked to validate.
                 # Don't any apply fixes from within this region and just return the
-                # original segment.
+                # original segment (taking back any segments within it which
+                # we've shared with the new one).
+                segment.set_as_parent()
                 return segment, [], [], True
         # Otherwise only validate if there's a match_grammar. Otherwise we may get
         # strange results (for example with the BracketedSegment).
+        elif defer_validation and hasattr(new_seg, "match_grammar"):
+            new_seg.__dict__[_UNVALIDATED] = True
+            validated = True
         elif hasattr(new_seg, "match_grammar"):
             validated = new_seg.validate_segment_with_reparse(
                 dialect,
@@ -346,3 +454,169 @@ def apply_fixes(
     # a parent segment still being valid. If we get all the way up
     # to the root and it's still not valid - that's a problem.
     return new_seg, before, after, validated
+
+
+def validate_deferred(
+    tree: BaseSegment,
+    dialect: "Dialect",
+    max_parse_depth: int,
+    max_parse_nodes: int = 0,
+) -> bool:
+    """Check the segments of a tree which `apply_fixes` left to check later.
+
+    Each is re-parsed, and as in `apply_fixes`, if one doesn't parse then the
+    segments it's within are checked in turn, until one of them does. Unlike
+    in `apply_fixes`, we don't know which fixes to undo if none of them do,
+    so we don't try to work around unparsable sections.
+
+    Returns:
+        :obj:`bool`: Whether all of them are valid. Either way, they're no
+        longer marked to be checked.
+    """
+    unvalidated: list[BaseSegment] = []
+    # NOTE: We walk the tree with a stack, so deep trees are fine.
+    stack = [tree]
+    while stack:
+        segment = stack.pop()
+        if segment.__dict__.pop(_UNVALIDATED, False):
+            unvalidated.append(segment)
+        stack.extend(segment.segments)
+
+    for segment in unvalidated:
+        while not segment.validate_segment_with_reparse(
+            dialect,
+            max_parse_depth=max_parse_depth,
+            max_parse_nodes=max_parse_nodes,
+        ):
+            parent = segment.get_parent()
+            while parent and not hasattr(parent[0], "match_grammar"):
+                parent = parent[0].get_parent()
+            if not parent or "unparsable" in (
+                parent[0].descendant_type_set | parent[0].class_types
+            ):
+                linter_logger.debug("Deferred validation failed for %s", segment)
+                return False
+            segment = parent[0]
+    return True
+
+
+def region_key(segment: BaseSegment) -> tuple[Hashable, ...]:
+    """A key for the content and position of a segment.
+
+    Segments with the same key have the same class, the same raw (by its
+    fingerprint) and types within them, and the same position in the
+    source and templated file (but not necessarily the same working
+    position). Fingerprints are kept by segments which don't change when
+    fixing, so this doesn't need to walk the whole segment.
+    """
+    pos_marker = segment.pos_marker
+    return (
+        segment.__class__,
+        segment.fingerprint,
+        segment.descendant_type_set,
+        pos_marker.source_slice.start if pos_marker else None,
+        pos_marker.source_slice.stop if pos_marker else None,
+        pos_marker.templated_slice.start if pos_marker else None,
+        pos_marker.templated_slice.stop if pos_marker else None,
+    )
+
+
+def _region_idx(segment: BaseSegment, tree: BaseSegment) -> Optional[int]:
+    """The index of the child of `tree` which contains `segment`.
+
+    Returns `None` if the segment isn't a descendant of the tree.
+    """
+    while True:
+        parent = segment.get_parent()
+        if not parent:
+            return None
+        parent_segment, idx = parent
+        if parent_segment.segments[idx] is not segment:  # pragma: no cover
+            return None
+        if parent_segment is tree:
+            return idx
+        segment = parent_segment
+
+
+class FixRegions:
+    """The regions of a file each rule has found no fixes in.
+
+    In the fix loop, the rules are run again on the whole tree after any of
+    them changes it, but most of the tree is usually unchanged. The regions
+    of a tree are its top level segments (i.e. its statements), and we
+    record the regions each rule has been run on without finding any fixes.
+    If a region is unchanged, that rule would still find no fixes in it, so
+    the rule only needs to be run again on the regions which have changed.
+
+    This only holds for rules which look no further than the statement they
+    are evaluating (see `BaseRule.is_statement_local`). Regions are compared
+    by their :func:`region_key`, so a region which changes and then changes
+    back is still known to be clean.
+    """
+
+    def __init__(self) -> None:
+        # An id for each distinct region we've seen, by its key.
+        self._ids: dict[tuple[Hashable, ...], int] = {}
+        # The ids of the regions each rule has found no fixes in, by code.
+        self._clean: dict[str, set[int]] = defaultdict(set)
+        # The ids of the regions of the last tree we've seen.
+        self._tree: Optional[BaseSegment] = None
+        self._tree_ids: list[int] = []
+
+    def _region_ids(self, tree: BaseSegment) -> list[int]:
+        """The ids of the regions of a tree, in order.
+
+        Statements without any fixes are shared between versions of the
+        tree (see `apply_fixes`), so any which were in the last tree keep
+        their id without working out their key.
+        """
+        if tree is not self._tree:
+            last_ids: dict[int, int] = {}
+            if self._tree:
+                # NOTE: The last tree is still alive, so these object ids
+                # can't have been reused yet.
+                last_ids = {
+                    id(segment): region_id
+                    for segment, region_id in zip(self._tree.segments, self._tree_ids)
+                }
+            tree_ids = []
+            for segment in tree.segments:
+                region_id = last_ids.get(id(segment))
+                if region_id is None:
+                    region_id = self._ids.setdefault(
+                        region_key(segment), len(self._ids)
+                    )
+                tree_ids.append(region_id)
+            self._tree = tree
+            self._tree_ids = tree_ids
+        return self._tree_ids
+
+    def dirty_idxs(self, code: str, tree: BaseSegment) -> Optional[list[int]]:
+        """The indices of the regions of a tree which a rule needs to check.
+
+        Returns `None` if the rule needs to check all of them.
+        """
+        clean = self._clean.get(code)
+        if not clean:
+            return None
+        idxs = [
+            idx
+            for idx, region_id in enumerate(self._region_ids(tree))
+            if region_id not in clean
+        ]
+        return idxs if len(idxs) < len(tree.segments) else None
+
+    def record(self, code: str, tree: BaseSegment, fixes: list[LintFix]) -> None:
+        """Record the regions of a tree in which a rule found no fixes."""
+        fixed: set[int] = set()
+        for fix in fixes:
+            idx = _region_idx(fix.anchor, tree)
+            if idx is None:
+                # We don't know where this fix is, so don't record anything.
+                return
+            fixed.add(idx)
+        self._clean[code].update(
+            region_id
+            for idx, region_id in enumerate(self._region_ids(tree))
+            if idx not in fixed
+        )
@@ -0,0 +1,403 @@
+"""Helpers for incrementally re-parsing an edited file.
+
+When only a small part of a large file has changed (e.g. on each keystroke
+in an editor), most of the previous parse tree is still valid. These helpers
+work out which top level statements of the previous tree an edit touches,
+so that only those need to be lexed and parsed again, and then splice the
+newly parsed statements into the rest of the previous tree.
+
+The statements before an edit are shared between the previous tree and the
+new one, so when linting the new tree, rules which only look within each
+statement don't need to be run on them again.
+"""
+
+import logging
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from sqlfluff.core.config import FluffConfig
+from sqlfluff.core.errors import SQLLintError
+from sqlfluff.core.linter.linted_file import LintedFile
+from sqlfluff.core.parser import BaseSegment
+from sqlfluff.core.parser.markers import PositionMarker
+from sqlfluff.core.rules.noqa import IgnoreMask
+from sqlfluff.core.templaters import TemplatedFile
+
+linter_logger = logging.getLogger("sqlfluff.linter")
+
+# The top level segment types which can be re-parsed independently of
+# their neighbours. Non-code segments (whitespace, comments etc) are
+# also allowed. Files with any other top level structure (e.g. batches
+# in T-SQL) are always parsed in full.
+SPLICEABLE_TYPES = ("statement", "statement_terminator")
+# Statements shared from previous trees keep the templated file they were
+# parsed in. This is the number of those files we allow the statements of a
+# new tree to refer to, before they're rebased onto its templated file (so
+# that editing the same file many times doesn't keep every version alive).
+_MAX_SHARED_FILES = 4
+
+
+class EditRegion(NamedTuple):
+    """The section of a file to re-parse after an edit.
+
+    Args:
+        first_idx (int): The index of the first top level segment of the
+            previous tree to replace.
+        stop_idx (int): The index after the last top level segment of the
+            previous tree to replace.
+        source_start (int): The position in both the previous and the new
+            source at which the region starts.
+        old_stop (int): The position in the previous source at which the
+            region ends.
+        new_stop (int): The position in the new source at which the region
+            ends.
+    """
+
+    first_idx: int
+    stop_idx: int
+    source_start: int
+    old_stop: int
+    new_stop: int
+
+    @property
+    def offset(self) -> int:
+        """The change in length of the region (and therefore the file)."""
+        return self.new_stop - self.old_stop
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Find the length of the common prefix of two strings.
+
+    A binary search over slice comparisons is much faster than comparing
+    character by character in python for long strings.
+    """
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Find the length of the common suffix of two strings, up to a limit."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def find_edit(old_str: str, new_str: str) -> tuple[int, int, int]:
+    """Find the span of a string which has changed.
+
+    Returns:
+        A tuple of the start of the edit (in both strings), and the end of
+        the edit in the old string and then in the new string. For identical
+        strings this is a zero length span at the end of the string.
+    """
+    start = _common_prefix_length(old_str, new_str)
+    suffix = _common_suffix_length(
+        old_str, new_str, min(len(old_str), len(new_str)) - start
+    )
+    return start, len(old_str) - suffix, len(new_str) - suffix
+
+
+def is_untemplated(templated_file: TemplatedFile) -> bool:
+    """Check whether a templated file is identical to its source.
+
+    Incremental parsing works in source positions, and so is only possible
+    if templating hasn't changed anything.
+    """
+    return templated_file.templated_str == templated_file.source_str and (
+        templated_file.is_source_slice_literal(
+            slice(0, len(templated_file.source_str))
+        )
+    )
+
+
+def _is_spliceable(segment: BaseSegment) -> bool:
+    return segment.is_type(*SPLICEABLE_TYPES) or not segment.is_code
+
+
+def find_edit_region(
+    tree: BaseSegment, old_str: str, new_str: str
+) -> Optional[EditRegion]:
+    """Find the top level statements of a parsed file touched by an edit.
+
+    The region is widened to whole statements, from just after the previous
+    statement terminator to the next statement terminator (inclusive), so
+    that it can be parsed as a file in its own right.
+
+    Returns:
+        The region to re-parse, or None if the tree doesn't have a
+        structure which allows incremental parsing.
+    """
+    # The last segment should always be the end of file marker.
+    if not tree.segments or not tree.segments[-1].is_type("end_of_file"):
+        return None  # pragma: no cover
+    body = tree.segments[:-1]
+    if not all(_is_spliceable(seg) for seg in body):
+        linter_logger.debug("Incremental parse not possible for top level structure.")
+        return None
+
+    start, old_stop, new_stop = find_edit(old_str, new_str)
+
+    if not body:
+        # An empty file, so the whole thing is the region.
+        return EditRegion(0, 0, 0, old_stop, new_stop)
+
+    first_idx = len(body) - 1
+    for idx, seg in enumerate(body):
+        assert seg.pos_marker
+        if seg.pos_marker.source_slice.stop >= start:
+            first_idx = idx
+            break
+    last_idx = first_idx
+    for idx in range(first_idx + 1, len(body)):
+        assert body[idx].pos_marker
+        if body[idx].pos_marker.source_slice.start > old_stop:
+            break
+        last_idx = idx
+
+    # Widen to whole statements.
+    while first_idx > 0 and not body[first_idx - 1].is_type("statement_terminator"):
+        first_idx -= 1
+    while last_idx < len(body) - 1 and not body[last_idx].is_type(
+        "statement_terminator"
+    ):
+        last_idx += 1
+
+    first_pos = body[first_idx].pos_marker
+    last_pos = body[last_idx].pos_marker
+    assert first_pos and last_pos
+    region_start = first_pos.source_slice.start
+    region_stop = last_pos.source_slice.stop
+    return EditRegion(
+        first_idx,
+        last_idx + 1,
+        region_start,
+        region_stop,
+        region_stop + (new_stop - old_stop),
+    )
+
+
+def can_splice(region_tree: BaseSegment, to_end_of_file: bool) -> bool:
+    """Check whether a re-parsed region can be spliced into the previous tree.
+
+    The region must only contain whole statements, and unless it runs to the
+    end of the file, it must end with a statement terminator. If not, then the
+    edit has changed how the rest of the file would parse (e.g. by removing a
+    statement terminator or opening a quoted string), and the region can't be
+    parsed in isolation.
+    """
+    body = region_tree.segments[:-1]
+    if not all(_is_spliceable(seg) for seg in body):
+        return False
+    if to_end_of_file:
+        return True
+    last_code = next((seg for seg in reversed(body) if seg.is_code), None)
+    return bool(last_code and last_code.is_type("statement_terminator"))
+
+
+def _rebase_segment(
+    segment: BaseSegment,
+    offset: int,
+    templated_file: TemplatedFile,
+    parent: Optional[BaseSegment] = None,
+    parent_idx: Optional[int] = None,
+) -> BaseSegment:
+    """Copy a segment (and its children) to a new position in a new file.
+
+    This is equivalent to ``segment.copy()`` followed by replacing the
+    position marker of every descendant, but done in one pass and without
+    going through ``__setattr__`` (which is a significant saving for a large
+    tree). The original segment isn't modified.
+    """
+    cls = segment.__class__
+    new_segment = cls.__new__(cls)
+    new_dict = new_segment.__dict__
+    new_dict.update(segment.__dict__)
+    # Any cached values may depend on the old position or children.
+    for key in segment._cached_property_names:
+        if key in new_dict:
+            del new_dict[key]
+    pos_marker = segment.pos_marker
+    assert pos_marker
+    # NOTE: The file is untemplated, so the source and templated slices
+    # are the same, and can be one object (as `PositionMarker` would make
+    # them anyway).
+    new_slice = slice(
+        pos_marker.templated_slice.start + offset,
+        pos_marker.templated_slice.stop + offset,
+    )
+    new_dict["pos_marker"] = PositionMarker(new_slice, new_slice, templated_file)
+    if parent:
+        assert parent_idx is not None
+        new_segment.set_parent(parent, parent_idx)
+    if segment.segments:
+        new_dict["segments"] = tuple(
+            _rebase_segment(child, offset, templated_file, new_segment, idx)
+            for idx, child in enumerate(segment.segments)
+        )
+    return new_segment
+
+
+def splice_region(
+    tree: BaseSegment,
+    region: EditRegion,
+    region_tree: BaseSegment,
+    templated_file: TemplatedFile,
+) -> BaseSegment:
+    """Replace a region of a parsed file with a newly parsed one.
+
+    The top level segments before the region are unchanged, and the new
+    source is identical to the previous one up to the region, so they're
+    shared with the new tree (rather than copied), and keep their positions
+    in the previous templated file. Only the segments after the region are
+    copied, to move them to their new position.
+
+    Args:
+        tree (:obj:`BaseSegment`): The previous parsed file. Its segments
+            aren't modified, but those before the region belong to the
+            returned tree (i.e. it's their parent) afterwards.
+        region (:obj:`EditRegion`): The region of the previous file
+            which was re-parsed.
+        region_tree (:obj:`BaseSegment`): The file segment from parsing
+            the region on its own.
+        templated_file (:obj:`TemplatedFile`): The templated file for the
+            new source, which the positions of all new segments refer to.
+
+    Returns:
+        A new file segment for the whole of the new source.
+    """
+    shared_files: set[int] = set()
+    before: list[BaseSegment] = []
+    for seg in tree.segments[: region.first_idx]:
+        assert seg.pos_marker
+        file_id = id(seg.pos_marker.templated_file)
+        if file_id not in shared_files and len(shared_files) >= _MAX_SHARED_FILES:
+            before.append(_rebase_segment(seg, 0, templated_file))
+            continue
+        shared_files.add(file_id)
+        before.append(seg)
+    segments = (
+        *before,
+        *(
+            _rebase_segment(seg, region.source_start, templated_file)
+            # Drop the end of file marker from the region.
+            for seg in region_tree.segments[:-1]
+        ),
+        *(
+            _rebase_segment(seg, region.offset, templated_file)
+            for seg in tree.segments[region.stop_idx :]
+        ),
+    )
+    # NOTE: The position of the file is given, because its children may
+    # refer to different templated files.
+    return tree.__class__(
+        segments,
+        pos_marker=PositionMarker(
+            slice(0, len(templated_file.source_str)),
+            slice(0, len(templated_file.templated_str)),
+            templated_file,
+        ),
+        fname=getattr(tree, "file_path", None),
+    )
+
+
+class SharedLint(NamedTuple):
+    """The results of linting a previous tree which hold for a new one.
+
+    Args:
+        shared_count (int): The number of top level segments at the start of
+            the new tree which are shared with the previous tree.
+        violations (dict): The violations which statement local rules found
+            in those segments, by rule code.
+    """
+
+    shared_count: int
+    violations: dict[str, list[SQLLintError]]
+
+
+def _top_level_segment(segment: BaseSegment) -> Optional[BaseSegment]:
+    """The top level segment of the tree which a segment is in (if any)."""
+    parent = segment.get_parent()
+    while parent:
+        grandparent = parent[0].get_parent()
+        if not grandparent:
+            return segment
+        segment, parent = parent[0], grandparent
+    return None
+
+
+def find_shared_lint(
+    previous: LintedFile,
+    tree: BaseSegment,
+    ignore_mask: Optional[IgnoreMask],
+    config: FluffConfig,
+) -> Optional[SharedLint]:
+    """Find the results of linting a previous tree which hold for a new one.
+
+    Statement local rules (see `BaseRule.is_statement_local`) would find
+    the same violations as before in the statements the trees share (see
+    :func:`splice_region`), as long as the noqa comments which affect them
+    haven't changed either.
+
+    Args:
+        previous (:obj:`LintedFile`): The result of linting (but not fixing)
+            the previous tree, with the same rules and config.
+        tree (:obj:`BaseSegment`): The new tree.
+        ignore_mask (:obj:`IgnoreMask`): The noqa comments of the new tree.
+        config (:obj:`FluffConfig`): The config to lint with.
+
+    Returns:
+        The shared results, or None if the trees don't share any statements
+        (or the results can't be shared).
+    """
+    # Unused noqa comments are only found by linting every statement.
+    if not previous.tree or config.get("warn_unused_ignores"):
+        return None
+    shared_count = 0
+    # NOTE: The end of file marker is never shared.
+    for segment, previous_segment in zip(tree.segments[:-1], previous.tree.segments):
+        if segment is not previous_segment:
+            break
+        shared_count += 1
+    if not shared_count:
+        return None
+
+    # The noqa comments up to the last line of the shared statements must be
+    # the same, because the violations were filtered by them.
+    last_segment = tree.segments[shared_count - 1]
+    assert last_segment.pos_marker
+    last_line = last_segment.pos_marker.line_no + last_segment.raw.count("\n")
+    previous_mask = previous.ignore_mask
+    if (previous_mask is None) != (ignore_mask is None) or (
+        previous_mask
+        and ignore_mask
+        and previous_mask.directives_to_line(last_line)
+        != ignore_mask.directives_to_line(last_line)
+    ):
+        linter_logger.debug("Not sharing lint results, as noqa comments changed.")
+        return None
+
+    shared_ids = {id(segment) for segment in tree.segments[:shared_count]}
+    violations: dict[str, list[SQLLintError]] = defaultdict(list)
+    for violation in previous.violations:
+        if not (
+            isinstance(violation, SQLLintError) and violation.rule.is_statement_local
+        ):
+            continue
+        top_level_segment = _top_level_segment(violation.segment)
+        if not top_level_segment:
+            # We can't tell which statement this is in.
+            return None
+        if id(top_level_segment) in shared_ids:
+            violations[violation.rule_code()].append(violation)
+    return SharedLint(shared_count, dict(violations))
@@ -16,15 +16,19 @@ from sqlfluff.core.errors import (
 from sqlfluff.core.formatter import FormatterInterface
 from sqlfluff.core.linter.linted_file import TMP_PRS_ERROR_TYPES, LintedFile
 from sqlfluff.core.parser.segments.base import BaseSegment
+from sqlfluff.core.timing import RuleTimingSummary, TimingSummary
 
 
-class LintingRecord(TypedDict):
-    """A class to store the linted file statistics."""
-
+class _LintingRecordBase(TypedDict):
     filepath: str
     violations: list[SerializedObject]
     # Things like file length
     statistics: dict[str, int]
+
+
+class LintingRecord(_LintingRecordBase, total=False):
+    """A class to store the linted file statistics."""
+
     # Raw timings, in seconds, for both rules and steps
     timings: dict[str, float]
 
@@ -57,8 +61,10 @@ class LintedDir:
         self.num_tmp_prs_errors: int = 0
         self.num_unfixable_lint_errors: int = 0
         # Timing
-        self.step_timings: list[dict[str, float]] = []
-        self.rule_timings: list[tuple[str, str, float]] = []
+        self.step_timing_summary = TimingSummary()
+        self.rule_timing_summary = RuleTimingSummary()
+        self.templater_cache_stats: dict[str, int] = {}
+        self.fix_loop_stats: dict[str, int] = {}
 
     def add(self, file: LintedFile) -> None:
         """Add a file to this path.
@@ -78,25 +84,11 @@ class LintedDir:
         record: LintingRecord = {
             "filepath": file.path,
             "violations": violation_records,
-            "statistics": {
-                "source_chars": (
-                    len(file.templated_file.source_str) if file.templated_file else 0
-                ),
-                "templated_chars": (
-                    len(file.templated_file.templated_str) if file.templated_file else 0
-                ),
-                # These are all the segments in the tree
-                "segments": (
-                    file.tree.count_segments(raw_only=False) if file.tree else 0
-                ),
-                # These are just the "leaf" nodes of the tree
-                "raw_segments": (
-                    file.tree.count_segments(raw_only=True) if file.tree else 0
-                ),
-            },
-            "timings": {},
+            "statistics": file.get_statistics(),
         }
 
+        # Timings aren't known for results restored from the lint result
+        # cache, so leave them out rather than reporting zeros.
         if file.timings:
             record["timings"] = {
                 # linting, parsing, templating etc...
@@ -129,10 +121,16 @@ class LintedDir:
             fixable=False,
         )
 
-        # Append timings if present
+        # Add timings if present
         if file.timings:
-            self.step_timings.append(file.timings.step_timings)
-            self.rule_timings.extend(file.timings.rule_timings)
+            self.step_timing_summary.add(file.timings.step_timings)
+            self.rule_timing_summary.add(file.timings.rule_timings)
+            for key, count in file.timings.cache_stats.items():
+                self.templater_cache_stats[key] = (
+                    self.templater_cache_stats.get(key, 0) + count
+                )
+            for key, count in file.timings.loop_stats.items():
+                self.fix_loop_stats[key] = self.fix_loop_stats.get(key, 0) + count
 
         # Finally, if set to persist files, do that.
         if self.retain_files:
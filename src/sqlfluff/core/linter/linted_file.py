@@ -12,7 +12,7 @@ import stat
 import tempfile
 from collections import defaultdict
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import NamedTuple, Optional
 
 from sqlfluff.core.errors import (
@@ -45,6 +45,10 @@ class FileTimings:
     # given file we record each run and then we can post
     # process this as we wish later.
     rule_timings: list[tuple[str, str, float]]
+    # Hits and misses on caches kept by the templater.
+    cache_stats: dict[str, int] = field(default_factory=dict)
+    # The number of fix loops, and the volume of crawling in each.
+    loop_stats: dict[str, int] = field(default_factory=dict)
 
     def __repr__(self) -> str:  # pragma: no cover
         return "<FileTimings>"
@@ -74,6 +78,33 @@ class LintedFile(NamedTuple):
     templated_file: Optional[TemplatedFile]
     encoding: str
     source_patches: Optional[list[FixPatch]] = None
+    # Statistics which are known even where the templated file or tree
+    # aren't (e.g. files skipped because noqa comments disable all rules,
+    # or results restored from the lint result cache).
+    statistics: Optional[dict[str, int]] = None
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get the lengths of the file and the number of segments in its tree.
+
+        Values which can't be derived from the templated file or tree fall
+        back to those in `statistics`, or zero if not known there either.
+        """
+        statistics = {
+            "source_chars": 0,
+            "templated_chars": 0,
+            # These are all the segments in the tree
+            "segments": 0,
+            # These are just the "leaf" nodes of the tree
+            "raw_segments": 0,
+        }
+        statistics.update(self.statistics or {})
+        if self.templated_file:
+            statistics["source_chars"] = len(self.templated_file.source_str)
+            statistics["templated_chars"] = len(self.templated_file.templated_str)
+        if self.tree:
+            statistics["segments"] = self.tree.count_segments(raw_only=False)
+            statistics["raw_segments"] = self.tree.count_segments(raw_only=True)
+        return statistics
 
     def check_tuples(
         self, raise_on_non_linting_violations: bool = True
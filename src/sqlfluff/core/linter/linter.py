@@ -4,7 +4,8 @@ import fnmatch
 import logging
 import os
 import time
-from collections.abc import Iterator, Sequence
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
 from typing import TYPE_CHECKING, Optional, Union, cast
 
 import regex
@@ -21,14 +22,32 @@ from sqlfluff.core.errors import (
 )
 from sqlfluff.core.formatter import FormatterInterface
 from sqlfluff.core.helpers.file import get_encoding
+from sqlfluff.core.linter.cache import LintResultCache, config_fingerprint
+from sqlfluff.core.linter.changes import get_changed_lines, ignore_unchanged_lines
 from sqlfluff.core.linter.common import (
     ParsedString,
     ParsedVariant,
     RenderedFile,
     RuleTuple,
 )
-from sqlfluff.core.linter.discovery import paths_from_path
-from sqlfluff.core.linter.fix import apply_fixes, compute_anchor_edit_info
+from sqlfluff.core.linter.discovery import (
+    DirectoryListingCache,
+    iter_paths_from_path,
+    paths_from_path,
+)
+from sqlfluff.core.linter.fix import (
+    FixRegions,
+    apply_fixes,
+    compute_anchor_edit_info,
+    validate_deferred,
+)
+from sqlfluff.core.linter.incremental import (
+    can_splice,
+    find_edit_region,
+    find_shared_lint,
+    is_untemplated,
+    splice_region,
+)
 from sqlfluff.core.linter.linted_dir import LintedDir
 from sqlfluff.core.linter.linted_file import (
     TMP_PRS_ERROR_TYPES,
@@ -37,22 +56,29 @@ from sqlfluff.core.linter.linted_file import (
 )
 from sqlfluff.core.linter.linting_result import LintingResult
 from sqlfluff.core.linter.patch import generate_source_patches, merge_source_patches
-from sqlfluff.core.parser import Lexer, Parser
-from sqlfluff.core.parser.segments.base import BaseSegment, SourceFix
+from sqlfluff.core.parser import Lexer, Parser, TokenStore
+from sqlfluff.core.parser.segments.base import BaseSegment
+from sqlfluff.core.parser.segments.fingerprint import Fingerprint
 from sqlfluff.core.rules import BaseRule, RulePack, get_ruleset
+from sqlfluff.core.rules.dispatch import can_dispatch, crawl_regions, crawl_rules
 from sqlfluff.core.rules.fix import LintFix
 from sqlfluff.core.rules.noqa import IgnoreMask
+from sqlfluff.core.templaters import TemplatedFile
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.dialects import Dialect
+    from sqlfluff.core.linter.runner import WorkerPool
     from sqlfluff.core.parser.segments.meta import MetaSegment
-    from sqlfluff.core.templaters import RawTemplater, TemplatedFile
+    from sqlfluff.core.templaters import RawTemplater
 
 
 RuleTimingsType = list[tuple[str, str, float]]
 
 # Instantiate the linter logger
 linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+# Whether we've logged that `parse_processes` doesn't apply to the Rust
+# parser, so that it's only logged once.
+_logged_parse_processes_unused = False
 
 
 class Linter:
@@ -122,8 +148,12 @@ class Linter:
     def load_raw_file_and_config(
         fname: str, root_config: FluffConfig
     ) -> tuple[str, FluffConfig, str]:
-        """Load a raw file and the associated config."""
-        file_config = root_config.make_child_from_path(fname)
+        """Load a raw file and the associated config.
+
+        NOTE: Files in the same directory, without any inline config, share
+        the same config object, so it must not be modified.
+        """
+        file_config = root_config.get_child_from_path(fname)
         config_encoding: str = file_config.get("encoding", default="autodetect")
         encoding = get_encoding(fname=fname, config_encoding=config_encoding)
         # Check file size before loading.
@@ -157,13 +187,17 @@ class Linter:
         with open(fname, encoding=encoding, errors="backslashreplace") as target_file:
             raw_file = target_file.read()
         # Scan the raw file for config commands.
-        file_config.process_raw_file_for_config(raw_file, fname)
+        file_config = file_config.with_inline_config(raw_file, fname)
         # Return the raw file and config
         return raw_file, file_config, encoding
 
     @staticmethod
     def _normalise_newlines(string: str) -> str:
         """Normalise newlines to unix-style line endings."""
+        # Most files have none to normalise, so keep the same string for those
+        # (e.g. so that it's found in the cache of `scan_source`).
+        if "\r" not in string:
+            return string
         return regex.sub(r"\r\n|\r", "\n", string)
 
     @staticmethod
@@ -177,13 +211,16 @@ class Linter:
         lexer = Lexer(config=config)
         # Lex the file and log any problems
         try:
-            segments, lex_vs = lexer.lex(templated_file)
+            # NOTE: The segments for the tokens are created lazily (as the
+            # parser needs them), so we use the store where we can.
+            tokens, lex_vs = lexer.lex_tokens(templated_file)
             # NOTE: There will always be segments, even if it's
             # just an end of file marker.
-            assert segments, "The token sequence should never be empty."
+            assert tokens, "The token sequence should never be empty."
             # We might just get the violations as a list
             violations += lex_vs
-            linter_logger.info("Lexed segments: %s", [seg.raw for seg in segments])
+            if linter_logger.isEnabledFor(logging.INFO):
+                linter_logger.info("Lexed segments: %s", tokens.raws())
         except SQLLexError as err:  # pragma: no cover
             linter_logger.info("LEXING FAILED! (%s): %s", templated_file.fname, err)
             violations.append(err)
@@ -199,7 +236,10 @@ class Linter:
         templating_blocks_indent = bool(templating_blocks_indent)
         # If we're forcing it through we don't check.
         if templating_blocks_indent and not force_block_indent:
-            indent_balance = sum(getattr(elem, "indent_val", 0) for elem in segments)
+            indent_balance = sum(
+                getattr(segment_class, "indent_val", 0) * count
+                for segment_class, count in tokens.segment_class_counts().items()
+            )
             if indent_balance != 0:  # pragma: no cover
                 linter_logger.debug(
                     "Indent balance test failed for %r. Template indents will not be "
@@ -209,10 +249,14 @@ class Linter:
                 # Don't enable the templating blocks.
                 templating_blocks_indent = False
 
+        if templating_blocks_indent:
+            # There are no indents to remove.
+            return tokens, violations
+
         # The file will have been lexed without config, so check all indents
         # are enabled.
         new_segments = []
-        for segment in segments:
+        for segment in tokens:
             if segment.is_meta:
                 meta_segment = cast("MetaSegment", segment)
                 if meta_segment.indent_val != 0:
@@ -224,6 +268,20 @@ class Linter:
         # Return new buffer
         return new_segments, violations
 
+    @staticmethod
+    def _log_parse_processes_unused(config: FluffConfig) -> None:
+        """Log (once) if `parse_processes` is set, but can't apply."""
+        global _logged_parse_processes_unused
+        if _logged_parse_processes_unused or config.get("parse_processes") == 1:
+            return
+        linter_logger.warning(
+            "parse_processes is set to %s, but only applies to the Python "
+            "parser, and the Rust parser is in use. Set use_rust_parser to "
+            "False to parse large files in parallel.",
+            config.get("parse_processes"),
+        )
+        _logged_parse_processes_unused = True
+
     @staticmethod
     def _parse_tokens(
         tokens: Sequence[BaseSegment],
@@ -268,8 +326,9 @@ class Linter:
             from sqlfluff.core.parser.rust_parser import RustParser
 
             if RustParser is not None:
-                parser: Union[Parser, "RustParser"] = RustParser(config=config)
+                parser: Union[Parser, "RustParser"] = RustParser.from_config(config)
                 linter_logger.info("Using Rust parser (experimental)")
+                Linter._log_parse_processes_unused(config)
             else:
                 if warn_if_unavailable:
                     linter_logger.warning(
@@ -281,13 +340,23 @@ class Linter:
         else:
             parser = Parser(config=config)
         violations = []
+        # Regardless of how the sequence was passed in, we should coerce it
+        # to a tuple here, before we head deeper into the parsing process.
+        # The exception is a store of tokens from the Rust lexer, which the
+        # Rust parser uses directly.
+        segments: Union[tuple[BaseSegment, ...], TokenStore]
+        if (
+            isinstance(tokens, TokenStore)
+            and tokens.rs_tokens is not None
+            and not isinstance(parser, Parser)
+        ):
+            segments = tokens
+        else:
+            segments = tuple(tokens)
         # Parse the file and log any problems
         try:
             parsed: Optional[BaseSegment] = parser.parse(
-                # Regardless of how the sequence was passed in, we should
-                # coerce it to a tuple here, before we head deeper into
-                # the parsing process.
-                tuple(tokens),
+                segments,
                 fname=fname,
                 parse_statistics=parse_statistics,
             )
@@ -451,6 +520,7 @@ class Linter:
             config=rendered.config,
             fname=rendered.fname,
             source_str=rendered.source_str,
+            cache_stats=rendered.cache_stats,
         )
 
     @classmethod
@@ -463,8 +533,19 @@ class Linter:
         fname: Optional[str] = None,
         templated_file: Optional["TemplatedFile"] = None,
         formatter: Optional[FormatterInterface] = None,
+        loop_stats: Optional[dict[str, int]] = None,
+        previous: Optional[LintedFile] = None,
     ) -> tuple[BaseSegment, list[SQLBaseError], Optional[IgnoreMask], RuleTimingsType]:
-        """Lint and optionally fix a tree object."""
+        """Lint and optionally fix a tree object.
+
+        If `loop_stats` is given when fixing, the number of linter loops, and
+        the number of rules run and regions crawled in each, are added to it.
+
+        If `previous` is given when linting, it's the result of linting a
+        previous version of the tree, which shares statements with it (see
+        `parse_string_incremental`). Statement local rules are then only run
+        on the statements which aren't shared.
+        """
         # Keep track of the linting errors on the very first linter pass. The
         # list of issues output by "lint" and "fix" only includes issues present
         # in the initial SQL code, EXCLUDING any issues that may be created by
@@ -472,10 +553,21 @@ class Linter:
         initial_linting_errors = []
         # A placeholder for the fixes we had on the previous loop
         last_fixes: Optional[list[LintFix]] = None
-        # Keep a set of previous versions to catch infinite loops.
-        previous_versions: set[tuple[str, tuple["SourceFix", ...]]] = {(tree.raw, ())}
+        # Keep a set of (the fingerprints of) previous versions to catch
+        # infinite loops.
+        previous_versions: set[Fingerprint] = {tree.fingerprint}
         # Keep a buffer for recording rule timings.
         rule_timings: RuleTimingsType = []
+        # When fixing, keep track of which statements each rule has already
+        # been run on, so that it's only run again on those which change.
+        fix_regions = FixRegions() if fix else None
+        # When fixing, the fixes are only checked (by re-parsing the segments
+        # they change) at the end of each loop, rather than as each rule's
+        # fixes are applied. If they're not valid, then the loop is run again
+        # checking each rule's fixes as they're applied.
+        defer_validation = fix
+        if loop_stats is None:
+            loop_stats = {}
 
         # If we are fixing then we want to loop up to the runaway_limit, otherwise just
         # once for linting.
@@ -498,7 +590,26 @@ class Linter:
         else:
             ignore_mask = None
 
+        shared_lint = (
+            find_shared_lint(previous, tree, ignore_mask, config)
+            if previous and not fix
+            else None
+        )
+        if shared_lint:
+            linter_logger.info(
+                "Reusing lint results of statement local rules for %s of %s "
+                "top level segments.",
+                shared_lint.shared_count,
+                len(tree.segments),
+            )
+
         save_tree = tree
+        if fix:
+            # Each version of the tree shares any segments which haven't changed
+            # with the next (see `apply_fixes`), so start with a copy to leave
+            # the original as it is.
+            tree = tree.copy()
+
         # There are two phases of rule running.
         # 1. The main loop is for most rules. These rules are assumed to
         # interact and cause a cascade of fixes requiring multiple passes.
@@ -517,7 +628,8 @@ class Linter:
                 ]
             else:
                 rules_this_phase = rule_pack.rules
-            for loop in range(loop_limit if phase == "main" else 2):
+            loop = 0
+            while loop < (loop_limit if phase == "main" else 2):
 
                 def is_first_linter_pass() -> bool:
                     return phase == phases[0] and loop == 0
@@ -528,11 +640,58 @@ class Linter:
                     f"\n\nEntering linter phase {phase}, loop {loop + 1}/{loop_limit}\n"
                 )
                 changed = False
+                loop_key = f"{phase} loop {loop + 1}"
+                if fix:
+                    loop_stats["loops"] = loop_stats.get("loops", 0) + 1
+                # Where to go back to if the fixes in this loop aren't valid.
+                rewind = (
+                    tree,
+                    set(previous_versions),
+                    last_fixes,
+                    len(initial_linting_errors),
+                )
 
                 if is_first_linter_pass():
                     # In order to compute initial_linting_errors correctly, need
                     # to run all rules on the first loop of the main phase.
                     rules_this_phase = rule_pack.rules
+                # When only linting, the rules are run together in a single
+                # walk of the tree where possible (see `crawl_rules`).
+                dispatched = (
+                    {}
+                    if fix
+                    else crawl_rules(
+                        [
+                            rule
+                            for rule in rules_this_phase
+                            if not (shared_lint and rule.is_statement_local)
+                        ],
+                        tree,
+                        dialect=config.get("dialect_obj"),
+                        templated_file=templated_file,
+                        ignore_mask=ignore_mask,
+                        fname=fname,
+                        config=config,
+                    )
+                )
+                if shared_lint:
+                    # Statement local rules would find the same as before in
+                    # the shared statements, so are only run on the rest.
+                    unshared = crawl_rules(
+                        [rule for rule in rules_this_phase if rule.is_statement_local],
+                        tree,
+                        dialect=config.get("dialect_obj"),
+                        templated_file=templated_file,
+                        ignore_mask=ignore_mask,
+                        fname=fname,
+                        config=config,
+                        child_idxs=range(shared_lint.shared_count, len(tree.segments)),
+                    )
+                    for code, (linting_errors, duration) in unshared.items():
+                        dispatched[code] = (
+                            shared_lint.violations.get(code, []) + linting_errors,
+                            duration,
+                        )
                 progress_bar_crawler = tqdm(
                     rules_this_phase,
                     desc="lint by rules",
@@ -554,22 +713,67 @@ class Linter:
                         continue
 
                     progress_bar_crawler.set_description(f"rule {crawler.code}")
+                    if crawler.code in dispatched:
+                        linting_errors, duration = dispatched[crawler.code]
+                        initial_linting_errors += linting_errors
+                        rule_timings.append((crawler.code, crawler.name, duration))
+                        continue
                     t0 = time.monotonic()
 
+                    # Rules which only look within each statement only need to
+                    # be run on the statements which they haven't already been
+                    # run on without finding any fixes.
+                    rule_regions = (
+                        fix_regions
+                        if crawler.is_statement_local
+                        and can_dispatch(crawler, tree, config)
+                        else None
+                    )
+                    child_idxs = (
+                        rule_regions.dirty_idxs(crawler.code, tree)
+                        if rule_regions
+                        else None
+                    )
+                    if fix:
+                        regions = len(tree.segments)
+                        crawled = regions if child_idxs is None else len(child_idxs)
+                        for stat, count in (
+                            ("rules", 1),
+                            ("regions crawled", crawled),
+                            ("regions skipped", regions - crawled),
+                        ):
+                            key = f"{loop_key} {stat}"
+                            loop_stats[key] = loop_stats.get(key, 0) + count
+
                     # fixes should be a dict {} with keys edit, delete, create
                     # delete is just a list of segments to delete
                     # edit and create are list of tuples. The first element is
                     # the "anchor", the segment to look for either to edit or to
                     # insert BEFORE. The second is the element to insert or create.
-                    linting_errors, _, fixes, _ = crawler.crawl(
-                        tree,
-                        dialect=config.get("dialect_obj"),
-                        fix=fix,
-                        templated_file=templated_file,
-                        ignore_mask=ignore_mask,
-                        fname=fname,
-                        config=config,
-                    )
+                    if child_idxs is None:
+                        linting_errors, _, fixes, _ = crawler.crawl(
+                            tree,
+                            dialect=config.get("dialect_obj"),
+                            fix=fix,
+                            templated_file=templated_file,
+                            ignore_mask=ignore_mask,
+                            fname=fname,
+                            config=config,
+                        )
+                    else:
+                        linting_errors, fixes = crawl_regions(
+                            crawler,
+                            tree,
+                            child_idxs,
+                            dialect=config.get("dialect_obj"),
+                            fix=fix,
+                            templated_file=templated_file,
+                            ignore_mask=ignore_mask,
+                            fname=fname,
+                            config=config,
+                        )
+                    if rule_regions:
+                        rule_regions.record(crawler.code, tree, fixes)
                     if is_first_linter_pass():
                         initial_linting_errors += linting_errors
 
@@ -618,18 +822,17 @@ class Linter:
                                 fix_even_unparsable=config.get("fix_even_unparsable"),
                                 max_parse_depth=config.get("max_parse_depth"),
                                 max_parse_nodes=config.get("max_parse_nodes"),
+                                defer_validation=defer_validation,
                             )
 
-                            # Check for infinite loops. We use a combination of the
-                            # fixed templated file and the list of source fixes to
-                            # apply.
-                            loop_check_tuple = (
-                                new_tree.raw,
-                                tuple(new_tree.source_fixes),
-                            )
+                            # Check for infinite loops. We use a fingerprint of
+                            # both the fixed templated file and the list of source
+                            # fixes to apply. Only the segments which the fixes
+                            # changed need a new fingerprint.
+                            loop_check = new_tree.fingerprint
                             # Was anything actually applied? If not, then the fixes we
                             # had cannot be safely applied and we should stop trying.
-                            if loop_check_tuple == (tree.raw, tuple(tree.source_fixes)):
+                            if loop_check == tree.fingerprint:
                                 linter_logger.debug(
                                     f"Fixes for {crawler.code} could not be safely be "
                                     "applied. Likely due to initially unparsable file."
@@ -643,11 +846,11 @@ class Linter:
                                     "report this as a bug with a minimal query "
                                     "which demonstrates this warning."
                                 )
-                            elif loop_check_tuple not in previous_versions:
+                            elif loop_check not in previous_versions:
                                 # We've not seen this version of the file so
                                 # far. Continue.
                                 tree = new_tree
-                                previous_versions.add(loop_check_tuple)
+                                previous_versions.add(loop_check)
                                 changed = True
                                 continue
                             else:
@@ -655,12 +858,45 @@ class Linter:
                                 # which we've seen before. We're in a loop, so
                                 # we want to stop.
                                 cls._warn_unfixable(crawler.code)
+                            # We're keeping the current tree, so take back any
+                            # segments it shared with the new one.
+                            tree.set_as_parent()
 
                     # Record rule timing
                     rule_timings.append(
                         (crawler.code, crawler.name, time.monotonic() - t0)
                     )
 
+                if (
+                    defer_validation
+                    and changed
+                    and not validate_deferred(
+                        tree,
+                        config.get("dialect_obj"),
+                        max_parse_depth=config.get("max_parse_depth"),
+                        max_parse_nodes=config.get("max_parse_nodes"),
+                    )
+                ):
+                    # Some of the fixes in this loop result in an invalid file,
+                    # but we don't know which. Go back to the start of the loop
+                    # and run it again, checking each rule's fixes as they're
+                    # applied so that those can be skipped.
+                    linter_logger.info(
+                        f"Fixes in {phase} loop {loop + 1} are not valid. Running "
+                        "it again, checking the fixes of each rule."
+                    )
+                    tree, previous_versions, last_fixes, error_count = rewind
+                    del initial_linting_errors[error_count:]
+                    # The later versions of the tree shared segments with this
+                    # one, so take them back. The regions the rules found no
+                    # fixes in may also have included errors (which we need
+                    # again on the first loop), so forget those too.
+                    tree.set_as_parent()
+                    fix_regions = FixRegions()
+                    defer_validation = False
+                    continue
+                defer_validation = fix
+
                 if fix and not changed:
                     # We did not change the file. Either the file is clean (no
                     # fixes), or any fixes which are present will take us back
@@ -670,6 +906,7 @@ class Linter:
                         f"achieved after {loop}/{loop_limit} loops."
                     )
                     break
+                loop += 1
             else:
                 if fix:
                     # The linter loop hit the limit before reaching a stable point
@@ -715,12 +952,20 @@ class Linter:
         fix: bool = False,
         formatter: Optional[FormatterInterface] = None,
         encoding: str = "utf8",
+        previous: Optional[LintedFile] = None,
     ) -> LintedFile:
-        """Lint a ParsedString and return a LintedFile."""
+        """Lint a ParsedString and return a LintedFile.
+
+        For a string from `parse_string_incremental`, pass the result of
+        linting the previous version (with the same rules) as `previous`,
+        so that rules which only look within each statement aren't run again
+        on the statements before the edit (see `lint_fix_parsed`).
+        """
         time_dict = parsed.time_dict
         tree: Optional[BaseSegment] = None
         templated_file: Optional[TemplatedFile] = None
         merged_source_patches = None
+        loop_stats: dict[str, int] = {}
         t0 = time.monotonic()
 
         root_variant = parsed.root_variant()
@@ -761,6 +1006,8 @@ class Linter:
                 fname=parsed.fname,
                 templated_file=root_variant.templated_file,
                 formatter=formatter,
+                loop_stats=loop_stats,
+                previous=previous,
             )
 
             # Set legacy variables for the return payload.
@@ -841,17 +1088,27 @@ class Linter:
         for violation in violations:
             violation.ignore_if_in(parsed.config.get("ignore"))
             violation.warning_if_in(parsed.config.get("warnings"))
+        # If only reporting on changed lines, ignore violations on the rest.
+        # NOTE: Fixes have already been applied, so this is only for linting.
+        changed_since = parsed.config.get("changed_since")
+        if changed_since and parsed.config.get("changed_lines_only") and not fix:
+            line_ranges = get_changed_lines(changed_since, os.getcwd()).get(
+                os.path.realpath(parsed.fname)
+            )
+            if line_ranges is not None:
+                ignore_unchanged_lines(violations, line_ranges)
 
         linted_file = LintedFile(
             parsed.fname,
             # Deduplicate violations
             LintedFile.deduplicate_in_source_space(violations),
-            FileTimings(time_dict, rule_timings),
+            FileTimings(time_dict, rule_timings, parsed.cache_stats, loop_stats),
             tree,
             ignore_mask=ignore_mask,
             templated_file=templated_file,
             encoding=encoding,
             source_patches=merged_source_patches,
+            statistics={"source_chars": len(parsed.source_str)},
         )
 
         # This is the main command line output from linting.
@@ -948,6 +1205,7 @@ class Linter:
             )
 
         variant_limit = config.get("render_variant_limit")
+        cache_stats_before = self.templater.get_cache_stats()
         templated_variants: list[TemplatedFile] = []
         templater_violations: list[SQLTemplaterError] = []
 
@@ -977,6 +1235,11 @@ class Linter:
 
         # Record time
         time_dict = {"templating": time.monotonic() - t0}
+        # Record any use of the templater's caches while rendering this file.
+        cache_stats = {
+            key: count - cache_stats_before.get(key, 0)
+            for key, count in self.templater.get_cache_stats().items()
+        }
 
         return RenderedFile(
             templated_variants,
@@ -986,15 +1249,60 @@ class Linter:
             fname,
             encoding,
             in_str,
+            cache_stats,
         )
 
-    def render_file(self, fname: str, root_config: FluffConfig) -> RenderedFile:
-        """Load and render a file with relevant config."""
+    def render_file(
+        self,
+        fname: str,
+        root_config: FluffConfig,
+        loaded: Optional[tuple[str, FluffConfig, str]] = None,
+    ) -> RenderedFile:
+        """Load and render a file with relevant config.
+
+        If the file has already been loaded (by `load_raw_file_and_config`),
+        then pass the result as `loaded` to avoid loading it again.
+
+        If noqa comments disable all rules throughout the file, then it isn't
+        rendered (and so won't be parsed or linted), as there can't be any
+        violations to report.
+        """
         # Load the raw file.
-        raw_file, config, encoding = self.load_raw_file_and_config(fname, root_config)
+        raw_file, config, encoding = loaded or self.load_raw_file_and_config(
+            fname, root_config
+        )
+        if self._noqa_disables_all(raw_file, config):
+            linter_logger.info("Skipping %s, as noqa disables all rules.", fname)
+            return RenderedFile(
+                [],
+                [],
+                config,
+                {"templating": 0.0},
+                fname,
+                encoding,
+                self._normalise_newlines(raw_file),
+            )
         # Render the file
         return self.render_string(raw_file, fname, config, encoding)
 
+    def _noqa_disables_all(self, raw_str: str, config: FluffConfig) -> bool:
+        """Whether noqa comments disable all rules throughout a raw file.
+
+        If noqa comments are (even partly) disabled, or unused ones are to be
+        reported, then we need to lint the file to know. We also need to if
+        templating could add comments which enable rules again.
+        """
+        if (
+            config.get("disable_noqa")
+            or config.get("disable_noqa_except")
+            or config.get("warn_unused_ignores")
+        ):
+            return False
+        if self.templater.may_add_comments(raw_str):
+            return False
+        dialect = config.get("dialect_obj")
+        return bool(dialect) and IgnoreMask.source_disables_all(raw_str, dialect)
+
     def parse_string(
         self,
         in_str: str,
@@ -1024,6 +1332,112 @@ class Linter:
 
         return self.parse_rendered(rendered, parse_statistics=parse_statistics)
 
+    def parse_string_incremental(
+        self,
+        previous: ParsedString,
+        in_str: str,
+        config: Optional[FluffConfig] = None,
+        encoding: str = "utf-8",
+    ) -> ParsedString:
+        """Parse an edited version of a previously parsed string.
+
+        This is intended for editor integrations, which parse and lint the
+        same file again after every edit. Only the top level statements
+        touched by the edit are lexed and parsed again, and the rest of the
+        tree from ``previous`` is reused. The statements before the edit are
+        shared with the new tree, so ``previous`` shouldn't be used for
+        anything else afterwards. The result can be linted with
+        :meth:`lint_parsed` as usual, and if the result of linting
+        ``previous`` is passed to that too, then rules which only look within
+        each statement are only run on the statements from the edit onwards.
+
+        If the file can't be parsed incrementally (e.g. because it contains
+        templated sections, the previous parse had errors, or the edit
+        touches inline config directives), then it is parsed in full.
+        ``config`` is only used in that case, otherwise the config from
+        ``previous`` is reused.
+        """
+        fname = previous.fname
+        in_str = self._normalise_newlines(in_str)
+
+        def _full_parse() -> ParsedString:
+            linter_logger.info("Incremental parse not possible for %s", fname)
+            return self.parse_string(in_str, fname, config=config, encoding=encoding)
+
+        root_variant = previous.root_variant()
+        if (
+            not root_variant
+            or len(previous.parsed_variants) != 1
+            or previous.violations
+            or not is_untemplated(root_variant.templated_file)
+        ):
+            return _full_parse()
+        assert root_variant.tree
+        region = find_edit_region(root_variant.tree, previous.source_str, in_str)
+        if not region:
+            return _full_parse()
+        region_str = in_str[region.source_start : region.new_stop]
+        # Inline config directives would change the config for the whole file.
+        if (
+            "sqlfluff:" in region_str
+            or "sqlfluff:"
+            in previous.source_str[region.source_start : region.old_stop]
+        ):
+            return _full_parse()
+
+        if self.formatter:
+            self.formatter.dispatch_template_header(fname, self.config, config)
+        # Render the whole file, because the templater decides whether any
+        # of it is templated.
+        rendered = self.render_string(in_str, fname, previous.config, encoding)
+        if (
+            len(rendered.templated_variants) != 1
+            or rendered.templater_violations
+            or not is_untemplated(rendered.templated_variants[0])
+        ):
+            return self.parse_rendered(rendered)
+        templated_file = rendered.templated_variants[0]
+
+        if self.formatter:
+            self.formatter.dispatch_parse_header(fname)
+        t0 = time.monotonic()
+        tokens, lex_errors = self._lex_templated_file(
+            TemplatedFile(region_str, fname=fname), previous.config
+        )
+        t1 = time.monotonic()
+        region_tree: Optional[BaseSegment] = None
+        if tokens and not lex_errors:
+            region_tree, parse_errors = self._parse_tokens(
+                tokens, previous.config, fname=fname
+            )
+            if parse_errors:
+                region_tree = None
+        if not region_tree or not can_splice(
+            region_tree,
+            to_end_of_file=region.stop_idx == len(root_variant.tree.segments) - 1,
+        ):
+            return self.parse_rendered(rendered)
+        tree = splice_region(root_variant.tree, region, region_tree, templated_file)
+        linter_logger.info(
+            "Incremental parse of %s re-parsed %s of %s characters.",
+            fname,
+            len(region_str),
+            len(in_str),
+        )
+        return ParsedString(
+            parsed_variants=[ParsedVariant(templated_file, tree, [], [])],
+            templating_violations=[],
+            time_dict={
+                **rendered.time_dict,
+                "lexing": t1 - t0,
+                "parsing": time.monotonic() - t1,
+            },
+            config=previous.config,
+            fname=fname,
+            source_str=in_str,
+            cache_stats=rendered.cache_stats,
+        )
+
     def fix(
         self,
         tree: BaseSegment,
@@ -1149,37 +1563,129 @@ class Linter:
         fixed_file_suffix: str = "",
         fix_even_unparsable: bool = False,
         retain_files: bool = True,
+        use_cache: bool = True,
+        worker_pool: Optional["WorkerPool"] = None,
     ) -> LintingResult:
-        """Lint an iterable of paths."""
+        """Lint an iterable of paths.
+
+        If ``use_cache`` is True (the default) and the ``cache_dir`` config
+        value is set, then results for unchanged files are served from the
+        lint result cache (see :class:`LintResultCache`) and new results
+        are stored in it. Listings of unchanged directories are also reused
+        when finding files (see :class:`DirectoryListingCache`).
+
+        If the ``changed_since`` config value is set, then only files which
+        have changed since that git ref are linted.
+
+        If a ``worker_pool`` is provided, files are linted using its
+        (already running) workers rather than a new set of processes, and
+        ``processes`` is ignored.
+
+        If ``retain_files`` is False, then linting is streamed: files are
+        linted as they are found rather than after finding them all, and
+        only compact records of each file's results are kept (not the
+        parsed trees). This bounds the memory used for large projects.
+        """
         # If no paths specified - assume local
         if not paths:  # pragma: no cover
             paths = (os.getcwd(),)
         # Set up the result to hold what we get back
         result = LintingResult()
 
-        expanded_paths: list[str] = []
-        expanded_path_to_linted_dir = {}
         sql_exts = self.config.get("sql_file_exts", default=".sql").lower().split(",")
-
+        # The LintedDir to add the result for each file to, for each file
+        # which has been found but not yet linted.
+        pending_linted_dirs: dict[str, list[LintedDir]] = {}
+        path_iterators: list[tuple[LintedDir, Iterator[str]]] = []
+        # Reuse directory listings from previous runs if the cache is enabled.
+        listing_cache = (
+            DirectoryListingCache.from_config(self.config) if use_cache else None
+        )
         for path in paths:
             linted_dir = LintedDir(path, retain_files=retain_files)
             result.add(linted_dir)
-            for fname in paths_from_path(
-                path,
-                ignore_non_existent_files=ignore_non_existent_files,
-                ignore_files=ignore_files,
-                target_file_exts=sql_exts,
-            ):
-                expanded_paths.append(fname)
-                expanded_path_to_linted_dir[fname] = linted_dir
+            # NOTE: Any problems with the path itself are raised here,
+            # before any linting starts.
+            path_iterators.append(
+                (
+                    linted_dir,
+                    iter_paths_from_path(
+                        path,
+                        ignore_non_existent_files=ignore_non_existent_files,
+                        ignore_files=ignore_files,
+                        target_file_exts=sql_exts,
+                        listing_cache=listing_cache,
+                    ),
+                )
+            )
+
+        # If only linting changed files, find them up front.
+        changed_since = self.config.get("changed_since")
+        changed_files = (
+            get_changed_lines(changed_since, os.getcwd()) if changed_since else None
+        )
+
+        def _iter_expanded_paths() -> Iterator[str]:
+            for linted_dir, fnames in path_iterators:
+                for fname in fnames:
+                    if (
+                        changed_files is not None
+                        and os.path.realpath(fname) not in changed_files
+                    ):
+                        continue
+                    pending_linted_dirs.setdefault(fname, []).append(linted_dir)
+                    yield fname
+
+        # Serve any unchanged files from the result cache if enabled, and
+        # only pass the remainder on to the runner.
+        result_cache = LintResultCache.from_config(self.config) if use_cache else None
+        cache_keys: dict[str, str] = {}
+        # Files loaded to make their cache keys, so the runner doesn't need
+        # to load them again.
+        loaded_files: dict[str, tuple[str, FluffConfig, str]] = {}
+        streaming = not retain_files
+        runner_paths: Iterable[str]
+        # The paths for the progress bar, if known in advance.
+        progress_paths: Optional[list[str]] = None
+        if streaming:
+            # Cache hits are found as files are discovered, and passed back
+            # to be yielded between the results from the runner.
+            cached_files: deque[LintedFile] = deque()
+            runner_paths = _iter_expanded_paths()
+            if result_cache:
+                runner_paths = self._iter_uncached_paths(
+                    runner_paths,
+                    result_cache,
+                    fix,
+                    cached_files,
+                    cache_keys,
+                    loaded_files,
+                )
+        else:
+            expanded_paths = list(_iter_expanded_paths())
+            cached_list: list[LintedFile] = []
+            if result_cache:
+                expanded_paths, cached_list, cache_keys = (
+                    self._partition_cached_paths(
+                        expanded_paths, result_cache, fix, loaded_files
+                    )
+                )
+            runner_paths = expanded_paths
+            cached_files = deque(cached_list)
+            # NOTE: Cached files are yielded first, so put them first here too.
+            progress_paths = [file.path for file in cached_list] + expanded_paths
 
-        files_count = len(expanded_paths)
         if processes is None:
             processes = self.config.get("processes", default=1)
         assert processes is not None
         # Hard set processes to 1 if only 1 file is queued.
         # The overhead will never be worth it with one file.
-        if files_count == 1:
+        # When streaming, we can only tell that in advance if a single file
+        # was given.
+        if progress_paths is not None:
+            if len(progress_paths) == 1:
+                processes = 1
+        elif len(paths) == 1 and os.path.isfile(paths[0]):
             processes = 1
 
         # to avoid circular import
@@ -1190,25 +1696,41 @@ class Linter:
             self.config,
             processes=processes,
             allow_process_parallelism=self.allow_process_parallelism,
+            worker_pool=worker_pool,
         )
+        runner.loaded_files = loaded_files
 
         if self.formatter and effective_processes != 1:
             self.formatter.dispatch_processing_header(effective_processes)
 
         # Show files progress bar only when there is more than one.
-        first_path = expanded_paths[0] if expanded_paths else ""
+        # When streaming, the total isn't known in advance.
+        first_path = progress_paths[0] if progress_paths else ""
         progress_bar_files = tqdm(
-            total=files_count,
+            total=len(progress_paths) if progress_paths is not None else None,
             desc=f"file {first_path}",
             leave=False,
-            disable=files_count <= 1 or progress_bar_configuration.disable_progress_bar,
+            disable=(progress_paths is not None and len(progress_paths) <= 1)
+            or progress_bar_configuration.disable_progress_bar,
         )
 
-        runner_iterator = runner.run(expanded_paths, fix)
+        # NOTE: Within a run, the templater may assume that the files it
+        # depends on (e.g. macros) don't change.
+        self.templater.start_run()
+        runner_iterator = runner.run(runner_paths, fix)
         try:
-            for i, linted_file in enumerate(runner_iterator, start=1):
-                linted_dir = expanded_path_to_linted_dir[linted_file.path]
+            for i, linted_file in enumerate(
+                self._iter_with_cached_files(runner_iterator, cached_files, fix),
+                start=1,
+            ):
+                linted_dirs = pending_linted_dirs[linted_file.path]
+                linted_dir = linted_dirs.pop(0)
+                if not linted_dirs:
+                    del pending_linted_dirs[linted_file.path]
                 linted_dir.add(linted_file)
+                # Store any fresh results in the cache.
+                if result_cache and linted_file.path in cache_keys:
+                    result_cache.put(cache_keys.pop(linted_file.path), linted_file, fix)
                 # If any fatal errors, then stop iteration.
                 if any(v.fatal for v in linted_file.violations):  # pragma: no cover
                     linter_logger.error("Fatal linting error. Halting further linting.")
@@ -1232,19 +1754,142 @@ class Linter:
                 # `enumerate` starts with `1` and there is `i < len` to not
                 # exceed files list length.
                 progress_bar_files.update(n=1)
-                if i < len(expanded_paths):
-                    progress_bar_files.set_description(f"file {expanded_paths[i]}")
+                if progress_paths is None:
+                    progress_bar_files.set_description(f"file {linted_file.path}")
+                elif i < len(progress_paths):
+                    progress_bar_files.set_description(f"file {progress_paths[i]}")
         finally:
             progress_bar_files.close()
             runner_close = getattr(runner_iterator, "close", None)
             if runner_close:
                 runner_close()
+            self.templater.end_run()
+
+        if listing_cache:
+            listing_cache.save()
+        if result_cache:
+            result_cache.prune()
+            result.cache_hits = result_cache.hits
+            result.cache_misses = result_cache.misses
 
         # Transfer skipped file count from the runner to the result.
         result.files_skipped = runner.skipped_file_count
+        result.tail_idle_time = runner.tail_idle_time
         result.stop_timer()
         return result
 
+    def _iter_with_cached_files(
+        self,
+        runner_iterator: Iterator[LintedFile],
+        cached_files: "deque[LintedFile]",
+        fix: bool,
+    ) -> Iterator[LintedFile]:
+        """Yield results from the cache and from the runner.
+
+        Any cached results are yielded before each result from the runner.
+        When streaming, ``cached_files`` is added to as files are found, so
+        it's checked again after each result.
+        """
+        for linted_file in runner_iterator:
+            while cached_files:
+                yield from self._iter_cached_files((cached_files.popleft(),), fix)
+            yield linted_file
+        while cached_files:
+            yield from self._iter_cached_files((cached_files.popleft(),), fix)
+
+    def _partition_cached_paths(
+        self,
+        fnames: list[str],
+        result_cache: LintResultCache,
+        fix: bool,
+        loaded_files: dict[str, tuple[str, FluffConfig, str]],
+    ) -> tuple[list[str], list[LintedFile], dict[str, str]]:
+        """Split paths into those served from the result cache and the rest.
+
+        Returns:
+            A tuple of the paths which still need linting, the cached
+            results for the others, and the cache keys for the paths which
+            still need linting (so their results can be stored later).
+            What was loaded for the paths which still need linting is stored
+            in ``loaded_files``.
+        """
+        cached_files: deque[LintedFile] = deque()
+        cache_keys: dict[str, str] = {}
+        uncached = list(
+            self._iter_uncached_paths(
+                fnames, result_cache, fix, cached_files, cache_keys, loaded_files
+            )
+        )
+        return uncached, list(cached_files), cache_keys
+
+    def _iter_uncached_paths(
+        self,
+        fnames: Iterable[str],
+        result_cache: LintResultCache,
+        fix: bool,
+        cached_files: "deque[LintedFile]",
+        cache_keys: dict[str, str],
+        loaded_files: dict[str, tuple[str, FluffConfig, str]],
+    ) -> Iterator[str]:
+        """Yield the paths which can't be served from the result cache.
+
+        Cached results are appended to ``cached_files`` instead, and the
+        cache keys for the paths yielded are stored in ``cache_keys`` (so
+        their results can be stored later). The raw file, config and
+        encoding loaded for any paths yielded are stored in ``loaded_files``,
+        so the runner doesn't need to load them again.
+        """
+        # Rule selection only depends on config, so memoise the selected
+        # codes to avoid building a rule pack for every file.
+        rule_codes_memo: dict[str, list[str]] = {}
+        for fname in fnames:
+            try:
+                raw_file, config, encoding = self.load_raw_file_and_config(
+                    fname, self.config
+                )
+            except Exception as err:
+                # Leave any errors (including skipped files) to be
+                # handled by the runner in the usual way.
+                linter_logger.debug("Not caching %s: %r", fname, err)
+                yield fname
+                continue
+            dependencies = self.templater.get_cache_dependencies(config)
+            if dependencies is None:
+                loaded_files[fname] = (raw_file, config, encoding)
+                yield fname
+                continue
+            fingerprint = config_fingerprint(config)
+            if fingerprint not in rule_codes_memo:
+                rule_codes_memo[fingerprint] = self.get_rulepack(config).codes()
+            key = result_cache.make_key(
+                raw_file,
+                config,
+                rule_codes_memo[fingerprint],
+                fix,
+                dependencies=dependencies,
+            )
+            linted_file = result_cache.get(key, fname, encoding)
+            if linted_file:
+                cached_files.append(linted_file)
+            else:
+                cache_keys[fname] = key
+                loaded_files[fname] = (raw_file, config, encoding)
+                yield fname
+
+    def _iter_cached_files(
+        self, cached_files: Iterable[LintedFile], fix: bool
+    ) -> Iterator[LintedFile]:
+        """Yield cached results, dispatching them to the formatter as we go."""
+        for linted_file in cached_files:
+            if self.formatter:
+                self.formatter.dispatch_file_violations(
+                    linted_file.path,
+                    linted_file,
+                    only_fixable=fix,
+                    warn_unused_ignores=False,
+                )
+            yield linted_file
+
     def parse_path(
         self,
         path: str,
@@ -1,6 +1,7 @@
 """Defines the linter class."""
 
 import csv
+import re
 import time
 from collections.abc import Iterable, Mapping
 from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
@@ -20,6 +21,11 @@ def sum_dicts(d1: Mapping[str, int], d2: Mapping[str, int]) -> dict[str, int]:
     return {key: d1.get(key, 0) + d2.get(key, 0) for key in keys}
 
 
+def _natural_sort_key(key: str) -> list[Union[str, int]]:
+    """Sort key for strings with numbers in, so that "loop 10" follows "loop 9"."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", key)]
+
+
 T = TypeVar("T")
 
 
@@ -43,6 +49,12 @@ class LintingResult:
         self._start_time: float = time.monotonic()
         self.total_time: float = 0.0
         self.files_skipped: int = 0
+        # Lint result cache counters, only set if the cache was in use.
+        self.cache_hits: Optional[int] = None
+        self.cache_misses: Optional[int] = None
+        # Time parallel workers spent idle at the end of the run, only set
+        # if a parallel runner was used.
+        self.tail_idle_time: Optional[float] = None
 
     def add(self, path: LintedDir) -> None:
         """Add a new `LintedDir` to this result."""
@@ -118,19 +130,36 @@ class LintingResult:
         all_stats["unclean files"] = all_stats["unclean"]
         all_stats["exit code"] = fail_code if counts["violations"] > 0 else success_code
         all_stats["status"] = "FAIL" if counts["violations"] > 0 else "PASS"
+        if self.cache_hits is not None and self.cache_misses is not None:
+            all_stats["cache hits"] = self.cache_hits
+            all_stats["cache misses"] = self.cache_misses
         return all_stats
 
     def timing_summary(self) -> dict[str, dict[str, Any]]:
         """Return a timing summary."""
         timing = TimingSummary()
         rules_timing = RuleTimingSummary()
+        cache_stats: dict[str, int] = {}
+        loop_stats: dict[str, int] = {}
         for dir in self.paths:
             # Add timings from cached values.
             # NOTE: This is so we don't rely on having the raw file objects any more.
-            for t in dir.step_timings:
-                timing.add(t)
-            rules_timing.add(dir.rule_timings)
-        return {**timing.summary(), **rules_timing.summary()}
+            timing.update(dir.step_timing_summary)
+            rules_timing.update(dir.rule_timing_summary)
+            cache_stats = sum_dicts(cache_stats, dir.templater_cache_stats)
+            loop_stats = sum_dicts(loop_stats, dir.fix_loop_stats)
+        summary: dict[str, dict[str, Any]] = {
+            **timing.summary(),
+            **rules_timing.summary(),
+        }
+        if cache_stats:
+            summary["templater cache"] = dict(sorted(cache_stats.items()))
+        if loop_stats:
+            # Sorted by phase, then loop number.
+            summary["fix loop"] = dict(
+                sorted(loop_stats.items(), key=lambda item: _natural_sort_key(item[0]))
+            )
+        return summary
 
     def persist_timing_records(self, filename: str) -> None:
         """Persist the timing records as a csv for external analysis."""
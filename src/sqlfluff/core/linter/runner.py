@@ -5,6 +5,9 @@ Implements various runner types for SQLFluff:
 - Parallel
   - Multiprocess
   - Multithread (used only by automated tests)
+
+Parallel runners either create a pool of workers for each run, or use a
+:class:`WorkerPool` which can be reused across runs.
 """
 
 import bdb
@@ -15,21 +18,95 @@ import multiprocessing.dummy
 import multiprocessing.pool
 import signal
 import sys
+import threading
+import time
 import traceback
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Iterator
+from itertools import count, groupby
 from types import TracebackType
-from typing import Callable, Optional, Union
+from typing import Callable, Optional, TypeVar, Union
 
 from sqlfluff.core import FluffConfig, Linter
 from sqlfluff.core.errors import SQLFluffSkipFile
 from sqlfluff.core.linter import LintedFile, RenderedFile
+from sqlfluff.core.linter.cache import config_fingerprint
 from sqlfluff.core.linter.common import DeferredRenderTask
+from sqlfluff.core.linter.schedule import (
+    estimate_costs,
+    schedule_files,
+    tail_idle_time,
+)
 from sqlfluff.core.plugin.host import is_main_process
+from sqlfluff.core.rules import RulePack
 
 linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
 
 PartialLintCallable = Callable[[], LintedFile]
+PartialTuple = tuple[str, Union[PartialLintCallable, DeferredRenderTask]]
+LintResult = Union["DelayedException", LintedFile]
+
+_MapInput = TypeVar("_MapInput")
+_MapOutput = TypeVar("_MapOutput")
+_CachedValue = TypeVar("_CachedValue")
+
+# Objects which workers need to lint deferred tasks, cached for the lifetime
+# of each worker and keyed by config fingerprint. Building a rule pack in
+# particular costs far more than linting a small file, and when a WorkerPool
+# is reused, later runs start with these already warm.
+_WORKER_CACHE_SIZE = 32
+# The number of tasks per process which can be sent to a pool but not yet
+# returned. This keeps the workers busy while bounding memory use.
+_TASKS_IN_FLIGHT_PER_PROCESS = 4
+_worker_linters: dict[str, Linter] = {}
+_worker_rulepacks: dict[str, RulePack] = {}
+# The ids of runs, and the id of the run each worker last rendered for.
+_run_ids = count(1)
+_worker_run_id: Optional[int] = None
+
+
+def _worker_cached(
+    cache: dict[str, _CachedValue],
+    key: str,
+    factory: Callable[[], _CachedValue],
+) -> _CachedValue:
+    """Get a value from a worker cache, creating it if necessary."""
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    if len(cache) >= _WORKER_CACHE_SIZE:
+        # The limit only guards against an unusual number of distinct
+        # configs, so there's no need to track which entries to evict.
+        cache.clear()
+    value = cache[key] = factory()
+    return value
+
+
+def _make_worker_linter(root_config: FluffConfig) -> Linter:
+    linter = Linter(config=root_config)
+    # FluffConfig.__getstate__ strips templater_obj to None before
+    # pickling (it's designed for main-process use only). Since we
+    # are deliberately rendering here in the worker, re-instantiate
+    # the templater from the config's templater name.
+    linter.templater = root_config.get_templater()
+    linter.templater.start_run()
+    return linter
+
+
+def _start_worker_run(run_id: int) -> None:
+    """Start a new run in a worker, if it's not already part of it.
+
+    Workers (in a reused pool) only see the tasks from each run, so the
+    templaters of any cached linters are moved onto a new run when the
+    first task from it arrives.
+    """
+    global _worker_run_id
+    if run_id == _worker_run_id:
+        return
+    for linter in _worker_linters.values():
+        linter.templater.start_run()
+    _worker_run_id = run_id
 
 
 class BaseRunner(ABC):
@@ -43,23 +120,34 @@ class BaseRunner(ABC):
         self.linter = linter
         self.config = config
         self.skipped_file_count: int = 0
+        # Total time parallel workers spent idle at the end of the last run.
+        # Only set by parallel runners.
+        self.tail_idle_time: Optional[float] = None
+        # The raw file, config and encoding of any files which have already
+        # been loaded (e.g. to check the lint result cache), by path. Each
+        # is removed once handed on for rendering.
+        self.loaded_files: dict[str, tuple[str, FluffConfig, str]] = {}
 
     pass_formatter = True
 
-    def iter_rendered(self, fnames: list[str]) -> Iterator[tuple[str, RenderedFile]]:
+    def iter_rendered(
+        self, fnames: Iterable[str]
+    ) -> Iterator[tuple[str, RenderedFile]]:
         """Iterate through rendered files ready for linting."""
         for fname in self.linter.templater.sequence_files(
             fnames, config=self.config, formatter=self.linter.formatter
         ):
             try:
-                yield fname, self.linter.render_file(fname, self.config)
+                yield fname, self.linter.render_file(
+                    fname, self.config, self.loaded_files.pop(fname, None)
+                )
             except SQLFluffSkipFile as s:
                 linter_logger.warning(str(s))
                 self.skipped_file_count += 1
 
     def iter_partials(
         self,
-        fnames: list[str],
+        fnames: Iterable[str],
         fix: bool = False,
     ) -> Iterator[tuple[str, Union[PartialLintCallable, DeferredRenderTask]]]:
         """Iterate through partials for linted files.
@@ -83,7 +171,7 @@ class BaseRunner(ABC):
             )
 
     @abstractmethod
-    def run(self, fnames: list[str], fix: bool) -> Iterator[LintedFile]:
+    def run(self, fnames: Iterable[str], fix: bool) -> Iterator[LintedFile]:
         """Run linting on the specified list of files."""
         ...
 
@@ -112,7 +200,7 @@ To hide this warning, add the failing file to .sqlfluffignore
 class SequentialRunner(BaseRunner):
     """Simple runner that does sequential processing."""
 
-    def run(self, fnames: list[str], fix: bool) -> Iterator[LintedFile]:
+    def run(self, fnames: Iterable[str], fix: bool) -> Iterator[LintedFile]:
         """Sequential implementation."""
         for fname, partial in self.iter_partials(fnames, fix=fix):
             try:
@@ -121,7 +209,7 @@ class SequentialRunner(BaseRunner):
                     # ParallelRunner.iter_partials.  Handle it here as a
                     # safety net: render + lint in one step in the main process.
                     rendered = self.linter.render_file(
-                        partial.fname, partial.root_config
+                        partial.fname, partial.root_config, partial.loaded
                     )
                     rule_pack = self.linter.get_rulepack(config=rendered.config)
                     yield self.linter.lint_rendered(
@@ -143,13 +231,22 @@ class ParallelRunner(BaseRunner):
     # don't pickle well.
     pass_formatter = False
 
-    def __init__(self, linter: Linter, config: FluffConfig, processes: int) -> None:
+    def __init__(
+        self,
+        linter: Linter,
+        config: FluffConfig,
+        processes: int,
+        worker_pool: Optional["WorkerPool"] = None,
+    ) -> None:
         super().__init__(linter, config)
         self.processes = processes
+        # If set, run using this pool rather than creating (and then
+        # terminating) a new one.
+        self.worker_pool = worker_pool
 
     def iter_partials(
         self,
-        fnames: list[str],
+        fnames: Iterable[str],
         fix: bool = False,
     ) -> Iterator[tuple[str, Union[PartialLintCallable, DeferredRenderTask]]]:
         """Iterate through partials or deferred tasks for parallel linting.
@@ -164,14 +261,17 @@ class ParallelRunner(BaseRunner):
         back to the base-class behaviour and template in the main process.
         """
         if self.linter.templater.templates_in_worker:
+            run_id = next(_run_ids)
             for fname in self.linter.templater.sequence_files(
                 fnames, config=self.config, formatter=None
             ):
-                yield fname, DeferredRenderTask(fname, self.config, fix)
+                yield fname, DeferredRenderTask(
+                    fname, self.config, fix, run_id, self.loaded_files.pop(fname, None)
+                )
         else:
             yield from super().iter_partials(fnames, fix=fix)
 
-    def run(self, fnames: list[str], fix: bool) -> Iterator[LintedFile]:
+    def run(self, fnames: Iterable[str], fix: bool) -> Iterator[LintedFile]:
         """Parallel implementation.
 
         Note that the partials are generated one at a time then
@@ -184,16 +284,18 @@ class ParallelRunner(BaseRunner):
         # processes may still be alive when Python's resource_tracker runs at
         # shutdown, causing "leaked semaphore objects" warnings from the named
         # POSIX semaphores used by the pool's internal SimpleQueue locks.
-        pool = self._create_pool(
-            self.processes,
-            self._init_global,
-        )
+        if self.worker_pool:
+            pool = self.worker_pool.pool
+        else:
+            pool = self._create_pool(
+                self.processes,
+                self._init_global,
+            )
+        start_time = time.monotonic()
+        completion_times: list[float] = []
+        results = self._iter_results(pool, fnames, fix, completion_times)
         try:
-            for lint_result in self._map(
-                pool,
-                self._apply,
-                self.iter_partials(fnames, fix=fix),
-            ):
+            for lint_result in results:
                 if isinstance(lint_result, DelayedException):
                     if isinstance(lint_result.ee, SQLFluffSkipFile):
                         # A file was skipped (e.g. exceeded
@@ -218,36 +320,118 @@ class ParallelRunner(BaseRunner):
                             ),
                         )
                     yield lint_result
+            self.tail_idle_time = tail_idle_time(
+                start_time, completion_times, self.processes
+            )
         except KeyboardInterrupt:  # pragma: no cover
             # On keyboard interrupt (Ctrl-C), terminate the workers.
             # Notify the user we've received the signal and are cleaning up,
             # in case it takes awhile.
             print("Received keyboard interrupt. Cleaning up and shutting down...")
         finally:
-            try:
-                pool.terminate()
-            finally:
-                pool.join()
+            # Stop sending tasks to the pool before shutting it down.
+            results.close()
+            # A shared pool is left running, and closed by its owner.
+            if not self.worker_pool:
+                try:
+                    pool.terminate()
+                finally:
+                    pool.join()
+
+    def _iter_results(
+        self,
+        pool: multiprocessing.pool.Pool,
+        fnames: Iterable[str],
+        fix: bool,
+        completion_times: list[float],
+    ) -> Iterator[LintResult]:
+        """Send files to the pool in the configured order, and yield results.
+
+        The time each task completes is appended to ``completion_times``.
+        In ``discovery`` order each task is one file, and files are sent as
+        they are found. Otherwise files are ordered by estimated cost (longest
+        first) and small files are sent in batches (see
+        :func:`schedule_files`), which means finding all the files first.
+        """
+        limiter = _TaskLimiter(self.processes * _TASKS_IN_FLIGHT_PER_PROCESS)
+        schedule = self.config.get("schedule") or "discovery"
+        try:
+            if schedule == "discovery":
+                partials = self.iter_partials(fnames, fix=fix)
+                for lint_result in self._map(
+                    pool, self._apply, limiter.iter(partials)
+                ):
+                    limiter.release()
+                    completion_times.append(time.monotonic())
+                    yield lint_result
+                return
+
+            for lint_results in self._map(
+                pool,
+                self._apply_batch,
+                limiter.iter(self._iter_partial_batches(list(fnames), fix, schedule)),
+            ):
+                limiter.release()
+                completion_times.append(time.monotonic())
+                yield from lint_results
+        finally:
+            limiter.close()
+
+    def _iter_partial_batches(
+        self, fnames: list[str], fix: bool, schedule: str
+    ) -> Iterator[tuple[PartialTuple, ...]]:
+        """Order files by estimated cost, and group them into batches."""
+        costs = estimate_costs(
+            fnames, schedule, self.config.get("schedule_history_path")
+        )
+        batches = schedule_files(fnames, costs, self.processes)
+        linter_logger.info(
+            "Scheduled %s files in %s batches by %s.",
+            len(fnames),
+            len(batches),
+            schedule,
+        )
+        batch_idx = {fname: idx for idx, batch in enumerate(batches) for fname in batch}
+        # NOTE: The templater may re-sequence files, so group whatever
+        # comes out of iter_partials by batch rather than assuming order.
+        ordered_fnames = [fname for batch in batches for fname in batch]
+        for _, group in groupby(
+            self.iter_partials(ordered_fnames, fix=fix),
+            key=lambda partial_tuple: batch_idx.get(partial_tuple[0]),
+        ):
+            yield tuple(group)
+
+    @classmethod
+    def _apply_batch(cls, partial_tuples: tuple[PartialTuple, ...]) -> list[LintResult]:
+        """Shim function used in parallel mode to lint a batch of files."""
+        return [cls._apply(partial_tuple) for partial_tuple in partial_tuples]
 
     @staticmethod
     def _apply(
-        partial_tuple: tuple[str, Union[PartialLintCallable, DeferredRenderTask]],
-    ) -> Union["DelayedException", LintedFile]:
+        partial_tuple: PartialTuple,
+    ) -> LintResult:
         """Shim function used in parallel mode."""
         fname, task = partial_tuple
         try:
             if isinstance(task, DeferredRenderTask):
-                # Worker-side rendering: reconstruct a Linter from the root
-                # config and do render + lint in one step, keeping the full
-                # RenderedFile off the IPC boundary.
-                linter = Linter(config=task.root_config)
-                # FluffConfig.__getstate__ strips templater_obj to None before
-                # pickling (it's designed for main-process use only). Since we
-                # are deliberately rendering here in the worker, re-instantiate
-                # the templater from the config's templater name.
-                linter.templater = task.root_config.get_templater()
-                rendered = linter.render_file(task.fname, task.root_config)
-                rule_pack = linter.get_rulepack(config=rendered.config)
+                # Worker-side rendering: get a Linter for the root config and
+                # do render + lint in one step, keeping the full RenderedFile
+                # off the IPC boundary. The Linter (and its templater) and
+                # the rule pack are reused for any tasks with the same config.
+                _start_worker_run(task.run_id)
+                linter = _worker_cached(
+                    _worker_linters,
+                    config_fingerprint(task.root_config),
+                    lambda: _make_worker_linter(task.root_config),
+                )
+                rendered = linter.render_file(
+                    task.fname, task.root_config, task.loaded
+                )
+                rule_pack = _worker_cached(
+                    _worker_rulepacks,
+                    config_fingerprint(rendered.config),
+                    lambda: linter.get_rulepack(config=rendered.config),
+                )
                 return Linter.lint_rendered(rendered, rule_pack, task.fix, None)
             return task()
         # Capture any exceptions and return as delayed exception to handle
@@ -272,12 +456,9 @@ class ParallelRunner(BaseRunner):
     def _map(
         cls,
         pool: multiprocessing.pool.Pool,
-        func: Callable[
-            [tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-            Union["DelayedException", LintedFile],
-        ],
-        iterable: Iterable[tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-    ) -> Iterable[Union["DelayedException", LintedFile]]:  # pragma: no cover
+        func: Callable[[_MapInput], _MapOutput],
+        iterable: Iterable[_MapInput],
+    ) -> Iterable[_MapOutput]:  # pragma: no cover
         """Class-specific map method.
 
         NOTE: Must be overridden by an implementation.
@@ -285,6 +466,41 @@ class ParallelRunner(BaseRunner):
         ...
 
 
+class _TaskLimiter:
+    """Limits the number of tasks sent to a pool but not yet returned.
+
+    Pools consume their input as fast as they can, which would otherwise
+    mean finding (and for templaters which render in the main process,
+    rendering) every file up front and holding them all in memory.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._semaphore = threading.Semaphore(limit)
+        self._closed = False
+
+    def iter(self, iterable: Iterable[_MapInput]) -> Iterator[_MapInput]:
+        """Yield from an iterable, waiting for a free slot before each item."""
+        iterator = iter(iterable)
+        while True:
+            self._semaphore.acquire()
+            if self._closed:
+                return
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            yield item
+
+    def release(self) -> None:
+        """Free a slot, once a task has been returned."""
+        self._semaphore.release()
+
+    def close(self) -> None:
+        """Stop sending tasks, e.g. if results are no longer being consumed."""
+        self._closed = True
+        self._semaphore.release()
+
+
 class MultiProcessRunner(ParallelRunner):
     """Runner that does parallel processing using multiple processes."""
 
@@ -312,12 +528,9 @@ class MultiProcessRunner(ParallelRunner):
     def _map(
         cls,
         pool: multiprocessing.pool.Pool,
-        func: Callable[
-            [tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-            Union["DelayedException", LintedFile],
-        ],
-        iterable: Iterable[tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-    ) -> Iterable[Union["DelayedException", LintedFile]]:
+        func: Callable[[_MapInput], _MapOutput],
+        iterable: Iterable[_MapInput],
+    ) -> Iterable[_MapOutput]:
         """Map using imap unordered.
 
         We use this so we can iterate through results as they arrive, and while other
@@ -338,12 +551,9 @@ class MultiThreadRunner(ParallelRunner):
     def _map(
         cls,
         pool: multiprocessing.pool.Pool,
-        func: Callable[
-            [tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-            Union["DelayedException", LintedFile],
-        ],
-        iterable: Iterable[tuple[str, Union[PartialLintCallable, DeferredRenderTask]]],
-    ) -> Iterable[Union["DelayedException", LintedFile]]:
+        func: Callable[[_MapInput], _MapOutput],
+        iterable: Iterable[_MapInput],
+    ) -> Iterable[_MapOutput]:
         """Map using imap.
 
         We use this so we can iterate through results as they arrive, and while other
@@ -352,6 +562,58 @@ class MultiThreadRunner(ParallelRunner):
         return pool.imap(func=func, iterable=iterable)
 
 
+class WorkerPool:
+    """A pool of parallel workers which can be reused across lint runs.
+
+    Each :class:`ParallelRunner` otherwise starts (and then terminates) its
+    own pool, which means every run pays for starting the workers and for
+    warming up the caches within them. Pass a ``WorkerPool`` to
+    :meth:`Linter.lint_paths` to keep warm workers between calls, e.g. in a
+    long running service. The pool should be closed when no longer needed,
+    ideally by using it as a context manager.
+
+    NOTE: Workers in a reused pool keep the state of any previous runs,
+    including loaded plugins and user rules. Runs should therefore share a
+    compatible environment.
+
+    Args:
+        processes (int): The number of workers, interpreted as for
+            :func:`get_runner`.
+        runner_class (type): The class of runner to use with the pool.
+            Defaults to :class:`MultiProcessRunner`.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        runner_class: type[ParallelRunner] = MultiProcessRunner,
+    ) -> None:
+        self.processes = _resolve_processes(processes)
+        self.runner_class = runner_class
+        self.pool = runner_class._create_pool(
+            self.processes, runner_class._init_global
+        )
+
+    def get_runner(self, linter: Linter, config: FluffConfig) -> ParallelRunner:
+        """Get a runner which uses this pool."""
+        return self.runner_class(
+            linter, config, processes=self.processes, worker_pool=self
+        )
+
+    def close(self) -> None:
+        """Shut down the workers."""
+        try:
+            self.pool.terminate()
+        finally:
+            self.pool.join()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
 class DelayedException(Exception):
     """Multiprocessing process pool uses this to propagate exceptions."""
 
@@ -367,11 +629,22 @@ class DelayedException(Exception):
         raise self.ee.with_traceback(self.tb)
 
 
+def _resolve_processes(processes: int) -> int:
+    """Convert a processes argument into a number of processes.
+
+    Non-positive values are relative to the number of cpus.
+    """
+    if processes <= 0:
+        return max(multiprocessing.cpu_count() + processes, 1)
+    return processes
+
+
 def get_runner(
     linter: Linter,
     config: FluffConfig,
     processes: int,
     allow_process_parallelism: bool = True,
+    worker_pool: Optional[WorkerPool] = None,
 ) -> tuple[BaseRunner, int]:
     """Generate a runner instance based on parallel and system configuration.
 
@@ -384,9 +657,13 @@ def get_runner(
     0 = all cpus
     1 = 1 cpu
 
+    If a ``worker_pool`` is provided, then a runner using that pool is
+    returned, and the processes argument is ignored.
     """
-    if processes <= 0:
-        processes = max(multiprocessing.cpu_count() + processes, 1)
+    if worker_pool:
+        return worker_pool.get_runner(linter, config), worker_pool.processes
+
+    processes = _resolve_processes(processes)
 
     if processes > 1:
         # Process parallelism isn't really supported during testing
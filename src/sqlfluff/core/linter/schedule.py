@@ -0,0 +1,140 @@
+"""Helpers for scheduling files across parallel workers.
+
+In discovery order, one or two very large files picked up late in a run
+can leave every other worker idle while they finish. Ordering work by
+estimated cost (longest first) avoids that, and batching many tiny files
+together reduces the overhead of sending each one to a worker separately.
+
+Costs are estimated either from file size, or from the per-file timings
+of a previous run (as written by ``--persist-timing``).
+"""
+
+import csv
+import logging
+import os
+from collections.abc import Sequence
+from typing import Optional
+
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# The step timings which make up the cost of a file in a timing record.
+_TIMING_STEPS = ("templating", "lexing", "parsing", "linting")
+
+# Aim for at least this many batches per worker, so that the last batches
+# to finish are small relative to the whole run.
+_BATCHES_PER_PROCESS = 8
+
+
+def _path_key(fname: str) -> str:
+    return os.path.normcase(os.path.abspath(fname))
+
+
+def load_timing_history(path: str) -> dict[str, float]:
+    """Load the total time taken per file from a persisted timing file.
+
+    Returns:
+        A dict of the time (in seconds) for each file, keyed by the
+        normalised absolute path. Empty if the file can't be read.
+    """
+    history: dict[str, float] = {}
+    try:
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    history[_path_key(row["path"])] = sum(
+                        float(row[step]) for step in _TIMING_STEPS if row.get(step)
+                    )
+                except (KeyError, ValueError):
+                    continue
+    except OSError as err:
+        linter_logger.info("Unable to load timing history from %s: %s", path, err)
+    return history
+
+
+def _file_size(fname: str) -> int:
+    try:
+        return os.path.getsize(fname)
+    except OSError:
+        return 0
+
+
+def estimate_costs(
+    fnames: Sequence[str], mode: str, history_path: Optional[str] = None
+) -> dict[str, float]:
+    """Estimate the relative cost of linting each file.
+
+    In ``size`` mode this is the size of the file. In ``history`` mode it's
+    the time taken in a previous run, where available. Files without any
+    history are estimated from their size, scaled by the average time per
+    byte of the files which do have history. If there's no history at all
+    this is the same as ``size`` mode.
+    """
+    sizes = {fname: _file_size(fname) for fname in fnames}
+    if mode != "history" or not history_path:
+        return {fname: float(size) for fname, size in sizes.items()}
+
+    history = load_timing_history(history_path)
+    known = {
+        fname: history[_path_key(fname)]
+        for fname in fnames
+        if _path_key(fname) in history
+    }
+    if not known:
+        linter_logger.info("No timing history found for any files. Using size.")
+        return {fname: float(size) for fname, size in sizes.items()}
+    known_bytes = sum(sizes[fname] for fname in known)
+    seconds_per_byte = sum(known.values()) / known_bytes if known_bytes else 0.0
+    return {
+        fname: known.get(fname, sizes[fname] * seconds_per_byte) for fname in fnames
+    }
+
+
+def schedule_files(
+    fnames: Sequence[str], costs: dict[str, float], processes: int
+) -> list[list[str]]:
+    """Order files longest first and batch together the smallest ones.
+
+    Files are batched so that each batch has roughly a fixed share of the
+    total cost, which means that large files are sent on their own and
+    runs of tiny files are sent together.
+
+    Returns:
+        A list of batches of filenames, in the order they should be sent.
+    """
+    # NOTE: Python's sort is stable, so files of equal cost stay in
+    # discovery order.
+    ordered = sorted(fnames, key=lambda fname: costs[fname], reverse=True)
+    target = sum(costs.values()) / max(processes * _BATCHES_PER_PROCESS, 1)
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_cost = 0.0
+    for fname in ordered:
+        batch.append(fname)
+        batch_cost += costs[fname]
+        if batch_cost >= target:
+            batches.append(batch)
+            batch, batch_cost = [], 0.0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def tail_idle_time(
+    start_time: float, completion_times: Sequence[float], processes: int
+) -> float:
+    """Estimate the total time workers spent idle at the end of a run.
+
+    The last task completed by each worker is one of the last ``processes``
+    tasks to complete overall, and that worker is idle from then until the
+    final task completes. Any workers which never got a task at all were
+    idle for the whole run.
+
+    Returns:
+        The idle time (in seconds), summed across workers.
+    """
+    if not completion_times:
+        return 0.0
+    end_time = completion_times[-1]
+    idle = sum(end_time - t for t in completion_times[-processes:])
+    unused_workers = max(processes - len(completion_times), 0)
+    return idle + unused_workers * (end_time - start_time)
@@ -56,6 +56,7 @@ from sqlfluff.core.parser.segments import (
     WhitespaceSegment,
     WordSegment,
 )
+from sqlfluff.core.parser.token_store import TokenStore
 from sqlfluff.core.parser.types import ParseMode
 
 # Get the appropriate lexer class (PyRsLexer if available, otherwise PyLexer)
@@ -108,6 +109,7 @@ __all__ = (
     "LexerType",
     "StringLexer",
     "RegexLexer",
+    "TokenStore",
     "Parser",
     "Matchable",
     "ParseMode",
@@ -19,10 +19,12 @@ from tqdm import tqdm
 
 from sqlfluff.core.config import progress_bar_configuration
 from sqlfluff.core.errors import SQLParseError
+from sqlfluff.core.parser.shape_cache import ParseShapeCache
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.config import FluffConfig
     from sqlfluff.core.dialects.base import Dialect
+    from sqlfluff.core.parser.dispatch import DispatchTable
     from sqlfluff.core.parser.match_result import MatchResult
     from sqlfluff.core.parser.matchable import Matchable
 
@@ -58,6 +60,7 @@ class ParseContext:
         max_parse_depth: int,
         max_parse_nodes: int = 0,
         indentation_config: Optional[dict[str, Any]] = None,
+        shape_cache: Optional[ParseShapeCache] = None,
     ) -> None:
         """Initialize a new instance of the class.
 
@@ -69,6 +72,9 @@ class ParseContext:
             indentation_config (Optional[dict[str, Any]], optional): The indentation
                 configuration used by Indent and Dedent to control the intended
                 indentation of certain features. Defaults to None.
+            shape_cache (Optional[ParseShapeCache], optional): A cache of
+                statement matches, to reuse for statements with the same
+                shape. Defaults to None, which disables it.
         """
         self.dialect = dialect
         # Indentation config is used by Indent and Dedent and used to control
@@ -85,6 +91,9 @@ class ParseContext:
         # A dict for parse caching. This is reset for each file,
         # but persists for the duration of an individual file parse.
         self._parse_cache: dict[tuple[Any, ...], "MatchResult"] = {}
+        # A cache of statement matches which, unlike the parse cache, can
+        # persist between files and is keyed by shape rather than location.
+        self.shape_cache = shape_cache
         # A dictionary for keeping track of some statistics on parsing
         # for performance optimisation.
         # Focused around BaseGrammar._longest_trimmed_match().
@@ -142,8 +151,19 @@ class ParseContext:
             indentation_config=indentation_config,
             max_parse_depth=max_parse_depth,
             max_parse_nodes=max_parse_nodes,
+            shape_cache=ParseShapeCache.from_config(config),
         )
 
+    def dispatch_table(self, grammar: "Matchable") -> Optional["DispatchTable"]:
+        """Get the dispatch table for a compound grammar, if there is one."""
+        if not self.dialect:
+            return None
+        return self.dialect.dispatch_table(grammar)
+
+    def increment(self, key: str, value: int = 1) -> None:
+        """Increment one of the counters in the parse statistics."""
+        self.parse_stats[key] = self.parse_stats.get(key, 0) + value
+
     def increment_parse_nodes(self, count: int = 1) -> None:
         """Increment the number of materialized parse nodes.
 
@@ -0,0 +1,165 @@
+"""Dispatch tables, for pruning the options of a grammar by the first token.
+
+When a grammar chooses between options (e.g. :obj:`OneOf` or the content of
+:obj:`Delimited`), :func:`~sqlfluff.core.parser.match_algorithms.prune_options`
+uses the *simple* hints of each option to discard those which can't match
+the first code token. Those hints only depend on the dialect, so rather
+than evaluating every option at every position, we index the options of
+each grammar once by the raws and types which could start them.
+"""
+
+import sys
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.grammar.anyof import AnyNumberOf
+from sqlfluff.core.parser.grammar.base import BaseGrammar
+from sqlfluff.core.parser.matchable import Matchable
+from sqlfluff.core.parser.types import SimpleHintType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.dialects.base import Dialect
+
+
+class DispatchTable:
+    """An index from the first token to the options which could match it.
+
+    The indices are public, so that they can also be used as a data source
+    when generating the grammar tables for the Rust parser.
+
+    Args:
+        options (:obj:`Sequence` of :obj:`Matchable`): The options, in the
+            order they should be tried.
+        hints (:obj:`Sequence` of simple hints): The simple hint for each
+            option, as returned by `Matchable.simple()`.
+    """
+
+    def __init__(
+        self, options: Sequence[Matchable], hints: Sequence[SimpleHintType]
+    ) -> None:
+        assert len(options) == len(hints)
+        self.options = tuple(options)
+        # Options which aren't simple, and must always be tried.
+        self.unconditional: tuple[int, ...] = tuple(
+            idx for idx, hint in enumerate(hints) if hint is None
+        )
+        raw_index: dict[str, list[int]] = {}
+        type_index: dict[str, list[int]] = {}
+        for idx, hint in enumerate(hints):
+            if hint is None:
+                continue
+            for raw in hint[0]:
+                raw_index.setdefault(raw, []).append(idx)
+            for _type in hint[1]:
+                type_index.setdefault(_type, []).append(idx)
+        self.raw_index = {raw: tuple(idxs) for raw, idxs in raw_index.items()}
+        self.type_index = {_type: tuple(idxs) for _type, idxs in type_index.items()}
+        # The selected options for each first raw and set of types.
+        # NOTE: Raws which aren't in the index are all equivalent, so
+        # they share a key. That keeps this bounded by the grammar rather
+        # than by the content of the files being parsed.
+        self._selections: dict[
+            tuple[Optional[str], frozenset[str]], tuple[Matchable, ...]
+        ] = {}
+
+    @classmethod
+    def from_options(
+        cls, options: Sequence[Matchable], parse_context: ParseContext
+    ) -> "DispatchTable":
+        """Build a table by evaluating the simple hint of each option."""
+        return cls(
+            options, [opt.simple(parse_context=parse_context) for opt in options]
+        )
+
+    def select(self, first_raw: str, first_types: frozenset[str]) -> list[Matchable]:
+        """Return the options which could match a given first token.
+
+        This gives the same result as evaluating the simple hints, in
+        the same order as the options.
+
+        Args:
+            first_raw (:obj:`str`): The uppercase raw of the first code
+                token.
+            first_types (:obj:`frozenset` of :obj:`str`): The class types
+                of the first code token.
+        """
+        key = (first_raw if first_raw in self.raw_index else None, first_types)
+        try:
+            selected = self._selections[key]
+        except KeyError:
+            idxs = set(self.unconditional)
+            idxs.update(self.raw_index.get(first_raw, ()))
+            for _type in first_types:
+                idxs.update(self.type_index.get(_type, ()))
+            selected = tuple(self.options[idx] for idx in sorted(idxs))
+            self._selections[key] = selected
+        return list(selected)
+
+
+def _iter_grammars(root: Any, seen: set[int]) -> Iterator[BaseGrammar]:
+    """Iterate through the grammars reachable from a library element."""
+    stack = [root]
+    while stack:
+        elem = stack.pop()
+        if id(elem) in seen:
+            continue
+        seen.add(id(elem))
+        if isinstance(elem, type):
+            # A segment class, which matches using its match grammar.
+            match_grammar = getattr(elem, "match_grammar", None)
+            if match_grammar is not None:
+                stack.append(match_grammar)
+            continue
+        if not isinstance(elem, BaseGrammar):
+            continue
+        yield elem
+        stack.extend(elem._elements)
+        stack.extend(elem.terminators)
+        for attr in ("exclude", "delimiter"):
+            child = getattr(elem, attr, None)
+            if child is not None:
+                stack.append(child)
+
+
+def build_dispatch_tables(
+    dialect: "Dialect",
+) -> dict[int, tuple[AnyNumberOf, DispatchTable]]:
+    """Build the dispatch tables for every compound grammar in a dialect.
+
+    Args:
+        dialect (:obj:`Dialect`): An expanded dialect.
+
+    Returns:
+        :obj:`dict` of tables, keyed by the `id()` of each grammar. The
+        grammar itself is included so that the identity can be checked
+        on lookup.
+    """
+    # NOTE: The hints only depend on the dialect, so any context will do.
+    parse_context = ParseContext(dialect=dialect, max_parse_depth=0)
+    tables: dict[int, tuple[AnyNumberOf, DispatchTable]] = {}
+    seen: set[int] = set()
+    # NOTE: Missing keywords suppress tracebacks when they're raised (see
+    # `Dialect.ref()`), which we don't want from here.
+    tracebacklimit = getattr(sys, "tracebacklimit", None)
+    try:
+        for elem in dialect._library.values():
+            for grammar in _iter_grammars(elem, seen):
+                if not isinstance(grammar, AnyNumberOf):
+                    continue
+                try:
+                    table = DispatchTable.from_options(
+                        grammar._elements, parse_context
+                    )
+                except RuntimeError:
+                    # Some grammars in the library refer to elements which
+                    # the dialect doesn't define, and can't be used. Those
+                    # are left to be pruned (and to raise) when matching.
+                    continue
+                tables[id(grammar)] = (grammar, table)
+    finally:
+        if tracebacklimit is not None:  # pragma: no cover
+            sys.tracebacklimit = tracebacklimit
+        elif hasattr(sys, "tracebacklimit"):
+            del sys.tracebacklimit
+    return tables
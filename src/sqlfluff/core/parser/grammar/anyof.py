@@ -152,6 +152,8 @@ class AnyNumberOf(BaseGrammar):
         working_idx = idx
         matched = MatchResult.empty_at(idx)
         max_idx = len(segments)  # What is the limit
+        # Precomputed pruning of the options, if the dialect has it.
+        dispatch_table = parse_context.dispatch_table(self)
 
         if self.parse_mode == ParseMode.GREEDY:
             max_idx = trim_to_terminator(
@@ -199,6 +201,7 @@ class AnyNumberOf(BaseGrammar):
                     self._elements,
                     working_idx,
                     ctx,
+                    dispatch_table=dispatch_table,
                 )
 
             # Did we fail to match?
@@ -105,6 +105,8 @@ class Delimited(OneOf):
         delimiter_match: Optional[MatchResult] = None
 
         delimiter_matchers = [self.delimiter]
+        # Precomputed pruning of the content options, if the dialect has it.
+        dispatch_table = parse_context.dispatch_table(self)
         # NOTE: If the configured delimiter is in `parse_context.terminators` then
         # treat is _only_ as a delimiter and not as a terminator. This happens
         # frequently during nested comma expressions.
@@ -152,6 +154,7 @@ class Delimited(OneOf):
                     ),
                     idx=working_idx,
                     parse_context=ctx,
+                    dispatch_table=None if seeking_delimiter else dispatch_table,
                 )
 
             if not match:
@@ -1,15 +1,17 @@
 """The code for the Lexer."""
 
+import functools
 import logging
 from collections.abc import Iterator
-from typing import Any, NamedTuple, Optional, Union
+from typing import Any, NamedTuple, Optional, Union, cast
 from uuid import UUID, uuid4
 
 import regex
 
 from sqlfluff.core.config import FluffConfig
-from sqlfluff.core.errors import SQLLexError
+from sqlfluff.core.errors import SQLFluffUserError, SQLLexError
 from sqlfluff.core.helpers.slice import is_zero_slice, offset_slice, to_tuple
+from sqlfluff.core.parser.lexer_patterns import analyse_pattern, combine_patterns
 from sqlfluff.core.parser.markers import PositionMarker
 from sqlfluff.core.parser.segments import (
     BaseSegment,
@@ -24,6 +26,7 @@ from sqlfluff.core.parser.segments import (
     TemplateSegment,
     UnlexableSegment,
 )
+from sqlfluff.core.parser.token_store import TokenStore
 from sqlfluff.core.templaters import TemplatedFile
 from sqlfluff.core.templaters.base import TemplatedFileSlice
 
@@ -738,6 +741,128 @@ def _iter_segments(
         )
 
 
+def _unlexable_error(forward_string: str) -> SQLLexError:
+    """The error raised when not even the last resort lexer matches."""
+    return SQLLexError(
+        "Fatal. Unable to lex characters: {0!r}".format(
+            forward_string[:10] + "..." if len(forward_string) > 9 else forward_string
+        )
+    )
+
+
+class CompiledLexerMatchers:
+    """A list of lexer matchers, compiled so that they can be matched together.
+
+    Consecutive matchers are combined into a single regex with a named
+    group for each, which the regex module tries in order, so the first
+    matcher which matches wins (as it does when trying each in turn). The
+    regex is matched at an offset in the string, rather than slicing off
+    the rest of the string for each element.
+
+    Matchers which can't be combined (see
+    :mod:`~sqlfluff.core.parser.lexer_patterns`) are matched on their own,
+    in the same position in the order. Any which can't be matched at an
+    offset, or are of an unknown type, are matched against a slice of the
+    string, as they would be by the sequential engine.
+    """
+
+    def __init__(self, lexer_matchers: list[LexerType]) -> None:
+        # Each step is a list of matchers and a regex to match them all,
+        # or None if the (single) matcher must be matched against a slice.
+        self._steps: list[tuple[list[LexerType], Optional[regex.Pattern[str]]]] = []
+        run_matchers: list[LexerType] = []
+        run_patterns: list[str] = []
+        for matcher in lexer_matchers:
+            pattern, combinable = self._analyse(matcher)
+            if pattern is not None and combinable:
+                run_matchers.append(matcher)
+                run_patterns.append(pattern)
+                continue
+            self._add_step(run_matchers, run_patterns)
+            run_matchers, run_patterns = [], []
+            if pattern is not None:
+                self._add_step([matcher], [pattern])
+            else:
+                self._steps.append(([matcher], None))
+        self._add_step(run_matchers, run_patterns)
+
+    def _add_step(self, matchers: list[LexerType], patterns: list[str]) -> None:
+        if not patterns:
+            return
+        # NOTE: Single patterns aren't wrapped in a group, so that any
+        # references to their own groups are unaffected.
+        pattern = patterns[0] if len(patterns) == 1 else combine_patterns(patterns)
+        self._steps.append((matchers, regex.compile(pattern, regex.DOTALL)))
+
+    @staticmethod
+    def _analyse(matcher: LexerType) -> tuple[Optional[str], bool]:
+        """Get a pattern to match a matcher at an offset, if there is one.
+
+        Returns:
+            :obj:`tuple` of the pattern (or None if the matcher can't be
+            matched at an offset) and whether it can be combined with
+            other patterns.
+        """
+        # NOTE: Subclasses may override how matching works, so only the
+        # built in classes are compiled.
+        if type(matcher) is StringLexer:
+            return regex.escape(matcher.template), True
+        if type(matcher) is RegexLexer:
+            info = analyse_pattern(matcher.template)
+            if info.offset_safe:
+                return info.pattern, info.combinable
+        return None, False
+
+    def match(self, string: str, pos: int) -> Optional[LexedElement]:
+        """Match the first matcher which matches at a position in a string."""
+        for matchers, compiled in self._steps:
+            if compiled is None:
+                element = matchers[0]._match(string[pos:])
+                if element:
+                    return element
+                continue
+            match = compiled.match(string, pos)
+            if not match:
+                continue
+            idx = int(cast(str, match.lastgroup)[1:]) if len(matchers) > 1 else 0
+            if match.end() > pos:
+                return LexedElement(match.group(), matchers[idx])
+            # Zero length matches don't count, so try the rest of this step
+            # in turn (which will also log a warning).
+            for matcher in matchers[idx:]:
+                element = matcher._match(string[pos:])
+                if element:
+                    return element
+        return None
+
+    def lex(
+        self, string: str, last_resort: "CompiledLexerMatchers"
+    ) -> list[LexedElement]:
+        """Lex a whole string, falling back on a last resort where necessary.
+
+        Raises:
+            SQLLexError: If not even the last resort matches.
+        """
+        elements: list[LexedElement] = []
+        pos = 0
+        while pos < len(string):
+            element = self.match(string, pos) or last_resort.match(string, pos)
+            if not element:  # pragma: no cover
+                # If we STILL can't match, then just panic out.
+                raise _unlexable_error(string[pos:])
+            elements += element.matcher._subdivide(element)
+            pos += len(element.raw)
+        return elements
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_lexer_matchers(
+    lexer_matchers: tuple[LexerType, ...],
+) -> CompiledLexerMatchers:
+    """Compile lexer matchers, caching the result for each dialect."""
+    return CompiledLexerMatchers(list(lexer_matchers))
+
+
 class PyLexer:
     """The Lexer class actually does the lexing step."""
 
@@ -762,6 +887,23 @@ class PyLexer:
             UnlexableSegment,
         )
 
+        # Select the lexing engine.
+        engine = self.config.get("python_lexer") or "compiled"
+        self._compiled_matchers: Optional[CompiledLexerMatchers] = None
+        self._compiled_last_resort: Optional[CompiledLexerMatchers] = None
+        if engine == "compiled":
+            self._compiled_matchers = _compile_lexer_matchers(
+                tuple(self.lexer_matchers)
+            )
+            self._compiled_last_resort = CompiledLexerMatchers(
+                [self.last_resort_lexer]
+            )
+        elif engine != "sequential":
+            raise SQLFluffUserError(
+                f"Unknown python_lexer {engine!r}. Expected 'compiled' or "
+                "'sequential'."
+            )
+
     def lex(
         self, raw: Union[str, TemplatedFile]
     ) -> tuple[tuple[BaseSegment, ...], list[SQLLexError]]:
@@ -771,6 +913,18 @@ class PyLexer:
         found something that we cannot lex. If that happens we should
         package it up as unlexable and keep track of the exceptions.
         """
+        store, violations = self.lex_tokens(raw)
+        return store.segments(), violations
+
+    def lex_tokens(
+        self, raw: Union[str, TemplatedFile]
+    ) -> tuple[TokenStore, list[SQLLexError]]:
+        """Take a string or TemplatedFile and return a store of its tokens.
+
+        As :meth:`lex`, but without converting the store to a tuple. The
+        python lexer creates the segments as it maps them to the template,
+        so they're all created up front.
+        """
         lexer_logger.info("Lexing file using PyLexer.")
         # Make sure we've got a string buffer and a template
         # regardless of what was passed in.
@@ -782,25 +936,12 @@ class PyLexer:
             str_buff = str(template)
 
         # Lex the string to get a tuple of LexedElement
-        element_buffer: list[LexedElement] = []
-        while True:
-            res = self.lex_match(str_buff, self.lexer_matchers)
-            element_buffer += res.elements
-            if res.forward_string:
-                resort_res = self.last_resort_lexer.match(res.forward_string)
-                if not resort_res:  # pragma: no cover
-                    # If we STILL can't match, then just panic out.
-                    raise SQLLexError(
-                        "Fatal. Unable to lex characters: {0!r}".format(
-                            res.forward_string[:10] + "..."
-                            if len(res.forward_string) > 9
-                            else res.forward_string
-                        )
-                    )
-                str_buff = resort_res.forward_string
-                element_buffer += resort_res.elements
-            else:  # pragma: no cover TODO?
-                break
+        if self._compiled_matchers and self._compiled_last_resort:
+            element_buffer = self._compiled_matchers.lex(
+                str_buff, self._compiled_last_resort
+            )
+        else:
+            element_buffer = self._lex_sequential(str_buff)
 
         # Map tuple LexedElement to list of TemplateElement.
         # This adds the template_slice to the object.
@@ -814,7 +955,24 @@ class PyLexer:
         # Generate any violations
         violations: list[SQLLexError] = self.violations_from_segments(segments)
 
-        return segments, violations
+        return TokenStore.from_segments(segments, template), violations
+
+    def _lex_sequential(self, str_buff: str) -> list[LexedElement]:
+        """Lex a string by trying each matcher in turn at each position."""
+        element_buffer: list[LexedElement] = []
+        while True:
+            res = self.lex_match(str_buff, self.lexer_matchers)
+            element_buffer += res.elements
+            if res.forward_string:
+                resort_res = self.last_resort_lexer.match(res.forward_string)
+                if not resort_res:  # pragma: no cover
+                    # If we STILL can't match, then just panic out.
+                    raise _unlexable_error(res.forward_string)
+                str_buff = resort_res.forward_string
+                element_buffer += resort_res.elements
+            else:  # pragma: no cover TODO?
+                break
+        return element_buffer
 
     def elements_to_segments(
         self, elements: list[TemplateElement], templated_file: TemplatedFile
@@ -930,14 +1088,30 @@ try:
     class PyRsLexer(RsLexer):
         """A wrapper around the sqlfluffrs lexer."""
 
+        def __init__(
+            self,
+            config: Optional[FluffConfig] = None,
+            last_resort_lexer: Optional[StringLexer] = None,
+            dialect: Optional[str] = None,
+        ):
+            # NOTE: The arguments are handled by RsLexer.__new__. Here we
+            # only need to know whether to keep the tokens on the segments,
+            # which take a lot of memory if the Rust parser won't use them.
+            # NB: We import here to avoid a circular import.
+            from sqlfluff.core.parser.rust_parser import rust_parser_enabled
+
+            self.keep_tokens = config is None or rust_parser_enabled(config)
+
         @staticmethod
         def _tokens_to_segments(
-            tokens: list["RsToken"], py_template: TemplatedFile
+            tokens: list["RsToken"],
+            py_template: TemplatedFile,
+            keep_tokens: bool = True,
         ) -> tuple[BaseSegment, ...]:
             """Convert tokens to segments."""
             return tuple(
                 segment_types.get(token.type, RawSegment).from_rstoken(
-                    token, py_template
+                    token, py_template, keep_token=keep_tokens
                 )
                 for token in tokens
             )
@@ -946,6 +1120,17 @@ try:
             self, raw: Union[str, TemplatedFile]
         ) -> tuple[tuple[BaseSegment, ...], list[SQLLexError]]:
             """Take a string or TemplatedFile and return segments."""
+            store, violations = self.lex_tokens(raw)
+            return store.segments(), violations
+
+        def lex_tokens(
+            self, raw: Union[str, TemplatedFile]
+        ) -> tuple[TokenStore, list[SQLLexError]]:
+            """Take a string or TemplatedFile and return a store of its tokens.
+
+            The segments for the tokens are only created when they're first
+            accessed.
+            """
             lexer_logger.info("Lexing file using RsLexer.")
             tokens, errors = self._lex(raw)
             first_token = tokens[0]
@@ -960,7 +1145,9 @@ try:
             )
 
             return (
-                self._tokens_to_segments(tokens, py_template),
+                TokenStore.from_rstokens(
+                    tokens, py_template, segment_types, keep_tokens=self.keep_tokens
+                ),
                 [SQLLexError.from_rs_error(error) for error in errors],
             )
 
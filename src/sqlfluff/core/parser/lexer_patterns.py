@@ -0,0 +1,353 @@
+"""Analysis of lexer regexes, so they can be combined into a single regex.
+
+The compiled lexing engine (see :class:`~sqlfluff.core.parser.lexer.PyLexer`)
+matches lexer patterns at an offset within the whole string, rather than
+against the remainder of the string as the sequential engine does. Those
+are only equivalent for patterns which can't see anything before the
+offset, so each pattern is analysed here to check:
+
+* whether it can be matched at an offset at all. Patterns with look-behinds
+  or word boundaries which could be evaluated before consuming enough
+  characters could see the preceding text, which they wouldn't otherwise.
+  Anchors for the start of the string are rewritten as ``\\G`` (the start of
+  the match), which is equivalent.
+* whether it can be combined with other patterns into one alternation.
+  Patterns which refer to their own groups (e.g. backreferences or
+  recursion) can't be combined, and inline flags need to be scoped to the
+  pattern they apply to.
+
+The analysis is deliberately conservative: anything which isn't understood
+is treated as neither combinable nor safe to match at an offset, in which
+case the lexer falls back to slicing the string.
+"""
+
+import math
+from typing import NamedTuple, Union
+
+# Escapes which match exactly one character.
+_CHAR_ESCAPES = set("dDsSwWhHvVtnrfae.\\") | set("^$*+?()[]{}|/-'\"`#&~ ,;:=!<>@%")
+# Escapes for hex and unicode characters, and the number of digits they take.
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+# Inline flags which can be scoped to a group instead.
+_SCOPABLE_FLAGS = set("ims")
+
+# The nodes of a parsed pattern. Each is a tuple, starting with the kind.
+_Node = tuple
+
+
+class _UnsupportedPattern(Exception):
+    """Raised when a pattern uses syntax which isn't understood."""
+
+
+class PatternInfo(NamedTuple):
+    """The result of analysing a lexer pattern.
+
+    Args:
+        pattern (str): An equivalent pattern, with any anchors for the
+            start of the string rewritten and leading inline flags scoped.
+        combinable (bool): Whether the pattern can be included in an
+            alternation with other patterns.
+        offset_safe (bool): Whether matching the pattern at an offset within
+            a string is equivalent to matching it against the rest of the
+            string.
+    """
+
+    pattern: str
+    combinable: bool
+    offset_safe: bool
+
+
+class _PatternParser:
+    """A small recursive descent parser for regex patterns.
+
+    This only builds enough of a tree to work out the widths of each part
+    of the pattern, and where it could look behind the current position.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.idx = 0
+        # The rewritten pattern.
+        self.out: list[str] = []
+        self.combinable = True
+
+    def parse(self) -> _Node:
+        node = self._alternation()
+        if self.idx < len(self.pattern):
+            # An unbalanced closing bracket.
+            raise _UnsupportedPattern(self.pattern)
+        return node
+
+    def _peek(self, length: int = 1) -> str:
+        return self.pattern[self.idx : self.idx + length]
+
+    def _take(self, length: int = 1) -> str:
+        chunk = self.pattern[self.idx : self.idx + length]
+        self.idx += length
+        self.out.append(chunk)
+        return chunk
+
+    def _alternation(self) -> _Node:
+        branches = [self._sequence()]
+        while self._peek() == "|":
+            self._take()
+            branches.append(self._sequence())
+        return ("alt", branches) if len(branches) > 1 else branches[0]
+
+    def _sequence(self) -> _Node:
+        items = []
+        while self.idx < len(self.pattern) and self._peek() not in "|)":
+            items.append(self._quantified(self._atom()))
+        return ("seq", items)
+
+    def _quantified(self, node: _Node) -> _Node:
+        char = self._peek()
+        if char in ("*", "+", "?"):
+            self._take()
+            low, high = {"*": (0, math.inf), "+": (1, math.inf), "?": (0, 1)}[char]
+        elif char == "{" and self._is_repeat():
+            end = self.pattern.index("}", self.idx)
+            body = self._take(end + 1 - self.idx)[1:-1]
+            low_str, comma, high_str = body.partition(",")
+            low = int(low_str or 0)
+            high: Union[int, float] = low
+            if comma:
+                high = int(high_str) if high_str else math.inf
+        else:
+            return node
+        # Lazy or possessive modifiers.
+        if self._peek() in ("?", "+"):
+            self._take()
+        return ("repeat", node, low, high)
+
+    def _is_repeat(self) -> bool:
+        end = self.pattern.find("}", self.idx)
+        if end == -1:
+            return False
+        body = self.pattern[self.idx + 1 : end]
+        return bool(body) and all(c.isdigit() or c == "," for c in body)
+
+    def _atom(self) -> _Node:
+        char = self._peek()
+        if char == "(":
+            return self._group()
+        if char == "[":
+            self._char_class()
+            return ("char",)
+        if char == "\\":
+            return self._escape()
+        if char == "^":
+            # NOTE: Without the MULTILINE flag, this only matches at the
+            # start of the string, which is the start of the match.
+            self.idx += 1
+            self.out.append("\\G")
+            return ("start",)
+        if char == "$":
+            self._take()
+            return ("empty",)
+        if char in ("*", "+", "?", "{"):
+            raise _UnsupportedPattern(self.pattern)
+        self._take()
+        return ("char",)
+
+    def _escape(self) -> _Node:
+        char = self.pattern[self.idx + 1 : self.idx + 2]
+        if not char:
+            raise _UnsupportedPattern(self.pattern)
+        if char in ("A", "G"):
+            self.idx += 2
+            self.out.append("\\G")
+            return ("start",)
+        if char in ("b", "B"):
+            self._take(2)
+            return ("boundary",)
+        if char in ("Z", "z"):
+            self._take(2)
+            return ("empty",)
+        if char in _HEX_ESCAPES:
+            self._take(2 + _HEX_ESCAPES[char])
+            return ("char",)
+        if char in ("p", "P", "N") and self.pattern[self.idx + 2 : self.idx + 3] == "{":
+            self._take(self.pattern.index("}", self.idx) + 1 - self.idx)
+            return ("char",)
+        if char == "0":
+            self._take(2)
+            while self._peek().isdigit():
+                self._take()
+            return ("char",)
+        if char.isdigit() or char in ("g", "k"):
+            # A backreference, which refers to a group by number or name.
+            self.combinable = False
+            self._take(2)
+            if self._peek() in ("<", "{"):
+                closer = ">" if self._peek() == "<" else "}"
+                self._take(self.pattern.index(closer, self.idx) + 1 - self.idx)
+            else:
+                while self._peek().isdigit():
+                    self._take()
+            return ("any",)
+        if char in _CHAR_ESCAPES:
+            self._take(2)
+            return ("char",)
+        raise _UnsupportedPattern(self.pattern)
+
+    def _char_class(self) -> None:
+        # NOTE: Character classes always match a single character, so we
+        # only need to find the end of them. Without the V1 flag, sets
+        # can't be nested, so an opening bracket within one is literal.
+        self._take()
+        if self._peek() == "^":
+            self._take()
+        if self._peek() == "]":
+            self._take()
+        while True:
+            char = self._peek()
+            if not char:
+                raise _UnsupportedPattern(self.pattern)
+            if char == "\\":
+                self._take(2)
+            elif self._peek(2) == "[:":
+                # A POSIX character class, e.g. [[:alpha:]].
+                self._take(self.pattern.index(":]", self.idx) + 2 - self.idx)
+            elif char == "]":
+                self._take()
+                return
+            else:
+                self._take()
+
+    def _group(self) -> _Node:
+        self._take()
+        kind = "group"
+        if self._peek() == "?":
+            prefix = self.pattern[self.idx + 1 : self.idx + 3]
+            if prefix[:1] in (":", ">"):
+                self._take(2)
+            elif prefix[:1] in ("=", "!"):
+                self._take(2)
+                kind = "lookahead"
+            elif prefix in ("<=", "<!"):
+                self._take(3)
+                kind = "lookbehind"
+            elif prefix[:1] == "#":
+                end = self.pattern.index(")", self.idx)
+                self._take(end + 1 - self.idx)
+                return ("empty",)
+            elif prefix[:1] == "R":
+                # Recursion. The pattern is re-entered at this point, so
+                # it can only look behind here if it can at the start.
+                self.combinable = False
+                self._take(3)
+                return ("recurse",)
+            elif prefix[:1].isalpha() or prefix[:1] == "-":
+                end = self.idx + 1
+                while self.pattern[end].isalpha() or self.pattern[end] == "-":
+                    end += 1
+                flags = self.pattern[self.idx + 1 : end]
+                if not set(flags) <= _SCOPABLE_FLAGS:
+                    raise _UnsupportedPattern(self.pattern)
+                if self.pattern[end] == ":":
+                    self._take(end + 1 - self.idx)
+                else:
+                    # Inline flags for the rest of the pattern. These are
+                    # handled by `analyse_pattern` at the very start, but
+                    # not elsewhere.
+                    raise _UnsupportedPattern(self.pattern)
+            else:
+                # Named groups, conditionals, branch resets etc.
+                raise _UnsupportedPattern(self.pattern)
+        node = self._alternation()
+        if self._peek() != ")":
+            raise _UnsupportedPattern(self.pattern)
+        self._take()
+        return (kind, node)
+
+
+def _width(node: _Node) -> tuple[Union[int, float], Union[int, float]]:
+    """The minimum and maximum number of characters a node can match."""
+    kind = node[0]
+    if kind == "char":
+        return 1, 1
+    if kind in ("empty", "start", "boundary", "lookahead", "lookbehind"):
+        return 0, 0
+    if kind in ("any", "recurse"):
+        return 0, math.inf
+    if kind == "group":
+        return _width(node[1])
+    if kind == "repeat":
+        low, high = _width(node[1])
+        return low * node[2], (high * node[3] if high else 0)
+    widths = [_width(child) for child in node[1]]
+    if kind == "seq":
+        return sum(w[0] for w in widths), sum(w[1] for w in widths)
+    # Alternation
+    return min(w[0] for w in widths), max(w[1] for w in widths)
+
+
+def _looks_behind(node: _Node, consumed: Union[int, float]) -> bool:
+    """Whether a node could look behind the start of the match.
+
+    Args:
+        node: The node to check.
+        consumed: The minimum number of characters consumed before
+            reaching this node.
+    """
+    kind = node[0]
+    if kind == "boundary":
+        return consumed < 1
+    if kind == "lookbehind":
+        return consumed < _width(node[1])[1]
+    if kind in ("group", "lookahead", "repeat"):
+        return _looks_behind(node[1], consumed)
+    if kind == "seq":
+        for child in node[1]:
+            if _looks_behind(child, consumed):
+                return True
+            consumed += _width(child)[0]
+        return False
+    if kind == "alt":
+        return any(_looks_behind(child, consumed) for child in node[1])
+    # NOTE: Recursion re-enters the whole pattern, having consumed at least
+    # as much as at the start, so it only looks behind if the rest of the
+    # pattern does.
+    return False
+
+
+def analyse_pattern(pattern: str) -> PatternInfo:
+    """Analyse a lexer pattern, to work out how it can be matched.
+
+    Args:
+        pattern (str): The regex pattern of a lexer, as compiled by the
+            regex module with the DOTALL flag.
+
+    Returns:
+        :obj:`PatternInfo`: An equivalent pattern and how it can be used.
+    """
+    # Leading inline flags apply to the whole pattern, so scope them
+    # to it.
+    leading_flags = ""
+    body = pattern
+    if body.startswith("(?") and ")" in body:
+        flags = body[2 : body.index(")")]
+        if flags and flags.isalpha():
+            if not set(flags) <= _SCOPABLE_FLAGS:
+                return PatternInfo(pattern, False, False)
+            leading_flags = flags
+            body = body[body.index(")") + 1 :]
+    parser = _PatternParser(body)
+    try:
+        tree = parser.parse()
+    except (_UnsupportedPattern, ValueError, IndexError):
+        return PatternInfo(pattern, False, False)
+    rewritten = "".join(parser.out)
+    if leading_flags:
+        rewritten = f"(?{leading_flags}:{rewritten})"
+    return PatternInfo(rewritten, parser.combinable, not _looks_behind(tree, 0))
+
+
+def combine_patterns(patterns: list[str]) -> str:
+    """Combine patterns into one alternation, with a named group for each.
+
+    The groups are named ``_0``, ``_1`` etc. in order, so that the pattern
+    which matched can be found from ``Match.lastgroup``.
+    """
+    return "|".join(f"(?P<_{idx}>{pattern})" for idx, pattern in enumerate(patterns))
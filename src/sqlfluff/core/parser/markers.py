@@ -14,7 +14,9 @@ if TYPE_CHECKING:  # pragma: no cover
     from sqlfluffrs import RsPositionMarker
 
 
-@dataclass(frozen=True)
+# NOTE: There's one of these for every segment, so we use slots to save the
+# memory of an instance dict.
+@dataclass(frozen=True, slots=True)
 class PositionMarker:
     """A reference to a position in a file.
 
@@ -39,6 +41,14 @@ class PositionMarker:
     working_line_pos: int = -1
 
     def __post_init__(self) -> None:
+        # Outside of templated sections, the source and templated slices
+        # are usually the same, in which case we share one slice between
+        # them to save memory.
+        if (
+            self.source_slice == self.templated_slice
+            and self.source_slice is not self.templated_slice
+        ):
+            object.__setattr__(self, "source_slice", self.templated_slice)
         # If the working position has not been explicitly set
         # then infer it from the position in the templated file.
         # This is accurate up until the point that any fixes have
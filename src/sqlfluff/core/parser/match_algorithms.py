@@ -6,7 +6,7 @@ or BaseGrammar to un-bloat those classes.
 
 from collections import defaultdict
 from collections.abc import Sequence
-from typing import DefaultDict, Optional, cast
+from typing import TYPE_CHECKING, DefaultDict, Optional, cast
 
 from sqlfluff.core.errors import SQLParseError
 from sqlfluff.core.parser.context import ParseContext
@@ -14,6 +14,9 @@ from sqlfluff.core.parser.match_result import MatchResult
 from sqlfluff.core.parser.matchable import Matchable
 from sqlfluff.core.parser.segments import BaseSegment, BracketedSegment, Dedent, Indent
 
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.dispatch import DispatchTable
+
 
 def skip_start_index_forward_to_code(
     segments: Sequence[BaseSegment], start_idx: int, max_idx: Optional[int] = None
@@ -83,11 +86,16 @@ def prune_options(
     segments: Sequence[BaseSegment],
     parse_context: ParseContext,
     start_idx: int = 0,
+    dispatch_table: Optional["DispatchTable"] = None,
 ) -> list[Matchable]:
     """Use the simple matchers to prune which options to match on.
 
     Works in the context of a grammar making choices between options
     such as AnyOf or the content of Delimited.
+
+    If a `dispatch_table` for the options is provided, then the pruned
+    options are looked up from that rather than evaluating the simple
+    matchers of each option.
     """
     available_options = []
     prune_buff = []
@@ -100,6 +108,12 @@ def prune_options(
         return list(options)
     first_raw, first_types = first
 
+    if dispatch_table:
+        parse_context.increment("prune_dispatch_lookups")
+        parse_context.increment("prune_evaluations_skipped", len(options))
+        return dispatch_table.select(first_raw, first_types)
+    parse_context.increment("prune_evaluations", len(options))
+
     for opt in options:
         simple = opt.simple(parse_context=parse_context)
         if simple is None:
@@ -142,6 +156,7 @@ def longest_match(
     matchers: Sequence[Matchable],
     idx: int,
     parse_context: ParseContext,
+    dispatch_table: Optional["DispatchTable"] = None,
 ) -> tuple[MatchResult, Optional[Matchable]]:
     """Return longest match from a selection of matchers.
 
@@ -166,7 +181,8 @@ def longest_match(
     The things which determine the performance of this method are:
     1. Pruning. This method uses `prune_options()` to filter down which matchable
         options proceed to the full matching step. Ideally only very few do and this
-        can handle the majority of the filtering.
+        can handle the majority of the filtering. If the matchers are the options
+        of a grammar, the `dispatch_table` for that grammar makes this a lookup.
     2. Caching. This method uses the parse cache (`check_parse_cache` and
         `put_parse_cache`) on the ParseContext to speed up repetitive matching
         operations. As we make progress through a file there will often not be a
@@ -192,7 +208,11 @@ def longest_match(
     # some complexity from this function so that we just take the first segment.
     # Maybe that's just small potatoes though.
     available_options = prune_options(
-        matchers, segments, parse_context=parse_context, start_idx=idx
+        matchers,
+        segments,
+        parse_context=parse_context,
+        start_idx=idx,
+        dispatch_table=dispatch_table,
     )
 
     # If no available options, return no match.
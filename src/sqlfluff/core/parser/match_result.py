@@ -112,6 +112,26 @@ class MatchResult:
         """Create an empty match at a particular index."""
         return cls(slice(idx, idx))
 
+    def shifted(self, offset: int) -> "MatchResult":
+        """Return a copy of this match, moved along by a number of segments.
+
+        This allows a match to be reused for an identical run of segments
+        at a different position.
+        """
+        if not offset:
+            return self
+        return MatchResult(
+            matched_slice=slice(
+                self.matched_slice.start + offset, self.matched_slice.stop + offset
+            ),
+            matched_class=self.matched_class,
+            segment_kwargs=self.segment_kwargs,
+            insert_segments=tuple(
+                (idx + offset, seg) for idx, seg in self.insert_segments
+            ),
+            child_matches=tuple(child.shifted(offset) for child in self.child_matches),
+        )
+
     def is_better_than(self, other: "MatchResult") -> bool:
         """A match is better compared on length."""
         return len(self) > len(other)
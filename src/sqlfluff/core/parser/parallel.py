@@ -0,0 +1,272 @@
+"""Matching the statements of a single large file in parallel.
+
+Parallelism in the runner is per file, so a single very large file (e.g. a
+dump of DDL or a bundle of migrations) is parsed on one core. Statements at
+the top level of a file are matched independently of each other, so the
+lexed segments can instead be split between statements, and each run of
+statements matched in a separate process.
+
+Files are only split at delimiters which can't be part of a statement:
+
+* The delimiter must be one of the `split_after_raws` of the root segment
+  of the dialect (e.g. ``;``, or ``GO`` in T-SQL), and be followed by a
+  newline before the next code. Delimiters which are words must also be
+  the first code on their line.
+* It mustn't be within brackets, a ``BEGIN``/``CASE`` ... ``END`` block or a
+  template block (e.g. ``{% if %}`` ... ``{% endif %}``).
+
+That's a heuristic, so the matches are checked before they're used. If any
+run of statements doesn't match completely, we return `None` and the file
+is matched as a whole as usual, which will then also report any unparsable
+sections in the normal way.
+"""
+
+import atexit
+import multiprocessing
+import multiprocessing.pool
+import signal
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Optional
+
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.match_result import MatchResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.parser.segments import BaseFileSegment, BaseSegment
+
+_OPENING_BRACKETS = frozenset(("(", "[", "{"))
+_CLOSING_BRACKETS = frozenset((")", "]", "}"))
+_BLOCK_OPENERS = frozenset(("BEGIN", "CASE"))
+# Code following BEGIN when it starts a transaction rather than a block.
+_TRANSACTION_KEYWORDS = frozenset(
+    (";", "TRANSACTION", "TRAN", "WORK", "DISTRIBUTED", "DEFERRED", "IMMEDIATE")
+)
+# Code following END when it closes a block which we don't count the start
+# of (e.g. `END IF`).
+_UNCOUNTED_BLOCK_ENDS = frozenset(("IF", "LOOP", "WHILE", "REPEAT", "FOR"))
+# The number of tasks per process, to balance runs of statements of
+# different sizes between the processes.
+_TASKS_PER_PROCESS = 2
+
+_pool: Optional[multiprocessing.pool.Pool] = None
+_pool_processes = 0
+
+
+def resolve_parse_processes(processes: int) -> int:
+    """Convert a `parse_processes` value into a number of processes.
+
+    As with `processes`, non-positive values are relative to the number
+    of cpus.
+    """
+    if processes <= 0:
+        return max(multiprocessing.cpu_count() + processes, 1)
+    return processes
+
+
+def _next_code_raw(segments: Sequence["BaseSegment"], idx: int) -> Optional[str]:
+    for _idx in range(idx, len(segments)):
+        if segments[_idx].is_code:
+            return segments[_idx].raw_upper
+    return None
+
+
+def split_statements(
+    segments: Sequence["BaseSegment"], root_segment: type["BaseFileSegment"]
+) -> list[int]:
+    """Find the indices at which a file can be split between statements.
+
+    Args:
+        segments (:obj:`Sequence` of :obj:`BaseSegment`): The lexed segments
+            of the file.
+        root_segment (:obj:`type` of :obj:`BaseFileSegment`): The root
+            segment of the dialect, which defines the delimiters.
+
+    Returns:
+        :obj:`list` of :obj:`int`: The index of the first code segment of
+        each statement (or batch) after the first, in order.
+    """
+    split_raws = root_segment.split_after_raws
+    if not split_raws:
+        return []
+    splits: list[int] = []
+    bracket_depth = 0
+    block_depth = 0
+    template_depth = 0
+    # Whether there's been a newline since the last code segment.
+    newline_before = True
+    # Whether the last code segment was a delimiter we could split after,
+    # and whether there's been a newline since.
+    after_delimiter = False
+    newline_after = False
+    for idx, segment in enumerate(segments):
+        if not segment.is_code:
+            if segment.is_type("newline"):
+                newline_before = True
+                newline_after = True
+            block_type = getattr(segment, "block_type", None)
+            if block_type == "block_start":
+                template_depth += 1
+            elif block_type == "block_end":
+                template_depth = max(template_depth - 1, 0)
+            continue
+        if after_delimiter and newline_after:
+            splits.append(idx)
+        raw = segment.raw_upper
+        if raw in _OPENING_BRACKETS:
+            bracket_depth += 1
+        elif raw in _CLOSING_BRACKETS:
+            bracket_depth = max(bracket_depth - 1, 0)
+        elif raw in _BLOCK_OPENERS:
+            if raw != "BEGIN" or (
+                _next_code_raw(segments, idx + 1) not in _TRANSACTION_KEYWORDS
+            ):
+                block_depth += 1
+        elif raw == "END":
+            if _next_code_raw(segments, idx + 1) not in _UNCOUNTED_BLOCK_ENDS:
+                block_depth = max(block_depth - 1, 0)
+        after_delimiter = (
+            raw in split_raws
+            and not (bracket_depth or block_depth or template_depth)
+            # Delimiters which are words must start a line.
+            and (newline_before or not raw.isalpha())
+        )
+        newline_before = False
+        newline_after = False
+    return splits
+
+
+def _ignore_interrupts() -> None:  # pragma: no cover
+    """Leave the handling of interrupts to the parent process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _create_pool(processes: int) -> multiprocessing.pool.Pool:
+    # NOTE: As in the runner, we use "spawn" on all platforms.
+    return multiprocessing.get_context("spawn").Pool(
+        processes=processes, initializer=_ignore_interrupts
+    )
+
+
+def _get_pool(processes: int) -> multiprocessing.pool.Pool:
+    """Get a process pool, which is kept between files."""
+    global _pool, _pool_processes
+    if _pool is None or _pool_processes != processes:
+        close_pool()
+        _pool = _create_pool(processes)
+        _pool_processes = processes
+    return _pool
+
+
+def close_pool() -> None:
+    """Shut down the process pool, if there is one."""
+    global _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+
+
+atexit.register(close_pool)
+
+
+def match_statements(
+    segments: tuple["BaseSegment", ...],
+    root_segment: type["BaseFileSegment"],
+    parse_context: ParseContext,
+) -> Optional[MatchResult]:
+    """Match some statements at the top level of a file.
+
+    Args:
+        segments (:obj:`tuple` of :obj:`BaseSegment`): The segments to
+            match, which may start and end with non-code.
+        root_segment (:obj:`type` of :obj:`BaseFileSegment`): The root
+            segment of the dialect.
+        parse_context (:obj:`ParseContext`): The context to match in.
+
+    Returns:
+        :obj:`MatchResult`: The match, or `None` unless it covers all the
+        code in the segments.
+    """
+    code_idxs = [idx for idx, segment in enumerate(segments) if segment.is_code]
+    if not code_idxs:
+        return None  # pragma: no cover
+    start_idx, end_idx = code_idxs[0], code_idxs[-1] + 1
+    assert root_segment.match_grammar
+    match = root_segment.match_grammar.match(
+        segments[:end_idx], start_idx, parse_context
+    )
+    if match.matched_slice != slice(start_idx, end_idx):
+        return None
+    return match
+
+
+def _match_statements_task(
+    task: tuple["FluffConfig", tuple["BaseSegment", ...]],
+) -> Optional[MatchResult]:  # pragma: no cover
+    """Match a run of statements in a worker process."""
+    config, segments = task
+    return match_statements(
+        segments,
+        config.get("dialect_obj").get_root_segment(),
+        # NOTE: Each run is matched with a fresh context, as it would be at
+        # the start of a file.
+        ParseContext.from_config(config),
+    )
+
+
+def parallel_match(
+    segments: tuple["BaseSegment", ...],
+    config: "FluffConfig",
+    processes: int,
+    parse_context: ParseContext,
+    fname: Optional[str] = None,
+) -> Optional[MatchResult]:
+    """Match the code of a file by splitting it between processes.
+
+    Args:
+        segments (:obj:`tuple` of :obj:`BaseSegment`): The lexed segments
+            of the file.
+        config (:obj:`FluffConfig`): The config to parse with, which is
+            sent to each process.
+        processes (:obj:`int`): The number of processes to use.
+        parse_context (:obj:`ParseContext`): The context of the file as
+            a whole, for statistics.
+        fname (:obj:`str`, optional): The name of the file, for logging.
+
+    Returns:
+        :obj:`MatchResult`: A match of the code in the file (i.e. from its
+        first code segment to its last), as the root segment of the dialect
+        would match it. `None` if the file couldn't be split, or the
+        statements didn't all match.
+    """
+    root_segment = config.get("dialect_obj").get_root_segment()
+    splits = split_statements(segments, root_segment)
+    if not splits:
+        return None
+    # Group the statements into runs of roughly equal numbers of segments.
+    # NOTE: Each task includes the segments it matches, which pickle with
+    # the templated file, so we keep the number of tasks small.
+    target = len(segments) / min(processes * _TASKS_PER_PROCESS, len(splits) + 1)
+    bounds = [0]
+    for split in splits:
+        if split - bounds[-1] >= target:
+            bounds.append(split)
+    bounds.append(len(segments))
+    tasks = [
+        (config, segments[start:stop]) for start, stop in zip(bounds, bounds[1:])
+    ]
+    parse_context.increment("parallel_parse_tasks", len(tasks))
+    matches = _get_pool(processes).map(_match_statements_task, tasks, chunksize=1)
+
+    combined = MatchResult.empty_at(0)
+    for match, start in zip(matches, bounds):
+        if match is None:
+            parse_context.logger.info(
+                "Parallel match failed for a run of statements in %s. Parsing "
+                "the whole file again sequentially.",
+                fname or "<string>",
+            )
+            return None
+        combined = combined.append(match.shifted(start))
+    return combined
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, Optional
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.helpers import check_still_complete
+from sqlfluff.core.parser.parallel import parallel_match, resolve_parse_processes
+from sqlfluff.core.plugin.host import is_main_process
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.parser.segments import BaseFileSegment, BaseSegment
@@ -45,11 +47,28 @@ class Parser:
         # instantiation.
         ctx = ParseContext.from_config(config=self.config)
         ctx.seed_parse_nodes(len(segments))
+        # Large files can be split between statements, and matched in
+        # parallel. That's only done from the main process, because the
+        # workers of the parallel runners can't start processes of their own.
+        match = None
+        parse_processes = resolve_parse_processes(self.config.get("parse_processes"))
+        if (
+            parse_processes > 1
+            and is_main_process.get()
+            and len(segments) >= self.config.get("parse_split_min_segments")
+        ):
+            match = parallel_match(
+                tuple(segments),
+                self.config,
+                parse_processes,
+                parse_context=ctx,
+                fname=fname,
+            )
         # Kick off parsing with the root segment. The BaseFileSegment has
         # a unique entry point to facilitate exactly this. All other segments
         # will use the standard .match() route.
         root = self.RootSegment.root_parse(
-            tuple(segments), fname=fname, parse_context=ctx
+            tuple(segments), fname=fname, parse_context=ctx, match=match
         )
 
         # Basic Validation, that we haven't dropped anything.
@@ -65,6 +84,13 @@ class Parser:
                 if key == "next_counts":
                     continue
                 ctx.logger.warning(f"{key}: {ctx.parse_stats[key]}")
+            _shape_lookups = ctx.parse_stats.get("shape_cache_hits", 0)
+            _shape_lookups += ctx.parse_stats.get("shape_cache_misses", 0)
+            if _shape_lookups:
+                ctx.logger.warning(
+                    "shape_cache_hit_rate: "
+                    f"{ctx.parse_stats.get('shape_cache_hits', 0) / _shape_lookups:.1%}"
+                )
             ctx.logger.warning("## Tokens following un-terminated matches")
             ctx.logger.warning(
                 "Adding terminator clauses to catch these may improve performance."
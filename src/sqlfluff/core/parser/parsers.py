@@ -326,13 +326,18 @@ class RegexParser(BaseParser):
 
         NOTE: This method's case sensitivity is based on objects ignore_case property
         """
-        _raw = segments[idx].raw_upper if self.ignore_case else segments[idx].raw
+        if self.matches_raw(segments[idx]):
+            return self._match_at(idx)
+        return MatchResult.empty_at(idx)
+
+    def matches_raw(self, segment: "BaseSegment") -> bool:
+        """Whether the raw of a segment matches this parser."""
+        _raw = segment.raw_upper if self.ignore_case else segment.raw
         result = self._template.match(_raw)
         if result:
             result_string = result.group(0)
             # Check that we've fully matched
             if result_string == _raw:
                 # Check that the anti_template (if set) hasn't also matched
-                if not self.anti_template or not self._anti_template.match(_raw):
-                    return self._match_at(idx)
-        return MatchResult.empty_at(idx)
+                return not self.anti_template or not self._anti_template.match(_raw)
+        return False
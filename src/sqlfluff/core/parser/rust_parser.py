@@ -13,6 +13,7 @@ double-counting issues.
 import functools
 import logging
 import os
+import threading
 import time
 from collections import defaultdict
 from typing import TYPE_CHECKING, Any, Optional, Union
@@ -20,6 +21,7 @@ from typing import TYPE_CHECKING, Any, Optional, Union
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.errors import SQLParseError
 from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.markers import PositionMarker
 from sqlfluff.core.parser.match_result import MatchResult, _get_point_pos_at_idx
 from sqlfluff.core.parser.segments import (
     BaseFileSegment,
@@ -30,8 +32,11 @@ from sqlfluff.core.parser.segments import (
     TemplateSegment,
     UnparsableSegment,
 )
+from sqlfluff.core.parser.token_store import TokenStore
 
 if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluffrs import RsTree
+
     from sqlfluff.core.dialects.base import Dialect
 
 # Instantiate the parser logger
@@ -109,6 +114,33 @@ def get_native_ast() -> bool:
     return _NATIVE_AST_ENABLED
 
 
+# --- Parser reuse ---------------------------------------------------------------
+# Constructing a RustParser (and the RsParser within it) costs far more than
+# parsing a small file, but the parser only depends on a handful of config
+# values. RustParser.from_config() therefore reuses parsers with the same
+# settings. They're kept per thread, because a single RsParser can't safely be
+# used from several threads at once.
+_RUST_PARSER_CACHE_SIZE = 16
+_rust_parser_cache = threading.local()
+
+
+def _rust_parser_key(config: FluffConfig) -> tuple[Any, ...]:
+    """The config values which a RustParser depends on."""
+    indent_config = config.get_section("indentation") or {}
+    return (
+        config.get("dialect"),
+        # NOTE: The dialect object itself, in case it's not the one which
+        # would be loaded by name.
+        id(config.get("dialect_obj")),
+        tuple(sorted((k, repr(v)) for k, v in indent_config.items())),
+        config.get("max_parse_depth"),
+        config.get("max_parse_nodes"),
+        config.get("rust_parser_max_iterations"),
+        config.get("rust_parser_warn_threshold"),
+        config.get("rust_parser_lazy_tree"),
+    )
+
+
 try:
     from sqlfluffrs import (
         MISSING_REF_PREFIX,
@@ -186,10 +218,31 @@ try:
                 max_parse_depth=max_parse_depth,
                 max_parse_nodes=max_parse_nodes,
             )
+            self._lazy_tree = bool(self.config.get("rust_parser_lazy_tree"))
+
+        @classmethod
+        def from_config(cls, config: FluffConfig) -> "RustParser":
+            """Get a parser for a config, reusing an existing one if possible.
+
+            Parsers are reused for configs with the same dialect, indentation
+            config and parse limits. See ``_rust_parser_key``.
+            """
+            cache: Optional[dict[tuple[Any, ...], RustParser]] = getattr(
+                _rust_parser_cache, "parsers", None
+            )
+            if cache is None:
+                cache = _rust_parser_cache.parsers = {}
+            key = _rust_parser_key(config)
+            parser = cache.get(key)
+            if parser is None:
+                if len(cache) >= _RUST_PARSER_CACHE_SIZE:
+                    cache.clear()
+                parser = cache[key] = cls(config=config)
+            return parser
 
         def parse(
             self,
-            segments: tuple["BaseSegment", ...],
+            segments: Union[tuple["BaseSegment", ...], TokenStore],
             fname: Optional[str] = None,
             parse_statistics: bool = False,
         ) -> Optional["BaseSegment"]:
@@ -199,7 +252,9 @@ try:
             a MatchResult and Python's apply() builds the AST, avoiding double-counting.
 
             Args:
-                segments: Tuple of RawSegment objects from the lexer
+                segments: Tuple of RawSegment objects from the lexer, or a
+                    TokenStore from the Rust lexer, in which case its
+                    tokens are used directly.
                 fname: Optional filename for error reporting
                 parse_statistics: Whether to log parse statistics (not yet implemented)
                 tf: Optional TemplatedFile for position marker reconstruction
@@ -217,6 +272,11 @@ try:
                 if not segments:  # pragma: no cover
                     return None
 
+                # Tokens from the Rust lexer, if we have them all already.
+                rs_tokens = (
+                    segments.rs_tokens if isinstance(segments, TokenStore) else None
+                )
+
                 parse_context = ParseContext.from_config(config=self.config)
                 parse_context.seed_parse_nodes(len(segments))
 
@@ -246,25 +306,47 @@ try:
                 if _start_idx == _end_idx:
                     # No code segments - return FileSegment with just non-code
                     parse_context.increment_parse_nodes()
-                    return self.RootSegment(segments=segments, fname=fname)
+                    return self.RootSegment(segments=tuple(segments), fname=fname)
 
                 # Extract the original RsToken objects from the RawSegments
                 # PYTHON PARITY: Only parse the code portion (segments[_start_idx:_end_idx])
                 # Just like Python's match(segments[:_end_idx], _start_idx, ...)
-                tokens = self._extract_tokens_from_segments(
-                    segments[_start_idx:_end_idx]
+                tokens = (
+                    rs_tokens[_start_idx:_end_idx]
+                    if rs_tokens is not None
+                    else self._extract_tokens_from_segments(
+                        segments[_start_idx:_end_idx]
+                    )
                 )
 
                 # Parse using Rust parser to get MatchResult
                 # The Rust parser may raise RsParseError for certain parse errors (e.g.,
                 # missing closing brackets in terminators). We catch these and convert to
                 # SQLParseError. Regular parse errors are embedded in the MatchResult.
+                # NOTE: The Rust parser matches the whole input at once, so
+                # the shape cache can only reuse results for whole inputs.
+                shape_cache = parse_context.shape_cache
+                rs_match = (
+                    shape_cache.get_input(segments[_start_idx:_end_idx])
+                    if shape_cache
+                    else None
+                )
                 try:
-                    if _prof is not None:
-                        _ts = time.perf_counter()
-                    rs_match = self._rs_parser.parse_match_result_from_tokens(tokens)
-                    if _prof is not None:
-                        _prof["rust_core"] = time.perf_counter() - _ts
+                    if rs_match is not None:
+                        parse_context.increment("shape_cache_hits")
+                    else:
+                        if _prof is not None:
+                            _ts = time.perf_counter()
+                        rs_match = self._rs_parser.parse_match_result_from_tokens(
+                            tokens
+                        )
+                        if _prof is not None:
+                            _prof["rust_core"] = time.perf_counter() - _ts
+                        if shape_cache:
+                            parse_context.increment("shape_cache_misses")
+                            shape_cache.put_input(
+                                segments[_start_idx:_end_idx], rs_match
+                            )
                 except RsParseError as e:
                     # A dangling grammar ref surfaces with the MISSING_REF_PREFIX
                     # sentinel. Re-raise via the dialect's own ref() so both
@@ -288,105 +370,31 @@ try:
                         e, segments[_start_idx:_end_idx]
                     ) from e
 
-                # Build the BaseSegment tree from the Rust match result.
-                # PYTHON PARITY: only the code portion (segments[_start_idx:_end_idx])
-                # is passed, since match-result indices are relative to it.
-                code_segments = segments[_start_idx:_end_idx]
-                if _NATIVE_AST_ENABLED:
-                    # Fused path: instantiate segments directly from rs_match in a
-                    # single pass (no intermediate Python MatchResult tree).
-                    if _prof is not None:
-                        _ts = time.perf_counter()
-                    _matched = self._apply_rs_match_result(
-                        rs_match, code_segments, parse_context
-                    )
-                    if _prof is not None:
-                        _prof["apply"] = time.perf_counter() - _ts
-                else:
-                    # Legacy path: rebuild a Python MatchResult, then apply it.
-                    if _prof is not None:
-                        _ts = time.perf_counter()
-                    match = self._convert_rs_match_result(rs_match, code_segments)
-                    if _prof is not None:
-                        _prof["convert"] = time.perf_counter() - _ts
-                    parser_logger.info("Root Match:\n%s", match)
-
-                    if _prof is not None:
-                        _ts = time.perf_counter()
-                    _matched = match.apply(code_segments, parse_context=parse_context)
-                    if _prof is not None:
-                        _prof["apply"] = time.perf_counter() - _ts
-
-                # PYTHON PARITY: Add back any unmatched segments after the match.
-                # matched_slice/truthiness are read from rs_match so both build
-                # paths agree (mirrors MatchResult.matched_slice / __bool__).
-                _m_start, _m_stop = rs_match.matched_slice
-                _match_truthy = _m_stop > _m_start or bool(rs_match.insert_segments)
-                matched_stop = _start_idx + _m_stop
-                _unmatched = segments[matched_stop:_end_idx]
-
-                # PYTHON PARITY: If there are unmatched code segments, wrap them in
-                # UnparsableSegment. This matches the logic in FileSegment.root_parse()
-                content: tuple[BaseSegment, ...]
-                if not _match_truthy:
-                    parse_context.increment_parse_nodes()
-                    content = (
-                        UnparsableSegment(
-                            segments[_start_idx:_end_idx],
-                            expected=str(self.RootSegment.match_grammar),
-                        ),
-                    )
-                elif _unmatched:
-                    _idx = 0
-                    for idx, seg in enumerate(_unmatched):
-                        if seg.is_code:
-                            _idx = idx
-                            break
-                    else:  # pragma: no cover
-                        _idx = len(_unmatched)
-                    parse_context.increment_parse_nodes()
-                    content = (
-                        _matched
-                        + _unmatched[:_idx]
-                        + (
-                            UnparsableSegment(
-                                _unmatched[_idx:],
-                                expected="Nothing else in FileSegment.",
-                            ),
-                        )
-                    )
-                else:
-                    content = _matched + _unmatched
-
-                parse_context.increment_parse_nodes()
-                result = self.RootSegment(
-                    segments[:_start_idx] + content + segments[_end_idx:], fname=fname
-                )
-
                 # Build the mutable Rust arena tree (RsTree) from the MatchResult.
                 # This is the id-addressable façade tree (RsTree/RsHandle) used by
                 # Rust-side linting/fixing to avoid round-tripping through Python's
                 # segment tree.
+                rs_tree: Optional["RsTree"]
                 try:
                     # Extract leading non-code tokens (segments before _start_idx:
                     # whitespace/newlines at the start of the file) so the arena's
                     # flat raw list matches Python's raw_segments ordering exactly.
                     leading_tokens = (
-                        self._extract_tokens_from_segments(segments[:_start_idx])
-                        if _start_idx
-                        else []
+                        rs_tokens[:_start_idx]
+                        if rs_tokens is not None
+                        else self._extract_tokens_from_segments(segments[:_start_idx])
                     )
                     # Extract trailing non-code tokens (segments after _end_idx: newline,
                     # end_of_file, etc.) and include them in the arena so that the
                     # reflow/respace rules can correctly detect EOF and trailing newlines.
                     trailing_tokens = (
-                        self._extract_tokens_from_segments(segments[_end_idx:])
-                        if _end_idx < len(segments)
-                        else []
+                        rs_tokens[_end_idx:]
+                        if rs_tokens is not None
+                        else self._extract_tokens_from_segments(segments[_end_idx:])
                     )
                     if _prof is not None:
                         _ts = time.perf_counter()
-                    result._rs_tree = rs_match.apply_as_tree(
+                    rs_tree = rs_match.apply_as_tree(
                         tokens,
                         leading=leading_tokens,
                         trailing=trailing_tokens,
@@ -409,7 +417,46 @@ try:
                         " back to Python. Please report this as a bug with the SQL that"
                         " caused it."
                     )
-                    result._rs_tree = None
+                    rs_tree = None
+
+                # Build the BaseSegment tree from the Rust match result. In the
+                # lazy tree mode, the children of the file are only built when
+                # they're first accessed. Until then, the arena answers for the
+                # raw and the types within the file, so (for example) crawls
+                # for types which aren't in the file don't need them.
+                if (
+                    self._lazy_tree
+                    and rs_tree is not None
+                    and rs_tree.root.pos_marker is not None
+                ):
+                    # NOTE: The nodes are counted against the limit up front,
+                    # rather than as they're built.
+                    parse_context.increment_parse_nodes(
+                        max(len(rs_tree) - len(segments), 0)
+                    )
+                    parse_context.max_parse_nodes = 0
+                    result = self._lazy_root(
+                        rs_tree,
+                        rs_match,
+                        segments,
+                        _start_idx,
+                        _end_idx,
+                        parse_context,
+                        fname,
+                    )
+                else:
+                    result = self.RootSegment(
+                        self._build_file_segments(
+                            rs_match,
+                            segments,
+                            _start_idx,
+                            _end_idx,
+                            parse_context,
+                            _prof,
+                        ),
+                        fname=fname,
+                    )
+                result._rs_tree = rs_tree
 
                 # Accumulate this variant's per-stage timings into the profile
                 # (summing across rendered variants of the same source).
@@ -421,6 +468,9 @@ try:
                     print(
                         "Warning: parse_statistics not yet implemented for Rust parser"
                     )
+                    for key in ("shape_cache_hits", "shape_cache_misses"):
+                        if key in parse_context.parse_stats:
+                            print(f"{key}: {parse_context.parse_stats[key]}")
 
                 return result
             except SQLParseError as err:
@@ -436,6 +486,132 @@ try:
                         )
                 raise err
 
+        def _build_file_segments(
+            self,
+            rs_match: "RsMatchResult",
+            segments: Union[tuple["BaseSegment", ...], TokenStore],
+            start_idx: int,
+            end_idx: int,
+            parse_context: ParseContext,
+            prof: Optional[dict[str, float]],
+        ) -> tuple["BaseSegment", ...]:
+            """Build the children of the file segment from the Rust match result."""
+            _ts = 0.0
+            # PYTHON PARITY: only the code portion (segments[start_idx:end_idx])
+            # is passed, since match-result indices are relative to it.
+            code_segments = segments[start_idx:end_idx]
+            if _NATIVE_AST_ENABLED:
+                # Fused path: instantiate segments directly from rs_match in a
+                # single pass (no intermediate Python MatchResult tree).
+                if prof is not None:
+                    _ts = time.perf_counter()
+                _matched = self._apply_rs_match_result(
+                    rs_match, code_segments, parse_context
+                )
+                if prof is not None:
+                    prof["apply"] = time.perf_counter() - _ts
+            else:
+                # Legacy path: rebuild a Python MatchResult, then apply it.
+                if prof is not None:
+                    _ts = time.perf_counter()
+                match = self._convert_rs_match_result(rs_match, code_segments)
+                if prof is not None:
+                    prof["convert"] = time.perf_counter() - _ts
+                parser_logger.info("Root Match:\n%s", match)
+
+                if prof is not None:
+                    _ts = time.perf_counter()
+                _matched = match.apply(code_segments, parse_context=parse_context)
+                if prof is not None:
+                    prof["apply"] = time.perf_counter() - _ts
+
+            # PYTHON PARITY: Add back any unmatched segments after the match.
+            # matched_slice/truthiness are read from rs_match so both build
+            # paths agree (mirrors MatchResult.matched_slice / __bool__).
+            _m_start, _m_stop = rs_match.matched_slice
+            _match_truthy = _m_stop > _m_start or bool(rs_match.insert_segments)
+            matched_stop = start_idx + _m_stop
+            _unmatched = segments[matched_stop:end_idx]
+
+            # PYTHON PARITY: If there are unmatched code segments, wrap them in
+            # UnparsableSegment. This matches the logic in FileSegment.root_parse()
+            content: tuple[BaseSegment, ...]
+            if not _match_truthy:
+                parse_context.increment_parse_nodes()
+                content = (
+                    UnparsableSegment(
+                        segments[start_idx:end_idx],
+                        expected=str(self.RootSegment.match_grammar),
+                    ),
+                )
+            elif _unmatched:
+                _idx = 0
+                for idx, seg in enumerate(_unmatched):
+                    if seg.is_code:
+                        _idx = idx
+                        break
+                else:  # pragma: no cover
+                    _idx = len(_unmatched)
+                parse_context.increment_parse_nodes()
+                content = (
+                    _matched
+                    + _unmatched[:_idx]
+                    + (
+                        UnparsableSegment(
+                            _unmatched[_idx:],
+                            expected="Nothing else in FileSegment.",
+                        ),
+                    )
+                )
+            else:
+                content = _matched + _unmatched
+
+            parse_context.increment_parse_nodes()
+            return segments[:start_idx] + content + segments[end_idx:]
+
+        def _lazy_root(
+            self,
+            rs_tree: "RsTree",
+            rs_match: "RsMatchResult",
+            segments: Union[tuple["BaseSegment", ...], TokenStore],
+            start_idx: int,
+            end_idx: int,
+            parse_context: ParseContext,
+            fname: Optional[str],
+        ) -> BaseFileSegment:
+            """Create a file segment whose children are built on first access.
+
+            The raw, position and descendant types of the file are taken from
+            the root of the arena tree, which covers the same segments.
+            """
+            templated_file = (
+                segments.templated_file
+                if isinstance(segments, TokenStore)
+                else segments[0].pos_marker.templated_file
+            )
+            root = rs_tree.root
+            assert root.pos_marker is not None
+
+            def _build_segments() -> tuple["BaseSegment", ...]:
+                prof: Optional[dict[str, float]] = {} if _PROFILE_ENABLED else None
+                children = self._build_file_segments(
+                    rs_match, segments, start_idx, end_idx, parse_context, prof
+                )
+                if prof is not None:
+                    for _stage, _dur in prof.items():
+                        _PARSE_PROFILE[_stage] = _PARSE_PROFILE.get(_stage, 0.0) + _dur
+                return children
+
+            return self.RootSegment.from_lazy_segments(
+                _build_segments,
+                PositionMarker.from_rs_position_marker(
+                    root.pos_marker, templated_file
+                ),
+                fname=fname,
+                raw=root.raw,
+                descendant_type_set=frozenset(root.descendant_type_set()),
+            )
+
         @functools.lru_cache(maxsize=128)
         def _get_segment_class_by_name(
             self, segment_name: str
@@ -748,3 +924,14 @@ try:
 except ImportError:
     RustParser = None  # type: ignore[assignment, misc]
     _HAS_RUST_PARSER = False
+
+
+def rust_parser_enabled(config: FluffConfig) -> bool:
+    """Whether files linted with a config will be parsed by the Rust parser.
+
+    The Rust parser needs the original tokens from the Rust lexer, which
+    are otherwise discarded to save memory.
+    """
+    return RustParser is not None and config.get_section(
+        ["core", "use_rust_parser"]
+    ) in ("auto", "Auto", "AUTO", True, "True", "true", 1)
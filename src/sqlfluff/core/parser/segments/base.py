@@ -13,7 +13,7 @@ from __future__ import annotations
 
 import logging
 import weakref
-from collections.abc import Iterator, Sequence
+from collections.abc import Collection, Iterator, Sequence
 from dataclasses import dataclass
 from functools import cached_property
 from io import StringIO
@@ -35,10 +35,12 @@ from sqlfluff.core.parser.helpers import trim_non_code_segments
 from sqlfluff.core.parser.markers import PositionMarker
 from sqlfluff.core.parser.match_result import MatchResult
 from sqlfluff.core.parser.matchable import Matchable
+from sqlfluff.core.parser.segments.fingerprint import Fingerprint
 from sqlfluff.core.parser.types import SimpleHintType
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.dialects import Dialect
+    from sqlfluff.core.parser.segments.index import SegmentIndex
     from sqlfluff.core.parser.segments.raw import RawSegment
 
 # Instantiate the linter logger (only for use in methods involved with fixing.)
@@ -193,6 +195,9 @@ class BaseSegment(metaclass=SegmentMetaclass):
     # Can we allow it to be empty? Usually used in combination
     # with the can_start_end_non_code.
     allow_empty = False
+    # Can matches be reused for other runs of segments with the same
+    # shape? See `ParseShapeCache`. This is set for statements.
+    cache_match_by_shape = False
     # What other kwargs need to be copied when applying fixes.
     additional_kwargs: list[str] = []
     pos_marker: Optional[PositionMarker]
@@ -244,6 +249,10 @@ class BaseSegment(metaclass=SegmentMetaclass):
         # Tracker for matching when things start moving.
         # NOTE: We store a plain int so that it's swift for comparisons.
         d["uuid"] = uuid or get_next_id()
+        # NOTE: As for raw segments, set these now to keep them in the shared
+        # keys of the instance dict.
+        d["_parent"] = None
+        d["_parent_idx"] = None
 
         self.set_as_parent(recurse=False)
         self.validate_non_code_ends()
@@ -253,6 +262,13 @@ class BaseSegment(metaclass=SegmentMetaclass):
         try:
             if key in ("segments", "pos_marker"):
                 self._recalculate_caches()
+            if key == "segments":
+                # The index of the tree (if any) no longer matches the tree
+                # (see `BaseFileSegment`), and nor do the fingerprints of this
+                # segment and those it's within.
+                self._get_tree_root(drop_fingerprints=True).__dict__.pop(
+                    "_segment_index", None
+                )
 
         except (AttributeError, KeyError):  # pragma: no cover
             pass
@@ -400,6 +416,27 @@ class BaseSegment(metaclass=SegmentMetaclass):
             parts.append(seg.raw)
         return "".join(parts)
 
+    @property
+    def fingerprint(self) -> Fingerprint:
+        """A fingerprint of the raw and source fixes of this segment.
+
+        Unlike `raw` (or other cached properties), this is kept until the
+        children of the segment change (rather than until any position
+        changes, or the caches are invalidated), because it only depends on
+        raw segments, which don't change. See
+        :mod:`sqlfluff.core.parser.segments.fingerprint`.
+
+        NOTE: Plain loop, for the same stack-depth reason as is_code().
+        """
+        fingerprint: Optional[Fingerprint] = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            fingerprints = []
+            for seg in self.segments:
+                fingerprints.append(seg.fingerprint)
+            fingerprint = Fingerprint.concat(fingerprints)
+            self.__dict__["_fingerprint"] = fingerprint
+        return fingerprint
+
     @property
     def class_types(self) -> frozenset[str]:
         """The set of types for this segment."""
@@ -532,6 +569,7 @@ class BaseSegment(metaclass=SegmentMetaclass):
         cls,
         segments: tuple[BaseSegment, ...],
         parent_pos: PositionMarker,
+        reusable: Collection[int] = (),
     ) -> tuple[BaseSegment, ...]:
         """Refresh positions of segments within a span.
 
@@ -543,10 +581,17 @@ class BaseSegment(metaclass=SegmentMetaclass):
         New segments are assumed to be metas or insertions
         and so therefore have a zero-length position in the
         source and templated file.
+
+        Segments are copied, apart from any in `reusable` (by id) which
+        are already in the right position. Those are used as they are,
+        so they must be safe to share with another tree (i.e. nothing
+        within them has changed, so that their caches are still valid).
         """
         assert segments, "_position_segments called on empty sequence."
         line_no = parent_pos.working_line_no
         line_pos = parent_pos.working_line_pos
+        # The ids of the segments we've reused, so that none is used twice.
+        reused: set[int] = set()
 
         # Use the index so that we can look forward
         # and backward.
@@ -633,6 +678,14 @@ class BaseSegment(metaclass=SegmentMetaclass):
                 )
                 new_seg = segment.copy(segments=child_segments)
                 new_seg.pos_marker = new_position
+            elif (
+                segment.segments
+                and id(segment) in reusable
+                and id(segment) not in reused
+            ):
+                reused.add(id(segment))
+                segment_buffer += (segment,)
+                continue
             else:
                 new_seg = segment.copy()
                 new_seg.pos_marker = new_position
@@ -774,11 +827,22 @@ class BaseSegment(metaclass=SegmentMetaclass):
 
         assert cls.match_grammar, f"{cls.__name__} has no match grammar."
 
+        shape_cache = parse_context.shape_cache if cls.cache_match_by_shape else None
+        if shape_cache:
+            cached = shape_cache.get(cls, segments, idx, parse_context.terminators)
+            if cached:
+                parse_context.increment("shape_cache_hits")
+                return cached
+            parse_context.increment("shape_cache_misses")
+
         with parse_context.deeper_match(name=cls.__name__) as ctx:
             match = cls.match_grammar.match(segments, idx, ctx)
 
         # Wrap are return regardless of success.
-        return match.wrap(cls)
+        match = match.wrap(cls)
+        if shape_cache:
+            shape_cache.put(cls, segments, idx, parse_context.terminators, match)
+        return match
 
     # ################ PRIVATE INSTANCE METHODS
 
@@ -841,11 +905,50 @@ class BaseSegment(metaclass=SegmentMetaclass):
         if not self._parent:
             return None
         _parent = self._parent()
-        if not _parent or self not in _parent.segments:
+        if not _parent:
             return None
         assert self._parent_idx is not None
+        # NOTE: Check for this exact segment at its index first, which is
+        # much quicker than comparing it with each of the parent's children.
+        _siblings = _parent.segments
+        if not (
+            self._parent_idx < len(_siblings) and _siblings[self._parent_idx] is self
+        ) and (self not in _siblings):
+            return None
         return _parent, self._parent_idx
 
+    def _get_tree_root(self, drop_fingerprints: bool = False) -> BaseSegment:
+        """Get the root of the tree this segment is in.
+
+        Unlike `get_parent()`, this only follows the references to parents
+        which still have this exact segment at its index.
+
+        If `drop_fingerprints` is set, the fingerprints of the segments on
+        the way (i.e. this one and all of those it's within) are dropped,
+        e.g. because its children have changed.
+        """
+        segment = self
+        while True:
+            if drop_fingerprints:
+                segment.__dict__.pop("_fingerprint", None)
+            _parent = segment._parent() if segment._parent else None
+            _idx = segment._parent_idx
+            if (
+                _parent is None
+                or _idx is None
+                or _idx >= len(_parent.segments)
+                or _parent.segments[_idx] is not segment
+            ):
+                return segment
+            segment = _parent
+
+    def _get_segment_index(self) -> Optional[SegmentIndex]:
+        """Get the index of the tree, if this segment is the root of one.
+
+        Only file segments have an index (see `BaseFileSegment`).
+        """
+        return None
+
     def get_type(self) -> str:
         """Returns the type of this segment as a string."""
         return self.type
@@ -1054,6 +1157,10 @@ class BaseSegment(metaclass=SegmentMetaclass):
             for idx, seg in enumerate(self.segments):
                 copied_segments.append(seg.copy(parent=new_segment, parent_idx=idx))
             new_segment.segments = tuple(copied_segments)
+            # The copied children have the same content, so keep the
+            # fingerprint (if any).
+            if "_fingerprint" in self.__dict__:
+                new_segment.__dict__["_fingerprint"] = self.__dict__["_fingerprint"]
 
         return new_segment
 
@@ -1183,6 +1290,33 @@ class BaseSegment(metaclass=SegmentMetaclass):
         if isinstance(no_recursive_seg_type, str):
             no_recursive_seg_type = [no_recursive_seg_type]
 
+        # If the tree has an index, look up the segments rather than walking
+        # the tree. There's no need if there's nothing to find within self.
+        if not self.descendant_type_set.isdisjoint(seg_type):
+            index = self._get_tree_root()._get_segment_index()
+            position = index.position_of(self) if index else None
+            if index and position is not None:
+                yield from index.crawl(
+                    position,
+                    seg_type,
+                    recurse_into=recurse_into,
+                    no_recursive_seg_type=no_recursive_seg_type,
+                    allow_self=allow_self,
+                )
+                return None
+
+        yield from self._recursive_crawl(
+            seg_type, recurse_into, no_recursive_seg_type, allow_self
+        )
+
+    def _recursive_crawl(
+        self,
+        seg_type: tuple[str, ...],
+        recurse_into: bool,
+        no_recursive_seg_type: list[str] | None,
+        allow_self: bool = True,
+    ) -> Iterator[BaseSegment]:
+        """Recursively crawl for segments of a given type, without an index."""
         # Assuming there is a segment to be found, first check self (if allowed):
         if allow_self and self.is_type(*seg_type):
             match = True
@@ -1204,10 +1338,8 @@ class BaseSegment(metaclass=SegmentMetaclass):
                 # NOTE: Setting no_recursive_seg_type can significantly
                 # improve performance in many cases.
                 if not no_recursive_seg_type or not seg.is_type(*no_recursive_seg_type):
-                    yield from seg.recursive_crawl(
-                        *seg_type,
-                        recurse_into=recurse_into,
-                        no_recursive_seg_type=no_recursive_seg_type,
+                    yield from seg._recursive_crawl(
+                        seg_type, recurse_into, no_recursive_seg_type
                     )
 
     def path_to(self, other: BaseSegment) -> list[PathStep]:
@@ -1239,6 +1371,28 @@ class BaseSegment(metaclass=SegmentMetaclass):
         if not self.segments:
             return []
 
+        # If the tree has an index, look up the path.
+        index = self._get_tree_root()._get_segment_index()
+        if index:
+            start = index.position_of(self)
+            position = index.position_of(other)
+            path = (
+                index.path(start, position)
+                if start is not None and position is not None
+                else None
+            )
+            if path is not None:
+                steps = []
+                for _position, _idx in path:
+                    _seg = index.segments[_position]
+                    steps.append(
+                        PathStep(_seg, _idx, len(_seg.segments), _seg._code_indices)
+                    )
+                return steps
+            elif start is not None and position is not None:
+                # They're both in the tree, but `other` isn't within self.
+                return []
+
         # Identifying the highest parent we can using any preset parent values.
         midpoint = other
         lower_path = []
@@ -1339,47 +1493,56 @@ class BaseSegment(metaclass=SegmentMetaclass):
         max_parse_depth: int,
         max_parse_nodes: int = 0,
     ) -> bool:
-        """Checks correctness of new segment by re-parsing it."""
-        ctx = ParseContext(
-            dialect=dialect,
-            max_parse_depth=max_parse_depth,
-            max_parse_nodes=max_parse_nodes,
-        )
-        # We're going to check the rematch without any metas because the
-        # matching routines will assume they haven't already been added.
-        # We also strip any non-code from the ends which might have moved.
-        raw_content = tuple(s for s in self.raw_segments if not s.is_meta)
-        _, trimmed_content, _ = trim_non_code_segments(raw_content)
-        if not trimmed_content and self.can_start_end_non_code:
-            # Edge case for empty segments which are allowed to be empty.
-            return True
-        ctx.seed_parse_nodes(len(trimmed_content))
-        rematch = self.match(trimmed_content, 0, ctx)
-        if not rematch.matched_slice == slice(0, len(trimmed_content)):
+        """Checks correctness of new segment by re-parsing it.
+
+        NOTE: Re-parsing builds new segments around the raw segments of this
+        one (which become their children), and those are then thrown away.
+        So afterwards we set this segment (and those within it) as the parent
+        of its children again.
+        """
+        try:
+            ctx = ParseContext(
+                dialect=dialect,
+                max_parse_depth=max_parse_depth,
+                max_parse_nodes=max_parse_nodes,
+            )
+            # We're going to check the rematch without any metas because the
+            # matching routines will assume they haven't already been added.
+            # We also strip any non-code from the ends which might have moved.
+            raw_content = tuple(s for s in self.raw_segments if not s.is_meta)
+            _, trimmed_content, _ = trim_non_code_segments(raw_content)
+            if not trimmed_content and self.can_start_end_non_code:
+                # Edge case for empty segments which are allowed to be empty.
+                return True
+            ctx.seed_parse_nodes(len(trimmed_content))
+            rematch = self.match(trimmed_content, 0, ctx)
+            if not rematch.matched_slice == slice(0, len(trimmed_content)):
+                linter_logger.debug(
+                    f"Validation Check Fail for {self}.Incomplete Match. "
+                    f"\nMatched: {rematch.apply(trimmed_content, parse_context=ctx)}. "
+                    f"\nUnmatched: {trimmed_content[rematch.matched_slice.stop :]}."
+                )
+                return False
+            opening_unparsables = set(self.recursive_crawl("unparsable"))
+            closing_unparsables: set[BaseSegment] = set()
+            new_segments = rematch.apply(trimmed_content, parse_context=ctx)
+            for seg in new_segments:
+                closing_unparsables.update(seg.recursive_crawl("unparsable"))
+            # Check we don't introduce any _additional_ unparsables.
+            # Pre-existing unparsables are ok, and for some rules that's as
+            # designed. The idea is that we shouldn't make the situation _worse_.
+            if opening_unparsables >= closing_unparsables:
+                return True
+
             linter_logger.debug(
-                f"Validation Check Fail for {self}.Incomplete Match. "
-                f"\nMatched: {rematch.apply(trimmed_content, parse_context=ctx)}. "
-                f"\nUnmatched: {trimmed_content[rematch.matched_slice.stop :]}."
+                f"Validation Check Fail for {self}.\nFound additional Unparsables: "
+                f"{closing_unparsables - opening_unparsables}"
             )
+            for unparsable in closing_unparsables - opening_unparsables:
+                linter_logger.debug("Unparsable:\n%s\n", unparsable)
             return False
-        opening_unparsables = set(self.recursive_crawl("unparsable"))
-        closing_unparsables: set[BaseSegment] = set()
-        new_segments = rematch.apply(trimmed_content, parse_context=ctx)
-        for seg in new_segments:
-            closing_unparsables.update(seg.recursive_crawl("unparsable"))
-        # Check we don't introduce any _additional_ unparsables.
-        # Pre-existing unparsables are ok, and for some rules that's as
-        # designed. The idea is that we shouldn't make the situation _worse_.
-        if opening_unparsables >= closing_unparsables:
-            return True
-
-        linter_logger.debug(
-            f"Validation Check Fail for {self}.\nFound additional Unparsables: "
-            f"{closing_unparsables - opening_unparsables}"
-        )
-        for unparsable in closing_unparsables - opening_unparsables:
-            linter_logger.debug("Unparsable:\n%s\n", unparsable)
-        return False
+        finally:
+            self.set_as_parent()
 
     @staticmethod
     def _log_apply_fixes_check_issue(
@@ -1,11 +1,15 @@
 """Definition of the BaseFileSegment."""
 
 from abc import abstractmethod
-from typing import Optional
+from functools import cached_property
+from typing import Any, Callable, Optional
 
+from sqlfluff.core.helpers.identity import get_next_id
 from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.markers import PositionMarker
+from sqlfluff.core.parser.match_result import MatchResult
 from sqlfluff.core.parser.segments.base import BaseSegment, UnparsableSegment
+from sqlfluff.core.parser.segments.index import SegmentIndex
 
 
 class BaseFileSegment(BaseSegment):
@@ -21,6 +25,10 @@ class BaseFileSegment(BaseSegment):
     can_start_end_non_code = True
     # A file can be empty!
     allow_empty = True
+    # The raws (in uppercase) of delimiters between the statements (or
+    # batches) at the top level of the file, at which it can be split to
+    # match them in parallel. Empty if the file can't be split.
+    split_after_raws: frozenset[str] = frozenset()
 
     def __init__(
         self,
@@ -31,6 +39,106 @@ class BaseFileSegment(BaseSegment):
         self._file_path = fname
         super().__init__(segments, pos_marker=pos_marker)
 
+    @classmethod
+    def from_lazy_segments(
+        cls,
+        build_segments: Callable[[], tuple[BaseSegment, ...]],
+        pos_marker: PositionMarker,
+        fname: Optional[str] = None,
+        raw: Optional[str] = None,
+        descendant_type_set: Optional[frozenset[str]] = None,
+    ) -> "BaseFileSegment":
+        """Create a file segment whose children are built when first accessed.
+
+        This is for parsers which can answer most questions about the tree
+        without building it (i.e. the Rust parser, from its arena), so that
+        lint runs which never look inside the tree don't pay to build it.
+
+        Args:
+            build_segments (:obj:`Callable`): Builds the children of the
+                file, when they're first accessed.
+            pos_marker (:obj:`PositionMarker`): The position of the file.
+            fname (:obj:`str`, optional): The path of the file.
+            raw (:obj:`str`, optional): The raw of the file, if known.
+            descendant_type_set (:obj:`frozenset` of :obj:`str`, optional):
+                The types within the file, if known. Crawls for types which
+                aren't in the file don't need the children.
+        """
+        segment = cls.__new__(cls)
+        d = segment.__dict__
+        d["_file_path"] = fname
+        d["pos_marker"] = pos_marker
+        d["uuid"] = get_next_id()
+        d["_parent"] = None
+        d["_parent_idx"] = None
+        d["_build_segments"] = build_segments
+        # NOTE: These are cached properties, which we populate directly.
+        # They're reset as usual if the children are changed.
+        if raw is not None:
+            d["raw"] = raw
+        if descendant_type_set is not None:
+            d["descendant_type_set"] = descendant_type_set
+        return segment
+
+    def __getattr__(self, name: str) -> Any:
+        # NOTE: This is only called for attributes which aren't found in the
+        # usual way, which includes the children of a file segment created
+        # with `from_lazy_segments`, until they're built.
+        if name == "segments":
+            build_segments = self.__dict__.pop("_build_segments", None)
+            if build_segments is not None:
+                segments = build_segments()
+                self.__dict__["segments"] = segments
+                self.set_as_parent(recurse=False)
+                return segments
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute {name!r}"
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the current state to allow pickling."""
+        # Build the children if they haven't been already.
+        if "segments" not in self.__dict__:
+            self.__getattr__("segments")
+        s = super().__getstate__()
+        # The index is rebuilt when needed.
+        s.pop("_segment_index", None)
+        return s
+
+    def copy(
+        self,
+        segments: Optional[tuple[BaseSegment, ...]] = None,
+        parent: Optional[BaseSegment] = None,
+        parent_idx: Optional[int] = None,
+    ) -> BaseSegment:
+        """Copy the segment, building its children first if they're lazy.
+
+        Otherwise the copy would keep the same builder for its children, and
+        so share them with this segment rather than having copies.
+        """
+        if segments is None and "segments" not in self.__dict__:
+            self.__getattr__("segments")
+        new_segment = super().copy(
+            segments=segments, parent=parent, parent_idx=parent_idx
+        )
+        new_segment.__dict__.pop("_build_segments", None)
+        return new_segment
+
+    @cached_property
+    def _segment_index(self) -> SegmentIndex:
+        """The index of the segments in the file.
+
+        NOTE: As a cached property, this is reset when the children of
+        the file change, and any change to the children of a segment in
+        the file resets it too (see `BaseSegment.__setattr__`). Fixes
+        create a new file segment, with its own index.
+        """
+        return SegmentIndex(self)
+
+    def _get_segment_index(self) -> Optional[SegmentIndex]:
+        """Get the index of the segments in the file."""
+        return self._segment_index
+
     @property
     def file_path(self) -> Optional[str]:
         """File path of a parsed SQL file."""
@@ -46,6 +154,7 @@ class BaseFileSegment(BaseSegment):
         segments: tuple[BaseSegment, ...],
         parse_context: ParseContext,
         fname: Optional[str] = None,
+        match: Optional[MatchResult] = None,
     ) -> "BaseFileSegment":
         """This is the entry method into parsing a file lexed segments.
 
@@ -53,6 +162,10 @@ class BaseFileSegment(BaseSegment):
         the start, matches the middle and then trims the end.
 
         Anything unexpected at the end is regarded as unparsable.
+
+        If the middle has already been matched (e.g. in parallel, see
+        :mod:`sqlfluff.core.parser.parallel`), then that `match` can be
+        provided instead.
         """
         # Trim the start
         _start_idx = 0
@@ -77,16 +190,17 @@ class BaseFileSegment(BaseSegment):
         )
         assert cls.match_grammar
 
-        # Set up the progress bar for parsing.
-        _final_seg = segments[-1]
-        assert _final_seg.pos_marker
-        _closing_position = _final_seg.pos_marker.templated_slice.stop
-        with parse_context.progress_bar(_closing_position):
-            # NOTE: Don't call .match() on the segment class itself, but go
-            # straight to the match grammar inside.
-            match = cls.match_grammar.match(
-                segments[:_end_idx], _start_idx, parse_context
-            )
+        if match is None:
+            # Set up the progress bar for parsing.
+            _final_seg = segments[-1]
+            assert _final_seg.pos_marker
+            _closing_position = _final_seg.pos_marker.templated_slice.stop
+            with parse_context.progress_bar(_closing_position):
+                # NOTE: Don't call .match() on the segment class itself, but go
+                # straight to the match grammar inside.
+                match = cls.match_grammar.match(
+                    segments[:_end_idx], _start_idx, parse_context
+                )
 
         parse_context.logger.info("Root Match:\n%s", match)
         _matched = match.apply(segments, parse_context=parse_context)
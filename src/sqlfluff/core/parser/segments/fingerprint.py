@@ -0,0 +1,80 @@
+"""Fingerprints of the content of segments.
+
+The fix loop needs to know whether applying fixes changed the file at all,
+and whether it has seen a version of the file before. Building (and
+keeping) the whole raw of the file for each version is costly for large
+files, so instead segments have a :obj:`Fingerprint` of their raw and
+source fixes.
+
+A fingerprint is a polynomial rolling hash of the (utf-8 encoded) raw, and
+of the source fixes, so the fingerprint of a segment can be found from
+those of its children (see :meth:`Fingerprint.concat`) without looking at
+their raws. Segments keep their fingerprint until their children change,
+so after a fix only the segments which changed need a new fingerprint.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.segments.base import SourceFix
+
+# The largest prime below 2**64. The base of the polynomial is 256 (i.e. one
+# term per byte), so the hash of a string is its bytes as an integer.
+MODULUS = (1 << 64) - 59
+BASE = 256
+
+
+class Fingerprint(NamedTuple):
+    """A fingerprint of the raw and source fixes of a segment.
+
+    The hash of a string is kept with the base raised to its length, which
+    is what's needed to concatenate it with another.
+    """
+
+    raw_hash: int
+    raw_power: int
+    fixes_hash: int
+    fixes_power: int
+
+    @classmethod
+    def concat(cls, fingerprints: Iterable[Fingerprint]) -> Fingerprint:
+        """The fingerprint of a sequence of segments, from theirs."""
+        raw_hash, raw_power, fixes_hash, fixes_power = 0, 1, 0, 1
+        for _raw_hash, _raw_power, _fixes_hash, _fixes_power in fingerprints:
+            raw_hash = (raw_hash * _raw_power + _raw_hash) % MODULUS
+            raw_power = raw_power * _raw_power % MODULUS
+            # Most segments have no source fixes (i.e. an empty string).
+            if _fixes_power != 1:
+                fixes_hash = (fixes_hash * _fixes_power + _fixes_hash) % MODULUS
+                fixes_power = fixes_power * _fixes_power % MODULUS
+        return cls(raw_hash, raw_power, fixes_hash, fixes_power)
+
+
+@lru_cache(maxsize=4096)
+def _string_hash(string: str) -> tuple[int, int]:
+    """The hash of a string, and the base raised to its length."""
+    encoded = string.encode("utf-8")
+    return int.from_bytes(encoded, "big") % MODULUS, pow(BASE, len(encoded), MODULUS)
+
+
+def raw_fingerprint(raw: str, source_fixes: Sequence[SourceFix]) -> Fingerprint:
+    """The fingerprint of a raw segment.
+
+    Source fixes are hashed as a string of all their fields, so (as when
+    comparing them) fixes which differ in any way have different hashes.
+    """
+    raw_hash, raw_power = _string_hash(raw)
+    if not source_fixes:
+        return Fingerprint(raw_hash, raw_power, 0, 1)
+    fixes_hash, fixes_power = _string_hash(
+        "".join(
+            f"{fix.edit!r}{fix.source_slice.start},{fix.source_slice.stop},"
+            f"{fix.templated_slice.start},{fix.templated_slice.stop};"
+            for fix in source_fixes
+        )
+    )
+    return Fingerprint(raw_hash, raw_power, fixes_hash, fixes_power)
@@ -0,0 +1,172 @@
+"""An index of the segments in a parsed tree.
+
+Rules often search the same tree many times (e.g. for every
+``select_statement``), and each search walks the part of the tree it's
+called on. The :obj:`SegmentIndex` of a tree is built in a single walk,
+and lists every segment in the tree in order (i.e. each segment before its
+children), with:
+
+* The position of the end of each segment's subtree, so the descendants of
+  any segment are a contiguous range of positions.
+* The position of each segment's parent, and its index within the parent.
+* The positions of the segments of each type, in order.
+
+Searches of the tree then become lookups of ranges of positions, rather
+than walks of the tree.
+
+The index is held by the root :obj:`BaseFileSegment` of the tree, and is
+only valid for as long as the tree doesn't change (see
+:meth:`BaseSegment.recursive_crawl`).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.segments.base import BaseSegment
+
+
+class SegmentIndex:
+    """The segments of a tree, by position and type."""
+
+    __slots__ = (
+        "segments",
+        "positions",
+        "ends",
+        "parents",
+        "child_idxs",
+        "by_type",
+    )
+
+    def __init__(self, root: BaseSegment) -> None:
+        # The segments, in order.
+        self.segments: list[BaseSegment] = []
+        # The position of each segment, by id. The index holds a reference to
+        # each segment, so their ids don't change.
+        self.positions: dict[int, int] = {}
+        # The position after the last descendant of each segment.
+        self.ends: list[int] = []
+        # The position of the parent of each segment (-1 for the root), and
+        # its index within the parent.
+        self.parents: list[int] = []
+        self.child_idxs: list[int] = []
+        # The positions of the segments of each type.
+        self.by_type: dict[str, list[int]] = defaultdict(list)
+
+        # NOTE: This walks the tree with a stack, rather than recursively, to
+        # be independent of the depth of the tree. `None` marks the end of
+        # the children of the segment at that position.
+        stack: list[tuple[Optional[BaseSegment], int, int]] = [(root, -1, 0)]
+        while stack:
+            segment, parent, child_idx = stack.pop()
+            if segment is None:
+                self.ends[parent] = len(self.segments)
+                continue
+            position = len(self.segments)
+            self.segments.append(segment)
+            self.positions[id(segment)] = position
+            self.ends.append(position + 1)
+            self.parents.append(parent)
+            self.child_idxs.append(child_idx)
+            for seg_type in segment.class_types:
+                self.by_type[seg_type].append(position)
+            if segment.segments:
+                stack.append((None, position, 0))
+                stack.extend(
+                    (child, position, idx)
+                    for idx, child in reversed(list(enumerate(segment.segments)))
+                )
+
+    def position_of(self, segment: BaseSegment) -> Optional[int]:
+        """The position of a segment, or `None` if it's not in the index."""
+        position = self.positions.get(id(segment))
+        if position is None or self.segments[position] is not segment:
+            return None
+        return position
+
+    def _positions_of_types(
+        self, seg_types: tuple[str, ...], start: int, stop: int
+    ) -> list[int]:
+        """The positions of the segments of the given types in a range."""
+        found: list[int] = []
+        for seg_type in seg_types:
+            positions = self.by_type.get(seg_type)
+            if not positions:
+                continue
+            found.extend(
+                positions[
+                    bisect_left(positions, start) : bisect_left(positions, stop)
+                ]
+            )
+        if len(seg_types) > 1:
+            # A segment may be of more than one of the types.
+            return sorted(set(found))
+        return found
+
+    def crawl(
+        self,
+        position: int,
+        seg_types: tuple[str, ...],
+        recurse_into: bool = True,
+        no_recursive_seg_type: Optional[list[str]] = None,
+        allow_self: bool = True,
+    ) -> list[BaseSegment]:
+        """The segments :meth:`BaseSegment.recursive_crawl` would yield.
+
+        Args:
+            position (:obj:`int`): The position of the segment to crawl.
+            seg_types (:obj:`tuple` of :obj:`str`): The types to look for.
+            recurse_into (:obj:`bool`): Whether to look within segments of
+                the types.
+            no_recursive_seg_type (:obj:`list` of :obj:`str`, optional):
+                The types of descendants not to look within (or return).
+            allow_self (:obj:`bool`): Whether the segment itself can be
+                returned.
+        """
+        stop = self.ends[position]
+        matches = self._positions_of_types(seg_types, position, stop)
+        # The positions of descendants which we mustn't look within.
+        blocked = (
+            self._positions_of_types(tuple(no_recursive_seg_type), position + 1, stop)
+            if no_recursive_seg_type
+            else []
+        )
+        result: list[BaseSegment] = []
+        blocked_idx = 0
+        # Everything before this position is excluded.
+        skip_until = 0
+        for match in matches:
+            # NOTE: Blocked segments are in order, and a blocked segment
+            # before the match excludes it if the match is within it.
+            while blocked_idx < len(blocked) and blocked[blocked_idx] <= match:
+                skip_until = max(skip_until, self.ends[blocked[blocked_idx]])
+                blocked_idx += 1
+            if match < skip_until:
+                continue
+            if match == position and not allow_self:
+                continue
+            result.append(self.segments[match])
+            if not recurse_into:
+                skip_until = max(skip_until, self.ends[match])
+        return result
+
+    def path(self, start: int, position: int) -> Optional[list[tuple[int, int]]]:
+        """The path from one segment down to another.
+
+        Returns:
+            :obj:`list` of the position of each segment on the path (from
+            the segment at `start`, but not including the one at `position`)
+            and the index of the next segment on the path within it. `None`
+            if the segment at `position` isn't within the one at `start`.
+        """
+        if not start < position < self.ends[start]:
+            return None
+        path: list[tuple[int, int]] = []
+        while position != start:
+            path.append((self.parents[position], self.child_idxs[position]))
+            position = self.parents[position]
+        path.reverse()
+        return path
@@ -89,14 +89,16 @@ class MetaSegment(RawSegment):
         token: "RsToken",
         tf: "TemplatedFile",
         type_override: Optional[str] = None,
+        keep_token: bool = True,
     ) -> "MetaSegment":
         """Create a RawSegment from an RSQL token."""
         segment = cls(
             pos_marker=PositionMarker.from_rs_position_marker(token.pos_marker, tf),
             block_uuid=token.block_uuid,
         )
-        # Cache the original RsToken for efficient round-trip to Rust parser
-        segment._rstoken = token
+        if keep_token:
+            # Cache the original RsToken for efficient round-trip to Rust parser
+            segment._rstoken = token
         return segment
 
 
@@ -305,6 +307,7 @@ class TemplateSegment(MetaSegment):
         token: "RsToken",
         tf: TemplatedFile,
         type_override: Optional[str] = None,
+        keep_token: bool = True,
     ) -> "TemplateSegment":
         """Create a TemplateSegment from a token."""
         segment = cls(
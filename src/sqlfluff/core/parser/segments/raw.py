@@ -5,18 +5,34 @@ any children, and the output of the lexer.
 """
 
 import functools
-from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, Union, cast
 
 import regex as re
 
 from sqlfluff.core.helpers.identity import get_next_id
 from sqlfluff.core.parser.markers import PositionMarker
 from sqlfluff.core.parser.segments.base import BaseSegment, SourceFix
+from sqlfluff.core.parser.segments.fingerprint import Fingerprint, raw_fingerprint
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.templaters import TemplatedFile
     from sqlfluffrs import RsToken
 
+_StrTuple = TypeVar("_StrTuple", bound=tuple[str, ...])
+
+# Tuples of types (and trim characters), shared between segments. There's
+# only a handful of distinct values, but one for each raw segment otherwise.
+_interned_tuples: dict[tuple[str, ...], tuple[str, ...]] = {}
+# The full set of types for each class and its instance types.
+_interned_class_types: dict[
+    tuple[frozenset[str], tuple[str, ...]], frozenset[str]
+] = {}
+
+
+def _intern_tuple(value: _StrTuple) -> _StrTuple:
+    """Return a shared tuple equal to the given one."""
+    return cast(_StrTuple, _interned_tuples.setdefault(value, value))
+
 
 class RawSegment(BaseSegment):
     """This is a segment without any subsegments."""
@@ -92,7 +108,10 @@ class RawSegment(BaseSegment):
         d = self.__dict__
         d["pos_marker"] = pos_marker
         d["_raw"] = _raw
-        d["_raw_upper"] = _raw.upper()
+        _raw_upper = _raw.upper()
+        # NOTE: Share the raw if it's already uppercase (as symbols,
+        # whitespace and numbers are), rather than keeping a copy.
+        d["_raw_upper"] = _raw if _raw_upper == _raw else _raw_upper
         # Set the segments attribute to be an empty tuple.
         d["segments"] = ()
         d["instance_types"] = instance_types
@@ -107,6 +126,11 @@ class RawSegment(BaseSegment):
         d["escape_replacements"] = escape_replacements
         d["casefold"] = casefold
         d["_raw_value"] = self.normalize()
+        # NOTE: These are set when the segment is added to a parent. Setting
+        # them now keeps them in the instance dict's shared keys, which would
+        # otherwise be copied into a (much larger) dict of its own.
+        d["_parent"] = None
+        d["_parent_idx"] = None
 
     @functools.cached_property
     def representation(self) -> str:
@@ -165,13 +189,24 @@ class RawSegment(BaseSegment):
 
         Add the surrogate type for raw segments.
         """
-        return frozenset(self.instance_types) | super().class_types
+        key = (self._class_types, self.instance_types)
+        try:
+            return _interned_class_types[key]
+        except KeyError:
+            class_types = frozenset(self.instance_types) | self._class_types
+            _interned_class_types[key] = class_types
+            return class_types
 
     @property
     def source_fixes(self) -> list[SourceFix]:
         """Return any source fixes as list."""
         return self._source_fixes or []
 
+    @property
+    def fingerprint(self) -> Fingerprint:
+        """A fingerprint of the raw and source fixes of this segment."""
+        return raw_fingerprint(self._raw, self.source_fixes)
+
     # ################ INSTANCE METHODS
 
     def invalidate_caches(self) -> None:
@@ -342,21 +377,28 @@ class RawSegment(BaseSegment):
         cls,
         token: "RsToken",
         tf: "TemplatedFile",
+        keep_token: bool = True,
     ) -> "RawSegment":
         """Create a RawSegment from an RSQL token.
 
         Args:
             token: The Rust token to create the segment from
             tf: The TemplatedFile for position marker reconstruction
+            keep_token: Whether to keep a reference to the token, for
+                the Rust parser.
         """
-        # Build instance_types from token
-        instance_types = tuple(token.instance_types)
-
         # NOTE: The pyo3 getters return lists (Vec<String>), but the Python
         # lexer configures these kwargs as tuples and downstream code (and
         # byte-level parity with Python-lexed segments) expects tuples.
-        trim_start = tuple(token.trim_start) if token.trim_start else None
-        trim_chars = tuple(token.trim_chars) if token.trim_chars else None
+        # They also return new strings for each token, so we intern the
+        # tuples to share them between segments.
+        instance_types = _intern_tuple(tuple(token.instance_types))
+        trim_start = (
+            _intern_tuple(tuple(token.trim_start)) if token.trim_start else None
+        )
+        trim_chars = (
+            _intern_tuple(tuple(token.trim_chars)) if token.trim_chars else None
+        )
 
         segment = cls(
             raw=token.raw,
@@ -364,13 +406,15 @@ class RawSegment(BaseSegment):
             instance_types=instance_types,
             trim_start=trim_start,
             trim_chars=trim_chars,
-            source_fixes=token.source_fixes,
+            # NOTE: This is an empty list rather than None if there are none.
+            source_fixes=token.source_fixes or None,
             uuid=token.uuid,
             quoted_value=token.quoted_value,
             escape_replacements=token.escape_replacements,
         )
-        # Cache the original RsToken for efficient round-trip to Rust parser
-        segment._rstoken = token
+        if keep_token:
+            # Cache the original RsToken for efficient round-trip to Rust parser
+            segment._rstoken = token
         return segment
 
 
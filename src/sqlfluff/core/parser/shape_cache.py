@@ -0,0 +1,353 @@
+"""A cache of matches for repeated statement shapes.
+
+The parse cache on the :obj:`ParseContext` is keyed by location, and reset
+for each file. Files with many near-identical statements (e.g. thousands
+of generated ``INSERT`` statements), or a corpus of generated files,
+therefore re-derive the same match again and again.
+
+The shape cache reuses the match of a statement for any other run of
+segments with the same *shape*: the same classes, types and (for code
+segments) raws. Non-code segments only contribute their class and types,
+so differences in whitespace, newlines and comments don't prevent reuse.
+Literals (which are mostly matched by type) contribute which of the
+dialect's raw parsers would match them, rather than their raw, so that
+statements which only differ in their values can share a match.
+
+A match can depend on more than the segments it claims, so the shape also
+includes the context it was matched in:
+
+* The terminators in effect.
+* The few code segments before it (for lookbehind matchers).
+* The segments after it, up to and including the next code segment. Only
+  statements which are followed by a semicolon (or by nothing) are cached.
+  Terminators are checked against what follows a match, which could look
+  further ahead, but a single delimiter can't lead to a different result.
+"""
+
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+from sqlfluff.core.parser.match_result import MatchResult
+from sqlfluff.core.parser.matchable import Matchable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.dialects import Dialect
+    from sqlfluff.core.parser.parsers import RegexParser
+    from sqlfluff.core.parser.segments import BaseSegment
+
+# The maximum number of segments in a cached statement.
+_MAX_STATEMENT_SEGMENTS = 2000
+# The maximum number of entries in each cache, before it's cleared.
+_MAX_ENTRIES = 4096
+# The number of distinct lengths of statement to try for each first segment.
+_MAX_CANDIDATE_LENGTHS = 8
+# The number of preceding code segments which are part of the shape.
+_LOOKBEHIND = 3
+# The maximum number of segments, and number of entries, for whole inputs.
+_MAX_INPUT_SEGMENTS = 20000
+_MAX_INPUTS = 64
+# The number of caches (one per dialect and parsing config) to keep.
+_MAX_CACHES = 8
+
+_shape_caches = threading.local()
+
+# The types of a statement terminator, before and after parsing.
+_TERMINATOR_TYPES = frozenset(("semicolon", "statement_terminator"))
+# A shape representing the end of the segments.
+_END = ("end",)
+# The types of the literals whose raws aren't part of their shape.
+_LITERAL_TYPES = frozenset(
+    ("numeric_literal", "quoted_literal", "single_quote", "dollar_quote")
+)
+
+
+class _LiteralShapes:
+    """The shapes of literals, for a dialect.
+
+    Literals are mostly matched by type, but some grammars match them
+    by raw (e.g. a particular string, or a regex for a range of numbers).
+    The shape of a literal is therefore either its raw (if any string
+    parser might match it), or which of the regex parsers match it.
+    """
+
+    def __init__(self, dialect: "Dialect") -> None:
+        # NOTE: Imported here to avoid a circular import (the parsers
+        # depend on the parse context, which holds this cache).
+        from sqlfluff.core.parser.parsers import RegexParser
+
+        # Every string in the grammar, uppercased. This includes the
+        # templates of any string parsers (and some other strings, which
+        # only means that fewer literals are normalised).
+        self._strings: set[str] = set()
+        self._regex_parsers: list["RegexParser"] = []
+        stack: list[Any] = list(dialect._library.values())
+        seen: set[int] = set()
+        while stack:
+            elem = stack.pop()
+            if id(elem) in seen:
+                continue
+            seen.add(id(elem))
+            if isinstance(elem, str):
+                self._strings.add(elem.upper())
+            elif isinstance(elem, (list, tuple, set, frozenset)):
+                stack.extend(elem)
+            elif isinstance(elem, dict):
+                stack.extend(elem.values())
+            elif isinstance(elem, type):
+                # Segment classes, which hold their grammar.
+                stack.append(getattr(elem, "match_grammar", None))
+            # NOTE: Checked by MRO, as the metaclass of segments is also
+            # a subclass of `Matchable`.
+            elif Matchable in type(elem).__mro__:
+                if isinstance(elem, RegexParser):
+                    self._regex_parsers.append(elem)
+                stack.extend(vars(elem).values())
+        # The regex parsers which might match a raw, by its first character.
+        self._candidates: dict[str, tuple["RegexParser", ...]] = {}
+
+    def _candidate_parsers(self, first: str) -> tuple["RegexParser", ...]:
+        candidates = self._candidates.get(first)
+        if candidates is None:
+            candidates = self._candidates[first] = tuple(
+                parser
+                for parser in self._regex_parsers
+                if parser._template.match(
+                    first.upper() if parser.ignore_case else first, partial=True
+                )
+            )
+        return candidates
+
+    def shape(self, segment: "BaseSegment") -> tuple[Any, ...]:
+        """The shape of a literal."""
+        if segment.raw_upper in self._strings:
+            return (segment.__class__, segment.class_types, segment.raw)
+        return (
+            segment.__class__,
+            segment.class_types,
+            # NOTE: The parsers are kept alive by the dialect.
+            tuple(
+                id(parser)
+                for parser in self._candidate_parsers(segment.raw[:1])
+                if parser.matches_raw(segment)
+            ),
+        )
+
+
+def _segment_shape(
+    segment: "BaseSegment", literals: Optional[_LiteralShapes] = None
+) -> tuple[Any, ...]:
+    """The aspects of a segment which matching depends on."""
+    if segment.is_code:
+        if literals and not _LITERAL_TYPES.isdisjoint(segment.class_types):
+            return literals.shape(segment)
+        return (segment.__class__, segment.class_types, segment.raw)
+    return (segment.__class__, segment.class_types)
+
+
+def _preceding_shape(
+    segments: Sequence["BaseSegment"],
+    idx: int,
+    literals: Optional[_LiteralShapes] = None,
+) -> tuple[tuple[Any, ...], ...]:
+    """The shape of the code segments immediately before an index."""
+    buff: list[tuple[Any, ...]] = []
+    idx -= 1
+    while idx >= 0 and len(buff) < _LOOKBEHIND:
+        if segments[idx].is_code and not segments[idx].is_meta:
+            buff.append(_segment_shape(segments[idx], literals))
+        idx -= 1
+    return tuple(buff)
+
+
+def _following_shape(
+    segments: Sequence["BaseSegment"],
+    idx: int,
+    literals: Optional[_LiteralShapes] = None,
+) -> Optional[tuple[tuple[Any, ...], ...]]:
+    """The shape of the segments after a match, up to the next code.
+
+    Returns `None` if the next code segment isn't a statement terminator,
+    in which case the match shouldn't be cached.
+    """
+    buff = []
+    for _idx in range(idx, len(segments)):
+        segment = segments[_idx]
+        buff.append(_segment_shape(segment, literals))
+        if segment.is_code:
+            if not _TERMINATOR_TYPES.intersection(segment.class_types):
+                return None
+            return tuple(buff)
+    buff.append(_END)
+    return tuple(buff)
+
+
+class ParseShapeCache:
+    """A cache of statement matches, keyed by their shape.
+
+    Matches are stored relative to the segments they were matched in,
+    and moved to the position of each new statement when reused. See the
+    module docstring for what the shape includes.
+    """
+
+    def __init__(self, literals: Optional[_LiteralShapes] = None) -> None:
+        self._literals = literals
+        self._entries: dict[Hashable, tuple[int, MatchResult]] = {}
+        # The lengths of the cached statements for each first segment and
+        # context, most recent first. This is how we find candidate shapes
+        # without matching first.
+        self._lengths: dict[Hashable, list[int]] = {}
+        # Terminators are keyed by id, so keep them alive for as long as
+        # any entries refer to them.
+        self._terminators: dict[int, "Matchable"] = {}
+        # Results for whole inputs, for parsers which can't reuse the
+        # matches of individual statements.
+        self._inputs: dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_config(cls, config: "FluffConfig") -> Optional["ParseShapeCache"]:
+        """Get the cache for a config, or `None` if it's disabled.
+
+        The cache persists between files (in the same thread), and is
+        shared by configs with the same dialect and parsing config.
+        """
+        if not config.get("parse_shape_cache"):
+            return None
+        caches: Optional[dict[tuple[Any, ...], ParseShapeCache]] = getattr(
+            _shape_caches, "caches", None
+        )
+        if caches is None:
+            caches = _shape_caches.caches = {}
+        indentation = config.get_section("indentation") or {}
+        key = (
+            config.get("dialect"),
+            # NOTE: The dialect object itself, in case it's not the one
+            # which would be loaded by name.
+            id(config.get("dialect_obj")),
+            tuple(sorted((k, repr(v)) for k, v in indentation.items())),
+        )
+        cache = caches.get(key)
+        if cache is None:
+            if len(caches) >= _MAX_CACHES:
+                caches.clear()
+            dialect = config.get("dialect_obj")
+            cache = caches[key] = cls(_LiteralShapes(dialect) if dialect else None)
+        return cache
+
+    def _context_key(
+        self,
+        matcher: Hashable,
+        segments: Sequence["BaseSegment"],
+        idx: int,
+        terminators: Sequence["Matchable"],
+    ) -> tuple[Any, ...]:
+        return (
+            matcher,
+            tuple(id(terminator) for terminator in terminators),
+            _preceding_shape(segments, idx, self._literals),
+            _segment_shape(segments[idx], self._literals),
+        )
+
+    def get(
+        self,
+        matcher: Hashable,
+        segments: Sequence["BaseSegment"],
+        idx: int,
+        terminators: Sequence["Matchable"],
+    ) -> Optional[MatchResult]:
+        """Look up a match for the segments starting at an index.
+
+        Args:
+            matcher: The matcher (usually a segment class) being matched.
+            segments: The segments being matched.
+            idx: The index of the first segment of the statement.
+            terminators: The terminators in effect.
+
+        Returns:
+            The cached match, moved to `idx`, or `None` on a miss.
+        """
+        context_key = self._context_key(matcher, segments, idx, terminators)
+        lengths = self._lengths.get(context_key)
+        if not lengths:
+            return None
+        max_length = min(max(lengths), len(segments) - idx)
+        shapes = tuple(
+            _segment_shape(segment, self._literals)
+            for segment in segments[idx : idx + max_length]
+        )
+        for length in lengths:
+            if length > max_length:
+                continue
+            following = _following_shape(segments, idx + length, self._literals)
+            if following is None:
+                continue
+            entry = self._entries.get((context_key, shapes[:length], following))
+            if entry:
+                return entry[1].shifted(idx - entry[0])
+        return None
+
+    def put(
+        self,
+        matcher: Hashable,
+        segments: Sequence["BaseSegment"],
+        idx: int,
+        terminators: Sequence["Matchable"],
+        match: MatchResult,
+    ) -> bool:
+        """Cache the match of the segments starting at an index.
+
+        Returns:
+            Whether the match was cached. Matches which are empty, too
+            long, or not followed by a statement terminator aren't.
+        """
+        length = match.matched_slice.stop - idx
+        if match.matched_slice.start != idx:
+            return False  # pragma: no cover
+        if not 0 < length <= _MAX_STATEMENT_SEGMENTS:
+            return False
+        following = _following_shape(
+            segments, match.matched_slice.stop, self._literals
+        )
+        if following is None:
+            return False
+        if len(self._entries) >= _MAX_ENTRIES:
+            self._entries.clear()
+            self._lengths.clear()
+            self._terminators.clear()
+        context_key = self._context_key(matcher, segments, idx, terminators)
+        for terminator in terminators:
+            self._terminators.setdefault(id(terminator), terminator)
+        shapes = tuple(
+            _segment_shape(segment, self._literals)
+            for segment in segments[idx : idx + length]
+        )
+        self._entries[(context_key, shapes, following)] = (idx, match)
+        lengths = self._lengths.setdefault(context_key, [])
+        if length in lengths:
+            lengths.remove(length)
+        lengths.insert(0, length)
+        del lengths[_MAX_CANDIDATE_LENGTHS:]
+        return True
+
+    def get_input(self, segments: Sequence["BaseSegment"]) -> Optional[Any]:
+        """Look up the result of parsing a whole run of segments.
+
+        This is for parsers which match the whole input at once (i.e. the
+        Rust parser), and so can only reuse results for the same shape of
+        input (e.g. files which only differ in layout or comments).
+        """
+        if len(segments) > _MAX_INPUT_SEGMENTS:
+            return None
+        return self._inputs.get(self._input_shape(segments))
+
+    def put_input(self, segments: Sequence["BaseSegment"], result: Any) -> None:
+        """Cache the result of parsing a whole run of segments."""
+        if len(segments) > _MAX_INPUT_SEGMENTS:
+            return
+        if len(self._inputs) >= _MAX_INPUTS:
+            self._inputs.clear()
+        self._inputs[self._input_shape(segments)] = result
+
+    def _input_shape(self, segments: Sequence["BaseSegment"]) -> tuple[Any, ...]:
+        return tuple(_segment_shape(seg, self._literals) for seg in segments)
@@ -0,0 +1,153 @@
+"""A lazy store of the tokens output by the lexer.
+
+The lexer's output is usually consumed as a tuple of raw segments, but
+some consumers (e.g. the Rust parser) don't need the Python segments at
+all, and others (e.g. checking the balance of template indents) only need
+the type of each token. Creating a segment (and its position marker) for
+every token up front is a large part of the cost of lexing.
+
+The :obj:`TokenStore` holds the tokens of a file once, and can be indexed
+like a tuple of segments. Segments are created lazily, when a token is
+first accessed, and kept so that each index always gives the same
+segment. For tokens from the Rust lexer, the store also keeps the original
+tokens, so that the Rust parser can use them directly.
+"""
+
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Optional, Union, overload
+
+from sqlfluff.core.parser.segments.raw import RawSegment
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.templaters import TemplatedFile
+    from sqlfluffrs import RsToken
+
+
+class TokenStore(Sequence[RawSegment]):
+    """The tokens of a file, with their segments created lazily.
+
+    Use :meth:`from_segments` or :meth:`from_rstokens` to create a store,
+    rather than instantiating one directly.
+    """
+
+    def __init__(
+        self,
+        templated_file: "TemplatedFile",
+        segments: list[Optional[RawSegment]],
+        rs_tokens: Optional[list["RsToken"]] = None,
+        segment_types: Optional[dict[str, type[RawSegment]]] = None,
+        keep_tokens: bool = True,
+    ) -> None:
+        self.templated_file = templated_file
+        self._segments = segments
+        self._rs_tokens = rs_tokens
+        self._segment_types = segment_types or {}
+        self._keep_tokens = keep_tokens
+
+    @classmethod
+    def from_segments(
+        cls, segments: Sequence[RawSegment], templated_file: "TemplatedFile"
+    ) -> "TokenStore":
+        """Create a store of segments which have already been created."""
+        return cls(templated_file, list(segments))
+
+    @classmethod
+    def from_rstokens(
+        cls,
+        tokens: list["RsToken"],
+        templated_file: "TemplatedFile",
+        segment_types: dict[str, type[RawSegment]],
+        keep_tokens: bool = True,
+    ) -> "TokenStore":
+        """Create a store of tokens from the Rust lexer.
+
+        Args:
+            tokens: The tokens output by the Rust lexer.
+            templated_file: The (python) templated file the tokens are from.
+            segment_types: The segment class for each token type. Tokens of
+                other types are created as plain :obj:`RawSegment`.
+            keep_tokens: Whether the segments created from the tokens
+                should keep a reference to them, for the Rust parser.
+        """
+        return cls(
+            templated_file,
+            [None] * len(tokens),
+            rs_tokens=tokens,
+            segment_types=segment_types,
+            keep_tokens=keep_tokens,
+        )
+
+    @property
+    def rs_tokens(self) -> Optional[list["RsToken"]]:
+        """The tokens from the Rust lexer, if the store was created from them."""
+        return self._rs_tokens
+
+    @property
+    def materialised(self) -> int:
+        """The number of segments which have been created so far."""
+        return len(self._segments) - self._segments.count(None)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @overload
+    def __getitem__(self, idx: int) -> RawSegment: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> tuple[RawSegment, ...]: ...
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[RawSegment, tuple[RawSegment, ...]]:
+        """Get the segment for a token, or a tuple for a slice of tokens."""
+        if isinstance(idx, slice):
+            return tuple(
+                self._segment(_idx) for _idx in range(*idx.indices(len(self)))
+            )
+        if idx < 0:
+            idx += len(self)
+        return self._segment(idx)
+
+    def __iter__(self) -> Iterator[RawSegment]:
+        for idx in range(len(self)):
+            yield self._segment(idx)
+
+    def __repr__(self) -> str:
+        return f"<TokenStore: {len(self)} tokens, {self.materialised} materialised>"
+
+    def _segment(self, idx: int) -> RawSegment:
+        segment = self._segments[idx]
+        if segment is None:
+            assert self._rs_tokens is not None
+            token = self._rs_tokens[idx]
+            segment = self._segments[idx] = self._segment_types.get(
+                token.type, RawSegment
+            ).from_rstoken(token, self.templated_file, keep_token=self._keep_tokens)
+        return segment
+
+    def segments(self) -> tuple[RawSegment, ...]:
+        """Get the segments for all the tokens, creating any which don't exist."""
+        return tuple(self)
+
+    def raws(self) -> list[str]:
+        """The raw of each token, without creating any segments."""
+        if self._rs_tokens is not None:
+            return [token.raw for token in self._rs_tokens]
+        return [segment.raw for segment in self]
+
+    def segment_class_counts(self) -> dict[type[RawSegment], int]:
+        """The number of tokens of each segment class.
+
+        NOTE: This only needs the type of each token, so doesn't create any
+        segments which don't exist yet.
+        """
+        counts: Counter[type[RawSegment]] = Counter()
+        if self._rs_tokens is not None:
+            for token_type, count in Counter(
+                token.type for token in self._rs_tokens
+            ).items():
+                counts[self._segment_types.get(token_type, RawSegment)] += count
+        else:
+            counts.update(segment.__class__ for segment in self._segments)
+        return dict(counts)
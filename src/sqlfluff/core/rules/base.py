@@ -404,6 +404,11 @@ class BaseRule(metaclass=RuleMetaclass):
     # - On the first pass of the main phase
     # - In a second linter pass after the main phase
     lint_phase = "main"
+    # Rules which evaluate each segment using only the statement (or other top
+    # level segment of the file) which contains it, and don't use memory, can
+    # set this to True. In the fix loop they're then only run again on the
+    # statements which have changed since they last ran (see `FixRegions`).
+    is_statement_local = False
     # Groups attribute to be overwritten.
     groups: tuple[str, ...] = ()
     # Name attribute to be overwritten.
@@ -614,91 +619,117 @@ class BaseRule(metaclass=RuleMetaclass):
         memory = root_context.memory
         context = root_context
         for context in self.crawl_behaviour.crawl(root_context):
-            try:
-                context.memory = memory
-                res = self._eval(context=context)
-            except (bdb.BdbQuit, KeyboardInterrupt):  # pragma: no cover
-                raise
-            # Any exception at this point would halt the linter and
-            # cause the user to get no results
-            except Exception as e:
-                # If a filename is present, include it in the critical exception.
-                self.logger.critical(
-                    (
-                        f"Applying rule {self.code} to {fname!r} "
-                        f"threw an Exception: {e}"
-                        if fname
-                        else f"Applying rule {self.code} threw an Exception: {e}"
+            carry_on, memory = self._eval_context(
+                context, memory, templated_file, ignore_mask, fname, tree, vs, fixes
+            )
+            if not carry_on:
+                return vs, context.raw_stack, fixes, context.memory
+        return vs, context.raw_stack if context else tuple(), fixes, context.memory
+
+    def _eval_context(
+        self,
+        context: RuleContext,
+        memory: Any,
+        templated_file: Optional["TemplatedFile"],
+        ignore_mask: Optional["IgnoreMask"],
+        fname: Optional[str],
+        tree: BaseSegment,
+        vs: list[SQLLintError],
+        fixes: list[LintFix],
+    ) -> tuple[bool, Any]:
+        """Evaluate the rule for one context from the crawler.
+
+        Any violations and fixes are added to `vs` and `fixes`.
+
+        Returns:
+            A tuple of whether to carry on evaluating the rule (i.e. it
+            didn't throw an exception), and the memory for the next context.
+        """
+        try:
+            context.memory = memory
+            res = self._eval(context=context)
+        except (bdb.BdbQuit, KeyboardInterrupt):  # pragma: no cover
+            raise
+        # Any exception at this point would halt the linter and
+        # cause the user to get no results
+        except Exception as e:
+            # If a filename is present, include it in the critical exception.
+            self.logger.critical(
+                (
+                    f"Applying rule {self.code} to {fname!r} "
+                    f"threw an Exception: {e}"
+                    if fname
+                    else f"Applying rule {self.code} threw an Exception: {e}"
+                ),
+                exc_info=True,
+            )
+            assert context.segment.pos_marker
+            exception_line, _ = context.segment.pos_marker.source_position()
+            self._log_critical_errors(e)
+            vs.append(
+                SQLLintError(
+                    rule=self,
+                    segment=context.segment,
+                    fixes=[],
+                    description=(
+                        f"Unexpected exception: {str(e)};\n"
+                        "Could you open an issue at "
+                        "https://github.com/sqlfluff/sqlfluff/issues ?\n"
+                        "You can ignore this exception for now, by adding "
+                        f"'-- noqa: {self.code}' at the end\n"
+                        f"of line {exception_line}\n"
                     ),
-                    exc_info=True,
                 )
-                assert context.segment.pos_marker
-                exception_line, _ = context.segment.pos_marker.source_position()
-                self._log_critical_errors(e)
-                vs.append(
-                    SQLLintError(
-                        rule=self,
-                        segment=context.segment,
-                        fixes=[],
-                        description=(
-                            f"Unexpected exception: {str(e)};\n"
-                            "Could you open an issue at "
-                            "https://github.com/sqlfluff/sqlfluff/issues ?\n"
-                            "You can ignore this exception for now, by adding "
-                            f"'-- noqa: {self.code}' at the end\n"
-                            f"of line {exception_line}\n"
-                        ),
-                    )
-                )
-                return vs, context.raw_stack, fixes, context.memory
+            )
+            return False, memory
 
-            new_lerrs: list[SQLLintError] = []
-            new_fixes: list[LintFix] = []
+        new_lerrs: list[SQLLintError] = []
+        new_fixes: list[LintFix] = []
 
-            if res is None or res == []:
-                # Assume this means no problems (also means no memory)
-                pass
-            elif isinstance(res, LintResult):
-                # Extract any memory
-                memory = res.memory
-                self._adjust_anchors_for_fixes(context, res)
+        if res is None or res == []:
+            # Assume this means no problems (also means no memory)
+            pass
+        elif isinstance(res, LintResult):
+            # Extract any memory
+            memory = res.memory
+            self._adjust_anchors_for_fixes(context, res)
+            self._process_lint_result(
+                res, templated_file, ignore_mask, new_lerrs, new_fixes, tree
+            )
+        elif isinstance(res, list) and all(
+            isinstance(elem, LintResult) for elem in res
+        ):
+            # Extract any memory from the *last* one, assuming
+            # it was the last to be added
+            memory = res[-1].memory
+            for elem in res:
+                self._adjust_anchors_for_fixes(context, elem)
                 self._process_lint_result(
-                    res, templated_file, ignore_mask, new_lerrs, new_fixes, tree
+                    elem, templated_file, ignore_mask, new_lerrs, new_fixes, tree
                 )
-            elif isinstance(res, list) and all(
-                isinstance(elem, LintResult) for elem in res
-            ):
-                # Extract any memory from the *last* one, assuming
-                # it was the last to be added
-                memory = res[-1].memory
-                for elem in res:
-                    self._adjust_anchors_for_fixes(context, elem)
-                    self._process_lint_result(
-                        elem, templated_file, ignore_mask, new_lerrs, new_fixes, tree
-                    )
-            else:  # pragma: no cover
-                raise TypeError(
-                    "Got unexpected result [{!r}] back from linting rule: {!r}".format(
-                        res, self.code
-                    )
+        else:  # pragma: no cover
+            raise TypeError(
+                "Got unexpected result [{!r}] back from linting rule: {!r}".format(
+                    res, self.code
                 )
+            )
 
-            for lerr in new_lerrs:
-                self.logger.info("!! Violation Found: %r", lerr.description)
-            if new_fixes:
-                if not self.is_fix_compatible:  # pragma: no cover
-                    rules_logger.error(
-                        f"Rule {self.code} returned a fix but is not documented as "
-                        "`is_fix_compatible`, you may encounter unusual fixing "
-                        "behaviour. Report this a bug to the developer of this rule."
-                    )
-                for lfix in new_fixes:
-                    self.logger.info("!! Fix Proposed: %r", lfix)
+        for lerr in new_lerrs:
+            self.logger.info("!! Violation Found: %r", lerr.description)
+        if new_fixes:
+            if not self.is_fix_compatible:  # pragma: no cover
+                rules_logger.error(
+                    f"Rule {self.code} returned a fix but is not documented as "
+                    "`is_fix_compatible`, you may encounter unusual fixing "
+                    "behaviour. Report this a bug to the developer of this rule."
+                )
+            for lfix in new_fixes:
+                self.logger.info("!! Fix Proposed: %r", lfix)
 
-            # Consume the new results
-            vs += new_lerrs
-            fixes += new_fixes
-        return vs, context.raw_stack if context else tuple(), fixes, context.memory
+        # Consume the new results
+        vs += new_lerrs
+        fixes += new_fixes
+        return True, memory
 
     # HELPER METHODS --------
     @staticmethod
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from sqlfluff.core.parser.segments.base import BaseSegment
 from sqlfluff.core.parser.segments.raw import RawSegment
@@ -77,6 +77,90 @@ class SegmentSeekerCrawler(BaseCrawler):
     def crawl(self, context: RuleContext) -> Iterator[RuleContext]:
         """Yields a RuleContext for each segment the rule should process.
 
+        If the segment was parsed by the Rust parser, we find the matching
+        segments using its arena (see `_crawl_arena`), and otherwise we
+        search the segment recursively.
+        """
+        if self._can_crawl_arena(context.segment):
+            matches = self._crawl_arena(context)
+            if matches is not None:
+                for segment, parent_stack, segment_idx in matches:
+                    # As in `_crawl_segment`, we modify the context in place.
+                    context.segment = segment
+                    context.parent_stack = parent_stack
+                    context.segment_idx = segment_idx
+                    yield context
+                return
+        yield from self._crawl_segment(context)
+
+    def _can_crawl_arena(self, segment: BaseSegment) -> bool:
+        """Whether to crawl the Rust arena of a segment, rather than the segment."""
+        return (
+            getattr(segment, "_rs_tree", None) is not None
+            # The raw stack needs every raw segment, so isn't worth it.
+            and not self.provide_raw_stack
+            # Subclasses which match segments differently crawl the segment.
+            and type(self).is_self_match is SegmentSeekerCrawler.is_self_match
+            # Unparsable sections aren't represented the same way in both
+            # trees, and need filtering, so crawl the segment instead.
+            and "unparsable" not in segment.descendant_type_set
+        )
+
+    def _crawl_arena(
+        self, context: RuleContext
+    ) -> Optional[list[tuple[BaseSegment, tuple[BaseSegment, ...], int]]]:
+        """Find the segments to process using the Rust arena of the segment.
+
+        The arena is crawled for the matching nodes in one call, and each is
+        then found in the segment by its path of child indices, so we don't
+        recurse through the segment at all.
+
+        Returns:
+            A list of the matching segments, with their parent stacks and
+            indices, in the order `_crawl_segment` would yield them. `None`
+            if the arena doesn't line up with the segment.
+        """
+        rs_root = getattr(context.segment, "_rs_tree").root
+        # The segment, parent stack and index for each node of the arena which
+        # we've found so far, by uuid. Matches are in order, so most of the
+        # path to each is shared with the one before.
+        found = {
+            rs_root.uuid: (
+                context.segment,
+                context.parent_stack,
+                context.segment_idx,
+            )
+        }
+        matches = []
+        for handle in rs_root.recursive_crawl(
+            list(self.types), self.allow_recurse, [], True
+        ):
+            # Walk up the arena to the nearest node we've already found...
+            steps = []
+            node = handle
+            while node.uuid not in found:
+                parent = node.get_parent()
+                if parent is None:  # pragma: no cover
+                    return None
+                steps.append((node.uuid, parent[1]))
+                node = parent[0]
+            segment, parent_stack, segment_idx = found[node.uuid]
+            # ...and then back down the segment by the same child indices.
+            for uuid, segment_idx in reversed(steps):
+                children = segment.segments
+                if segment_idx >= len(children):  # pragma: no cover
+                    return None
+                parent_stack += (segment,)
+                segment = children[segment_idx]
+                found[uuid] = (segment, parent_stack, segment_idx)
+            if not segment.is_type(handle.type):  # pragma: no cover
+                return None
+            matches.append((segment, parent_stack, segment_idx))
+        return matches
+
+    def _crawl_segment(self, context: RuleContext) -> Iterator[RuleContext]:
+        """Yields a RuleContext for each segment the rule should process.
+
         We assume that segments are yielded by their parent.
         """
         # Check whether we should consider this segment _or it's children_
@@ -127,7 +211,7 @@ class SegmentSeekerCrawler(BaseCrawler):
             context.segment = child
             context.parent_stack = new_parent_stack
             context.segment_idx = idx
-            yield from self.crawl(context)
+            yield from self._crawl_segment(context)
 
 
 class ParentOfSegmentCrawler(SegmentSeekerCrawler):
@@ -0,0 +1,288 @@
+"""Running many rules in a single walk of the tree.
+
+Each rule crawls the tree separately (see :meth:`BaseRule.crawl`), so with
+most of the rules enabled, the tree is walked once per rule. When we're
+only linting (i.e. not fixing), the rules can't change the tree, so the
+rules which use one of the standard crawlers can instead be run together,
+in a single walk of the tree.
+
+At each segment, the rules to evaluate are looked up by the types of the
+segment (or for :obj:`ParentOfSegmentCrawler`, the types of its children),
+and we only walk into segments which contain a type which one of the
+remaining rules is looking for. Each rule sees the same segments, in the
+same order and with the same memory, as it would crawling the tree by
+itself, so gives the same results.
+
+When fixing, a rule can instead be run on just some of the top level
+segments of the tree (see :func:`crawl_regions`), if we already know it
+won't find anything in the others.
+"""
+
+import pathlib
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlfluff.core.errors import SQLLintError
+from sqlfluff.core.parser import BaseSegment
+from sqlfluff.core.rules.base import BaseRule
+from sqlfluff.core.rules.context import RuleContext
+from sqlfluff.core.rules.crawlers import (
+    ParentOfSegmentCrawler,
+    RootOnlyCrawler,
+    SegmentSeekerCrawler,
+)
+from sqlfluff.core.rules.fix import LintFix
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.dialects import Dialect
+    from sqlfluff.core.rules.noqa import IgnoreMask
+    from sqlfluff.core.templaters import TemplatedFile
+
+
+class _RuleState:
+    """The state of a rule during a walk of the tree."""
+
+    __slots__ = (
+        "rule",
+        "types",
+        "allow_recurse",
+        "works_on_unparsable",
+        "context",
+        "memory",
+        "violations",
+        "fixes",
+        "duration",
+    )
+
+    def __init__(self, rule: BaseRule, context: RuleContext) -> None:
+        self.rule = rule
+        crawler = rule.crawl_behaviour
+        self.types: frozenset[str] = frozenset(getattr(crawler, "types", ()))
+        self.allow_recurse: bool = getattr(crawler, "allow_recurse", True)
+        self.works_on_unparsable = crawler.works_on_unparsable
+        self.context = context
+        self.memory: Any = context.memory
+        self.violations: list[SQLLintError] = []
+        self.fixes: list[LintFix] = []
+        self.duration = 0.0
+
+
+def can_dispatch(rule: BaseRule, tree: BaseSegment, config: "FluffConfig") -> bool:
+    """Whether a rule can be run in a shared walk of the tree.
+
+    That's any rule which uses one of the standard crawlers (without the
+    raw stack), unless it evaluates the whole file natively in Rust.
+    """
+    crawler_class = type(rule.crawl_behaviour)
+    if crawler_class not in (
+        RootOnlyCrawler,
+        SegmentSeekerCrawler,
+        ParentOfSegmentCrawler,
+    ):
+        return False
+    if getattr(rule.crawl_behaviour, "provide_raw_stack", False):
+        return False
+    # Rules which crawl (or evaluate) differently are run by themselves.
+    if type(rule).crawl is not BaseRule.crawl:  # pragma: no cover
+        return False
+    return not (
+        type(rule)._eval_rust is not BaseRule._eval_rust
+        and rule._rust_rules_enabled(config)
+        and getattr(tree, "_rs_tree", None) is not None
+    )
+
+
+def crawl_rules(
+    rules: Sequence[BaseRule],
+    tree: BaseSegment,
+    dialect: "Dialect",
+    templated_file: Optional["TemplatedFile"],
+    ignore_mask: Optional["IgnoreMask"],
+    fname: Optional[str],
+    config: "FluffConfig",
+    child_idxs: Optional[Sequence[int]] = None,
+) -> dict[str, tuple[list[SQLLintError], float]]:
+    """Lint a tree with several rules in a single walk of the tree.
+
+    Rules which can't be run this way (see :func:`can_dispatch`) are left
+    out, and should be run with :meth:`BaseRule.crawl` as usual.
+
+    If `child_idxs` is given, then as for :func:`crawl_regions`, the tree
+    itself is evaluated as usual, but only the children at those indices
+    are walked.
+
+    Returns:
+        :obj:`dict` of the violations of each rule which was run, and the
+        time spent evaluating it, by rule code.
+    """
+    states: list[_RuleState] = []
+    root_only: list[_RuleState] = []
+    # The rules to evaluate at a segment, by the types of the segment, or
+    # of its direct children.
+    seekers_by_type: dict[str, list[_RuleState]] = defaultdict(list)
+    parents_by_type: dict[str, list[_RuleState]] = defaultdict(list)
+    for rule in rules:
+        if not can_dispatch(rule, tree, config):
+            continue
+        state = _RuleState(
+            rule,
+            RuleContext(
+                dialect=dialect,
+                fix=False,
+                templated_file=templated_file,
+                path=pathlib.Path(fname) if fname else None,
+                segment=tree,
+                config=config,
+            ),
+        )
+        states.append(state)
+        crawler = rule.crawl_behaviour
+        if isinstance(crawler, ParentOfSegmentCrawler):
+            for seg_type in state.types:
+                parents_by_type[seg_type].append(state)
+        elif isinstance(crawler, SegmentSeekerCrawler):
+            for seg_type in state.types:
+                seekers_by_type[seg_type].append(state)
+        else:
+            root_only.append(state)
+
+    # Rules are removed from this set if they fail.
+    running = set(states)
+
+    def _evaluate(
+        state: _RuleState,
+        segment: BaseSegment,
+        parent_stack: tuple[BaseSegment, ...],
+        segment_idx: int,
+    ) -> None:
+        context = state.context
+        context.segment = segment
+        context.parent_stack = parent_stack
+        context.segment_idx = segment_idx
+        t0 = time.monotonic()
+        carry_on, state.memory = state.rule._eval_context(
+            context,
+            state.memory,
+            templated_file,
+            ignore_mask,
+            fname,
+            tree,
+            state.violations,
+            state.fixes,
+        )
+        state.duration += time.monotonic() - t0
+        if not carry_on:
+            running.discard(state)
+
+    def _walk(
+        segment: BaseSegment,
+        parent_stack: tuple[BaseSegment, ...],
+        segment_idx: int,
+        active: list[_RuleState],
+        child_idxs: Optional[Sequence[int]] = None,
+    ) -> None:
+        if segment.is_type("unparsable"):
+            active = [state for state in active if state.works_on_unparsable]
+        # The rules which match this segment.
+        matched: set[_RuleState] = set()
+        for seg_type in segment.class_types:
+            matched.update(seekers_by_type.get(seg_type, ()))
+        if segment.segments:
+            for seg_type in segment.direct_descendant_type_set:
+                matched.update(parents_by_type.get(seg_type, ()))
+        for state in active:
+            if state in matched and state in running:
+                _evaluate(state, segment, parent_stack, segment_idx)
+
+        if not segment.segments:
+            return
+        descendant_types = segment.descendant_type_set
+        active = [
+            state
+            for state in active
+            if state in running
+            and not (state in matched and not state.allow_recurse)
+            and not state.types.isdisjoint(descendant_types)
+        ]
+        if not active:
+            return
+        new_parent_stack = parent_stack + (segment,)
+        if child_idxs is None:
+            child_idxs = range(len(segment.segments))
+        for idx in child_idxs:
+            _walk(segment.segments[idx], new_parent_stack, idx, active)
+
+    for state in root_only:
+        if state.rule.crawl_behaviour.passes_filter(tree):
+            _evaluate(state, tree, (), 0)
+    seekers = [state for state in states if state not in root_only]
+    if seekers:
+        _walk(tree, (), 0, seekers, child_idxs)
+
+    return {state.rule.code: (state.violations, state.duration) for state in states}
+
+
+def crawl_regions(
+    rule: BaseRule,
+    tree: BaseSegment,
+    child_idxs: Sequence[int],
+    dialect: "Dialect",
+    fix: bool,
+    templated_file: Optional["TemplatedFile"],
+    ignore_mask: Optional["IgnoreMask"],
+    fname: Optional[str],
+    config: "FluffConfig",
+) -> tuple[list[SQLLintError], list[LintFix]]:
+    """Run a rule on a tree, but only within some of its children.
+
+    The tree itself is evaluated as usual, but only the children at the
+    given indices are crawled. For rules which can be run this way (see
+    :func:`can_dispatch`), the results are the same as from
+    :meth:`BaseRule.crawl` if the rule finds nothing in the other children.
+
+    Returns:
+        A tuple of the violations and fixes.
+    """
+    crawler = rule.crawl_behaviour
+    assert isinstance(crawler, SegmentSeekerCrawler)
+    context = RuleContext(
+        dialect=dialect,
+        fix=fix,
+        templated_file=templated_file,
+        path=pathlib.Path(fname) if fname else None,
+        segment=tree,
+        config=config,
+    )
+    vs: list[SQLLintError] = []
+    fixes: list[LintFix] = []
+    if not crawler.passes_filter(tree):
+        return vs, fixes
+    memory = context.memory
+    # NOTE: This mirrors the top level of `SegmentSeekerCrawler._crawl_segment`.
+    if crawler.is_self_match(tree):
+        carry_on, memory = rule._eval_context(
+            context, memory, templated_file, ignore_mask, fname, tree, vs, fixes
+        )
+        if not carry_on or not crawler.allow_recurse:
+            return vs, fixes
+    for idx in child_idxs:
+        context.segment = tree.segments[idx]
+        context.parent_stack = (tree,)
+        context.segment_idx = idx
+        for child_context in crawler.crawl(context):
+            carry_on, memory = rule._eval_context(
+                child_context,
+                memory,
+                templated_file,
+                ignore_mask,
+                fname,
+                tree,
+                vs,
+                fixes,
+            )
+            if not carry_on:
+                return vs, fixes
+    return vs, fixes
@@ -2,10 +2,13 @@
 
 import fnmatch
 import logging
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Optional, Union, cast
 
 from sqlfluff.core.errors import SQLBaseError, SQLParseError, SQLUnusedNoQaWarning
+from sqlfluff.core.helpers.source import scan_source
 from sqlfluff.core.parser import BaseSegment, RawSegment, RegexLexer
 
 # Instantiate the linter logger
@@ -23,31 +26,53 @@ class NoQaDirective:
     raw_str: str = ""  # The raw representation of the directive for warnings.
     used: bool = False  # Has it been used.
 
-    def _filter_violations_single_line(
-        self, violations: list[SQLBaseError]
-    ) -> list[SQLBaseError]:
-        """Filter a list of violations based on this single line noqa.
 
-        Also record whether this class was _used_ in any of that filtering.
+class _LineRanges:
+    """The lines on which "disable"/"enable" directives ignore a rule.
+
+    The directives which affect the rule are sorted by line, and after each
+    one we keep the "disable" directive in effect (if any). The ranges of
+    lines between directives are then the intervals in which the state is
+    the same, so finding the state at a line is a bisection.
+    """
+
+    def __init__(self, directives: list[NoQaDirective]) -> None:
+        # NOTE: The sort is stable, so directives on the same line stay in
+        # the order they're in the file.
+        self.directives = sorted(directives, key=lambda ignore: ignore.line_no)
+        self.lines = [ignore.line_no for ignore in self.directives]
+        # The "disable" directive in effect after each directive.
+        self.disabled_by: list[Optional[NoQaDirective]] = []
+        # The positions of "enable" directives which end a disabled range.
+        self.range_ends: list[int] = []
+        # How many of those we've already marked as used.
+        self.marked = 0
+        last_ignore: Optional[NoQaDirective] = None
+        for idx, ignore in enumerate(self.directives):
+            if ignore.action == "enable":
+                if last_ignore:
+                    self.range_ends.append(idx)
+                last_ignore = None
+            elif ignore.action == "disable":
+                last_ignore = ignore
+            self.disabled_by.append(last_ignore)
+
+    def disabled_at(self, line_no: int) -> Optional[NoQaDirective]:
+        """Find the "disable" directive in effect at a line (if any).
 
-        The "ignore" list is assumed to ONLY contain NoQaDirectives with
-        action=None.
+        Also record which directives are _used_ in finding it, i.e. any
+        "enable" directives which end a disabled range up to this line, and
+        the next directive if it's an "enable".
         """
-        assert not self.action
-        matched_violations = [
-            v
-            for v in violations
-            if (
-                v.line_no == self.line_no
-                and (self.rules is None or v.rule_code() in self.rules)
-            )
-        ]
-        if matched_violations:
-            # Successful match, mark ignore as used.
-            self.used = True
-            return [v for v in violations if v not in matched_violations]
-        else:
-            return violations
+        idx = bisect_right(self.lines, line_no)
+        while (
+            self.marked < len(self.range_ends) and self.range_ends[self.marked] < idx
+        ):
+            self.directives[self.range_ends[self.marked]].used = True
+            self.marked += 1
+        if idx < len(self.directives) and self.directives[idx].action == "enable":
+            self.directives[idx].used = True
+        return self.disabled_by[idx - 1] if idx else None
 
 
 class IgnoreMask:
@@ -55,6 +80,17 @@ class IgnoreMask:
 
     def __init__(self, ignores: list[NoQaDirective]):
         self._ignore_list = ignores
+        # Single line directives, by line (in the order they're in the file).
+        self._single_line: dict[int, list[NoQaDirective]] = defaultdict(list)
+        # The "disable"/"enable" directives, and the lines those ignore each
+        # rule on (built as they're needed), by rule code.
+        self._range_directives: list[NoQaDirective] = []
+        self._line_ranges: dict[str, _LineRanges] = {}
+        for ignore in ignores:
+            if ignore.action:
+                self._range_directives.append(ignore)
+            else:
+                self._single_line[ignore.line_no].append(ignore)
 
     def __repr__(self) -> str:  # pragma: no cover
         return "<IgnoreMask>"
@@ -200,11 +236,12 @@ class IgnoreMask:
         """
         ignore_buff: list[NoQaDirective] = []
         violations: list[SQLBaseError] = []
-        for idx, line in enumerate(source.split("\n")):
-            match = inline_comment_regex.search(line) if line else None
+        # NOTE: Only lines which mention "noqa" can hold a directive.
+        for line_no, line in scan_source(source).noqa_lines:
+            match = inline_comment_regex.search(line)
             if match:
                 ignore_entry = cls._parse_noqa(
-                    line[match[0] : match[1]], idx + 1, match[0], reference_map
+                    line[match[0] : match[1]], line_no, match[0], reference_map
                 )
                 if isinstance(ignore_entry, SQLParseError):
                     violations.append(ignore_entry)  # pragma: no cover
@@ -227,7 +264,15 @@ class IgnoreMask:
         empty ignore mask and no new violations so callers can continue without
         raising an unhelpful ``IndexError``.
         """
-        inline_comment_regex = next(
+        inline_comment_regex = cls._inline_comment_regex(dialect)
+        if inline_comment_regex is None:
+            return cls([]), []
+        return cls.from_source(source, inline_comment_regex, reference_map)
+
+    @staticmethod
+    def _inline_comment_regex(dialect: Any) -> Optional[RegexLexer]:
+        """The ``inline_comment`` lexer matcher of a dialect (if it has one)."""
+        return next(
             (
                 cast(RegexLexer, matcher)
                 for matcher in dialect.lexer_matchers
@@ -235,113 +280,113 @@ class IgnoreMask:
             ),
             None,
         )
-        if inline_comment_regex is None:
-            return cls([]), []
-        return cls.from_source(source, inline_comment_regex, reference_map)
 
-    # ### Application methods.
+    @classmethod
+    def source_disables_all(cls, source: str, dialect: Any) -> bool:
+        """Whether the noqa comments in raw source disable all rules everywhere.
 
-    @staticmethod
-    def _ignore_masked_violations_single_line(
-        violations: list[SQLBaseError], ignore_mask: list[NoQaDirective]
-    ) -> list[SQLBaseError]:
-        """Filter a list of violations based on this single line noqa.
+        That's the case if the first line of the source is a comment which
+        disables all rules (i.e. ``-- noqa: disable=all``), and no other
+        ``noqa`` comment might enable any of them again. This is checked on
+        the raw source, so that such files needn't be templated or parsed.
 
-        The "ignore" list is assumed to ONLY contain NoQaDirectives with
-        action=None.
+        NOTE: To be safe, any other mention of both "noqa" and "enable"
+        counts, including in block comments or strings, which aren't
+        otherwise considered here.
         """
-        for ignore in ignore_mask:
-            violations = ignore._filter_violations_single_line(violations)
-        return violations
+        noqa_lines = scan_source(source).noqa_lines
+        if not noqa_lines or noqa_lines[0][0] != 1:
+            return False
+        if any("enable" in line for _, line in noqa_lines):
+            return False
+        inline_comment_regex = cls._inline_comment_regex(dialect)
+        if inline_comment_regex is None:
+            return False
+        line = noqa_lines[0][1]
+        match = inline_comment_regex.search(line)
+        # The comment must start the line, so that it can't be within
+        # anything else (e.g. a string).
+        if not match or match[0] != 0:
+            return False
+        directive = cls._parse_noqa(line[match[0] : match[1]], 1, 0, {})
+        return (
+            isinstance(directive, NoQaDirective)
+            and directive.action == "disable"
+            and directive.rules is None
+        )
 
-    @staticmethod
-    def _should_ignore_violation_line_range(
-        line_no: int, ignore_rules: list[NoQaDirective]
-    ) -> tuple[bool, Optional[NoQaDirective]]:
-        """Returns whether to ignore a violation at line_no.
-
-        Loop through the NoQaDirectives to find the state of things at
-        line_no. Assumptions about "ignore_rules":
-        - Contains directives for only ONE RULE, i.e. the rule that was
-          violated at line_no
-        - Sorted in ascending order by line number
-        """
-        ignore = False
-        last_ignore: Optional[NoQaDirective] = None
-        for idx, ignore_rule in enumerate(ignore_rules):
-            if ignore_rule.line_no > line_no:
-                # Peak at the next rule to see if it's a matching disable
-                # and if it is, then mark it as used.
-                if ignore_rule.action == "enable":
-                    # Mark as used
-                    ignore_rule.used = True
-                break
-
-            if ignore_rule.action == "enable":
-                # First, if this enable did counteract a
-                # corresponding _disable_, then it has been _used_.
-                if last_ignore:
-                    ignore_rule.used = True
-                last_ignore = None
-                ignore = False
-            elif ignore_rule.action == "disable":
-                last_ignore = ignore_rule
-                ignore = True
+    # ### Application methods.
 
-        return ignore, last_ignore
+    def _single_line_ignore(
+        self, line_no: int, rule_code: str
+    ) -> Optional[NoQaDirective]:
+        """The first single line directive which ignores a rule on a line."""
+        for ignore in self._single_line.get(line_no, ()):
+            if ignore.rules is None or rule_code in ignore.rules:
+                return ignore
+        return None
 
-    @classmethod
-    def _ignore_masked_violations_line_range(
-        cls, violations: list[SQLBaseError], ignore_mask: list[NoQaDirective]
-    ) -> list[SQLBaseError]:
-        """Returns whether to ignore error for line-range directives.
+    def _rule_line_ranges(self, rule_code: str) -> _LineRanges:
+        """The lines "disable"/"enable" directives ignore a rule on.
 
-        The "ignore" list is assumed to ONLY contain NoQaDirectives where
-        action is "enable" or "disable".
+        The directives which affect the rule are those which either
+        reference it, or don't specify a list of rules (i.e. affect ALL
+        rules).
         """
-        result = []
-        for v in violations:
-            # Find the directives that affect the violated rule "v", either
-            # because they specifically reference it or because they don't
-            # specify a list of rules, thus affecting ALL rules.
-            ignore_rule = sorted(
-                (
+        line_ranges = self._line_ranges.get(rule_code)
+        if line_ranges is None:
+            line_ranges = _LineRanges(
+                [
                     ignore
-                    for ignore in ignore_mask
-                    if not ignore.rules or (v.rule_code() in ignore.rules)
-                ),
-                key=lambda ignore: ignore.line_no,
+                    for ignore in self._range_directives
+                    if not ignore.rules or rule_code in ignore.rules
+                ]
             )
-            # Determine whether to ignore the violation, based on the relevant
-            # enable/disable directives.
-            ignore, last_ignore = cls._should_ignore_violation_line_range(
-                v.line_no, ignore_rule
-            )
-            if not ignore:
-                result.append(v)
-            # If there was a previous ignore which mean that we filtered out
-            # a violation, then mark it as used.
-            elif last_ignore:
-                last_ignore.used = True
-
-        return result
+            self._line_ranges[rule_code] = line_ranges
+        return line_ranges
 
     def ignore_masked_violations(
         self, violations: list[SQLBaseError]
     ) -> list[SQLBaseError]:
         """Remove any violations specified by ignore_mask.
 
-        This involves two steps:
-        1. Filter out violations affected by single-line "noqa" directives.
-        2. Filter out violations affected by disable/enable "noqa" directives.
+        This involves two steps for each violation:
+        1. Filter it out if it's affected by a single-line "noqa" directive.
+        2. Filter it out if it's affected by disable/enable "noqa" directives.
+
+        Each step is a lookup (by line) rather than a check of every
+        directive, so this is quick even with many directives.
         """
-        ignore_specific = [ignore for ignore in self._ignore_list if not ignore.action]
-        ignore_range = [ignore for ignore in self._ignore_list if ignore.action]
-        violations = self._ignore_masked_violations_single_line(
-            violations, ignore_specific
-        )
-        violations = self._ignore_masked_violations_line_range(violations, ignore_range)
-        return violations
+        if not self._ignore_list:
+            return violations
+        result = []
+        for v in violations:
+            rule_code = v.rule_code()
+            ignore = self._single_line_ignore(v.line_no, rule_code)
+            if ignore:
+                ignore.used = True
+                continue
+            if self._range_directives:
+                ignore = self._rule_line_ranges(rule_code).disabled_at(v.line_no)
+                if ignore:
+                    # This directive filtered out the violation, so mark it as
+                    # used.
+                    ignore.used = True
+                    continue
+            result.append(v)
+        return result
+
+    def directives_to_line(self, line_no: int) -> list[tuple[Any, ...]]:
+        """The position, rules and action of each directive up to a line.
+
+        Violations up to that line can only be affected by these directives,
+        so if two masks have the same ones, they filter those the same way.
+        """
+        return [
+            (ignore.line_no, ignore.line_pos, ignore.rules, ignore.action)
+            for ignore in self._ignore_list
+            if ignore.line_no <= line_no
+        ]
 
     def generate_warnings_for_unused(self) -> list[SQLBaseError]:
         """Generates warnings for any unused NoQaDirectives."""
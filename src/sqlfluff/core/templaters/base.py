@@ -541,6 +541,48 @@ class RawTemplater:
         # Default is to process in the original order.
         return fnames
 
+    def get_cache_dependencies(self, config: FluffConfig) -> Optional[list[str]]:
+        """Return paths outside the file being templated which affect the output.
+
+        This is used by the lint result cache to invalidate cached results
+        when any of these files change. Return ``None`` if the output depends
+        on state which can't be captured this way, in which case results are
+        never cached for this templater.
+        """
+        # The raw templater only depends on the file itself.
+        return []
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Return the running counts of hits and misses on any internal caches.
+
+        The linter records the change in these counts while rendering each
+        file, so that they can be reported alongside timings (e.g. with
+        ``--bench``). Templaters which don't cache anything return an
+        empty dict.
+        """
+        return {}
+
+    def may_add_comments(self, in_str: str) -> bool:
+        """Whether rendering a string could add comments which aren't in it.
+
+        Comments added by templating (e.g. from a jinja include or macro)
+        could enable rules which noqa comments in the source disable. The raw
+        templater doesn't change the source at all, but templaters which
+        inherit from it are assumed to add comments unless they say otherwise.
+        """
+        return self.name != "raw"
+
+    def start_run(self) -> None:
+        """Start a run over a set of files (e.g. by ``lint_paths``).
+
+        Templaters may keep state which is only valid for the length of a
+        run (e.g. snapshots of the files they depend on), until
+        :meth:`end_run`. The raw templater doesn't keep any.
+        """
+
+    def end_run(self) -> None:
+        """End a run over a set of files, discarding any state from it."""
+
     @large_file_check
     def process(
         self,
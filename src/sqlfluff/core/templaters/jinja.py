@@ -3,13 +3,16 @@
 import copy
 import importlib
 import importlib.util
+import json
 import logging
+import os
 import os.path
 import pkgutil
 import re
 import sys
 from collections.abc import Iterable, Iterator
 from functools import reduce
+from types import CodeType
 from typing import (
     Any,
     Callable,
@@ -22,6 +25,7 @@ import jinja2.nodes
 import jinja2.parser
 from jinja2 import (
     Environment,
+    FileSystemBytecodeCache,
     FileSystemLoader,
     TemplateError,
     TemplateSyntaxError,
@@ -34,7 +38,7 @@ from jinja2.sandbox import SandboxedEnvironment
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.errors import SQLFluffUserError, SQLTemplaterError
 from sqlfluff.core.formatter import FormatterInterface
-from sqlfluff.core.helpers.file import get_encoding
+from sqlfluff.core.helpers.file import get_encoding, snapshot_paths
 from sqlfluff.core.helpers.slice import is_zero_slice, slice_length
 from sqlfluff.core.templaters.base import (
     RawFileSlice,
@@ -49,6 +53,18 @@ from sqlfluff.core.templaters.slicers.tracer import JinjaAnalyzer, JinjaTrace
 # Instantiate the templater logger
 templater_logger = logging.getLogger("sqlfluff.templater")
 
+# The number of environments kept by each templater (one for each distinct
+# templater config), and of compiled templates kept by each environment.
+# These limits only guard against unusual numbers of distinct entries, so
+# when reached the cache is just cleared.
+_ENV_CACHE_SIZE = 16
+_COMPILED_CACHE_SIZE = 256
+
+
+def _count(stats: dict[str, int], key: str) -> None:
+    """Increment a cache hit or miss counter."""
+    stats[key] = stats.get(key, 0) + 1
+
 
 class UndefinedRecorder:
     """Similar to jinja2.StrictUndefined, but remembers, not fails."""
@@ -90,10 +106,64 @@ class UndefinedRecorder:
         yield UndefinedRecorder(f"iter({self.name})", self.undefined_set)
 
 
+class CachingSandboxedEnvironment(SandboxedEnvironment):
+    """A sandboxed environment which reuses compiled templates.
+
+    Templates loaded by name (e.g. with ``{% include %}``) are cached by the
+    environment itself, and by the bytecode cache if one is configured.
+    Templates created with ``from_string()`` have no name to cache on, so
+    their compiled code is kept here, keyed on the source. The compiled code
+    only refers to the environment and context when rendered, so it's safe
+    to reuse with a different context.
+    """
+
+    def __init__(
+        self, *args: Any, cache_stats: Optional[dict[str, int]] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._compiled: dict[str, CodeType] = {}
+        # NOTE: This may be shared with the templater which created the
+        # environment, so that counts accumulate across environments.
+        self.cache_stats = cache_stats if cache_stats is not None else {}
+
+    def compile(  # type: ignore[override]
+        self,
+        source: Union[str, jinja2.nodes.Template],
+        name: Optional[str] = None,
+        filename: Optional[str] = None,
+        raw: bool = False,
+        defer_init: bool = False,
+    ) -> Union[str, CodeType]:
+        """Compile a template, reusing the result for unnamed templates."""
+        if (
+            not isinstance(source, str)
+            or name is not None
+            or filename is not None
+            or raw
+            or defer_init
+        ):
+            return super().compile(source, name, filename, raw, defer_init)
+        code = self._compiled.get(source)
+        if code is not None:
+            _count(self.cache_stats, "compile hits")
+            return code
+        _count(self.cache_stats, "compile misses")
+        code = cast(CodeType, super().compile(source))
+        if len(self._compiled) >= _COMPILED_CACHE_SIZE:
+            self._compiled.clear()
+        self._compiled[source] = code
+        return code
+
+
 class JinjaTemplater(PythonTemplater):
     """A templater using the jinja2 library.
 
     See: https://jinja.palletsprojects.com/
+
+    Environments and their contexts (including any macros and libraries)
+    are built once for each distinct templater config and then shared
+    between files. They're rebuilt if any of the macro, loader or library
+    files change.
     """
 
     name = "jinja"
@@ -103,6 +173,44 @@ class JinjaTemplater(PythonTemplater):
 
         pass
 
+    def __init__(self, override_context: Optional[dict[str, Any]] = None) -> None:
+        super().__init__(override_context=override_context)
+        # Environments and base contexts, keyed on a fingerprint of the
+        # config which affects them. Each is stored with a snapshot of the
+        # files which they were loaded from.
+        self._env_cache: dict[str, tuple[str, Environment, dict[str, Any]]] = {}
+        # The environment used for analysing templates, which doesn't
+        # depend on any config.
+        self._analyzer_env: Optional[Environment] = None
+        self._cache_stats: dict[str, int] = {}
+        # Snapshots of the files which environments depend on, taken once
+        # per run (see `start_run`). Outside a run, they're taken for each
+        # file.
+        self._run_snapshots: Optional[dict[tuple[str, ...], str]] = None
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Return the running counts of hits and misses on the jinja caches."""
+        return dict(self._cache_stats)
+
+    def start_run(self) -> None:
+        """Start a run, during which dependencies are only snapshotted once."""
+        self._run_snapshots = {}
+
+    def end_run(self) -> None:
+        """End a run, so that dependencies are snapshotted for each file."""
+        self._run_snapshots = None
+
+    def _dependency_snapshot(self, paths: list[str]) -> str:
+        """Snapshot the size and mtime of every file within the given paths."""
+        if self._run_snapshots is None:
+            return snapshot_paths(paths)
+        path_key = tuple(sorted(paths))
+        if path_key in self._run_snapshots:
+            return self._run_snapshots[path_key]
+        snapshot = snapshot_paths(path_key)
+        self._run_snapshots[path_key] = snapshot
+        return snapshot
+
     @staticmethod
     def _is_trim_tag(raw_slice: RawFileSlice) -> bool:
         """Return whether a raw slice is a Jinja tag with whitespace trimming."""
@@ -409,7 +517,8 @@ class JinjaTemplater(PythonTemplater):
         regular FileSystemLoader. It then sets the extensions to ['jinja2.ext.do']
         and adds the DBTTestExtension if the _apply_dbt_builtins method returns
         True. Finally, it returns a SandboxedEnvironment object with the
-        specified settings.
+        specified settings. If a ``cache_dir`` is configured, compiled
+        templates from the loader are also cached on disk between runs.
 
         Args:
             config (dict, optional): A dictionary containing configuration settings.
@@ -450,15 +559,31 @@ class JinjaTemplater(PythonTemplater):
         if self._apply_dbt_builtins(config):
             extensions.append(DBTTestExtension)
 
-        return SandboxedEnvironment(
+        cache_dir = config and config.get("cache_dir")
+        bytecode_cache = (
+            FileSystemBytecodeCache(self._make_bytecode_cache_dir(str(cache_dir)))
+            if cache_dir and loader
+            else None
+        )
+
+        return CachingSandboxedEnvironment(
             # We explicitly want to preserve newlines.
             keep_trailing_newline=True,
             # The do extension allows the "do" directive
             autoescape=False,
             extensions=extensions,
             loader=loader,
+            bytecode_cache=bytecode_cache,
+            cache_stats=self._cache_stats,
         )
 
+    @staticmethod
+    def _make_bytecode_cache_dir(cache_dir: str) -> str:
+        """Create (if necessary) the directory for jinja's bytecode cache."""
+        bytecode_dir = os.path.join(cache_dir, "jinja")
+        os.makedirs(bytecode_dir, exist_ok=True)
+        return bytecode_dir
+
     def _get_macros_path(
         self, config: Optional[FluffConfig], key: str
     ) -> Optional[list[str]]:
@@ -518,6 +643,17 @@ class JinjaTemplater(PythonTemplater):
                     return result
         return None
 
+    def get_cache_dependencies(self, config: FluffConfig) -> Optional[list[str]]:
+        """Return the macro, loader and library paths which affect the output."""
+        library_path = config.get("library_path") or config.get_section(
+            (self.templater_selector, self.name, "library_path")
+        )
+        return [
+            *(self._get_macros_path(config, "load_macros_from_path") or []),
+            *(self._get_loader_search_path(config) or []),
+            *([library_path] if library_path else []),
+        ]
+
     def _get_jinja_analyzer(self, raw_str: str, env: Environment) -> JinjaAnalyzer:
         """Creates a new object derived from JinjaAnalyzer.
 
@@ -624,6 +760,66 @@ class JinjaTemplater(PythonTemplater):
 
         return live_context
 
+    def _get_env_fingerprint(self, config: FluffConfig) -> str:
+        """Fingerprint the config which affects the environment and context."""
+        return json.dumps(
+            [
+                # Paths in the config may be relative to the working directory.
+                os.getcwd(),
+                config.get_section((self.templater_selector, self.name)),
+                config.get("library_path"),
+                config.get("ignore"),
+                config.get("encoding"),
+                config.get("cache_dir"),
+            ],
+            sort_keys=True,
+            default=repr,
+        )
+
+    def _get_env_and_context(
+        self, fname: Optional[str], config: Optional[FluffConfig]
+    ) -> tuple[Environment, dict[str, Any]]:
+        """Get an environment and the templating context for a file.
+
+        Loading macros and libraries can be slow, so the environment and
+        context are cached, keyed on the config which affects them. Cached
+        entries are reused only while none of the macro, loader or library
+        files have changed (which is checked once per run, if in one). Each
+        file gets a copy of the context, because it's extended with any
+        undefined variables while processing.
+
+        NOTE: The context doesn't depend on ``fname`` (see `get_context`),
+        so it's safe to share between files.
+        """
+        dependencies = self.get_cache_dependencies(config) if config else None
+        if not config or dependencies is None:
+            env = self._get_jinja_env(config)
+            return env, self._get_env_context(fname, config, env)
+
+        key = self._get_env_fingerprint(config)
+        snapshot = self._dependency_snapshot(dependencies)
+        cached = self._env_cache.get(key)
+        if cached and cached[0] == snapshot:
+            _count(self._cache_stats, "env hits")
+            _, env, base_context = cached
+        else:
+            _count(self._cache_stats, "env misses")
+            env = self._get_jinja_env(config)
+            base_context = self._get_env_context(fname, config, env)
+            if len(self._env_cache) >= _ENV_CACHE_SIZE:
+                self._env_cache.clear()
+            self._env_cache[key] = (snapshot, env, base_context)
+        return env, dict(base_context)
+
+    def _get_analyzer_env(self) -> Environment:
+        """Get the environment used to analyse templates.
+
+        This doesn't depend on any config, so is shared by all files.
+        """
+        if self._analyzer_env is None:
+            self._analyzer_env = self._get_jinja_env()
+        return self._analyzer_env
+
     def construct_render_func(
         self, fname: Optional[str] = None, config: Optional[FluffConfig] = None
     ) -> tuple[Environment, dict[str, Any], Callable[[str], str]]:
@@ -641,9 +837,7 @@ class JinjaTemplater(PythonTemplater):
                 - render_func (Callable[[str], str]): A callable function
                 that is used to instantiate templates.
         """
-        # Load the context
-        env = self._get_jinja_env(config)
-        live_context = self._get_env_context(fname, config, env)
+        env, live_context = self._get_env_and_context(fname, config)
 
         def render_func(in_str: str) -> str:
             """Used by JinjaTracer to instantiate templates.
@@ -872,7 +1066,7 @@ class JinjaTemplater(PythonTemplater):
 
         templater_logger.info("Slicing File Template")
         templater_logger.debug("    Raw String: %r", raw_str[:80])
-        analyzer = self._get_jinja_analyzer(raw_str, self._get_jinja_env())
+        analyzer = self._get_jinja_analyzer(raw_str, self._get_analyzer_env())
         tracer = analyzer.analyze(render_func)
         trace = tracer.trace(append_to_templated=append_to_templated)
         return trace.raw_sliced, trace.sliced_file, trace.templated_str
@@ -985,7 +1179,7 @@ class JinjaTemplater(PythonTemplater):
             append_to_templated (:obj:`str`, optional): Optional string to append
                 to the templated file.
         """
-        analyzer = self._get_jinja_analyzer(in_str, self._get_jinja_env())
+        analyzer = self._get_jinja_analyzer(in_str, self._get_analyzer_env())
         tracer_copy = analyzer.analyze(render_func)
 
         max_variants_generated = 10
@@ -1041,7 +1235,7 @@ class JinjaTemplater(PythonTemplater):
             variant_raw_str = "".join(variant_key)
             if variant_raw_str not in variants:
                 analyzer = self._get_jinja_analyzer(
-                    variant_raw_str, self._get_jinja_env()
+                    variant_raw_str, self._get_analyzer_env()
                 )
                 tracer_trace = analyzer.analyze(render_func)
                 try:
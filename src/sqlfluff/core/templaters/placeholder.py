@@ -115,6 +115,13 @@ class PlaceholderTemplater(RawTemplater):
 
         return live_context
 
+    def may_add_comments(self, in_str: str) -> bool:
+        """Whether rendering a string could add comments which aren't in it.
+
+        Placeholders are only ever replaced with parameter values.
+        """
+        return False
+
     @large_file_check
     def process(
         self,
@@ -207,6 +207,14 @@ class PythonTemplater(RawTemplater):
             live_context[k] = self.infer_type(live_context[k])
         return live_context
 
+    def may_add_comments(self, in_str: str) -> bool:
+        """Whether rendering a string could add comments which aren't in it.
+
+        Without any braces there's nothing to template, and this also holds
+        for the jinja templater (and others which inherit from this one).
+        """
+        return "{" in in_str
+
     @large_file_check
     def process(
         self,
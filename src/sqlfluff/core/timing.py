@@ -1,41 +1,75 @@
 """Timing summary class."""
 
-from collections import defaultdict
 from typing import Optional, Union
 
+# The running totals kept for each step or rule: count, sum, min and max.
+_Stats = list[float]
+
+
+def _add_time(stats: dict[str, _Stats], key: str, time: float) -> None:
+    """Add a single time into a set of running totals."""
+    current = stats.get(key)
+    if current is None:
+        stats[key] = [1, time, time, time]
+    else:
+        current[0] += 1
+        current[1] += time
+        current[2] = min(current[2], time)
+        current[3] = max(current[3], time)
+
+
+def _merge_stats(stats: dict[str, _Stats], other: dict[str, _Stats]) -> None:
+    """Merge one set of running totals into another."""
+    for key, (cnt, total, min_time, max_time) in other.items():
+        current = stats.get(key)
+        if current is None:
+            stats[key] = [cnt, total, min_time, max_time]
+        else:
+            current[0] += cnt
+            current[1] += total
+            current[2] = min(current[2], min_time)
+            current[3] = max(current[3], max_time)
+
 
 class TimingSummary:
-    """An object for tracking the timing of similar steps across many files."""
+    """An object for tracking the timing of similar steps across many files.
+
+    Only running totals are kept (rather than every timing), so that the
+    memory used doesn't grow with the number of files.
+    """
 
     def __init__(self, steps: Optional[list[str]] = None):
         self.steps = steps
-        self._timings: list[dict[str, float]] = []
+        self._stats: dict[str, _Stats] = {}
 
     def add(self, timing_dict: dict[str, float]) -> None:
         """Add a timing dictionary to the summary."""
-        self._timings.append(timing_dict)
         if not self.steps:
             self.steps = list(timing_dict.keys())
+        for step, time in timing_dict.items():
+            _add_time(self._stats, step, time)
+
+    def update(self, other: "TimingSummary") -> None:
+        """Add all the timings from another summary into this one."""
+        if not self.steps:
+            self.steps = other.steps
+        _merge_stats(self._stats, other._stats)
 
     def summary(self) -> dict[str, dict[str, float]]:
         """Generate a summary for display."""
-        vals: dict[str, list[float]] = defaultdict(list)
         if not self.steps:  # pragma: no cover
             return {}
 
-        for timing_dict in self._timings:
-            for step in self.steps:
-                if step in timing_dict:
-                    vals[step].append(timing_dict[step])
         summary = {}
         for step in self.steps:
-            if vals[step]:
+            if step in self._stats:
+                cnt, total, min_time, max_time = self._stats[step]
                 summary[step] = {
-                    "cnt": len(vals[step]),
-                    "sum": sum(vals[step]),
-                    "min": min(vals[step]),
-                    "max": max(vals[step]),
-                    "avg": sum(vals[step]) / len(vals[step]),
+                    "cnt": cnt,
+                    "sum": total,
+                    "min": min_time,
+                    "max": max_time,
+                    "avg": total / cnt,
                 }
         return summary
 
@@ -44,37 +78,38 @@ class RuleTimingSummary:
     """An object for tracking the timing of rules across many files."""
 
     def __init__(self) -> None:
-        self._timings: list[tuple[str, str, float]] = []
+        self._stats: dict[str, _Stats] = {}
+        self._names: dict[str, tuple[str, str]] = {}
 
     def add(self, rule_timings: list[tuple[str, str, float]]) -> None:
         """Add a set of rule timings."""
-        # Add records to the main list.
-        self._timings.extend(rule_timings)
+        for code, name, time in rule_timings:
+            key = f"{code}: {name}"
+            self._names[key] = (code, name)
+            _add_time(self._stats, key, time)
+
+    def update(self, other: "RuleTimingSummary") -> None:
+        """Add all the timings from another summary into this one."""
+        self._names.update(other._names)
+        _merge_stats(self._stats, other._stats)
 
     def summary(
         self, threshold: float = 0.5
     ) -> dict[str, dict[str, Union[float, str]]]:
         """Generate a summary for display."""
-        keys: set[tuple[str, str]] = set()
-        vals: dict[tuple[str, str], list[float]] = defaultdict(list)
-
-        for code, name, time in self._timings:
-            vals[(code, name)].append(time)
-            keys.add((code, name))
-
         summary: dict[str, dict[str, Union[float, str]]] = {}
-        for code, name in sorted(keys):
-            timings = vals[(code, name)]
+        for key in sorted(self._stats, key=self._names.__getitem__):
+            cnt, total, min_time, max_time = self._stats[key]
             # For brevity, if the total time taken is less than
             # `threshold`, then don't display.
-            if sum(timings) < threshold:
+            if total < threshold:
                 continue
             # NOTE: This summary isn't covered in tests, it's tricky
             # to force it to exist in a test environment without
             # making things complicated.
-            summary[f"{code}: {name}"] = {  # pragma: no cover
-                "sum (n)": f"{sum(timings):.2f} ({len(timings)})",
-                "min": min(timings),
-                "max": max(timings),
+            summary[key] = {  # pragma: no cover
+                "sum (n)": f"{total:.2f} ({int(cnt)})",
+                "min": min_time,
+                "max": max_time,
             }
         return summary
@@ -815,6 +815,7 @@ class FileSegment(BaseFileSegment):
     has no match_grammar.
     """
 
+    split_after_raws = frozenset((";",))
     # Allow leading & trailing delimiters plus runs of delimited statements.
     match_grammar = Sequence(
         AnyNumberOf(Ref("DelimiterGrammar")),
@@ -4129,6 +4130,8 @@ class StatementSegment(BaseSegment):
     """A generic segment, to any of its child subsegments."""
 
     type = "statement"
+    # Generated SQL often repeats the same statements, so reuse matches.
+    cache_match_by_shape = True
     match_grammar: Matchable = OneOf(
         Ref("SelectableGrammar"),
         Ref("MergeStatementSegment"),
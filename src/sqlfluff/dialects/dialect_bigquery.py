@@ -692,6 +692,7 @@ class FileSegment(BaseFileSegment):
     has no match_grammar.
     """
 
+    split_after_raws = frozenset((";",))
     # NB: We don't need a match_grammar here because we're
     # going straight into instantiating it directly usually.
     match_grammar = Sequence(
@@ -7515,6 +7515,7 @@ class FileSegment(BaseFileSegment):
     file level without requiring a semicolon delimiter.
     """
 
+    split_after_raws = frozenset((";",))
     match_grammar = AnyNumberOf(
         Ref("PostgresCopyStdinDataStatementSegment"),
         Ref("PsqlCopyMetaCommandStatementSegment"),
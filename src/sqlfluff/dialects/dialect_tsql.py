@@ -839,6 +839,9 @@ class FileSegment(BaseFileSegment):
     has no match_grammar.
     """
 
+    # NOTE: Statements within a batch are part of the batch segment, so we
+    # can only split between batches.
+    split_after_raws = frozenset(("GO",))
     match_grammar = Sequence(
         AnyNumberOf(
             Ref("BatchSegment"),
@@ -90,6 +90,7 @@ class Rule_AL05(BaseRule):
         "redshift",
     ]
     is_fix_compatible = True
+    is_statement_local = True
 
     # config
     alias_case_check: str
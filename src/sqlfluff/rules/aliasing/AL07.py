@@ -88,6 +88,7 @@ class Rule_AL07(BaseRule):
     config_keywords = ["force_enable"]
     crawl_behaviour = SegmentSeekerCrawler({"select_statement"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[list[LintResult]]:
         """Identify aliases in from clause and join conditions.
@@ -44,6 +44,7 @@ class Rule_AM03(BaseRule):
     groups: tuple[str, ...] = ("all", "ambiguous")
     crawl_behaviour = SegmentSeekerCrawler({"orderby_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     @staticmethod
     def _get_orderby_info(segment: BaseSegment) -> list[OrderByColumnInfo]:
@@ -45,6 +45,7 @@ class Rule_AM05(BaseRule):
     config_keywords = ["fully_qualify_join_types"]
     crawl_behaviour = SegmentSeekerCrawler({"join_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Fully qualify JOINs."""
@@ -42,6 +42,7 @@ class Rule_AM08(BaseRule):
     groups: tuple[str, ...] = ("all", "ambiguous")
     crawl_behaviour = SegmentSeekerCrawler({"join_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Find joins without ON clause.
@@ -43,6 +43,7 @@ class Rule_CV02(BaseRule):
     groups = ("all", "convention")
     crawl_behaviour = SegmentSeekerCrawler({"function_name_identifier"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Use ``COALESCE`` instead of ``IFNULL`` or ``NVL``."""
@@ -43,6 +43,7 @@ class Rule_CV03(BaseRule):
     config_keywords = ["select_clause_trailing_comma"]
     crawl_behaviour = SegmentSeekerCrawler({"select_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Trailing commas within select clause."""
@@ -56,6 +56,7 @@ class Rule_CV12(BaseRule):
     groups = ("all", "convention")
     crawl_behaviour = SegmentSeekerCrawler({"select_statement"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> EvalResultType:
         """Find joins with WHERE clause.
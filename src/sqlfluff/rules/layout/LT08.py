@@ -41,6 +41,7 @@ class Rule_LT08(BaseRule):
     groups = ("all", "core", "layout")
     crawl_behaviour = SegmentSeekerCrawler({"with_compound_statement"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[list[LintResult]]:
         """Blank line expected but not found after CTE definition."""
@@ -97,6 +97,7 @@ class Rule_LT09(BaseRule):
     config_keywords = ["wildcard_policy", "single_target_policy"]
     crawl_behaviour = SegmentSeekerCrawler({"select_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         self.wildcard_policy: str
@@ -90,6 +90,7 @@ class Rule_RF03(BaseRule):
     # This could be turned into an option
     _fix_inconsistent_to = "qualified"
     is_fix_compatible = True
+    is_statement_local = True
     single_table_references: str
 
     def _eval(self, context: RuleContext) -> EvalResultType:
@@ -99,6 +99,7 @@ class Rule_ST02(BaseRule):
     groups: tuple[str, ...] = ("all", "structure")
     crawl_behaviour = SegmentSeekerCrawler({"case_expression"})
     is_fix_compatible = True
+    is_statement_local = True
 
     @staticmethod
     def _coalesce_fix_list(
@@ -104,6 +104,7 @@ class Rule_ST05(BaseRule):
         "both": ["join_clause", "from_expression_element"],
     }
     is_fix_compatible = True
+    is_statement_local = True
 
     # These are dialects that support WITH ... INSERT ... SELECT instead of
     # INSERT ... WITH ... SELECT
@@ -49,6 +49,7 @@ class Rule_ST06(BaseRule):
     groups = ("all", "structure")
     crawl_behaviour = SegmentSeekerCrawler({"select_clause"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _is_view_with_explicit_columns(self, context: RuleContext) -> bool:
         """Check if SELECT is in a CREATE VIEW with explicit column list.
@@ -70,6 +70,7 @@ class Rule_ST07(BaseRule):
     groups: tuple[str, ...] = ("all", "structure")
     crawl_behaviour = SegmentSeekerCrawler({"join_clause"})
     is_fix_compatible = True
+    is_statement_local = True
     _dialects_disabled_by_default = [
         "clickhouse",
     ]
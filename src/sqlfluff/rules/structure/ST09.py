@@ -72,6 +72,7 @@ class Rule_ST09(BaseRule):
     config_keywords = ["preferred_first_table_in_join_clause"]
     crawl_behaviour = SegmentSeekerCrawler({"from_expression"})
     is_fix_compatible = True
+    is_statement_local = True
 
     # Operators that are either commutative (can swap sides without change) or
     # have known inverses (swap sides and flip operator). Directional operators
@@ -61,6 +61,7 @@ class Rule_TQ02(BaseRule):
     groups = ("all", "tsql")
     crawl_behaviour = SegmentSeekerCrawler({"create_procedure_statement"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Procedure bodies with multiple statements should be wrapped in BEGIN/END."""
@@ -43,6 +43,7 @@ class Rule_TQ04(BaseRule):
     config_keywords = ["force_enable"]
     crawl_behaviour = SegmentSeekerCrawler({"alias_expression"})
     is_fix_compatible = True
+    is_statement_local = True
 
     def _eval(self, context: RuleContext) -> Optional[LintResult]:
         """Prefer ANSI-style ``AS`` aliasing over ``alias = expression``."""
@@ -2610,6 +2610,31 @@ def test_cli_warn_unused_noqa_flag():
     )
 
 
+def test_cli_lint_cache_dir(tmp_path):
+    """Test that results served from --cache-dir match a fresh lint."""
+    args = [
+        lint,
+        [
+            "test/fixtures/linter/indentation_errors.sql",
+            "--cache-dir",
+            str(tmp_path),
+            "-vv",
+        ],
+    ]
+    first = invoke_assert_code(ret_code=1, args=args)
+    assert re.search(r"cache misses:\s+1", first.stdout)
+    second = invoke_assert_code(ret_code=1, args=args)
+    assert re.search(r"cache hits:\s+1", second.stdout)
+    violations = [line for line in first.stdout.splitlines() if line.startswith("L:")]
+    assert violations
+    assert violations == [
+        line for line in second.stdout.splitlines() if line.startswith("L:")
+    ]
+    # The cache isn't used at all with --no-cache.
+    third = invoke_assert_code(ret_code=1, args=[lint, args[1] + ["--no-cache"]])
+    assert "cache hits" not in third.stdout
+
+
 def test_cli_get_default_config():
     """`nocolor` and `verbose` values loaded from config if not specified via CLI."""
     config = get_config(
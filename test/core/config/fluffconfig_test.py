@@ -2,11 +2,12 @@
 
 import logging
 import os
+import pickle
 
 import pytest
 
 import sqlfluff
-from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core import FluffConfig, Linter, dialect_selector
 from sqlfluff.core.errors import SQLFluffUserError
 from sqlfluff.core.templaters import (
     JinjaTemplater,
@@ -433,6 +434,47 @@ def test__api__immutable_config():
     assert config.get("dialect") == "ansi"
 
 
+def test__config__dialect_cached():
+    """Configs share expanded dialects, which aren't pickled with the config."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    assert config.get("dialect_obj") is dialect_selector("ansi")
+    assert config.get("dialect_obj") is not dialect_selector("postgres")
+
+    pickled = pickle.dumps(config)
+    assert len(pickled) < len(pickle.dumps(config.get("dialect_obj")))
+    unpickled = pickle.loads(pickled)
+    assert unpickled.get("dialect_obj") is config.get("dialect_obj")
+    # The original config still has its dialect.
+    assert config.get("dialect_obj") is dialect_selector("ansi")
+
+
+def test__config__get_child_from_path_shared():
+    """Files in the same directory share a config, unless they have inline config."""
+    root = FluffConfig(overrides={"dialect": "ansi"})
+    config = root.get_child_from_path("test/fixtures/config/inheritance_a/a.sql")
+    assert config is root.get_child_from_path(
+        "test/fixtures/config/inheritance_a/testing.sql"
+    )
+    # It's the same config as an unshared child.
+    assert not config.diff_to(
+        root.make_child_from_path("test/fixtures/config/inheritance_a/testing.sql")
+    )
+    nested = root.get_child_from_path(
+        "test/fixtures/config/inheritance_a/nested/blah.sql"
+    )
+    assert nested is not config
+    assert nested.get("dialect") == "ansi"
+
+    # Without any inline config, the shared config is used as it is.
+    assert config.with_inline_config("SELECT 1\n", "a.sql") is config
+    inline = config.with_inline_config(
+        "-- sqlfluff:dialect:postgres\nSELECT 1\n", "a.sql"
+    )
+    assert inline is not config
+    assert inline.get("dialect") == "postgres"
+    assert config.get("dialect") == "ansi"
+
+
 def test_resolve_path_glob_patterns(tmp_path):
     """Test that _resolve_path function supports glob patterns."""
     from sqlfluff.core.config.file import _resolve_path
@@ -0,0 +1,41 @@
+"""Test the source helpers."""
+
+import pytest
+
+from sqlfluff.core.helpers.source import scan_source
+
+
+@pytest.mark.parametrize(
+    "raw_str, config_lines, noqa_lines",
+    [
+        ("SELECT 1\n", (), ()),
+        (
+            "-- sqlfluff:dialect:ansi\nSELECT 1 -- noqa: LT01\n",
+            ("-- sqlfluff:dialect:ansi",),
+            ((2, "SELECT 1 -- noqa: LT01"),),
+        ),
+        # Only lines which start with a config command count.
+        (
+            "SELECT 1 -- sqlfluff:dialect:ansi\n--sqlfluff:rules:LT01\n",
+            ("--sqlfluff:rules:LT01",),
+            (),
+        ),
+        # Line numbers are of normalised newlines.
+        (
+            "SELECT 1\r\n-- sqlfluff:dialect:ansi\rSELECT 2 -- noqa\r\n",
+            ("-- sqlfluff:dialect:ansi",),
+            ((3, "SELECT 2 -- noqa"),),
+        ),
+        # Config commands can follow other line breaks.
+        (
+            "SELECT 1\x0c-- sqlfluff:dialect:ansi",
+            ("-- sqlfluff:dialect:ansi",),
+            (),
+        ),
+    ],
+)
+def test__helpers_source__scan_source(raw_str, config_lines, noqa_lines):
+    """Test finding the lines of a raw file which may hold directives."""
+    scan = scan_source(raw_str)
+    assert scan.config_lines == config_lines
+    assert scan.noqa_lines == noqa_lines
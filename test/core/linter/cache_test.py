@@ -0,0 +1,179 @@
+"""Tests for the lint result cache."""
+
+import os
+import shutil
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.linter.cache import LintResultCache
+
+
+@pytest.fixture
+def cache_config(tmp_path):
+    """A config with the lint result cache enabled."""
+    return FluffConfig(
+        overrides={"dialect": "ansi", "cache_dir": str(tmp_path / "cache")}
+    )
+
+
+def test__cache__from_config(tmp_path):
+    """Test the cache is only enabled when configured."""
+    no_cache_config = FluffConfig(overrides={"dialect": "ansi"})
+    assert LintResultCache.from_config(no_cache_config) is None
+    cache = LintResultCache.from_config(
+        FluffConfig(
+            overrides={
+                "dialect": "ansi",
+                "cache_dir": str(tmp_path),
+                "cache_max_size_mb": 3,
+            }
+        )
+    )
+    assert cache
+    assert cache.max_size == 3 * 1024 * 1024
+    # The cache can't reproduce unused noqa warnings, so it's disabled.
+    assert (
+        LintResultCache.from_config(
+            FluffConfig(
+                overrides={
+                    "dialect": "ansi",
+                    "cache_dir": str(tmp_path),
+                    "warn_unused_ignores": True,
+                }
+            )
+        )
+        is None
+    )
+
+
+def test__cache__make_key(cache_config, tmp_path):
+    """Test the cache key changes with everything which affects the result."""
+    cache = LintResultCache.from_config(cache_config)
+    assert cache
+    key = cache.make_key("select 1\n", cache_config, ["LT01"], False)
+    # Stable for the same inputs.
+    assert key == cache.make_key("select 1\n", cache_config, ["LT01"], False)
+    # But different for changes to any of them.
+    assert key != cache.make_key("select 2\n", cache_config, ["LT01"], False)
+    assert key != cache.make_key("select 1\n", cache_config, ["LT02"], False)
+    assert key != cache.make_key("select 1\n", cache_config, ["LT01"], True)
+    other_config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "cache_dir": str(tmp_path / "cache"),
+            "max_line_length": 40,
+        }
+    )
+    assert key != cache.make_key("select 1\n", other_config, ["LT01"], False)
+    # Changes to values which don't affect results don't change the key.
+    verbose_config = FluffConfig(
+        overrides={"dialect": "ansi", "cache_dir": str(tmp_path), "verbose": 2}
+    )
+    assert key == cache.make_key("select 1\n", verbose_config, ["LT01"], False)
+    # Or to the dependencies.
+    macro_path = tmp_path / "macros.sql"
+    macro_path.write_text("{% macro foo() %}1{% endmacro %}")
+    dep_key = cache.make_key(
+        "select 1\n", cache_config, ["LT01"], False, dependencies=[str(macro_path)]
+    )
+    assert key != dep_key
+    macro_path.write_text("{% macro foo() %}12{% endmacro %}")
+    # NOTE: Use a fresh cache object, because snapshots are memoised per run.
+    fresh_cache = LintResultCache.from_config(cache_config)
+    assert fresh_cache
+    assert dep_key != fresh_cache.make_key(
+        "select 1\n", cache_config, ["LT01"], False, dependencies=[str(macro_path)]
+    )
+
+
+def test__cache__round_trip(cache_config):
+    """Test violations survive a trip through the cache."""
+    lntr = Linter(config=cache_config)
+    linted_file = lntr.lint_string(
+        "SELECT a+b  FROM tbl;\nSELECT c  FROM tbl -- noqa: LT01\n", fname="test.sql"
+    )
+    assert linted_file.violations
+    cache = LintResultCache.from_config(cache_config)
+    assert cache
+    assert cache.get("abc", "test.sql", "utf-8") is None
+    assert cache.misses == 1
+    assert cache.put("abc", linted_file, fix=False)
+    cached_file = cache.get("abc", "test.sql", "utf-8")
+    assert cached_file
+    assert cache.hits == 1
+    assert cached_file.check_tuples() == linted_file.check_tuples()
+    assert [v.to_dict() for v in cached_file.get_violations()] == [
+        v.to_dict() for v in linted_file.get_violations()
+    ]
+    assert cached_file.num_violations(fixable=True) == linted_file.num_violations(
+        fixable=True
+    )
+    # When fixing, files with fixes aren't stored.
+    assert not cache.put("def", linted_file, fix=True)
+
+
+def test__cache__prune(tmp_path):
+    """Test the least recently used entries are evicted first."""
+    cache = LintResultCache(str(tmp_path), max_size=0)
+    lntr = Linter(dialect="ansi")
+    linted_file = lntr.lint_string("select 1\n", fname="test.sql")
+    for idx, key in enumerate(("a", "b", "c")):
+        assert cache.put(key, linted_file, fix=False)
+        os.utime(tmp_path / f"{key}.json", ns=(idx * 10**9, idx * 10**9))
+    entry_size = os.path.getsize(tmp_path / "a.json")
+    # Allow room for two entries.
+    cache.max_size = entry_size * 2
+    # Reading "a" makes it the most recently used.
+    assert cache.get("a", "test.sql", "utf-8")
+    assert cache.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+
+def test__cache__lint_paths(cache_config, tmp_path):
+    """Test a second lint is served from the cache with the same results."""
+    shutil.copytree("test/fixtures/linter/multiple_files", tmp_path / "sql")
+    path = str(tmp_path / "sql")
+
+    first = Linter(config=cache_config).lint_paths((path,))
+    assert (first.cache_hits, first.cache_misses) == (0, 3)
+    second = Linter(config=cache_config).lint_paths((path,))
+    assert (second.cache_hits, second.cache_misses) == (3, 0)
+    assert second.as_records() == [
+        # Statistics are retained in the cache, but timings are left out.
+        {key: value for key, value in record.items() if key != "timings"}
+        for record in first.as_records()
+    ]
+    assert all(record["statistics"]["segments"] for record in second.as_records())
+    assert second.stats(1, 0)["cache hits"] == 3
+
+    # Editing a file invalidates only that file.
+    with open(tmp_path / "sql" / "passing.1.sql", "a") as f:
+        f.write("\n")
+    third = Linter(config=cache_config).lint_paths((path,))
+    assert (third.cache_hits, third.cache_misses) == (2, 1)
+
+    # The cache can be bypassed.
+    fourth = Linter(config=cache_config).lint_paths((path,), use_cache=False)
+    assert fourth.cache_hits is None
+    assert "cache hits" not in fourth.stats(1, 0)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test__cache__lint_paths_loads_once(cache_config, tmp_path, monkeypatch, processes):
+    """Test files which miss the cache aren't loaded again to lint them."""
+    shutil.copytree("test/fixtures/linter/multiple_files", tmp_path / "sql")
+    loaded = []
+    load_raw_file_and_config = Linter.load_raw_file_and_config
+
+    def _load(fname, root_config):
+        loaded.append(fname)
+        return load_raw_file_and_config(fname, root_config)
+
+    monkeypatch.setattr(Linter, "load_raw_file_and_config", staticmethod(_load))
+    linter = Linter(config=cache_config)
+    # Use threads, so the loads from workers are counted too.
+    linter.allow_process_parallelism = False
+    result = linter.lint_paths((str(tmp_path / "sql"),), processes=processes)
+    assert result.cache_misses == 3
+    assert len(loaded) == len(set(loaded)) == 3
@@ -0,0 +1,110 @@
+"""Tests for linting only the files and lines changed since a git ref."""
+
+import os
+import subprocess
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.errors import SQLFluffUserError
+from sqlfluff.core.linter.changes import (
+    WHOLE_FILE,
+    _parse_diff,
+    get_changed_lines,
+)
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A git repo with a branch which changes some files."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "unchanged.sql").write_text("SELECT a  FROM tbl\n")
+    (repo / "changed.sql").write_text("SELECT a\nFROM tbl\nWHERE b = 1\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    _git(repo, "checkout", "-q", "-b", "feature")
+    # Add a violation on a new line, and leave one on an existing line.
+    (repo / "changed.sql").write_text(
+        "SELECT a\nFROM tbl\nWHERE b = 1\nAND   c = 2\nand d = 3\n"
+    )
+    _git(repo, "commit", "-q", "-am", "change")
+    # An untracked file.
+    (repo / "new.sql").write_text("SELECT 1\n")
+    # Clear any cached results from other repos in the same location.
+    get_changed_lines.cache_clear()
+    oldcwd = os.getcwd()
+    os.chdir(repo)
+    yield repo
+    os.chdir(oldcwd)
+    get_changed_lines.cache_clear()
+
+
+def test__changes__parse_diff():
+    """Test parsing the changed lines from a diff."""
+    diff = (
+        "diff --git a/a.sql b/a.sql\n"
+        "--- a/a.sql\n"
+        "+++ b/a.sql\n"
+        "@@ -1 +1 @@\n"
+        "-select 1\n"
+        "+select 2\n"
+        "@@ -5,2 +5,3 @@\n"
+        # A removal only.
+        "@@ -10,2 +11,0 @@\n"
+        "--- a/deleted.sql\n"
+        "+++ /dev/null\n"
+        "@@ -1,2 +0,0 @@\n"
+    )
+    assert _parse_diff(diff, "/root") == {
+        os.path.realpath("/root/a.sql"): ((1, 1), (5, 7), (11, 12))
+    }
+
+
+def test__changes__get_changed_lines(git_repo):
+    """Test finding changed files in a git repo."""
+    assert get_changed_lines("main", str(git_repo)) == {
+        os.path.realpath(git_repo / "changed.sql"): ((4, 5),),
+        os.path.realpath(git_repo / "new.sql"): WHOLE_FILE,
+    }
+
+
+def test__changes__bad_ref(git_repo):
+    """Test an unknown ref is reported to the user."""
+    with pytest.raises(SQLFluffUserError, match="Unable to find changed files"):
+        get_changed_lines("not-a-ref", str(git_repo))
+
+
+def test__changes__lint_paths(git_repo):
+    """Test only changed files, and optionally lines, are linted."""
+    config = FluffConfig(overrides={"dialect": "ansi", "changed_since": "main"})
+    result = Linter(config=config).lint_paths((".",))
+    assert sorted(record["filepath"] for record in result.as_records()) == [
+        "changed.sql",
+        "new.sql",
+    ]
+    # The existing capitalisation and whitespace violations on lines 1 to 3
+    # are still reported.
+    lines = {v.line_no for v in result.get_violations()}
+    assert lines & {1, 2, 3}
+
+    config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "changed_since": "main",
+            "changed_lines_only": True,
+        }
+    )
+    result = Linter(config=config).lint_paths(("changed.sql",))
+    lines = {v.line_no for v in result.get_violations()}
+    assert lines and lines <= {4, 5}
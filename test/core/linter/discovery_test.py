@@ -5,7 +5,12 @@ import os
 import pytest
 
 from sqlfluff.core.errors import SQLFluffUserError
-from sqlfluff.core.linter.discovery import _load_specs_from_lines, paths_from_path
+from sqlfluff.core.linter.discovery import (
+    DirectoryListingCache,
+    _load_specs_from_lines,
+    iter_paths_from_path,
+    paths_from_path,
+)
 
 
 def normalise_paths(paths):
@@ -52,6 +57,43 @@ def test__linter__path_from_paths__file():
     assert normalise_paths(paths) == {"test.fixtures.linter.indentation_errors.sql"}
 
 
+def test__linter__iter_paths_from_path__lazy():
+    """Test paths are found lazily, in the same order as paths_from_path."""
+    paths = iter_paths_from_path("test/fixtures/linter")
+    # The first path is found without walking the whole tree.
+    first = next(paths)
+    assert [first, *paths] == paths_from_path("test/fixtures/linter")
+    # Bad paths are still raised as soon as it's called.
+    with pytest.raises(SQLFluffUserError):
+        iter_paths_from_path("asflekjfhsakuefhse")
+
+
+def test__linter__path_from_paths__listing_cache(tmp_path):
+    """Test directory listings are reused while directories are unchanged."""
+    root = tmp_path / "project"
+    for dirname in ("a", "b"):
+        (root / dirname).mkdir(parents=True)
+        (root / dirname / "query.sql").write_text("select 1\n")
+    # Backdate the directories, so they're not too recent to store.
+    for dirpath in (root, root / "a", root / "b"):
+        os.utime(dirpath, (0, 0))
+    snapshot_path = str(tmp_path / "cache" / "listings.json")
+
+    listing_cache = DirectoryListingCache(snapshot_path)
+    paths = paths_from_path(str(root), listing_cache=listing_cache)
+    assert paths == paths_from_path(str(root))
+    assert (listing_cache.hits, listing_cache.misses) == (0, 3)
+    listing_cache.save()
+
+    # A later run only lists the directory which has changed.
+    (root / "b" / "other.sql").write_text("select 2\n")
+    listing_cache = DirectoryListingCache(snapshot_path)
+    paths = paths_from_path(str(root), listing_cache=listing_cache)
+    assert paths == paths_from_path(str(root))
+    assert str(root / "b" / "other.sql") in paths
+    assert (listing_cache.hits, listing_cache.misses) == (2, 1)
+
+
 def test__linter__path_from_paths__not_exist():
     """Test that the right errors are raise when a file doesn't exist."""
     with pytest.raises(SQLFluffUserError):
@@ -6,7 +6,13 @@ import pytest
 
 from sqlfluff.core import Linter
 from sqlfluff.core.config import FluffConfig
-from sqlfluff.core.linter.fix import compute_anchor_edit_info
+from sqlfluff.core.linter import fix as fix_module
+from sqlfluff.core.linter import linter as linter_module
+from sqlfluff.core.linter.fix import (
+    FixRegions,
+    apply_fixes,
+    compute_anchor_edit_info,
+)
 from sqlfluff.core.linter.patch import (
     FixPatch,
     generate_source_patches,
@@ -412,3 +418,125 @@ def test__fix__merge_source_patches_skips_conflicting_insertions_at_same_point()
     assert merge_source_patches([[first_insertion], [conflicting_insertion]]) == [
         first_insertion
     ]
+
+
+def test__fix__regions():
+    """Test tracking the statements each rule has found no fixes in."""
+    linter = Linter(dialect="ansi")
+    tree = linter.parse_string("SELECT 1;\nSELECT 2;\nSELECT 3;\n").tree
+    regions = FixRegions()
+    # Until a rule has run, it needs to check everything.
+    assert regions.dirty_idxs("XX01", tree) is None
+    fix = LintFix.delete(next(tree.recursive_crawl("numeric_literal")))
+    regions.record("XX01", tree, [fix])
+    # The first statement had a fix, so still needs checking.
+    assert regions.dirty_idxs("XX01", tree) == [0]
+    regions.record("XX01", tree, [])
+    assert regions.dirty_idxs("XX01", tree) == []
+    assert regions.dirty_idxs("XX02", tree) is None
+    # A tree with a different last statement.
+    tree = linter.parse_string("SELECT 1;\nSELECT 2;\nSELECT 4;\n").tree
+    assert [
+        tree.segments[idx].raw for idx in regions.dirty_idxs("XX01", tree)
+    ] == ["SELECT 4"]
+
+
+def test__fix__regions_lint_fix(monkeypatch):
+    """Test fixing only checks changed statements, with the same results."""
+    sql = (
+        "select a from b join c using(x)\nunion select d from e;\n"
+        "SELECT CASE WHEN x = 1 THEN 'a' ELSE NULL END AS y FROM t;\n"
+    ) * 5
+    linter = Linter(
+        config=FluffConfig(overrides={"dialect": "ansi", "rules": "AM02,AM05,ST01"})
+    )
+    linted_file = linter.lint_string(sql, fix=True)
+    loop_stats = linted_file.timings.loop_stats
+    assert loop_stats["loops"] >= 2
+    assert loop_stats["main loop 2 regions skipped"] > 0
+    # Without skipping any statements, we get the same results.
+    monkeypatch.setattr(FixRegions, "dirty_idxs", lambda self, code, tree: None)
+    full_file = linter.lint_string(sql, fix=True)
+    assert full_file.fix_string() == linted_file.fix_string()
+    assert full_file.check_tuples() == linted_file.check_tuples()
+    assert full_file.timings.loop_stats["main loop 2 regions skipped"] == 0
+
+
+def test__fix__apply_fixes_shares_unchanged_segments():
+    """Test segments without fixes in them are shared with the fixed tree."""
+    linter = Linter(dialect="ansi")
+    tree = linter.parse_string("SELECT 1;\nSELECT 2;\nSELECT 3;\n").tree
+    literal = next(tree.recursive_crawl("numeric_literal"))
+    fixes = [LintFix.replace(literal, [literal.edit(raw="10")])]
+    new_tree, _, _, valid = apply_fixes(
+        tree,
+        linter.config.get("dialect_obj"),
+        "XX01",
+        compute_anchor_edit_info(fixes),
+        max_parse_depth=255,
+        defer_validation=True,
+    )
+    assert valid
+    assert new_tree.raw == "SELECT 10;\nSELECT 2;\nSELECT 3;\n"
+    assert tree.raw == "SELECT 1;\nSELECT 2;\nSELECT 3;\n"
+    # Only the first statement changed, so the others are shared.
+    assert new_tree.segments[0] is not tree.segments[0]
+    assert new_tree.segments[3] is tree.segments[3]
+    assert new_tree.segments[6] is tree.segments[6]
+    # ...and belong to the new tree.
+    for segment in new_tree.recursive_crawl_all():
+        for idx, child in enumerate(segment.segments):
+            assert child.get_parent() == (segment, idx)
+
+
+def test__fix__regions_shared_segments(monkeypatch):
+    """Test statements shared with the last tree keep their region."""
+    linter = Linter(dialect="ansi")
+    tree = linter.parse_string("SELECT 1;\nSELECT 2;\nSELECT 3;\n").tree
+    regions = FixRegions()
+    regions.record("XX01", tree, [])
+    literal = next(tree.recursive_crawl("numeric_literal"))
+    fixes = [LintFix.replace(literal, [literal.edit(raw="10")])]
+    new_tree, _, _, _ = apply_fixes(
+        tree,
+        linter.config.get("dialect_obj"),
+        "XX01",
+        compute_anchor_edit_info(fixes),
+        max_parse_depth=255,
+    )
+    keyed = []
+    region_key = fix_module.region_key
+    monkeypatch.setattr(
+        fix_module, "region_key", lambda seg: keyed.append(seg) or region_key(seg)
+    )
+    assert [
+        new_tree.segments[idx].raw for idx in regions.dirty_idxs("XX01", new_tree)
+    ] == ["SELECT 10"]
+    # Only the segments which aren't shared need a key.
+    assert {id(seg) for seg in keyed}.isdisjoint(id(seg) for seg in tree.segments)
+    assert len(keyed) == len(new_tree.segments) - 2
+
+
+def test__fix__deferred_validation_rewinds(monkeypatch):
+    """Test a loop with invalid fixes is run again, with the same results."""
+    sql = "select a from b join c using(x)\nunion select d from e;\n" * 3
+    linter = Linter(
+        config=FluffConfig(overrides={"dialect": "ansi", "rules": "AM02,AM05,LT01"})
+    )
+    linted_file = linter.lint_string(sql, fix=True)
+    checks: list[bool] = []
+
+    def validate_deferred(*args, **kwargs):
+        # Fail the first check, as if one of the fixes were invalid.
+        checks.append(not checks)
+        return len(checks) > 1
+
+    monkeypatch.setattr(linter_module, "validate_deferred", validate_deferred)
+    rewound_file = linter.lint_string(sql, fix=True)
+    assert checks[0]
+    assert rewound_file.fix_string() == linted_file.fix_string()
+    assert rewound_file.check_tuples() == linted_file.check_tuples()
+    assert (
+        rewound_file.timings.loop_stats["loops"]
+        == linted_file.timings.loop_stats["loops"] + 1
+    )
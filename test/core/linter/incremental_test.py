@@ -0,0 +1,208 @@
+"""Tests for incremental parsing of edited files."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.linter import incremental
+from sqlfluff.core.linter.incremental import find_edit, find_edit_region
+
+SOURCE = (
+    "select a, b + 1 as c\nfrom tbl1\nwhere x = 'y;';\n\n"
+    "-- A comment; with a semicolon.\n"
+    "select d from tbl2;\n"
+    "select e\nfrom tbl3\n"
+)
+
+
+@pytest.mark.parametrize(
+    "old,new,result",
+    [
+        ("abc", "abc", (3, 3, 3)),
+        ("abc", "axc", (1, 2, 2)),
+        ("abc", "abxc", (2, 2, 3)),
+        ("abc", "ac", (1, 2, 1)),
+        ("aaa", "aaaa", (3, 3, 4)),
+        ("", "abc", (0, 0, 3)),
+    ],
+)
+def test__incremental__find_edit(old, new, result):
+    """Test finding the changed span between two strings."""
+    assert find_edit(old, new) == result
+
+
+def test__incremental__find_edit_region():
+    """Test edits are widened to whole statements."""
+    tree = Linter(dialect="ansi").parse_string(SOURCE).tree
+    # An edit in the second statement.
+    idx = SOURCE.index("tbl2")
+    new_source = SOURCE[:idx] + "x" + SOURCE[idx:]
+    region = find_edit_region(tree, SOURCE, new_source)
+    assert region
+    # The region runs from just after the first terminator, to the second
+    # terminator inclusive.
+    assert region.source_start == SOURCE.index(";\n\n") + 1
+    assert region.old_stop == SOURCE.index("tbl2;") + 5
+    assert region.new_stop == region.old_stop + 1
+    assert tree.segments[region.first_idx - 1].is_type("statement_terminator")
+    assert tree.segments[region.stop_idx - 1].is_type("statement_terminator")
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        # Editing within a statement.
+        ("tbl2;", "tbl22;"),
+        ("select a,", "select aa,"),
+        ("select e\n", "select e, f\n"),
+        # Editing between statements.
+        ("\n\n--", "\n\n\n--"),
+        ("-- A comment", "-- An edited comment"),
+        # Adding and removing statement terminators.
+        ("select d from tbl2;", "select d; select from tbl2;"),
+        ("'y;';\n", "'y;'\n"),
+        ("from tbl3\n", "from tbl3;\n"),
+        # Opening a quoted string or comment, which changes later statements.
+        ("select d", "select 'd"),
+        ("select d", "/* select d"),
+        # Replacing everything.
+        (SOURCE, "select 1\n"),
+    ],
+)
+def test__incremental__parse_matches_full_parse(old, new):
+    """Test incremental parsing gives the same result as a full parse."""
+    lntr = Linter(dialect="ansi")
+    previous = lntr.parse_string(SOURCE)
+    previous_stringified = previous.tree.stringify()
+    assert old in SOURCE
+    new_source = SOURCE.replace(old, new, 1)
+
+    parsed = lntr.parse_string_incremental(previous, new_source)
+    expected = lntr.parse_string(new_source)
+    assert parsed.source_str == new_source
+    assert [v.to_dict() for v in parsed.violations] == [
+        v.to_dict() for v in expected.violations
+    ]
+    if expected.root_variant():
+        assert parsed.tree.raw == new_source
+        assert parsed.tree.stringify() == expected.tree.stringify()
+    # The previous tree shouldn't have been modified.
+    assert previous.tree.stringify() == previous_stringified
+
+
+def test__incremental__parse_sequence_of_edits(caplog):
+    """Test incremental parses can build on each other."""
+    lntr = Linter(dialect="ansi")
+    parsed = lntr.parse_string(SOURCE)
+    source = SOURCE
+    for old, new in [
+        ("tbl2;", "tbl2 where z = 1;"),
+        ("select a,", "select\n    a,"),
+        ("from tbl3\n", "from tbl3;\nselect 2;\n"),
+    ]:
+        source = source.replace(old, new, 1)
+        caplog.clear()
+        with caplog.at_level("INFO", logger="sqlfluff.linter"):
+            parsed = lntr.parse_string_incremental(parsed, source)
+        assert "Incremental parse of" in caplog.text
+        assert parsed.tree.stringify() == lntr.parse_string(source).tree.stringify()
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        # Templated content can't be parsed incrementally.
+        ("select d", "select {{ 'd' }}"),
+        # Nor can changes to inline config.
+        ("-- A comment; with a semicolon.", "-- sqlfluff:max_line_length:20"),
+    ],
+)
+def test__incremental__parse_falls_back(old, new, caplog):
+    """Test a full parse is used if an incremental one isn't possible."""
+    lntr = Linter(config=FluffConfig(overrides={"dialect": "ansi"}))
+    previous = lntr.parse_string(SOURCE)
+    new_source = SOURCE.replace(old, new, 1)
+    with caplog.at_level("INFO", logger="sqlfluff.linter"):
+        parsed = lntr.parse_string_incremental(previous, new_source)
+    assert "Incremental parse of" not in caplog.text
+    assert parsed.tree.stringify() == lntr.parse_string(new_source).tree.stringify()
+    assert parsed.config.get("max_line_length") == (
+        20 if "sqlfluff:" in new else 80
+    )
+
+
+def test__incremental__lint_parsed():
+    """Test linting an incremental parse gives the same results as usual."""
+    lntr = Linter(dialect="ansi")
+    previous = lntr.parse_string(SOURCE)
+    new_source = SOURCE.replace("tbl2;", "tbl2  where z=1;")
+    parsed = lntr.parse_string_incremental(previous, new_source)
+    linted = lntr.lint_parsed(parsed, lntr.get_rulepack())
+    expected = lntr.lint_string(new_source)
+    assert linted.check_tuples() == expected.check_tuples()
+    assert linted.fix_string() == expected.fix_string()
+
+
+def test__incremental__shares_statements_before_edit(monkeypatch):
+    """Test statements before an edit are shared, rather than copied."""
+    monkeypatch.setattr(incremental, "_MAX_SHARED_FILES", 2)
+    lntr = Linter(dialect="ansi")
+    source = "select 1;\nselect 2;\nselect 3;\nselect 4;\n"
+    parsed = lntr.parse_string(source)
+    for edit in ("select 11", "select 22", "select 33", "select 44"):
+        previous = parsed.tree.segments
+        source = source.replace(edit[:-1], edit, 1)
+        parsed = lntr.parse_string_incremental(parsed, source)
+        assert parsed.tree.stringify() == lntr.parse_string(source).tree.stringify()
+        # Everything up to the terminator before the edited statement is
+        # shared (unless it's from a third older file), and belongs to the
+        # new tree.
+        stop = source.rfind(";", 0, source.index(edit)) + 1
+        for idx, seg in enumerate(parsed.tree.segments):
+            if seg.pos_marker.source_slice.stop <= stop and edit != "select 44":
+                assert seg is previous[idx]
+            assert seg.get_parent() == (parsed.tree, idx)
+    # Each statement was parsed with a different file, but only two old ones
+    # are kept, so the third statement was moved onto the latest one.
+    statements = parsed.tree.segments[:-1:3]
+    assert [seg.raw for seg in statements] == [f"select {n}{n}" for n in "1234"]
+    assert statements[2] is not previous[6]
+    assert len({id(seg.pos_marker.templated_file) for seg in statements}) == 3
+    # Linting and fixing a tree with shared statements works as usual.
+    linted = lntr.lint_parsed(parsed, lntr.get_rulepack(), fix=True)
+    expected = lntr.lint_string(source, fix=True)
+    assert linted.check_tuples() == expected.check_tuples()
+    assert linted.fix_string() == expected.fix_string()
+
+
+def test__incremental__lint_parsed_previous(caplog):
+    """Test statement local rules are only run again after an edit."""
+    lntr = Linter(dialect="ansi")
+    rule_pack = lntr.get_rulepack()
+    source = (
+        "SELECT a,b  FROM tbl1; select  x;\n"
+        "select c from tbl2 -- noqa: CP01\n;\n"
+        "SELECT d  FROM tbl3;\n"
+        "select  e from tbl4;\n"
+    )
+    parsed = lntr.parse_string(source)
+    linted = lntr.lint_parsed(parsed, rule_pack)
+    for old, new, reused in [
+        # Edits to later statements reuse the results for those before.
+        ("select  e", "select  e,f", True),
+        ("SELECT d  FROM", "SELECT d FROM", True),
+        ("-- noqa: CP01", "", True),
+        # Unless noqa comments which affect those change.
+        ("select  x;", "select  x; -- noqa", False),
+        # Or there aren't any before the edit.
+        ("SELECT a,b", "SELECT a, b", False),
+    ]:
+        source = source.replace(old, new, 1)
+        parsed = lntr.parse_string_incremental(parsed, source)
+        caplog.clear()
+        with caplog.at_level("INFO", logger="sqlfluff.linter"):
+            linted = lntr.lint_parsed(parsed, rule_pack, previous=linted)
+        assert ("Reusing lint results" in caplog.text) is reused
+        expected = lntr.lint_string(source)
+        assert [v.to_dict() for v in linted.get_violations()] == [
+            v.to_dict() for v in expected.get_violations()
+        ]
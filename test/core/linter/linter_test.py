@@ -1,6 +1,7 @@
 """Tests for the Linter class and LintingResult class."""
 
 import logging
+import multiprocessing.pool
 import os
 from unittest.mock import patch
 
@@ -19,7 +20,12 @@ from sqlfluff.core.errors import (
 )
 from sqlfluff.core.linter import runner
 from sqlfluff.core.linter.common import DeferredRenderTask
-from sqlfluff.core.linter.linting_result import combine_dicts, sum_dicts
+from sqlfluff.core.linter.linted_dir import LintedDir
+from sqlfluff.core.linter.linting_result import (
+    LintingResult,
+    combine_dicts,
+    sum_dicts,
+)
 from sqlfluff.core.linter.runner import get_runner
 from sqlfluff.core.templaters import RawTemplater, TemplatedFile
 from sqlfluff.utils.testing.logging import fluff_log_catcher
@@ -194,6 +200,26 @@ def test__linter__linting_result__combine_dicts():
     )
 
 
+
+def test__linter__linting_result__fix_loop_summary_sorted():
+    """Test fix loop statistics are summarised by phase, then loop number."""
+    result = LintingResult()
+    for stats in (
+        {"main loop 10 rules": 1, "post loop 1 rules": 1, "main loop 2 rules": 1},
+        {"main loop 9 rules": 1, "loops": 4, "main loop 1 rules": 2},
+    ):
+        linted_dir = LintedDir("path")
+        linted_dir.fix_loop_stats = stats
+        result.add(linted_dir)
+    assert list(result.timing_summary()["fix loop"].items()) == [
+        ("loops", 4),
+        ("main loop 1 rules", 2),
+        ("main loop 2 rules", 1),
+        ("main loop 9 rules", 1),
+        ("main loop 10 rules", 1),
+        ("post loop 1 rules", 1),
+    ]
+
 def test__linter__linting_result_check_tuples():
     """Test that a LintingResult can partition violations by the source files."""
     lntr = Linter()
@@ -317,6 +343,49 @@ def test__linter__linting_result_get_violations(processes):
     all([isinstance(v, SQLLintError) for v in result.get_violations()])
 
 
+@pytest.mark.parametrize("processes", [1, 2])
+def test__linter__lint_paths_streaming(processes):
+    """Test streaming lint_paths gives the same results as retaining files."""
+    lntr = Linter(config=FluffConfig(overrides={"dialect": "ansi"}))
+    paths = ("test/fixtures/linter/exit_codes", "test/fixtures/linter/comma_errors.sql")
+    retained = lntr.lint_paths(paths, processes=processes)
+    streamed = lntr.lint_paths(paths, processes=processes, retain_files=False)
+    # NOTE: The timings will differ, so leave them out.
+    assert [
+        {k: v for k, v in record.items() if k != "timings"}
+        for record in streamed.as_records()
+    ] == [
+        {k: v for k, v in record.items() if k != "timings"}
+        for record in retained.as_records()
+    ]
+    assert streamed.stats(111, 222) == retained.stats(111, 222)
+    # NOTE: Rules are only in the summary if they took long enough, which
+    # varies between runs, so only compare the steps.
+    assert {k for k in streamed.timing_summary() if ": " not in k} == {
+        k for k in retained.timing_summary() if ": " not in k
+    }
+    # No files or trees are kept when streaming.
+    assert all(not linted_dir.files for linted_dir in streamed.paths)
+
+
+def test__parallel_runner__tasks_in_flight_limited():
+    """Test the parallel runner doesn't queue up every file at once."""
+    lntr = Linter(config=FluffConfig(overrides={"dialect": "ansi"}))
+    fetched = []
+
+    def _iter_fnames():
+        for _ in range(40):
+            fetched.append(None)
+            yield "test/fixtures/linter/passing.sql"
+
+    thd_runner = runner.MultiThreadRunner(lntr, lntr.config, processes=2)
+    results = thd_runner.run(_iter_fnames(), fix=False)
+    next(results)
+    # Files are only fetched as earlier ones complete.
+    assert len(fetched) < 40
+    assert len(list(results)) == 39
+
+
 @pytest.mark.parametrize("force_error", [False, True])
 def test__linter__linting_parallel_thread(force_error, monkeypatch):
     """Run linter in parallel mode using threads.
@@ -448,6 +517,24 @@ def test__parallel_runner__apply_deferred_task():
     assert isinstance(result, LintedFile)
 
 
+def test__parallel_runner__apply_deferred_task_new_run(monkeypatch):
+    """Workers start a new templater run when a task from a new run arrives."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    fname = "test/fixtures/linter/passing.sql"
+    monkeypatch.setattr(runner, "_worker_linters", {})
+    monkeypatch.setattr(runner, "_worker_run_id", None)
+    runner.ParallelRunner._apply((fname, DeferredRenderTask(fname, config, False, 1)))
+    (worker_linter,) = runner._worker_linters.values()
+    starts = []
+    monkeypatch.setattr(
+        worker_linter.templater, "start_run", lambda: starts.append(True)
+    )
+    runner.ParallelRunner._apply((fname, DeferredRenderTask(fname, config, False, 1)))
+    assert not starts
+    runner.ParallelRunner._apply((fname, DeferredRenderTask(fname, config, False, 2)))
+    assert len(starts) == 1
+
+
 def test__parallel_runner__apply_callable_task(monkeypatch):
     """_apply with a PartialLintCallable covers the dbt-like non-deferred path.
 
@@ -595,6 +682,7 @@ def test__linter__lint_paths_closes_runner_iterator_on_early_break(monkeypatch):
         def __init__(self, iterator):
             self.iterator = iterator
             self.skipped_file_count = 0
+            self.tail_idle_time = None
 
         def run(self, fnames, fix):
             return self.iterator
@@ -714,6 +802,36 @@ def test__parallel_runner__pool_join_called_on_generator_close(monkeypatch):
     assert tracking_pool.joined, "pool.join() was not called"
 
 
+def test__worker_pool__reused_across_runs(monkeypatch):
+    """A WorkerPool is shared by runs, and only shut down when closed."""
+    created_pools = []
+    create_pool = runner.MultiThreadRunner._create_pool
+
+    def _tracking_create_pool(processes, initializer):
+        pool = create_pool(processes, initializer)
+        created_pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(runner.MultiThreadRunner, "_create_pool", _tracking_create_pool)
+    monkeypatch.setattr(runner, "_worker_rulepacks", {})
+    paths = (
+        "test/fixtures/linter/comma_errors.sql",
+        "test/fixtures/linter/whitespace_errors.sql",
+    )
+    lntr = Linter(dialect="ansi")
+    expected = lntr.lint_paths(paths, processes=1).check_tuples_by_path()
+    with runner.WorkerPool(2, runner_class=runner.MultiThreadRunner) as worker_pool:
+        assert worker_pool.processes == 2
+        for _ in range(2):
+            result = lntr.lint_paths(paths, worker_pool=worker_pool)
+            assert result.check_tuples_by_path() == expected
+        # Only the one pool is created, and the workers share a rule pack.
+        assert len(created_pools) == 1
+        assert len(runner._worker_rulepacks) == 1
+        assert created_pools[0]._state == multiprocessing.pool.RUN
+    assert created_pools[0]._state == multiprocessing.pool.TERMINATE
+
+
 def test__linter__empty_file():
     """Test linter behaves nicely with an empty string.
 
@@ -735,6 +853,35 @@ def test__linter__empty_file():
     assert not parsed.violations
 
 
+@pytest.mark.parametrize(
+    "sql, overrides, skipped",
+    [
+        ("SELECT  a,b FROM  tbl\n", {}, True),
+        ("SELECT  a,b FROM  tbl\n", {"disable_noqa": True}, False),
+        ("SELECT  a,b FROM  tbl\n", {"warn_unused_ignores": True}, False),
+        # Templating could enable rules again (e.g. with an include)...
+        ("SELECT  {{ 'a' }},b FROM  tbl\n", {}, False),
+        # ...but not with the raw templater.
+        ("SELECT  '{a}',b FROM  tbl\n", {"templater": "raw"}, True),
+    ],
+)
+def test__linter__noqa_disables_all_skips_file(tmp_path, sql, overrides, skipped):
+    """Test files in which noqa disables all rules aren't parsed or linted."""
+    path = tmp_path / "disabled.sql"
+    path.write_text("-- noqa: disable=all\n" + sql)
+    lntr = Linter(config=FluffConfig(overrides={"dialect": "ansi", **overrides}))
+    result = lntr.lint_paths((str(path),), retain_files=True)
+    linted_file = result.paths[0].files[0]
+    assert (linted_file.tree is None) is skipped
+    # Whether or not it's skipped, the results are the same as linting it.
+    expected = lntr.lint_string(path.read_text(), fname=str(path))
+    assert linted_file.check_tuples() == expected.check_tuples()
+    assert bool(linted_file.check_tuples()) is ("disable_noqa" in overrides)
+    # The length of the source is known either way.
+    (record,) = result.as_records()
+    assert record["statistics"]["source_chars"] == len(path.read_text())
+
+
 def test__linter__parse_fail():
     """Test linter behaves as expected with an unparsable string.
 
@@ -1136,6 +1283,20 @@ def test__attempt_to_change_templater_warning():
     assert "Attempt to set templater to " in caplog.text
 
 
+
+def test__linter__parse_processes_unused_logged_once(monkeypatch):
+    """Test that parse_processes not applying to the Rust parser is logged once."""
+    monkeypatch.setattr(
+        "sqlfluff.core.linter.linter._logged_parse_processes_unused", False
+    )
+    with fluff_log_catcher(logging.WARNING, "sqlfluff.linter") as caplog:
+        Linter._log_parse_processes_unused(FluffConfig.from_kwargs(dialect="ansi"))
+        assert not caplog.text
+        config = FluffConfig(overrides={"dialect": "ansi", "parse_processes": 4})
+        Linter._log_parse_processes_unused(config)
+        Linter._log_parse_processes_unused(config)
+    assert caplog.text.count("only applies to the Python parser") == 1
+
 def test_advanced_api_methods():
     """Test advanced API methods on segments."""
     # These aren't used by the simple API, which returns
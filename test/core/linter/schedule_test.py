@@ -0,0 +1,121 @@
+"""Tests for scheduling files across parallel workers."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.errors import SQLFluffUserError
+from sqlfluff.core.linter import runner
+from sqlfluff.core.linter.schedule import (
+    estimate_costs,
+    load_timing_history,
+    schedule_files,
+    tail_idle_time,
+)
+
+
+@pytest.fixture
+def sql_files(tmp_path):
+    """Some files of different sizes."""
+    fnames = []
+    for name, size in [("small", 1), ("large", 20), ("medium", 5)]:
+        path = tmp_path / f"{name}.sql"
+        path.write_text("select 1;\n" * size)
+        fnames.append(str(path))
+    return fnames
+
+
+def test__schedule__estimate_costs_size(sql_files):
+    """Test costs are estimated from file size."""
+    costs = estimate_costs(sql_files, "size")
+    assert costs == {
+        fname: len("select 1;\n") * n for fname, n in zip(sql_files, (1, 20, 5))
+    }
+    # Without any history path, history mode falls back to size.
+    assert estimate_costs(sql_files, "history") == costs
+
+
+def test__schedule__estimate_costs_history(sql_files, tmp_path):
+    """Test costs are estimated from timing history, where available."""
+    history_path = tmp_path / "timings.csv"
+    history_path.write_text(
+        "path,source_chars,templating,lexing,parsing,linting,LT01\n"
+        # The small file was slow last time.
+        f"{sql_files[0]},10,1.0,0.5,2.0,0.5,0.1\n"
+        f"{sql_files[1]},200,0.1,0.1,0.1,0.1,0.1\n"
+    )
+    assert load_timing_history(str(history_path)) == pytest.approx(
+        {sql_files[0]: 4.0, sql_files[1]: 0.4}
+    )
+    costs = estimate_costs(sql_files, "history", str(history_path))
+    assert costs[sql_files[0]] == pytest.approx(4.0)
+    assert costs[sql_files[1]] == pytest.approx(0.4)
+    # The medium file is estimated from the average time per byte.
+    assert costs[sql_files[2]] == pytest.approx(50 * 4.4 / 210)
+    # Missing history falls back to size.
+    assert estimate_costs(sql_files, "history", str(tmp_path / "missing.csv")) == (
+        estimate_costs(sql_files, "size")
+    )
+
+
+def test__schedule__schedule_files():
+    """Test files are ordered longest first, and small ones batched."""
+    costs = {"a": 1.0, "b": 50.0, "c": 1.0, "d": 30.0, "e": 1.0, "f": 1.0}
+    # 84 total over 2 * 8 batches gives a target of 5.25 per batch.
+    assert schedule_files(list(costs), costs, 2) == [
+        ["b"],
+        ["d"],
+        ["a", "c", "e", "f"],
+    ]
+    # With only one file per batch, the order is stable for equal costs.
+    assert schedule_files(["x", "y", "z"], {"x": 1, "y": 2, "z": 1}, 4) == [
+        ["y"],
+        ["x"],
+        ["z"],
+    ]
+    assert schedule_files([], {}, 2) == []
+
+
+@pytest.mark.parametrize(
+    "completion_times,processes,idle",
+    [
+        ([], 2, 0.0),
+        # Two workers, the first finishing 3 seconds before the second.
+        ([1.0, 2.0, 4.0, 7.0], 2, 3.0),
+        # Three workers but only two tasks, so one is idle throughout.
+        ([1.0, 2.0], 3, 1.0 + 2.0),
+    ],
+)
+def test__schedule__tail_idle_time(completion_times, processes, idle):
+    """Test estimating the idle time at the end of a run."""
+    assert tail_idle_time(0.0, completion_times, processes) == idle
+
+
+@pytest.mark.parametrize("schedule", ["discovery", "size", "history"])
+def test__schedule__parallel_run(schedule, tmp_path):
+    """Test every file is linted, whatever the schedule."""
+    config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "schedule": schedule,
+            "schedule_history_path": str(tmp_path / "timings.csv"),
+        }
+    )
+    lntr = Linter(config=config)
+    fnames = [
+        "test/fixtures/linter/comma_errors.sql",
+        "test/fixtures/linter/whitespace_errors.sql",
+        "test/fixtures/linter/indentation_errors.sql",
+    ]
+    thd_runner = runner.MultiThreadRunner(lntr, config, processes=2)
+    linted = list(thd_runner.run(fnames, fix=False))
+    assert sorted(linted_file.path for linted_file in linted) == sorted(fnames)
+    assert thd_runner.tail_idle_time is not None
+    # The idle time is passed on to the result.
+    result = lntr.lint_paths(tuple(fnames), processes=2)
+    assert result.tail_idle_time is not None
+
+
+def test__schedule__invalid_config():
+    """Test an invalid schedule is rejected."""
+    with pytest.raises(SQLFluffUserError, match="invalid value for `schedule`"):
+        FluffConfig(overrides={"dialect": "ansi", "schedule": "random"})
@@ -0,0 +1,97 @@
+"""Tests for the dispatch tables used when pruning options."""
+
+import sys
+
+import pytest
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.dialects.base import Dialect
+from sqlfluff.core.parser import (
+    KeywordSegment,
+    Lexer,
+    OneOf,
+    Ref,
+    StringParser,
+    SymbolSegment,
+)
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.dispatch import DispatchTable
+from sqlfluff.core.parser.lexer import RegexLexer
+from sqlfluff.core.parser.match_algorithms import prune_options
+from sqlfluff.core.parser.segments import CodeSegment
+
+
+@pytest.mark.parametrize(
+    "first_raw,first_types,expected",
+    [
+        ("SELECT", frozenset({"keyword"}), ["any", "select", "keyword"]),
+        ("FOO", frozenset({"code", "word"}), ["any", "code", "foo"]),
+        ("BAR", frozenset({"code"}), ["any", "code", "foo"]),
+        ("BAR", frozenset({"symbol"}), ["any"]),
+    ],
+)
+def test__parser__dispatch_table_select(first_raw, first_types, expected):
+    """Test selecting options from a dispatch table."""
+    options = ["any", "select", "code", "foo", "nothing", "keyword"]
+    hints = [
+        None,
+        (frozenset({"SELECT"}), frozenset()),
+        (frozenset(), frozenset({"code"})),
+        (frozenset({"FOO"}), frozenset({"code"})),
+        (frozenset(), frozenset()),
+        (frozenset({"SELECT"}), frozenset({"keyword"})),
+    ]
+    table = DispatchTable(options, hints)
+    assert table.select(first_raw, first_types) == expected
+    # Selections are cached, but not shared with the caller.
+    table.select(first_raw, first_types).append("extra")
+    assert table.select(first_raw, first_types) == expected
+
+
+def test__parser__dispatch_matches_prune_options(fresh_ansi_dialect):
+    """Test the tables select the same options as evaluating simple hints."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    segments, _ = Lexer(config=config).lex(
+        "SELECT a.b, 1 + 2 AS c FROM tbl WHERE x IN (1, 'y') -- comment\n"
+    )
+    ctx = ParseContext(dialect=fresh_ansi_dialect, max_parse_depth=0)
+    tables = fresh_ansi_dialect._dispatch_tables
+    assert tables
+    for grammar, table in tables.values():
+        assert fresh_ansi_dialect.dispatch_table(grammar) is table
+        for idx in range(len(segments)):
+            assert prune_options(
+                grammar._elements, segments, ctx, idx, dispatch_table=table
+            ) == prune_options(grammar._elements, segments, ctx, idx)
+    assert ctx.parse_stats["prune_evaluations_skipped"] == ctx.parse_stats[
+        "prune_evaluations"
+    ]
+
+
+def test__parser__dispatch_tables_built_on_expand():
+    """Test dialects build their tables on expansion, and reset them on change."""
+    dialect = Dialect("test", root_segment_name="FileSegment")
+    dialect.set_lexer_matchers(
+        [RegexLexer("code", r"[0-9a-zA-Z_]+", CodeSegment)],
+    )
+    dialect.add(
+        FooSegment=StringParser("foo", KeywordSegment),
+        BarSegment=StringParser("bar", KeywordSegment),
+        FooOrBarGrammar=OneOf(Ref("FooSegment"), Ref("BarSegment")),
+        # This refers to a keyword which doesn't exist.
+        BrokenGrammar=OneOf(Ref("FooSegment"), Ref("MissingKeywordSegment")),
+    )
+    expanded = dialect.expand()
+    grammar = expanded.ref("FooOrBarGrammar")
+    table = expanded.dispatch_table(grammar)
+    assert table
+    assert table.raw_index == {"FOO": (0,), "BAR": (1,)}
+    # Grammars which can't be used don't have a table, and building the
+    # tables shouldn't affect tracebacks.
+    assert not expanded.dispatch_table(expanded.ref("BrokenGrammar"))
+    assert not hasattr(sys, "tracebacklimit")
+    # Other copies of the grammar don't share the table.
+    assert not expanded.dispatch_table(grammar.copy())
+    # Changing the dialect invalidates the tables.
+    expanded.replace(BarSegment=StringParser(";", SymbolSegment))
+    assert not expanded.dispatch_table(grammar)
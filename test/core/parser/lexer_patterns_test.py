@@ -0,0 +1,49 @@
+"""Tests for the analysis of lexer patterns."""
+
+import pytest
+import regex
+
+from sqlfluff.core.parser.lexer_patterns import (
+    PatternInfo,
+    analyse_pattern,
+    combine_patterns,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        # Plain patterns are unchanged.
+        (r"\s+", PatternInfo(r"\s+", True, True)),
+        (r"'([^'\\]|\\.|'')*'", PatternInfo(r"'([^'\\]|\\.|'')*'", True, True)),
+        (r"\[([^\[\]]*)*\]", PatternInfo(r"\[([^\[\]]*)*\]", True, True)),
+        # Anchors for the start of the string are rewritten.
+        (r"(^--|#)[^\n]*", PatternInfo(r"(\G--|#)[^\n]*", True, True)),
+        (r"\Aa", PatternInfo(r"\Ga", True, True)),
+        # Leading inline flags are scoped.
+        (r"(?si)E'.*?'", PatternInfo(r"(?si:E'.*?')", True, True)),
+        # Look-behinds and word boundaries are fine once enough is consumed.
+        (r"\d+((?<=\.)|(?=\b))", PatternInfo(r"\d+((?<=\.)|(?=\b))", True, True)),
+        (r"a?(?<=a)", PatternInfo(r"a?(?<=a)", True, False)),
+        (r"a(?<=ba)", PatternInfo(r"a(?<=ba)", True, False)),
+        (r"\bselect", PatternInfo(r"\bselect", True, False)),
+        # Backreferences and recursion can't be combined.
+        (r"\$(\w*)\$(.*?)\$\1\$", PatternInfo(r"\$(\w*)\$(.*?)\$\1\$", False, True)),
+        (r"/\*(?:[^*]|(?R))*\*/", PatternInfo(r"/\*(?:[^*]|(?R))*\*/", False, True)),
+        # Unsupported syntax is neither.
+        (r"(?P<name>a)", PatternInfo(r"(?P<name>a)", False, False)),
+        (r"a(?i)b", PatternInfo(r"a(?i)b", False, False)),
+        (r"(?x) a", PatternInfo(r"(?x) a", False, False)),
+    ],
+)
+def test__parser__analyse_pattern(pattern, expected):
+    """Test analysing lexer patterns."""
+    assert analyse_pattern(pattern) == expected
+
+
+def test__parser__combine_patterns():
+    """Test the first matching pattern is found from the combined regex."""
+    combined = regex.compile(combine_patterns(["ab", "a", "(b)+"]), regex.DOTALL)
+    assert combined.match("abc").lastgroup == "_0"
+    assert combined.match("ac").lastgroup == "_1"
+    assert combined.match("xbb", 1).lastgroup == "_2"
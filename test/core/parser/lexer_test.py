@@ -1,11 +1,13 @@
 """The Test file for The New Parser (Lexing steps)."""
 
 import logging
+from pathlib import Path
 from typing import Any, NamedTuple, Union
 
 import pytest
 
 from sqlfluff.core import FluffConfig, SQLLexError
+from sqlfluff.core.errors import SQLFluffUserError
 from sqlfluff.core.parser import CodeSegment, Lexer, NewlineSegment, PyLexer
 from sqlfluff.core.parser.lexer import LexMatch, RegexLexer, StringLexer
 from sqlfluff.core.parser.segments.meta import TemplateSegment
@@ -204,6 +206,57 @@ def test__parser__lexer_trim_post_subdivide(caplog):
         assert len(res.elements) == 3
 
 
+def _lexed_tokens(engine, dialect, raw):
+    lexer = PyLexer(
+        config=FluffConfig(overrides={"dialect": dialect, "python_lexer": engine})
+    )
+    segments, violations = lexer.lex(raw)
+    return (
+        [(seg.raw, seg.get_type(), seg.pos_marker.source_slice) for seg in segments],
+        [(v.line_no, v.line_pos, v.desc()) for v in violations],
+    )
+
+
+@pytest.mark.parametrize(
+    "dialect",
+    # Dialects with patterns which can't simply be combined, e.g. with
+    # anchors, backreferences or recursion.
+    ["ansi", "bigquery", "databricks", "doris", "duckdb", "postgres", "tsql"],
+)
+def test__parser__lexer_compiled_matches_sequential(dialect):
+    """Test the compiled engine lexes the dialect fixtures identically."""
+    fixture_path = Path("test/fixtures/dialects") / dialect
+    for path in sorted(fixture_path.glob("*.sql")):
+        raw = path.read_text(encoding="utf8")
+        assert _lexed_tokens("compiled", dialect, raw) == _lexed_tokens(
+            "sequential", dialect, raw
+        ), path
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "",
+        "Select \u0394 from \u0394\u0394 \t\u0394",
+        "select $tag$ a $tag$ from tbl /* a /* nested */ comment */",
+    ],
+)
+def test__parser__lexer_compiled_edge_cases(raw):
+    """Test the compiled engine with unlexable and non-combinable input."""
+    for dialect in ("ansi", "duckdb"):
+        assert _lexed_tokens("compiled", dialect, raw) == _lexed_tokens(
+            "sequential", dialect, raw
+        )
+
+
+def test__parser__lexer_unknown_engine():
+    """Test an unknown lexing engine is reported to the user."""
+    with pytest.raises(SQLFluffUserError, match="Unknown python_lexer 'fast'"):
+        PyLexer(
+            config=FluffConfig(overrides={"dialect": "ansi", "python_lexer": "fast"})
+        )
+
+
 class _LexerSlicingCase(NamedTuple):
     name: str
     in_str: str
@@ -731,3 +784,19 @@ def test__parser__pyrs_lexer_unicode_preservation(unicode_char, description):
         f"{description} was corrupted. Expected '{unicode_char}', "
         f"got: {comment_segments[0].raw!r}"
     )
+
+
+@pytest.mark.skipif(not HAS_RUST_LEXER, reason="Rust lexer not available")
+@pytest.mark.parametrize("use_rust_parser", [False, "auto"])
+def test__parser__pyrs_lexer_keep_tokens(use_rust_parser):
+    """Test the Rust tokens are only kept when the Rust parser can use them."""
+    from sqlfluff.core.parser.rust_parser import rust_parser_enabled
+
+    config = FluffConfig(
+        overrides={"dialect": "ansi", "use_rust_parser": use_rust_parser}
+    )
+    segments, _ = PyRsLexer(config=config).lex("SELECT 1\n")
+    expected = rust_parser_enabled(config)
+    assert [hasattr(seg, "_rstoken") for seg in segments] == [expected] * len(
+        segments
+    )
@@ -70,3 +70,15 @@ def test_markers__comparison():
     assert all(a_pos <= p for p in all_pos)
     # Check greater than or equal
     assert all(c_pos >= p for p in all_pos)
+
+
+def test_markers__shared_slices():
+    """Test markers share their slices when they're the same."""
+    templ = TemplatedFile.from_string("foobar")
+    marker = PositionMarker(slice(1, 3), slice(1, 3), templ)
+    assert marker.source_slice is marker.templated_slice
+    # Markers have no instance dict.
+    assert not hasattr(marker, "__dict__")
+    marker = PositionMarker(slice(1, 3), slice(2, 4), templ)
+    assert marker.source_slice == slice(1, 3)
+    assert marker.templated_slice == slice(2, 4)
@@ -123,3 +123,32 @@ def test__parser__matchresult2_apply_zero_length_with_context(
         seg.to_tuple(show_raw=True, include_meta=True) for seg in out_segments
     )
     assert serialised == (("dedent", ""),)
+
+
+def test__parser__matchresult2_shifted():
+    """Test moving a match to a different position."""
+    match = MatchResult(
+        matched_slice=slice(1, 4),
+        insert_segments=((3, Indent),),
+        child_matches=(
+            MatchResult(
+                matched_slice=slice(2, 3),
+                matched_class=ExampleSegment,
+                segment_kwargs={"expected": "foo"},
+                insert_segments=((2, Dedent),),
+            ),
+        ),
+    )
+    assert match.shifted(0) is match
+    assert match.shifted(5) == MatchResult(
+        matched_slice=slice(6, 9),
+        insert_segments=((8, Indent),),
+        child_matches=(
+            MatchResult(
+                matched_slice=slice(7, 8),
+                matched_class=ExampleSegment,
+                segment_kwargs={"expected": "foo"},
+                insert_segments=((7, Dedent),),
+            ),
+        ),
+    )
@@ -0,0 +1,49 @@
+"""Regression benchmarks for the memory used by lexed and parsed segments."""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.parser import Lexer, Parser, PyLexer
+
+# The memory allocated per lexed segment, in bytes, when lexing and then
+# parsing a typical query. For reference, these were around 1400 and 2400
+# bytes with the Rust lexer, before segments and markers were made leaner.
+# There's some headroom for different python versions, and for caches which
+# grow while parsing.
+LEXED_BYTES_PER_SEGMENT = 1000
+PARSED_BYTES_PER_SEGMENT = 2000
+
+SQL = "".join(
+    f"SELECT a.id, b.name, COUNT(*) AS c{i}\n"
+    f"FROM t{i} AS a\n"
+    f"JOIN t{i + 1} AS b ON a.id = b.id  -- comment\n"
+    f"WHERE a.x > {i} AND b.y IN (1, 2, 3);\n"
+    for i in range(25)
+)
+
+
+@pytest.mark.parametrize("lexer_class", [Lexer, PyLexer])
+def test__parser__memory_per_segment(lexer_class):
+    """Test the memory used by segments doesn't regress."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    lexer = lexer_class(config=config)
+    parser = Parser(config=config)
+    # Warm up any caches, so that we only measure the segments.
+    parser.parse(lexer.lex(SQL)[0])
+    gc.collect()
+    tracemalloc.start()
+    try:
+        segments, _ = lexer.lex(SQL)
+        gc.collect()
+        lexed = tracemalloc.get_traced_memory()[0]
+        tree = parser.parse(segments)
+        gc.collect()
+        parsed = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert tree
+    assert lexed / len(segments) < LEXED_BYTES_PER_SEGMENT
+    assert parsed / len(segments) < PARSED_BYTES_PER_SEGMENT
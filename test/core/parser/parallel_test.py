@@ -0,0 +1,87 @@
+"""Tests for matching the statements of a large file in parallel."""
+
+import multiprocessing.dummy
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import Lexer, Parser, parallel
+from sqlfluff.core.parser.parallel import split_statements
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Match in threads rather than processes, which is quicker to test."""
+    monkeypatch.setattr(parallel, "_create_pool", multiprocessing.dummy.Pool)
+    yield
+    parallel.close_pool()
+
+
+def _raws_after_splits(sql, dialect="ansi"):
+    config = FluffConfig(overrides={"dialect": dialect})
+    rendered = Linter(config=config).render_string(sql, "<string>", config, "utf8")
+    segments, _ = Lexer(config=config).lex(rendered.templated_variants[0])
+    root_segment = config.get("dialect_obj").get_root_segment()
+    return [segments[idx].raw for idx in split_statements(segments, root_segment)]
+
+
+@pytest.mark.parametrize(
+    "sql,dialect,expected",
+    [
+        ("SELECT 1;\nSELECT 2;\n\nSELECT 3\n", "ansi", ["SELECT", "SELECT"]),
+        # Statements on the same line aren't split.
+        ("SELECT 1; SELECT 2;\nSELECT 3;\n", "ansi", ["SELECT"]),
+        # Nor are those in blocks or brackets.
+        (
+            "CREATE PROCEDURE p()\nBEGIN\n  SELECT 1;\n  SELECT 2;\nEND;\n"
+            "SELECT (\n1;\n);\nSELECT 3;\n",
+            "mysql",
+            ["SELECT", "SELECT"],
+        ),
+        # Transactions aren't blocks.
+        ("BEGIN;\nSELECT 1;\nCOMMIT;\n", "postgres", ["SELECT", "COMMIT"]),
+        # Batches in T-SQL are split at GO, but not at a GO with a count.
+        (
+            "SELECT 1;\nSELECT 2\nGO\nSELECT 3\nGO 2\nSELECT 4\n",
+            "tsql",
+            ["SELECT"],
+        ),
+        # Template blocks aren't split.
+        ("{% if true %}SELECT 1;\nSELECT 2;\n{% endif %}\n", "ansi", []),
+    ],
+)
+def test__parser__parallel_split_statements(sql, dialect, expected):
+    """Test where files are split between statements."""
+    assert _raws_after_splits(sql, dialect) == expected
+
+
+@pytest.mark.parametrize(
+    "sql,dialect,falls_back",
+    [
+        (
+            "SELECT a FROM b;\n" * 20 + "INSERT INTO t VALUES (1);\n" * 20,
+            "ansi",
+            False,
+        ),
+        ("SELECT 1\nGO\n" * 10, "tsql", False),
+        # If a run of statements doesn't match, we match the file as a whole.
+        ("SELECT 1;\n" * 10 + "CREATE TABLE;\n" + "SELECT 1;\n" * 10, "ansi", True),
+    ],
+)
+def test__parser__parallel_match(thread_pool, sql, dialect, falls_back, caplog):
+    """Test parallel matching gives the same tree as matching sequentially."""
+    config = FluffConfig(
+        overrides={
+            "dialect": dialect,
+            "parse_processes": 3,
+            "parse_split_min_segments": 0,
+        }
+    )
+    segments, _ = Lexer(config=config).lex(sql)
+    with caplog.at_level("INFO", logger="sqlfluff.parser"):
+        tree = Parser(config=config).parse(segments, fname="big.sql")
+    expected = Parser(dialect=dialect).parse(segments)
+    assert tree.to_tuple(show_raw=True) == expected.to_tuple(show_raw=True)
+    assert parallel._pool_processes == 3
+    assert ("Parallel match failed" in caplog.text) == falls_back
+    assert ("big.sql" in caplog.text) == falls_back
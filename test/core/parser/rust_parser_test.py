@@ -1294,3 +1294,24 @@ def test__rust_parser__tsql_datatype_method_case_sensitive(method, is_datatype_m
     native_ids = method_ids(False)
     assert rust_ids == native_ids  # parity with native
     assert (method in rust_ids) is is_datatype_method
+
+
+@pytest.mark.skipif(not _HAS_RUST_PARSER, reason="Rust parser not available")
+def test__rust_parser__from_config_reuses_parsers():
+    """Parsers are reused for configs with the same parser settings."""
+    from sqlfluff.core import FluffConfig
+
+    parser = RustParser.from_config(FluffConfig(overrides={"dialect": "ansi"}))
+    assert parser is RustParser.from_config(
+        # Config which doesn't affect parsing doesn't matter.
+        FluffConfig(overrides={"dialect": "ansi", "max_line_length": 20})
+    )
+    for config in [
+        FluffConfig(overrides={"dialect": "postgres"}),
+        FluffConfig(overrides={"dialect": "ansi", "max_parse_depth": 10}),
+        FluffConfig.from_string(
+            "[sqlfluff]\ndialect = ansi\n"
+            "[sqlfluff:indentation]\nindented_joins = True\n"
+        ),
+    ]:
+        assert parser is not RustParser.from_config(config)
@@ -6,7 +6,8 @@ import pytest
 
 from sqlfluff.core import Linter
 from sqlfluff.core.parser import BaseSegment, PositionMarker, RawSegment
-from sqlfluff.core.parser.segments.base import PathStep
+from sqlfluff.core.parser.segments.base import PathStep, SourceFix
+from sqlfluff.core.parser.segments.fingerprint import Fingerprint, raw_fingerprint
 from sqlfluff.core.rules.base import LintFix
 from sqlfluff.core.templaters import TemplatedFile
 
@@ -584,3 +585,26 @@ def test__parser__base_segments_structural_simplify_with_position():
     assert result_nested["start_line_no"] == 1
     assert result_nested["parent"]["child"] == "val"
     assert result_nested["parent"]["start_line_no"] == 1
+
+
+def test__parser__base_segments_fingerprint():
+    """Test fingerprints depend on the raw and source fixes, not the tree."""
+    tree = Linter(dialect="ansi").parse_string("select a, b from c\n").tree
+    flat = Fingerprint.concat(seg.fingerprint for seg in tree.raw_segments)
+    assert tree.fingerprint == flat
+    assert tree.fingerprint == raw_fingerprint(tree.raw, [])
+    assert tree.fingerprint != raw_fingerprint("select a, b from d\n", [])
+    fix = SourceFix("x", slice(0, 1), slice(0, 1))
+    assert raw_fingerprint("a", [fix]) != raw_fingerprint("a", [])
+    assert raw_fingerprint("a", [fix]) != raw_fingerprint(
+        "a", [SourceFix("x", slice(0, 1), slice(1, 2))]
+    )
+
+    # Copies keep the fingerprint, but changing the children of a segment
+    # drops that of the segment and those it's within.
+    copied = tree.copy()
+    assert copied.__dict__["_fingerprint"] == tree.fingerprint
+    select = next(copied.recursive_crawl("select_clause"))
+    select.segments = select.segments[:1]
+    assert "_fingerprint" not in copied.__dict__
+    assert copied.fingerprint == raw_fingerprint("select from c\n", [])
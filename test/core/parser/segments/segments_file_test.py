@@ -1,6 +1,6 @@
 """Test the BaseFileSegment class."""
 
-from sqlfluff.core.parser import BaseFileSegment
+from sqlfluff.core.parser import BaseFileSegment, PositionMarker
 
 
 def test__parser__base_segments_file(raw_segments):
@@ -10,3 +10,55 @@ def test__parser__base_segments_file(raw_segments):
     assert base_seg.file_path == "/some/dir/file.sql"
     assert base_seg.can_start_end_non_code
     assert base_seg.allow_empty
+
+
+def test__parser__base_segments_file_lazy(raw_segments):
+    """Test the children of a lazy BaseFileSegment are only built when needed."""
+    calls = []
+
+    def build_segments():
+        calls.append(1)
+        return raw_segments
+
+    pos_marker = PositionMarker.from_points(
+        raw_segments[0].pos_marker.start_point_marker(),
+        raw_segments[-1].pos_marker.end_point_marker(),
+    )
+    expected = BaseFileSegment(raw_segments, fname="file.sql")
+    base_seg = BaseFileSegment.from_lazy_segments(
+        build_segments,
+        pos_marker,
+        fname="file.sql",
+        raw=expected.raw,
+        descendant_type_set=expected.descendant_type_set,
+    )
+    assert base_seg.raw == "foobar.barfoo"
+    assert base_seg.file_path == "file.sql"
+    # Crawling for types which aren't in the file doesn't need the children.
+    assert not list(base_seg.recursive_crawl("comment"))
+    assert not calls
+    assert [seg.raw for seg in base_seg.recursive_crawl("raw")] == [
+        "foobar",
+        ".barfoo",
+    ]
+    assert base_seg.segments[0].get_parent()[0] is base_seg
+    assert len(calls) == 1
+    assert base_seg.to_tuple(show_raw=True) == expected.to_tuple(show_raw=True)
+
+
+def test__parser__base_segments_file_lazy_copy(raw_segments):
+    """Test copying a lazy BaseFileSegment copies its children."""
+    pos_marker = PositionMarker.from_points(
+        raw_segments[0].pos_marker.start_point_marker(),
+        raw_segments[-1].pos_marker.end_point_marker(),
+    )
+    base_seg = BaseFileSegment.from_lazy_segments(
+        lambda: tuple(seg.copy() for seg in raw_segments), pos_marker
+    )
+    copied = base_seg.copy()
+    assert "_build_segments" not in copied.__dict__
+    assert copied.raw == base_seg.raw
+    for seg, copied_seg in zip(base_seg.segments, copied.segments):
+        assert copied_seg is not seg
+        assert seg.get_parent()[0] is base_seg
+        assert copied_seg.get_parent()[0] is copied
@@ -0,0 +1,78 @@
+"""Tests for the index of the segments in a parsed tree."""
+
+import pytest
+
+from sqlfluff.core import Linter
+
+SQL = (
+    "with cte as (select a, b from tbl where x in (select y from z))\n"
+    "select cte.a, (select max(c) from d) as m\n"
+    "from cte join e using (b)\n"
+)
+
+
+@pytest.fixture
+def tree():
+    """A parsed tree to index."""
+    return Linter(dialect="ansi").parse_string(SQL).tree
+
+
+@pytest.mark.parametrize(
+    "seg_type, recurse_into, no_recursive_seg_type, allow_self",
+    [
+        (("select_statement",), True, None, True),
+        (("select_statement",), False, None, True),
+        (("column_reference", "identifier"), True, None, True),
+        (("naked_identifier",), True, ["bracketed"], True),
+        (("select_statement", "bracketed"), False, ["from_clause"], True),
+        (("file",), True, None, False),
+    ],
+)
+def test__parser__segment_index_crawl(
+    tree, seg_type, recurse_into, no_recursive_seg_type, allow_self
+):
+    """Test crawls using the index find the same segments as walking the tree."""
+    for segment in [tree] + list(tree.recursive_crawl("bracketed")):
+        expected = list(
+            segment._recursive_crawl(
+                seg_type, recurse_into, no_recursive_seg_type, allow_self
+            )
+        )
+        actual = list(
+            segment.recursive_crawl(
+                *seg_type,
+                recurse_into=recurse_into,
+                no_recursive_seg_type=no_recursive_seg_type,
+                allow_self=allow_self,
+            )
+        )
+        assert [seg.uuid for seg in actual] == [seg.uuid for seg in expected]
+    assert "_segment_index" in tree.__dict__
+
+
+def test__parser__segment_index_path_to(tree):
+    """Test paths found with the index."""
+    select = next(tree.recursive_crawl("select_statement"))
+    ref = next(select.recursive_crawl("column_reference"))
+    path = select.path_to(ref)
+    assert path[0].segment is select
+    assert path[-1].segment.segments[path[-1].idx] is ref
+    for step, next_step in zip(path, path[1:]):
+        assert step.segment.segments[step.idx] is next_step.segment
+    # A segment which isn't within the other has no path to it.
+    other = list(tree.recursive_crawl("select_statement"))[-1]
+    assert not other.path_to(ref)
+    assert tree.path_to(tree) == []
+
+
+def test__parser__segment_index_invalidated(tree):
+    """Test the index is dropped when any segment in the tree changes."""
+    before = list(tree.recursive_crawl("select_clause_element"))
+    assert "_segment_index" in tree.__dict__
+    select = next(tree.recursive_crawl("select_clause"))
+    removed = list(select.recursive_crawl("select_clause_element"))
+    select.segments = select.segments[:1]
+    assert "_segment_index" not in tree.__dict__
+    after = list(tree.recursive_crawl("select_clause_element"))
+    assert len(after) == len(before) - len(removed)
+    assert not {seg.uuid for seg in removed} & {seg.uuid for seg in after}
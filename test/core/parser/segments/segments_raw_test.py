@@ -1,5 +1,6 @@
 """Test the RawSegment class."""
 
+from sqlfluff.core.parser import CodeSegment
 from sqlfluff.core.parser.segments.base import PathStep
 
 
@@ -28,3 +29,16 @@ def test__parser__raw_segments_with_ancestors(
         ),
         (raw_segments[1], [PathStep(test_seg, 1, 2, (0, 1))]),
     ]
+
+
+def test__parser__raw_shared_values():
+    """Test raw segments share values which are the same for many segments."""
+    upper = CodeSegment("SELECT", instance_types=("keyword",))
+    lower = CodeSegment("select", instance_types=("keyword",))
+    # The raw is reused if it's already uppercase.
+    assert upper.raw_upper is upper.raw
+    assert lower.raw_upper == "SELECT"
+    # Segments with the same class and types share their set of types.
+    assert upper.class_types is lower.class_types
+    assert upper.class_types == {"keyword", "raw", "base"}
+    assert upper.class_types is not CodeSegment("x").class_types
@@ -0,0 +1,104 @@
+"""Tests for reusing the matches of statements with the same shape."""
+
+import threading
+
+import pytest
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.parser import Lexer, Parser, shape_cache
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.shape_cache import ParseShapeCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_shape_caches(monkeypatch):
+    """Start each test without any cached shapes."""
+    monkeypatch.setattr(shape_cache, "_shape_caches", threading.local())
+
+
+def _parse(sql, use_cache, dialect="ansi"):
+    """Parse some sql, returning the tree and the parse statistics."""
+    config = FluffConfig(overrides={"dialect": dialect, "parse_shape_cache": use_cache})
+    segments, _ = Lexer(config=config).lex(sql)
+    contexts = []
+    from_config = ParseContext.from_config
+
+    def _capture(config):
+        contexts.append(from_config(config))
+        return contexts[-1]
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ParseContext, "from_config", _capture)
+        tree = Parser(config=config).parse(segments)
+    return tree, contexts[0].parse_stats
+
+
+@pytest.mark.parametrize(
+    "sql,hits,misses",
+    [
+        # Repeated statements are reused, regardless of layout and
+        # comments between them, but not if the code differs.
+        (
+            "SELECT a FROM b;\nSELECT a FROM b;\nSELECT a  FROM b;\n"
+            "-- c\nSELECT a FROM b;\nSELECT a FROM c;\n",
+            2,
+            3,
+        ),
+        # The start of the file is a different context to later statements.
+        ("INSERT INTO t VALUES (1, 'a');\n" * 5, 3, 2),
+        # Statements which only differ in their literals are reused too.
+        ("".join(f"INSERT INTO t VALUES ({i}, 'v{i}');\n" for i in range(200)), 198, 2),
+        # Statements which aren't followed by a semicolon aren't cached.
+        ("SELECT 1\n" * 3, 0, 1),
+    ],
+)
+def test__parser__shape_cache_reuse(sql, hits, misses):
+    """Test statements with the same shape reuse their match."""
+    tree, stats = _parse(sql, use_cache=True)
+    expected_tree, expected_stats = _parse(sql, use_cache=False)
+    assert tree.to_tuple(show_raw=True) == expected_tree.to_tuple(show_raw=True)
+    assert (stats.get("shape_cache_hits", 0), stats["shape_cache_misses"]) == (
+        hits,
+        misses,
+    )
+    assert "shape_cache_hits" not in expected_stats
+
+
+def test__parser__shape_cache_between_files():
+    """Test the cache persists between files, for the same config."""
+    sql = "SELECT a FROM b;\nUPDATE t SET x = 1 WHERE y = 2;\n"
+    _parse(sql, use_cache=True)
+    _, stats = _parse(sql, use_cache=True)
+    assert stats.get("shape_cache_hits", 0) == 2
+    # Other dialects have their own cache.
+    _, stats = _parse(sql, use_cache=True, dialect="postgres")
+    assert "shape_cache_hits" not in stats
+
+
+def test__parser__shape_cache_disabled():
+    """Test there's no cache unless it's configured."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    assert ParseShapeCache.from_config(config) is None
+
+
+def test__parser__shape_cache_literal_shapes():
+    """Test literals share a shape, unless the grammar matches their raw."""
+    config = FluffConfig(overrides={"dialect": "snowflake"})
+    segments, _ = Lexer(config=config).lex(
+        "1 2 20001 20002 'a' 'b' 'bucket-owner-full-control'"
+    )
+    literals = shape_cache._LiteralShapes(config.get("dialect_obj"))
+    shapes = [
+        shape_cache._segment_shape(segment, literals)
+        for segment in segments
+        if segment.is_code
+    ]
+    one, two, code_a, code_b, str_a, str_b, acl = shapes
+    assert one == two
+    assert code_a == code_b
+    # Exception codes are matched by a regex, so differ from other numbers.
+    assert one != code_a
+    assert str_a == str_b
+    # Some strings are matched exactly.
+    assert acl != str_a
+    assert acl[-1] == "'bucket-owner-full-control'"
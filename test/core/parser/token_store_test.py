@@ -0,0 +1,81 @@
+"""Tests for the lazy store of lexed tokens."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import Lexer, PyLexer, TokenStore
+from sqlfluff.core.parser.segments import CommentSegment, EndOfFile, Indent
+
+SQL = (
+    "SELECT a, b -- comment\n"
+    "FROM t\n"
+    "{% if true %}WHERE x = 1{% endif %}\n"
+    "{% for i in [1, 2] %} {{ i }}{% endfor %}\n"
+)
+
+
+@pytest.fixture(scope="module")
+def templated_file():
+    """The templated file to lex."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    rendered = Linter(config=config).render_string(SQL, "<string>", config, "utf8")
+    return rendered.templated_variants[0]
+
+
+@pytest.mark.parametrize("lexer_class", [Lexer, PyLexer])
+def test__parser__token_store_segments(lexer_class, templated_file):
+    """Test the store gives the same segments as lexing them directly."""
+    lexer = lexer_class(config=FluffConfig(overrides={"dialect": "ansi"}))
+    store, violations = lexer.lex_tokens(templated_file)
+    segments, _ = lexer.lex(templated_file)
+    assert isinstance(store, TokenStore)
+    assert not violations
+    assert len(store) == len(segments)
+    assert store.raws() == [segment.raw for segment in segments]
+    counts = store.segment_class_counts()
+    assert counts[CommentSegment] == 1
+    assert counts[EndOfFile] == 1
+    assert counts[Indent] == 3
+    assert [
+        (segment.__class__, segment.raw, segment.pos_marker.working_loc)
+        for segment in store
+    ] == [
+        (segment.__class__, segment.raw, segment.pos_marker.working_loc)
+        for segment in segments
+    ]
+
+
+def test__parser__token_store_lazy(templated_file):
+    """Test the segments from the Rust lexer are only created when accessed."""
+    store, _ = Lexer(config=FluffConfig(overrides={"dialect": "ansi"})).lex_tokens(
+        templated_file
+    )
+    if store.rs_tokens is None:  # pragma: no cover
+        pytest.skip("The Rust lexer isn't available.")
+    assert store.materialised == 0
+    assert store.segment_class_counts()[CommentSegment] == 1
+    assert store.raws()[2] == "a"
+    assert store.materialised == 0
+    segment = store[2]
+    assert segment.raw == "a"
+    assert store[2] is segment
+    assert store[-1].is_type("end_of_file")
+    assert store.materialised == 2
+    assert store[:3][2] is segment
+    assert store.segments()[2] is segment
+    assert store.materialised == len(store)
+
+
+def test__parser__token_store_linter(templated_file):
+    """Test the linter passes the store through from the lexer."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    tokens, _ = Linter._lex_templated_file(templated_file, config)
+    assert isinstance(tokens, TokenStore)
+    # Without template indents, the indents are removed.
+    config = FluffConfig(
+        configs={"indentation": {"template_blocks_indent": False}},
+        overrides={"dialect": "ansi"},
+    )
+    tokens, _ = Linter._lex_templated_file(templated_file, config)
+    assert not isinstance(tokens, TokenStore)
+    assert not any(segment.is_type("indent") for segment in tokens)
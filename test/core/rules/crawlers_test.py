@@ -4,6 +4,7 @@ import pytest
 
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.linter.linter import Linter
+from sqlfluff.core.parser import Lexer, Parser
 from sqlfluff.core.rules.context import RuleContext
 from sqlfluff.core.rules.crawlers import (
     ParentOfSegmentCrawler,
@@ -51,3 +52,56 @@ def test_rules_crawlers(CrawlerType, crawler_kwargs, raw_sql_in, target_raws_out
     result_raws = [context.segment.raw for context in crawler.crawl(root_context)]
 
     assert result_raws == target_raws_out
+
+
+@pytest.mark.parametrize(
+    "crawler_kwargs",
+    [
+        {"types": {"column_reference"}},
+        {"types": {"expression"}, "allow_recurse": False},
+        {"types": {"file", "keyword"}},
+        {"types": {"comparison_operator"}},
+    ],
+)
+def test_rules_crawlers_arena(crawler_kwargs):
+    """Test crawling the Rust arena finds the same segments as the python tree."""
+    sqlfluffrs = pytest.importorskip("sqlfluffrs")
+    raw_sql_in = "SELECT a, b + 1 AS c\nFROM t -- hi\nWHERE x IN (1, (2));\n" * 3
+    cfg = FluffConfig(overrides={"dialect": "ansi"})
+    tokens, _ = Lexer(config=cfg).lex_tokens(raw_sql_in)
+    if tokens.rs_tokens is None:  # pragma: no cover
+        pytest.skip("The Rust lexer isn't available.")
+    root = Parser(config=cfg).parse(tokens.segments())
+    code_idxs = [idx for idx, token in enumerate(tokens.rs_tokens) if token.is_code]
+    rs_tokens = tokens.rs_tokens[code_idxs[0] : code_idxs[-1] + 1]
+    rs_match = sqlfluffrs.RsParser(dialect="ansi").parse_match_result_from_tokens(
+        rs_tokens
+    )
+    rs_tree = rs_match.apply_as_tree(
+        rs_tokens,
+        leading=tokens.rs_tokens[: code_idxs[0]],
+        trailing=tokens.rs_tokens[code_idxs[-1] + 1 :],
+    )
+
+    def _crawl():
+        root_context = RuleContext(
+            dialect=cfg.get("dialect_obj"),
+            fix=False,
+            templated_file=None,
+            path=None,
+            segment=root,
+            config=cfg,
+        )
+        return [
+            (
+                context.segment.uuid,
+                [segment.uuid for segment in context.parent_stack],
+                context.segment_idx,
+            )
+            for context in SegmentSeekerCrawler(**crawler_kwargs).crawl(root_context)
+        ]
+
+    expected = _crawl()
+    root._rs_tree = rs_tree
+    assert SegmentSeekerCrawler(**crawler_kwargs)._can_crawl_arena(root)
+    assert _crawl() == expected
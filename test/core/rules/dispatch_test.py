@@ -0,0 +1,51 @@
+"""Tests for running many rules in a single walk of the tree."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.rules.dispatch import can_dispatch, crawl_rules
+
+
+@pytest.mark.parametrize(
+    "raw_sql",
+    [
+        "select a,B from tbl as t\nwhere  t.x = 1 AND y IN (1,2)\n",
+        "SELECT 1;\nSELECT a b c FROM;\nselect x from y\n",
+        "with cte as (select 1 as x) select x from cte union select 2\n",
+    ],
+)
+def test_rules_dispatch_matches_crawl(raw_sql):
+    """Test the rules give the same results as crawling the tree separately."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    linter = Linter(config=config)
+    parsed = linter.parse_string(raw_sql)
+    rules = linter.get_rulepack(config=config).rules
+    kwargs = dict(
+        dialect=config.get("dialect_obj"),
+        templated_file=parsed.parsed_variants[0].templated_file,
+        ignore_mask=None,
+        fname=None,
+        config=config,
+    )
+    dispatched = crawl_rules(rules, parsed.tree, **kwargs)
+    assert dispatched
+    for rule in rules:
+        if not can_dispatch(rule, parsed.tree, config):
+            assert rule.code not in dispatched
+            continue
+        expected, _, _, _ = rule.crawl(parsed.tree, fix=False, **kwargs)
+        violations, _ = dispatched[rule.code]
+        assert [
+            (violation.segment.uuid, violation.desc()) for violation in violations
+        ] == [(violation.segment.uuid, violation.desc()) for violation in expected]
+
+
+def test_rules_dispatch_can_dispatch():
+    """Test which rules are run in the shared walk."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    linter = Linter(config=config)
+    tree = linter.parse_string("SELECT 1\n").tree
+    rules = {rule.code: rule for rule in linter.get_rulepack(config=config).rules}
+    assert not can_dispatch(rules["LT07"], tree, config)
+    assert can_dispatch(rules["LT01"], tree, config)
+    assert can_dispatch(rules["CP01"], tree, config)
@@ -391,6 +391,89 @@ def test_linted_file_ignore_masked_violations(
     assert actually_used == expected_used
 
 
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("-- noqa: disable=all\nSELECT 1\n", True),
+        ("--noqa:disable=all\nSELECT 1 -- noqa: LT01\n", True),
+        # Not on the first line, so there may be violations before it.
+        ("\n-- noqa: disable=all\nSELECT 1\n", False),
+        # Not all rules.
+        ("-- noqa: disable=LT01\nSELECT 1\n", False),
+        # Not a comment.
+        ("SELECT '-- noqa: disable=all'\n", False),
+        # Enabled again (even if possibly not).
+        ("-- noqa: disable=all\nSELECT 1\n-- noqa: enable=LT01\n", False),
+        ("-- noqa: disable=all\nSELECT 1 /* noqa: enable=all */\n", False),
+        ("-- noqa: disable=all\nSELECT 'enable' -- noqa\n", False),
+    ],
+)
+def test_source_disables_all(source, expected):
+    """Test finding whether noqa comments disable all rules in raw source."""
+    dialect = FluffConfig(overrides={"dialect": "ansi"}).get("dialect_obj")
+    assert IgnoreMask.source_disables_all(source, dialect) is expected
+
+
+def test_ignore_masked_violations_one_at_a_time():
+    """Test filtering violations separately, as rules do, matches in a batch."""
+    noqa = [
+        dict(comment="noqa: disable=LT01", line_no=2),
+        dict(comment="noqa: LT02", line_no=3),
+        dict(comment="noqa", line_no=3),
+        dict(comment="noqa: disable=all", line_no=5),
+        dict(comment="noqa: enable=LT02", line_no=6),
+        dict(comment="noqa: enable=all", line_no=8),
+        dict(comment="noqa: enable=LT01", line_no=9),
+    ]
+    violations = [
+        DummyLintError(line_no, code)
+        for line_no in range(1, 11)
+        for code in ("LT01", "LT02", "AL01")
+    ]
+    results = []
+    for one_at_a_time in (False, True):
+        ignore_mask = [
+            IgnoreMask._parse_noqa(reference_map=dummy_rule_map, line_pos=0, **c)
+            for c in noqa
+        ]
+        mask = IgnoreMask(ignore_mask)
+        if one_at_a_time:
+            result = [v for v in violations if mask.ignore_masked_violations([v])]
+        else:
+            result = mask.ignore_masked_violations(violations)
+        results.append(
+            (
+                [(v.line_no, v.rule_code()) for v in result],
+                [ignore.used for ignore in ignore_mask],
+            )
+        )
+    assert results[0] == results[1]
+    assert results[0][0] == [
+        (1, "LT01"),
+        (1, "LT02"),
+        (1, "AL01"),
+        (2, "LT02"),
+        (2, "AL01"),
+        (4, "LT02"),
+        (4, "AL01"),
+        (6, "LT02"),
+        (7, "LT02"),
+        (8, "LT01"),
+        (8, "LT02"),
+        (8, "AL01"),
+        (9, "LT01"),
+        (9, "LT02"),
+        (9, "AL01"),
+        (10, "LT01"),
+        (10, "LT02"),
+        (10, "AL01"),
+    ]
+    # NOTE: The "noqa" on line 3 only filters out the violation which the
+    # "noqa: LT02" before it didn't, and the "enable=LT01" on line 9 is used
+    # because it follows a violation of LT01 (even though it's not disabled).
+    assert all(results[0][1])
+
+
 def test_linter_noqa():
     """Test "noqa" feature at the higher "Linter" level."""
     lntr = Linter(
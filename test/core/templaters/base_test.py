@@ -3,6 +3,9 @@
 import pytest
 
 from sqlfluff.core.templaters import (
+    JinjaTemplater,
+    PlaceholderTemplater,
+    PythonTemplater,
     RawTemplater,
     TemplatedFile,
 )
@@ -35,6 +38,28 @@ def test__templater_raw():
     assert instr == str(outstr)
 
 
+
+class _PluginTemplater(RawTemplater):
+    name = "plugin"
+
+
+@pytest.mark.parametrize(
+    "templater, in_str, result",
+    [
+        (RawTemplater(), "SELECT {{ a }}", False),
+        (PlaceholderTemplater(), "SELECT :a", False),
+        (PythonTemplater(), "SELECT a", False),
+        (PythonTemplater(), "SELECT {a}", True),
+        (JinjaTemplater(), "SELECT a", False),
+        (JinjaTemplater(), "SELECT {{ a }}", True),
+        # Templaters from plugins may add comments unless they say otherwise.
+        (_PluginTemplater(), "SELECT a", True),
+    ],
+)
+def test__templater_may_add_comments(templater, in_str, result):
+    """Test which templaters could add comments to a string."""
+    assert templater.may_add_comments(in_str) is result
+
 SIMPLE_FILE_KWARGS = {
     "fname": "test.sql",
     "source_str": "01234\n6789{{foo}}fo\nbarss",
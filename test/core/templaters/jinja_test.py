@@ -7,6 +7,7 @@ loops and placeholders.
 """
 
 import logging
+import os
 from collections import defaultdict
 from pathlib import Path
 from typing import NamedTuple, Union
@@ -633,7 +634,115 @@ def test__templater_jinja_macro_path_configured_encoding(
     assert "square" in macros
 
 
-def test__templater_jinja_dynamic_variable_no_violations():
+def test__templater_jinja_get_cache_dependencies(tmp_path):
+    """Test the macro and library paths are reported as cache dependencies."""
+    macro_file = tmp_path / "macros.sql"
+    macro_file.write_text("{% macro square(n) %}{{ n * n }}{% endmacro %}")
+    config = FluffConfig(
+        configs={
+            "core": {"dialect": "ansi", "templater": "jinja"},
+            "templater": {
+                "jinja": {
+                    "load_macros_from_path": str(macro_file),
+                    "library_path": str(tmp_path / "libs"),
+                },
+            },
+        }
+    )
+    assert JinjaTemplater().get_cache_dependencies(config) == [
+        str(macro_file),
+        str(tmp_path / "libs"),
+    ]
+    assert (
+        JinjaTemplater().get_cache_dependencies(
+            FluffConfig(overrides={"dialect": "ansi"})
+        )
+        == []
+    )
+
+
+def test__templater_jinja_env_cache(tmp_path):
+    """Test environments are shared between files until the macros change."""
+    macro_file = tmp_path / "macros.sql"
+    macro_file.write_text("{% macro square(n) %}{{ n * n }}{% endmacro %}")
+    config = FluffConfig(
+        configs={
+            "core": {"dialect": "ansi", "templater": "jinja"},
+            "templater": {"jinja": {"load_macros_from_path": str(macro_file)}},
+        }
+    )
+    templater = JinjaTemplater()
+
+    def render(in_str):
+        templated_file, violations = templater.process(
+            in_str=in_str, fname="test.sql", config=config
+        )
+        return str(templated_file), [v.desc() for v in violations]
+
+    assert render("SELECT {{ square(2) }}, {{ undefined_a }}\n") == (
+        "SELECT 4, \n",
+        ["Undefined jinja template variable: 'undefined_a'"],
+    )
+    # Undefined variables from the first file aren't carried over.
+    assert render("SELECT {{ square(3) }}, {{ undefined_a }}\n") == (
+        "SELECT 9, \n",
+        ["Undefined jinja template variable: 'undefined_a'"],
+    )
+    stats = templater.get_cache_stats()
+    assert stats["env misses"] == 1
+    assert stats["env hits"] == 1
+
+    # Changing the macro file invalidates the cached environment.
+    macro_file.write_text("{% macro square(n) %}{{ n * n * 10 }}{% endmacro %}")
+    os.utime(macro_file, ns=(0, 0))
+    assert render("SELECT {{ square(2) }}\n") == ("SELECT 40\n", [])
+    assert templater.get_cache_stats()["env misses"] == 2
+
+
+def test__templater_jinja_env_cache_snapshot_per_run(tmp_path, monkeypatch):
+    """Test the macros are only snapshotted once per run."""
+    snapshots = []
+
+    def _snapshot_paths(paths):
+        snapshots.append(tuple(paths))
+        return "snapshot"
+
+    monkeypatch.setattr(
+        "sqlfluff.core.templaters.jinja.snapshot_paths", _snapshot_paths
+    )
+    macro_file = tmp_path / "macros" / "macros.sql"
+    macro_file.parent.mkdir()
+    macro_file.write_text("{% macro one() %}1{% endmacro %}")
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.sql").write_text("SELECT {{ one() }}\n")
+    config = FluffConfig(
+        overrides={"dialect": "ansi"},
+        configs={
+            "templater": {"jinja": {"load_macros_from_path": str(macro_file)}}
+        },
+    )
+    linter = Linter(config=config)
+    linter.lint_paths((str(tmp_path / "a.sql"), str(tmp_path / "b.sql")))
+    assert len(snapshots) == 1
+    # Each run takes a new snapshot.
+    linter.lint_paths((str(tmp_path / "c.sql"),))
+    assert len(snapshots) == 2
+    # Outside of a run, they're taken for each file.
+    linter.lint_string("SELECT {{ one() }}\n")
+    linter.lint_string("SELECT {{ one() }}\n")
+    assert len(snapshots) == 4
+
+
+def test__templater_jinja_env_cache_timing_summary(tmp_path):
+    """Test the cache counters are reported in the timing summary."""
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.sql").write_text(f"SELECT {{{{ '{name}' }}}}\n")
+    linter = Linter(config=FluffConfig(overrides={"dialect": "ansi"}))
+    result = linter.lint_paths((str(tmp_path),))
+    summary = result.timing_summary()["templater cache"]
+    assert summary["env misses"] == 1
+    assert summary["env hits"] >= 1
+
     """Test no templater violation for variable defined within template."""
     t = JinjaTemplater(override_context=dict(blah="foo"))
     instr = """{% if True %}
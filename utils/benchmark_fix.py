@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the fix loop.
+
+Files are parsed once, and then only the fix loop (i.e. running the rules
+and applying their fixes, until the file is stable) is timed. Alongside
+the time, this counts the loops run and the segments re-parsed to check
+that fixes are valid, which is the bulk of the cost of applying them.
+
+By default the files are the ``before.sql`` files of the autofix test
+fixtures for the dialect.
+
+Usage:
+    python utils/benchmark_fix.py --dialect ansi --iterations 5
+    python utils/benchmark_fix.py --dialect tsql path/to/file.sql
+"""
+
+import argparse
+import glob
+import time
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser.segments.base import BaseSegment
+
+FIXTURES = "test/fixtures/linter/autofix/{dialect}/*/before.sql"
+
+
+def count_reparses() -> dict[str, int]:
+    """Count the calls to `validate_segment_with_reparse` from now on."""
+    counts = {"reparses": 0}
+    validate = BaseSegment.validate_segment_with_reparse
+
+    def counted(self: BaseSegment, *args, **kwargs) -> bool:
+        counts["reparses"] += 1
+        return validate(self, *args, **kwargs)
+
+    BaseSegment.validate_segment_with_reparse = counted  # type: ignore[method-assign]
+    return counts
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--dialect", default="ansi")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    config = FluffConfig(overrides={"dialect": args.dialect})
+    linter = Linter(config=config)
+    rule_pack = linter.get_rulepack(config=config)
+    paths = args.paths or sorted(glob.glob(FIXTURES.format(dialect=args.dialect)))
+    parsed = []
+    for path in paths:
+        with open(path) as f:
+            variant = linter.parse_string(f.read(), fname=path).root_variant()
+        if variant and variant.tree:
+            parsed.append((path, variant))
+
+    counts = count_reparses()
+    loop_stats: dict[str, int] = {}
+    total = 0.0
+    for iteration in range(args.iterations + 1):
+        start = time.perf_counter()
+        for path, variant in parsed:
+            Linter.lint_fix_parsed(
+                variant.tree,
+                config,
+                rule_pack,
+                fix=True,
+                fname=path,
+                templated_file=variant.templated_file,
+                loop_stats=loop_stats if iteration else None,
+            )
+        if not iteration:
+            # The first iteration is a warm up (e.g. for caches of the rules).
+            counts["reparses"] = 0
+            continue
+        total += time.perf_counter() - start
+
+    print(f"Fix loop ({args.dialect}, {len(parsed)} files)")
+    print(f"{'time per iteration (ms)':<28}{total * 1000 / args.iterations:>10.1f}")
+    for name, count in (
+        ("loops", loop_stats.get("loops", 0)),
+        ("reparses", counts["reparses"]),
+    ):
+        print(f"{name + ' per iteration':<28}{count / args.iterations:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
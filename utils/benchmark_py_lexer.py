@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark of the python lexer engines over the dialect fixture corpus.
+
+The python lexer (used when the Rust lexer isn't available) has two
+engines, selected with the `python_lexer` config value: `sequential`, which
+tries each lexer matcher in turn and slices off the rest of the string after
+each element, and `compiled`, which combines the matchers into one regex
+and matches at an offset. This lexes every fixture file with both, checks
+that the tokens are identical and reports the time taken by each.
+
+Files can be repeated to show how each engine scales with file size.
+
+Usage:
+    python utils/benchmark_py_lexer.py --dialect ansi --dialect tsql --repeat 10
+"""
+
+import argparse
+import glob
+import os.path
+import sys
+import time
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.dialects import dialect_readout
+from sqlfluff.core.parser.lexer import PyLexer
+
+ENGINES = ("sequential", "compiled")
+FIXTURE_PATH = os.path.join("test", "fixtures", "dialects")
+
+
+def token_stream(lexer: PyLexer, raw: str) -> list[tuple[str, str, str, int, int]]:
+    """Lex a string, returning a comparable summary of the tokens."""
+    segments, _ = lexer.lex(raw)
+    return [
+        (
+            type(segment).__name__,
+            segment.raw,
+            segment.get_type(),
+            segment.pos_marker.source_slice.start,
+            segment.pos_marker.source_slice.stop,
+        )
+        for segment in segments
+    ]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dialect",
+        action="append",
+        help="A dialect to benchmark. Can be repeated. Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="The number of times to repeat the content of each file.",
+    )
+    args = parser.parse_args()
+
+    dialects = args.dialect or [dialect.label for dialect in dialect_readout()]
+    totals = dict.fromkeys(ENGINES, 0.0)
+    mismatches = 0
+    header = "".join(f"{engine + ' (s)':>18}" for engine in ENGINES)
+    print(f"{'dialect':<14}{'files':>7}{header}")
+    for dialect in dialects:
+        lexers = {
+            engine: PyLexer(
+                config=FluffConfig(
+                    overrides={"dialect": dialect, "python_lexer": engine}
+                )
+            )
+            for engine in ENGINES
+        }
+        times = dict.fromkeys(ENGINES, 0.0)
+        fnames = sorted(glob.glob(os.path.join(FIXTURE_PATH, dialect, "*.sql")))
+        for fname in fnames:
+            with open(fname, encoding="utf8") as f:
+                raw = f.read() * args.repeat
+            streams = {}
+            for engine, lexer in lexers.items():
+                start = time.perf_counter()
+                streams[engine] = token_stream(lexer, raw)
+                times[engine] += time.perf_counter() - start
+            if streams["sequential"] != streams["compiled"]:
+                mismatches += 1
+                print(f"MISMATCH: {fname}")
+        for engine in ENGINES:
+            totals[engine] += times[engine]
+        print(
+            f"{dialect:<14}{len(fnames):>7}"
+            + "".join(f"{times[engine]:>18.3f}" for engine in ENGINES)
+        )
+    print(f"{'total':<21}" + "".join(f"{totals[e]:>18.3f}" for e in ENGINES))
+    if mismatches:
+        print(f"{mismatches} files lexed differently.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
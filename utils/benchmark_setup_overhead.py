@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the per-file setup cost of linting small files.
+
+Every file linted needs a config (which holds an expanded dialect) and,
+when the Rust parser is in use, a parser. Both are cached per process.
+This times creating them with the caches cleared before each file (as
+before the caches existed) and with warm caches, alongside parsing a
+small file for scale.
+
+Usage:
+    python utils/benchmark_setup_overhead.py --dialect tsql --iterations 50
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.dialects import dialect_selector
+from sqlfluff.core.parser.rust_parser import RustParser, _rust_parser_cache
+
+SMALL_SQL = "SELECT a, b FROM tbl WHERE c = 1;\n"
+
+
+def clear_caches() -> None:
+    """Clear the process wide dialect and parser caches."""
+    dialect_selector.cache_clear()
+    _rust_parser_cache.__dict__.clear()
+
+
+def time_per_call(func: Callable[[], object], iterations: int, cold: bool) -> float:
+    """Time a function, optionally clearing the caches before each call."""
+    # Warm up, so that imports aren't included.
+    func()
+    total = 0.0
+    for _ in range(iterations):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / iterations
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialect", default="ansi")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    overrides = {"dialect": args.dialect}
+    config = FluffConfig(overrides=overrides)
+    steps: list[tuple[str, Callable[[], object]]] = [
+        ("config", lambda: FluffConfig(overrides=overrides)),
+    ]
+    if RustParser is not None:
+        steps.append(("rust parser", lambda: RustParser.from_config(config)))
+    linter = Linter(config=config)
+    steps.append(("parse file", lambda: linter.parse_string(SMALL_SQL)))
+
+    print(f"Per-file setup cost ({args.dialect}, {args.iterations} iterations)")
+    print(f"{'step':<14}{'cold (ms)':>12}{'cached (ms)':>14}")
+    for name, func in steps:
+        cold = time_per_call(func, args.iterations, cold=True)
+        warm = time_per_call(func, args.iterations, cold=False)
+        print(f"{name:<14}{cold * 1000:>12.3f}{warm * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()